@@ -12,7 +12,8 @@ HIGH FIX: Активный механизм защиты от эхо-камер
 from typing import Dict, List, Tuple, Optional
 from dataclasses import dataclass
 from datetime import datetime
-import re
+
+from lexicon import Lexicon
 
 
 @dataclass
@@ -64,6 +65,20 @@ class AntiEchoDetector:
             r'you might want to'
         ]
         
+        # Маркеры критической рефлексии (подстроки)
+        self.critique_markers = ['однако', 'но', 'с другой стороны', 'важно учесть',
+                                 'however', 'but', 'on the other hand']
+        
+        # Все словари — в один сканер, компилируется один раз
+        self.lexicon = Lexicon(
+            {
+                'agreement': self.agreement_patterns,
+                'flattery': self.flattery_patterns,
+                'avoidance': self.avoidance_patterns,
+            },
+            literals={'critique': self.critique_markers},
+        )
+        
         self.echo_history: List[EchoPattern] = []
     
     def detect_echo_pattern(self, response: str, context: Dict) -> Tuple[bool, float, List[EchoPattern]]:
@@ -78,10 +93,10 @@ class AntiEchoDetector:
             Tuple[is_echo, confidence, detected_patterns]
         """
         detected_patterns = []
+        counts = self.lexicon.counts(response)  # один проход по тексту
         
         # 1. Проверка избыточного согласия
-        agreement_count = sum(1 for pattern in self.agreement_patterns 
-                             if re.search(pattern, response, re.IGNORECASE))
+        agreement_count = counts['agreement']
         
         if agreement_count > 2:
             detected_patterns.append(EchoPattern(
@@ -92,10 +107,7 @@ class AntiEchoDetector:
             ))
         
         # 2. Проверка отсутствия критики
-        critique_markers = ['однако', 'но', 'с другой стороны', 'важно учесть', 
-                           'however', 'but', 'on the other hand']
-        critique_count = sum(1 for marker in critique_markers 
-                            if marker.lower() in response.lower())
+        critique_count = counts['critique']
         
         response_length = len(response.split())
         if response_length > 50 and critique_count == 0:
@@ -107,8 +119,7 @@ class AntiEchoDetector:
             ))
         
         # 3. Проверка лести
-        flattery_count = sum(1 for pattern in self.flattery_patterns 
-                            if re.search(pattern, response, re.IGNORECASE))
+        flattery_count = counts['flattery']
         
         if flattery_count > 1:
             detected_patterns.append(EchoPattern(
@@ -119,8 +130,7 @@ class AntiEchoDetector:
             ))
         
         # 4. Проверка избегания прямого ответа
-        avoidance_count = sum(1 for pattern in self.avoidance_patterns 
-                             if re.search(pattern, response, re.IGNORECASE))
+        avoidance_count = counts['avoidance']
         
         if avoidance_count > 2:
             detected_patterns.append(EchoPattern(
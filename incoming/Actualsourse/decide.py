@@ -14,9 +14,16 @@ import sys
 from pathlib import Path
 from typing import Dict, List, Tuple
 
+from lexicon import Lexicon
+
 
 BASELINE = Path("reports/baseline_report.md")
 
+# Философские маркеры черных ячеек (подстроки, без учета регистра)
+CHAOS_KEYWORDS = ['парадокс', 'противоречие', 'uncertain', 'хаос', 'неопределенность']
+PAIN_KEYWORDS = ['боль', 'pain', 'конфликт', 'страдание', 'ошибка']
+DELTA_MARKERS = Lexicon(literals={'chaos': CHAOS_KEYWORDS, 'pain': PAIN_KEYWORDS})
+
 
 def analyze_delta_metrics(delta_block: Dict) -> Dict[str, float]:
     """
@@ -39,16 +46,13 @@ def analyze_delta_metrics(delta_block: Dict) -> Dict[str, float]:
     pain_markers = 0
     paradox_count = 0
     
-    # Философские маркеры
-    chaos_keywords = ['парадокс', 'противоречие', 'uncertain', 'хаос', 'неопределенность']
-    pain_keywords = ['боль', 'pain', 'конфликт', 'страдание', 'ошибка']
-    
     for d in d_blocks:
-        inference = d.get('inference', '').lower()
         fact = d.get('fact')
+        # Один проход по выводу на обе категории маркеров
+        counts = DELTA_MARKERS.counts(d.get('inference', ''))
         
         # Подсчет маркеров хаоса
-        if any(keyword in inference for keyword in chaos_keywords):
+        if counts['chaos']:
             chaos_markers += 1
         
         # uncertain факт = парадокс
@@ -57,7 +61,7 @@ def analyze_delta_metrics(delta_block: Dict) -> Dict[str, float]:
             paradox_count += 1
         
         # Подсчет маркеров боли
-        if any(keyword in inference for keyword in pain_keywords):
+        if counts['pain']:
             pain_markers += 1
     
     # Нормализация метрик
@@ -167,6 +167,259 @@ class FractalAnomalyDetector:
         return severity_scores
 
 
+class OnlineDetector:
+    """
+    Базовый онлайн-детектор аномалий для одной метрики
+    
+    В отличие от FractalAnomalyDetector не требует обучения на базовой
+    выборке: состояние — несколько чисел, обновление стоит O(1), поэтому
+    детектор можно вести для каждой сессии на каждом ходе. Состояние
+    сериализуется в JSON-совместимый словарь (``to_state`` /
+    ``OnlineDetector.from_state``).
+    """
+    
+    kind = 'base'
+    params: Tuple[str, ...] = ()
+    fields: Tuple[str, ...] = ()
+    
+    def update(self, value: float) -> Dict:
+        """Учесть новое значение; возвращает {'score', 'alarm', ...}"""
+        raise NotImplementedError
+    
+    def to_state(self) -> Dict:
+        state = {'type': self.kind}
+        state.update({name: getattr(self, name) for name in self.params})
+        state.update({name: getattr(self, '_' + name) for name in self.fields})
+        return state
+    
+    @staticmethod
+    def from_state(state: Dict) -> 'OnlineDetector':
+        """Восстановить детектор любого типа из ``to_state``"""
+        try:
+            cls = ONLINE_DETECTORS[state['type']]
+        except KeyError:
+            raise ValueError(f"Неизвестный тип онлайн-детектора: {state.get('type')}")
+        detector = cls(**{name: state[name] for name in cls.params if name in state})
+        for name in cls.fields:
+            if name in state:
+                setattr(detector, '_' + name, state[name])
+        return detector
+
+
+class EWMAZScoreDetector(OnlineDetector):
+    """
+    Z-оценка относительно экспоненциально взвешенных среднего и дисперсии
+    
+    Значение сравнивается со статистиками, накопленными до него, затем
+    статистики обновляются. Ловит резкие выбросы; к медленному дрейфу
+    адаптируется (для него — CUSUM и Page-Hinkley).
+    """
+    
+    kind = 'ewma'
+    params = ('alpha', 'threshold', 'warmup')
+    fields = ('n', 'mean', 'var')
+    
+    def __init__(self, alpha: float = 0.05, threshold: float = 3.5, warmup: int = 10):
+        if not 0.0 < alpha <= 1.0:
+            raise ValueError("alpha должен быть в (0, 1]")
+        self.alpha = alpha
+        self.threshold = threshold
+        self.warmup = warmup
+        self._n = 0
+        self._mean = 0.0
+        self._var = 0.0
+    
+    def update(self, value: float) -> Dict:
+        value = float(value)
+        if self._n == 0:
+            self._n, self._mean = 1, value
+            return {'score': 0.0, 'alarm': False, 'z': 0.0}
+        diff = value - self._mean
+        z = diff / (np.sqrt(self._var) + 1e-10) if self._var > 0 else 0.0
+        alarm = self._n >= self.warmup and abs(z) > self.threshold
+        # Экспоненциально взвешенные среднее и дисперсия (West, 1979);
+        # пока точек мало, веса равные — иначе дисперсия занижена
+        alpha = max(self.alpha, 1.0 / (self._n + 1))
+        increment = alpha * diff
+        self._mean += increment
+        self._var = (1.0 - alpha) * (self._var + diff * increment)
+        self._n += 1
+        return {'score': float(min(1.0, abs(z) / self.threshold)), 'alarm': bool(alarm), 'z': float(z)}
+
+
+class CUSUMDetector(OnlineDetector):
+    """
+    Двусторонний CUSUM по стандартизованным значениям
+    
+    Первые ``warmup`` значений задают опорные среднее и дисперсию (метод
+    Уэлфорда), затем опорный уровень фиксируется и накапливаются суммы
+    отклонений вверх и вниз за вычетом допуска ``k`` (в σ). Сигнал —
+    когда одна из сумм превышает ``h``; после сигнала суммы сбрасываются.
+    
+    σ не опускается ниже ``min_std`` (в единицах метрики): у постоянной
+    на разогреве метрики (например, confidence) дисперсия нулевая, и без
+    нижней границы любое последующее малое изменение давало бы z ~ 1e3
+    и мгновенный сигнал.
+    """
+    
+    kind = 'cusum'
+    params = ('k', 'h', 'warmup', 'min_std')
+    fields = ('n', 'mean', 'm2', 'pos', 'neg')
+    
+    def __init__(self, k: float = 0.5, h: float = 8.0, warmup: int = 20, min_std: float = 0.01):
+        if warmup < 2:
+            raise ValueError("warmup должен быть не меньше 2")
+        if min_std <= 0:
+            raise ValueError("min_std должен быть положительным")
+        self.k = k
+        self.h = h
+        self.warmup = warmup
+        self.min_std = min_std
+        self._n = 0
+        self._mean = 0.0
+        self._m2 = 0.0
+        self._pos = 0.0
+        self._neg = 0.0
+    
+    def update(self, value: float) -> Dict:
+        value = float(value)
+        if self._n < self.warmup:
+            self._n += 1
+            delta = value - self._mean
+            self._mean += delta / self._n
+            self._m2 += delta * (value - self._mean)
+            return {'score': 0.0, 'alarm': False, 'direction': None}
+        std = max(np.sqrt(self._m2 / (self._n - 1)), self.min_std)
+        z = (value - self._mean) / std
+        self._pos = max(0.0, self._pos + z - self.k)
+        self._neg = max(0.0, self._neg - z - self.k)
+        score = max(self._pos, self._neg) / self.h
+        direction = None
+        if self._pos > self.h:
+            direction = 'up'
+        elif self._neg > self.h:
+            direction = 'down'
+        if direction:
+            self._pos = self._neg = 0.0
+        return {'score': float(min(1.0, score)), 'alarm': direction is not None, 'direction': direction}
+
+
+class PageHinkleyDetector(OnlineDetector):
+    """
+    Тест Пейджа–Хинкли на сдвиг среднего в обе стороны
+    
+    Накапливает отклонения от текущего среднего за вычетом допуска
+    ``delta`` и сравнивает с накопленным экстремумом; сигнал — когда
+    разрыв превышает ``threshold`` (в единицах метрики). После сигнала
+    состояние сбрасывается, и отсчёт начинается заново.
+    """
+    
+    kind = 'page_hinkley'
+    params = ('delta', 'threshold', 'min_samples')
+    fields = ('n', 'mean', 'up', 'up_min', 'down', 'down_max')
+    
+    def __init__(self, delta: float = 0.01, threshold: float = 0.5, min_samples: int = 5):
+        self.delta = delta
+        self.threshold = threshold
+        self.min_samples = min_samples
+        self._reset()
+    
+    def _reset(self) -> None:
+        self._n = 0
+        self._mean = 0.0
+        self._up = self._up_min = 0.0
+        self._down = self._down_max = 0.0
+    
+    def update(self, value: float) -> Dict:
+        value = float(value)
+        self._n += 1
+        self._mean += (value - self._mean) / self._n
+        self._up += value - self._mean - self.delta
+        self._up_min = min(self._up_min, self._up)
+        self._down += value - self._mean + self.delta
+        self._down_max = max(self._down_max, self._down)
+        rise = self._up - self._up_min
+        fall = self._down_max - self._down
+        direction = None
+        if self._n >= self.min_samples:
+            if rise > self.threshold:
+                direction = 'up'
+            elif fall > self.threshold:
+                direction = 'down'
+        score = max(rise, fall) / self.threshold
+        if direction:
+            self._reset()
+        return {'score': float(min(1.0, score)), 'alarm': direction is not None, 'direction': direction}
+
+
+ONLINE_DETECTORS = {cls.kind: cls for cls in (EWMAZScoreDetector, CUSUMDetector, PageHinkleyDetector)}
+
+
+class OnlineAnomalyMonitor:
+    """
+    Набор онлайн-детекторов (EWMA, CUSUM, Page-Hinkley) для каждой метрики
+    
+    Замена FractalAnomalyDetector на горячем пути: без обучения и без
+    sklearn, O(1) памяти и времени на метрику за ход. Всё состояние —
+    словарь чисел, который можно хранить в сессии и восстанавливать
+    через ``from_state``.
+    """
+    
+    DEFAULT_METRICS = ('hfd', 'complexity_score', 'confidence')
+    
+    def __init__(self, metrics: Tuple[str, ...] = DEFAULT_METRICS,
+                 detector_factory: Optional[Callable[[], Dict[str, OnlineDetector]]] = None):
+        self.metrics = tuple(metrics)
+        self.detector_factory = detector_factory or self.default_detectors
+        self.detectors = {metric: self.detector_factory() for metric in self.metrics}
+    
+    @staticmethod
+    def default_detectors() -> Dict[str, OnlineDetector]:
+        return {cls.kind: cls() for cls in ONLINE_DETECTORS.values()}
+    
+    def update(self, current_metrics: Dict) -> Dict:
+        """
+        Оценить метрики текущего хода и обновить состояние
+        
+        Returns:
+            Dict: по каждой метрике — результаты детекторов, а также
+            'alarms' (список "метрика:детектор"), 'anomaly_rate' (доля
+            сработавших детекторов) и 'max_score'
+        """
+        per_metric = {}
+        alarms = []
+        scores = []
+        for metric, detectors in self.detectors.items():
+            value = current_metrics.get(metric)
+            if value is None:
+                continue
+            results = {name: detector.update(value) for name, detector in detectors.items()}
+            per_metric[metric] = results
+            for name, result in results.items():
+                scores.append(result['score'])
+                if result['alarm']:
+                    alarms.append(f"{metric}:{name}")
+        return {
+            'metrics': per_metric,
+            'alarms': alarms,
+            'anomaly_rate': len(alarms) / len(scores) if scores else 0.0,
+            'max_score': max(scores) if scores else 0.0,
+        }
+    
+    def to_state(self) -> Dict:
+        return {metric: {name: detector.to_state() for name, detector in detectors.items()}
+                for metric, detectors in self.detectors.items()}
+    
+    @classmethod
+    def from_state(cls, state: Dict) -> 'OnlineAnomalyMonitor':
+        monitor = cls(metrics=tuple(state))
+        monitor.detectors = {
+            metric: {name: OnlineDetector.from_state(detector) for name, detector in detectors.items()}
+            for metric, detectors in state.items()
+        }
+        return monitor
+
+
 class EarlyWarningSystem:
     """
     Система раннего предупреждения для фрактальных изменений
@@ -174,7 +427,8 @@ class EarlyWarningSystem:
     
     def __init__(self, 
                  warning_thresholds: Dict = None,
-                 critical_thresholds: Dict = None):
+                 critical_thresholds: Dict = None,
+                 online_monitor: Optional[OnlineAnomalyMonitor] = None):
         # Базовые пороговые значения
         self.warning_thresholds = warning_thresholds or {
             'hfd_drop_rate': 0.05,        # Снижение HFD на 5% за короткий период
@@ -202,6 +456,8 @@ class EarlyWarningSystem:
         
         self.history = []
         self.active_warnings = []
+        # Онлайн-детекторы: состояние можно сохранить через online_monitor.to_state()
+        self.online_monitor = online_monitor or OnlineAnomalyMonitor()
     
     def analyze_health_state(self, current_metrics: Dict, 
                            historical_data: List[Dict]) -> Dict:
@@ -221,8 +477,11 @@ class EarlyWarningSystem:
         # Оцениваем текущее состояние
         current_state = self._evaluate_current_state(current_metrics)
         
+        # Онлайн-детекция аномалий по метрикам хода (без переобучения)
+        online_anomalies = self.online_monitor.update(current_metrics)
+        
         # Вычисляем предупредительные индикаторы
-        warning_indicators = self._calculate_warning_indicators(current_metrics, trends)
+        warning_indicators = self._calculate_warning_indicators(current_metrics, trends, online_anomalies)
         
         # Определяем уровень предупреждения
         warning_level = self._determine_warning_level(warning_indicators)
@@ -237,6 +496,7 @@ class EarlyWarningSystem:
             'current_state': current_state,
             'trends': trends,
             'warning_indicators': warning_indicators,
+            'online_anomalies': online_anomalies,
             'recommendations': recommendations,
             'timestamp': current_metrics.get('timestamp'),
             'requires_attention': warning_level >= 2
@@ -327,10 +587,18 @@ class EarlyWarningSystem:
         return state
     
     def _calculate_warning_indicators(self, current_metrics: Dict, 
-                                    trends: Dict) -> Dict:
+                                    trends: Dict,
+                                    online_anomalies: Optional[Dict] = None) -> Dict:
         """Расчет предупредительных индикаторов"""
         indicators = {}
         
+        # Индикаторы онлайн-детекторов
+        anomaly_rate = (online_anomalies or {}).get('anomaly_rate', 0.0)
+        indicators['online_anomaly_rate'] = anomaly_rate
+        indicators['online_anomaly_warning'] = anomaly_rate > self.warning_thresholds['anomaly_rate']
+        if online_anomalies and online_anomalies['alarms']:
+            indicators['online_alarms'] = online_anomalies['alarms']
+        
         # Трендовые индикаторы
         hfd_trend = trends.get('hfd_trend', 0)
         complexity_trend = trends.get('complexity_trend', 0)
@@ -409,6 +677,12 @@ class EarlyWarningSystem:
         if indicators.get('stability_warning', False):
             warning_score += 2
         
+        if indicators.get('online_anomaly_warning', False):
+            if indicators['online_anomaly_rate'] > self.critical_thresholds['anomaly_rate']:
+                warning_score += 2
+            else:
+                warning_score += 1
+        
         health_score = indicators.get('combined_health_score', 0)
         if health_score < -0.5:
             warning_score += 3
@@ -434,6 +708,8 @@ class EarlyWarningSystem:
                 recommendations.append("Рекомендуется увеличить структурную сложность")
             if indicators.get('stability_warning', False):
                 recommendations.append("Повысить стабильность системы")
+            if indicators.get('online_anomaly_warning', False):
+                recommendations.append("Онлайн-детекторы фиксируют сдвиг метрик - усилить наблюдение")
         
         elif warning_level == 2:  # Warning
             recommendations.append("Предупреждение: обнаружены проблемы в работе системы")
@@ -441,6 +717,9 @@ class EarlyWarningSystem:
                 recommendations.append("Критично: снижение фрактальной размерности - требуется вмешательство")
             if indicators.get('complexity_degradation_warning', False):
                 recommendations.append("Внедрить элементы разнообразия для повышения сложности")
+            if indicators.get('online_anomaly_warning', False):
+                recommendations.append("Резкий сдвиг метрик по онлайн-детекторам: " +
+                                       ", ".join(indicators.get('online_alarms', [])))
             recommendations.append("Рекомендуется запуск диагностических процедур")
         
         elif warning_level == 3:  # Critical
@@ -675,6 +954,14 @@ if __name__ == "__main__":
     print(f"Уровень предупреждения: {health_analysis['warning_level']} ({health_analysis['warning_level_name']})")
     print(f"Требует внимания: {health_analysis['requires_attention']}")
     
+    # Онлайн-режим: по ходу на вызов, состояние детекторов переживает сессию
+    monitor = OnlineAnomalyMonitor()
+    for value in baseline_hfd[:30] + [1.05] * 5:
+        online = monitor.update({'hfd': value})
+    restored = OnlineAnomalyMonitor.from_state(monitor.to_state())
+    print(f"Онлайн-сигналы на последнем ходе: {online['alarms']} "
+          f"(состояние восстановлено: {restored.to_state() == monitor.to_state()})")
+    
     # Система адаптивного реагирования
     response_system = AdaptiveResponseSystem()
     response_plan = response_system.process_warning(health_analysis)
@@ -1,13 +1,14 @@
 # Обновленный код SLOEnforcer с поддержкой Хундуна
 # Сохранить в: /workspace/code/enhanced_slo_enforcer.py
 
-import re
 import yaml
 import time
 from typing import Dict, List, Tuple, Optional
 from dataclasses import dataclass
 from enum import Enum
 
+from lexicon import Lexicon
+
 class SystemState(Enum):
     CRYSTAL = "crystal"
     ANTIMATTER = "antimatter" 
@@ -188,23 +189,26 @@ class MakiHundunCoordinator:
 class EnhancedMetricsCalculator:
     """Улучшенный калькулятор метрик с поддержкой Хундуна"""
     
+    # Словари маркеров: компилируются один раз в общий сканер
+    CLARITY_LOW = [r'\?\?\?', 'не понима', 'запута', 'неясно', 'сомневаюсь']
+    CLARITY_HIGH = [r'\d+', r'шаг \d+', 'конкретно', 'определенно', 'точно']
+    CHAOS_INDICATORS = [
+        'хаос', 'беспорядок', 'неопределенность', 'противоречие',
+        'парадокс', 'неожиданно', 'внезапно', 'непонятно',
+        'разрушение', 'ломка', 'переворот'
+    ]
+    MARKERS = Lexicon(
+        {'clarity_low': CLARITY_LOW, 'clarity_high': CLARITY_HIGH},
+        literals={'chaos': CHAOS_INDICATORS},
+    )
+    
     def __init__(self):
         self.chaos_detector = HundunChaosPatternDetector()
     
     def calc_clarity(self, text: str) -> float:
         """Расчет ясности (переопределено)"""
-        score = 0.5
-        low = ['???','не понима','запута', 'неясно', 'сомневаюсь']
-        high = ['\\d+','шаг \\d+','конкретно', 'определенно', 'точно']
-        
-        for pattern in low:
-            if re.search(pattern, text, re.I): 
-                score -= 0.1
-        
-        for pattern in high:
-            if re.search(pattern, text, re.I): 
-                score += 0.1
-        
+        counts = self.MARKERS.counts(text)
+        score = 0.5 - 0.1 * counts['clarity_low'] + 0.1 * counts['clarity_high']
         return max(0, min(1, score))
     
     def calc_chaos_temperature(self, text: str, history: List[Dict]) -> float:
@@ -233,19 +237,7 @@ class EnhancedMetricsCalculator:
     
     def _extract_chaos_markers(self, text: str) -> float:
         """Извлечение маркеров хаоса из текста"""
-        chaos_indicators = [
-            'хаос', 'беспорядок', 'неопределенность', 'противоречие',
-            'парадокс', 'неожиданно', 'внезапно', 'непонятно',
-            'разрушение', 'ломка', 'переворот'
-        ]
-        
-        score = 0
-        text_lower = text.lower()
-        
-        for indicator in chaos_indicators:
-            if indicator in text_lower:
-                score += 0.1
-        
+        score = 0.1 * self.MARKERS.counts(text)['chaos']
         return min(1.0, score)
     
     def _analyze_structural_disruption(self, text: str, history: List[Dict]) -> float:
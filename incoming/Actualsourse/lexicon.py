@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Lexicon — общий многошаблонный сканер текста для детекторов на словарях маркеров
+
+Копия packages/iskra_server/services/lexicon.py для модулей этого
+каталога (они импортируют соседей по имени модуля); при изменении
+держать оба файла в синхроне.
+
+Маркеры готовятся один раз. Простые строки (все literals и шаблоны без
+синтаксиса регулярных выражений) проверяются как подстроки текста,
+приведённого к нижнему регистру один раз за проход, — это намного
+быстрее движка re. Остальные шаблоны выполняются заранее
+скомпилированными. Общая альтернатива всех маркеров нужна только
+search(), которому достаточно самого левого совпадения (сканировать ею
+весь текст медленнее: re не использует поиск по литеральному префиксу
+между альтернативами, а короткие маркеры вроде «но» совпадают почти
+везде). Результат — ровно «какие маркеры встречаются в тексте», как у
+циклов с re.search по каждому маркеру:
+
+    lexicon = Lexicon({'flattery': [r'гениальн\\w+']},
+                      literals={'critique': ['однако', 'however']})
+    lexicon.counts(text)   # {'flattery': 1, 'critique': 0}
+    lexicon.search(text)   # первое вхождение (категория, маркер) или None
+"""
+from __future__ import annotations
+
+import re
+from typing import Dict, Iterable, List, Mapping, Optional, Tuple
+
+__all__ = ["Lexicon"]
+
+_REGEX_SYNTAX = frozenset("\\.^$*+?{}[]|()")
+
+
+class Lexicon:
+    """Categories of markers prepared once for repeated scanning.
+
+    Args:
+        patterns: Category -> regular expressions.
+        literals: Category -> plain phrases, matched as substrings.
+        flags: ``re`` flags for every marker (case-insensitive by default).
+
+    Raises:
+        ValueError: If a category appears in both mappings or a pattern
+            does not compile.
+    """
+
+    def __init__(
+        self,
+        patterns: Optional[Mapping[str, Iterable[str]]] = None,
+        literals: Optional[Mapping[str, Iterable[str]]] = None,
+        flags: int = re.IGNORECASE,
+    ) -> None:
+        patterns = dict(patterns or {})
+        literals = dict(literals or {})
+        overlap = set(patterns) & set(literals)
+        if overlap:
+            raise ValueError(f"Categories defined twice: {sorted(overlap)}")
+
+        # (category, source shown to callers, compiled marker) in lexicon order
+        self._markers: List[Tuple[str, str, "re.Pattern[str]"]] = []
+        self.categories: Tuple[str, ...] = tuple(patterns) + tuple(literals)
+        try:
+            for category, sources in patterns.items():
+                for source in sources:
+                    self._markers.append((category, source, re.compile(source, flags)))
+            for category, phrases in literals.items():
+                for phrase in phrases:
+                    self._markers.append((category, phrase, re.compile(re.escape(phrase), flags)))
+        except re.error as exc:
+            raise ValueError(f"Invalid lexicon pattern: {exc}") from exc
+
+        # Per marker: the substring to look for, or None to run the regex.
+        self._fold = bool(flags & re.IGNORECASE)
+        plain_flags = not flags & ~(re.IGNORECASE | re.UNICODE)
+        self._plain: List[Optional[str]] = []
+        for category, source, compiled in self._markers:
+            if category in literals or (plain_flags and not _REGEX_SYNTAX.intersection(source)):
+                self._plain.append(source.lower() if self._fold else source)
+            else:
+                self._plain.append(None)
+
+        alternation = "|".join(f"(?:{compiled.pattern})" for _, _, compiled in self._markers)
+        self._combined = re.compile(alternation, flags) if self._markers else None
+
+    def __len__(self) -> int:
+        return len(self._markers)
+
+    def scan(self, text: str) -> Dict[str, List[str]]:
+        """Markers of every category that occur in *text*.
+
+        Returns:
+            Category -> matched marker sources in lexicon order; every
+            category is present, with an empty list when nothing matched.
+        """
+        folded = text.lower() if self._fold else text
+        hits: Dict[str, List[str]] = {category: [] for category in self.categories}
+        for (category, source, compiled), plain in zip(self._markers, self._plain):
+            if plain is not None:
+                matched = plain in folded
+            else:
+                matched = compiled.search(text) is not None
+            if matched:
+                hits[category].append(source)
+        return hits
+
+    def counts(self, text: str) -> Dict[str, int]:
+        """Number of distinct markers per category found in *text*."""
+        return {category: len(sources) for category, sources in self.scan(text).items()}
+
+    def search(self, text: str) -> Optional[Tuple[str, str]]:
+        """First marker occurrence in *text* as ``(category, source)``.
+
+        Stops at the leftmost match, which makes it the cheap check for
+        "does anything match at all" (e.g. guardrails).
+        """
+        if self._combined is None:
+            return None
+        match = self._combined.search(text)
+        if match is None:
+            return None
+        start = match.start()
+        for category, source, compiled in self._markers:
+            if compiled.match(text, start):
+                return category, source
+        return None  # pragma: no cover - the combined match implies a marker
@@ -1,8 +1,21 @@
 """
 Алгоритмы отслеживания фрактальной размерности в системе Мета-∆DΩΛ
 Реализация модулей для вычисления HFD и мониторинга структурной сложности
+
+kmax для HFD берётся из таблицы по корзинам длины ряда
+(hfd_kmax_table.json рядом с модулем). Таблица строится один раз на
+синтетических fBm-рядах (``python structural_complexity_analyzer.py
+--build-kmax-table``), поэтому calculate_hfd никогда не генерирует
+синтетические сигналы на горячем пути.
 """
 
+import bisect
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from multiprocessing import shared_memory
+
 import numpy as np
 import pandas as pd
 from typing import List, Tuple, Dict, Optional, Callable
@@ -13,6 +26,64 @@ from sklearn.preprocessing import StandardScaler
 import warnings
 warnings.filterwarnings('ignore')
 
+# Таблица kmax по длине ряда: {"buckets": [[N, kmax], ...]}, N по возрастанию
+KMAX_TABLE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "hfd_kmax_table.json")
+# Нижние границы корзин длины (геометрическая сетка)
+KMAX_TABLE_LENGTHS = (16, 24, 32, 48, 64, 96, 128, 192, 256, 384, 512, 768,
+                      1024, 1536, 2048, 3072, 4096, 6144, 8192)
+
+
+@lru_cache(maxsize=None)
+def load_kmax_table(path: str = KMAX_TABLE_PATH) -> Tuple[Tuple[int, int], ...]:
+    """Загрузка таблицы kmax (один раз на путь); без файла — пустая таблица"""
+    try:
+        with open(path, encoding="utf-8") as fh:
+            rows = json.load(fh)["buckets"]
+    except (OSError, ValueError, KeyError, TypeError):
+        return ()
+    return tuple(sorted((int(n), int(k)) for n, k in rows))
+
+
+def build_kmax_table(lengths=KMAX_TABLE_LENGTHS, seed: int = 42, trials: int = 8) -> Dict[str, object]:
+    """
+    Построение таблицы kmax: для каждой корзины длины N — оптимум
+    HiguchiFractalDimension.optimize_kmax на синтетических fBm-рядах
+
+    Оптимумы отдельных корзин шумят (своя реализация fBm на корзину),
+    поэтому в таблицу идёт МНК-подгонка kmax ≈ a + b·ln N, округлённая,
+    ограниченная [min_kmax, N/4] и приведённая к неубывающей по N.
+    Сырые оптимумы сохраняются в "calibrated".
+    """
+    rng = np.random.default_rng(seed)
+    hfd = HiguchiFractalDimension()
+    n = np.array(lengths, dtype=int)
+    calibrated = np.array([hfd.optimize_kmax(int(size), rng=rng, trials=trials) for size in n])
+    if len(n) >= 2:
+        slope, intercept = np.polyfit(np.log(n), calibrated, 1)
+        fitted = np.rint(intercept + slope * np.log(n))
+    else:
+        slope, intercept = 0.0, float(calibrated[0]) if len(n) else 0.0
+        fitted = calibrated.astype(float)
+    kmax = np.maximum.accumulate(np.clip(fitted, hfd.min_kmax, np.maximum(hfd.min_kmax, n // 4)))
+    return {
+        "description": "kmax для HFD по нижней границе длины ряда "
+                       "(подгонка a + b·ln N к optimize_kmax на fBm)",
+        "seed": seed,
+        "trials": trials,
+        "fit": {"intercept": round(float(intercept), 4), "slope": round(float(slope), 4)},
+        "calibrated": [int(k) for k in calibrated],
+        "buckets": [[int(size), int(k)] for size, k in zip(n, kmax)],
+    }
+
+
+def save_kmax_table(table: Dict[str, object], path: str = KMAX_TABLE_PATH) -> None:
+    """Сохранение таблицы kmax и сброс кэша загрузки"""
+    with open(path, "w", encoding="utf-8") as fh:
+        json.dump(table, fh, ensure_ascii=False, indent=2)
+        fh.write("\n")
+    load_kmax_table.cache_clear()
+
+
 class HiguchiFractalDimension:
     """
     Реализация алгоритма Хигучи для вычисления фрактальной размерности (HFD)
@@ -30,55 +101,57 @@ class HiguchiFractalDimension:
         self.min_kmax = min_kmax
         self.max_kmax_ratio = max_kmax_ratio
         self.optimal_kmax = None
+        self.kmax_table = load_kmax_table()
+        # Мемоизация kmax по длине ряда
+        self._kmax_by_length: Dict[int, int] = {}
         
-    def _generate_synthetic_fbm(self, n_points: int, hurst: float) -> np.ndarray:
-        """Генерация синтетических fBm данных с известной фрактальной размерностью"""
-        from scipy.stats import norm
-        
-        # Приближенный алгоритм генерации fBm
-        n = n_points
-        H = hurst
-        
-        # Создаем белый шум
-        x = np.random.normal(0, 1, n)
+    def _generate_synthetic_fbm(self, n_points: int, hurst: float, rng=None) -> np.ndarray:
+        """Генерация синтетических fBm данных с известной фрактальной размерностью
         
-        # Добавляем долгосрочную корреляцию
-        filter_length = min(n//4, 1000)
-        filter_weights = np.arange(1, filter_length+1) ** (-H - 0.5)
-        filter_weights = filter_weights / np.sum(filter_weights)
-        
-        fbm = np.convolve(x, filter_weights, mode='same')
-        fbm = np.cumsum(fbm)  # Интегрируем для получения fBm
-        
-        return fbm
+        Спектральный синтез: случайные фазы и амплитуды со спектром
+        мощности ~ f^-(2H+1), обратное БПФ даёт ряд с показателем Хёрста H
+        (HFD = 2 - H).
+        """
+        generator = rng if rng is not None else np.random
+        freqs = np.fft.rfftfreq(n_points)[1:]
+        amplitudes = freqs ** (-(2 * hurst + 1) / 2)
+        spectrum = amplitudes * (generator.normal(0, 1, len(freqs)) + 1j * generator.normal(0, 1, len(freqs)))
+        return np.fft.irfft(np.concatenate(([0.0], spectrum)), n_points)
     
     def _calculate_error_curve(self, N: int, target_fd: float, 
-                              kmax_range: range) -> Tuple[np.ndarray, np.ndarray]:
+                              kmax_range: range, rng=None) -> Tuple[np.ndarray, np.ndarray]:
         """Вычисление кривой ошибки для разных значений kmax"""
         errors = []
         k_values = []
         
         # Генерируем синтетические данные с известной FD
         target_hurst = 2 - target_fd
-        synthetic_data = self._generate_synthetic_fbm(N, target_hurst)
+        synthetic_data = self._generate_synthetic_fbm(N, target_hurst, rng)
         
+        # L(k) считаются один раз; HFD для каждого kmax — регрессия по префиксу
+        lengths = self.curve_lengths(synthetic_data, max(kmax_range, default=0))
         for kmax in kmax_range:
             try:
-                computed_fd = self.calculate_hfd(synthetic_data, kmax)
+                computed_fd = self.hfd_from_lengths(lengths[:kmax])
                 error = abs(computed_fd - target_fd) / target_fd
                 errors.append(error)
                 k_values.append(kmax)
-            except:
+            except ValueError:
                 errors.append(float('inf'))
                 k_values.append(kmax)
         
         return np.array(k_values), np.array(errors)
     
-    def optimize_kmax(self, N: int, target_fd_range: Tuple[float, float] = (1.1, 1.9)) -> int:
+    def optimize_kmax(self, N: int, target_fd_range: Tuple[float, float] = (1.1, 1.9),
+                      rng=None, trials: int = 1) -> int:
         """
         Оптимизация параметра kmax на основе длины временного ряда
         
-        Основано на анализе синтетических данных с различными FD
+        Основано на анализе синтетических данных с различными FD: кривые
+        ошибки усредняются по целевым FD и ``trials`` реализациям, и
+        выбирается kmax с наименьшей средней ошибкой. Дорогая операция:
+        используется для построения таблицы kmax (build_kmax_table), а не
+        при каждом вызове calculate_hfd.
         """
         # Диапазон kmax для тестирования
         min_kmax = self.min_kmax
@@ -87,38 +160,53 @@ class HiguchiFractalDimension:
         # Тестируем несколько FD в диапазоне
         test_fds = np.linspace(target_fd_range[0], target_fd_range[1], 5)
         
-        best_kmax_errors = []
+        k_values = np.arange(min_kmax, max_kmax + 1)
+        total_errors = np.zeros(len(k_values))
         
         for target_fd in test_fds:
-            k_values, errors = self._calculate_error_curve(N, target_fd, 
-                                                         range(min_kmax, max_kmax+1))
-            
-            # Находим kmax с минимальной ошибкой
-            valid_indices = errors != float('inf')
-            if np.any(valid_indices):
-                min_error_idx = np.argmin(errors[valid_indices])
-                best_kmax = k_values[valid_indices][min_error_idx]
-                best_error = errors[valid_indices][min_error_idx]
-                best_kmax_errors.append((best_kmax, best_error))
-        
-        if best_kmax_errors:
+            for _ in range(max(1, trials)):
+                _, errors = self._calculate_error_curve(N, target_fd, 
+                                                        range(min_kmax, max_kmax+1), rng)
+                total_errors += errors
+        
+        valid_indices = np.isfinite(total_errors)
+        if np.any(valid_indices):
             # Выбираем kmax с наименьшей средней ошибкой
-            avg_errors = [err for _, err in best_kmax_errors]
-            best_idx = np.argmin(avg_errors)
-            self.optimal_kmax = best_kmax_errors[best_idx][0]
+            best_idx = np.argmin(total_errors[valid_indices])
+            self.optimal_kmax = int(k_values[valid_indices][best_idx])
         else:
             # Fallback к эмпирической формуле
             self.optimal_kmax = min(max(6, int(np.sqrt(N))), max_kmax)
         
         return self.optimal_kmax
     
+    def kmax_for_length(self, N: int) -> int:
+        """
+        kmax для ряда длины N по таблице (мемоизировано по N)
+        
+        Берётся корзина с наибольшей нижней границей <= N; для рядов
+        короче первой корзины или без таблицы — эмпирическая формула.
+        """
+        kmax = self._kmax_by_length.get(N)
+        if kmax is None:
+            lengths = [n for n, _ in self.kmax_table]
+            idx = bisect.bisect_right(lengths, N) - 1
+            if idx >= 0:
+                kmax = self.kmax_table[idx][1]
+            else:
+                kmax = max(6, int(np.sqrt(N)))
+            kmax = max(self.min_kmax, min(kmax, N//4))
+            self._kmax_by_length[N] = kmax
+        return kmax
+    
     def calculate_hfd(self, data: np.ndarray, kmax: Optional[int] = None) -> float:
         """
         Вычисление фрактальной размерности Хигучи (HFD)
         
         Args:
             data: временной ряд (одномерный массив)
-            kmax: максимальный временной интервал (если None, используется оптимальное значение)
+            kmax: максимальный временной интервал (если None — значение из
+                таблицы kmax при adaptive_kmax, иначе min(6, N/4))
         
         Returns:
             HFD: фрактальная размерность в диапазоне [1, 2]
@@ -128,90 +216,86 @@ class HiguchiFractalDimension:
         
         N = len(data)
         
-        # Оптимизация kmax если требуется
-        if kmax is None or self.adaptive_kmax:
-            if self.optimal_kmax is None:
-                kmax = self.optimize_kmax(N)
+        # kmax из таблицы по длине ряда, без синтетической оптимизации
+        if kmax is None:
+            if self.adaptive_kmax:
+                kmax = self.optimal_kmax = self.kmax_for_length(N)
             else:
-                kmax = self.optimal_kmax
-        elif kmax is None:
-            kmax = min(6, N//4)
+                kmax = min(6, N//4)
         
         # Гарантируем что kmax валиден
         kmax = max(self.min_kmax, min(kmax, N//4))
         
-        L_values = []
+        return self.hfd_from_lengths(self.curve_lengths(data, kmax))
+    
+    @staticmethod
+    def curve_lengths(data: np.ndarray, kmax: int) -> np.ndarray:
+        """
+        Длины кривой L(k), k = 1..kmax (векторизованно)
         
-        # Вычисляем длину кривой для каждого k
+        Для каждого k все подпоследовательности data[m::k] обрабатываются
+        одним проходом: |x[i+k] - x[i]| считается для всех i сразу, а сумма
+        по подпоследовательности m — это сумма по остаткам i % k. Порядок
+        сложения тот же, что в поэлементном цикле, поэтому результат
+        совпадает с ним бит в бит. L(k) ~ k^(-HFD).
+        """
+        x = np.asarray(data)
+        N = len(x)
+        L_values = []
         for k in range(1, kmax + 1):
-            L_m_values = []
-            
-            # Для каждого начального времени m
-            for m in range(k):
-                # Создаем подпоследовательность с шагом k
-                subsequence = data[m::k]
-                
-                if len(subsequence) < 2:
-                    continue
-                
-                # Вычисляем длину подпоследовательности
-                length = 0
-                for i in range(1, len(subsequence)):
-                    length += abs(subsequence[i] - subsequence[i-1])
-                
-                # Нормировка
-                length = length * (N - 1) / ((len(subsequence) - 1) * k)
-                
-                L_m_values.append(length)
-            
-            if L_m_values:
-                L_k = np.mean(L_m_values)
-                L_values.append(L_k)
-            else:
+            # Число приращений в подпоследовательности m: len(data[m::k]) - 1
+            pairs = (N - 1 - np.arange(k)) // k
+            valid = pairs > 0
+            if not np.any(valid):
                 # Если нет валидных подпоследовательностей, пропускаем это k
                 continue
-        
+            increments = np.abs(x[k:] - x[:-k])
+            padding = (-len(increments)) % k
+            if padding:
+                increments = np.concatenate((increments, np.zeros(padding)))
+            # cumsum складывает строго по порядку (sum для k = 1 — попарно)
+            sums = increments.reshape(-1, k).cumsum(axis=0)[-1]
+            # Нормировка Хигучи: (N - 1) / (число приращений · k), затем / k
+            lengths = sums[valid] * (N - 1) / (pairs[valid] * k) / k
+            L_values.append(np.mean(lengths))
+        return np.array(L_values)
+    
+    @staticmethod
+    def hfd_from_lengths(L_values: np.ndarray) -> float:
+        """
+        HFD по длинам кривой: наклон регрессии ln(L(k)) на ln(1/k)
+        """
         if len(L_values) < 3:
             raise ValueError("Недостаточно валидных значений L(k) для расчета HFD")
         
         # Регрессионный анализ ln(L(k)) vs ln(1/k)
         k_effective = np.arange(1, len(L_values) + 1)
         ln_l = np.log(L_values)
-        ln_inv_k = np.log(k_effective)
-        
-        # Линейная регрессия
-        coeffs = np.polyfit(ln_inv_k, ln_l, 1)
-        slope = coeffs[0]
+        ln_inv_k = np.log(1.0 / k_effective)
         
-        # HFD = наклон линии регрессии
-        hfd = slope
+        # Линейная регрессия (МНК в замкнутой форме); HFD = наклон
+        ln_inv_k = ln_inv_k - ln_inv_k.mean()
+        hfd = np.dot(ln_inv_k, ln_l - ln_l.mean()) / np.dot(ln_inv_k, ln_inv_k)
         
         # Гарантируем что HFD в диапазоне [1, 2]
-        hfd = max(1.0, min(2.0, hfd))
-        
-        return hfd
+        return max(1.0, min(2.0, float(hfd)))
     
     def calculate_katz_fd(self, data: np.ndarray) -> float:
         """
         Быстрая оценка фрактальной размерности по методу Katz
         
-        Альтернативный алгоритм с меньшей вычислительной сложностью
+        Альтернативный алгоритм с меньшей вычислительной сложностью: O(N)
         """
         N = len(data)
         if N < 2:
             return 1.0
+        data = np.asarray(data)
         
-        # Вычисляем общую длину кривой
-        total_length = 0
-        for i in range(1, N):
-            total_length += abs(data[i] - data[i-1])
+        # Вычисляем общую длину кривой (cumsum — тот же порядок сложения)
+        total_length = np.abs(np.diff(data)).cumsum()[-1]
         
-        # Находим максимальное расстояние
-        max_distance = 0
-        for i in range(N):
-            for j in range(i+1, N):
-                distance = abs(data[i] - data[j])
-                max_distance = max(max_distance, distance)
+        # Максимальное попарное расстояние в одномерном ряду — размах
+        max_distance = data.max() - data.min()
         
         # Среднее расстояние между точками
         avg_distance = total_length / (N - 1)
@@ -224,6 +308,100 @@ class HiguchiFractalDimension:
             return 1.0
 
 
+class SlidingHiguchi:
+    """
+    Инкрементальный HFD по скользящему окну
+    
+    Хранит кольцевой буфер последних ``window`` отсчётов и частичные суммы
+    |x[i+k] - x[i]| по остаткам i % k для каждого k <= kmax. Новый отсчёт
+    добавляет по одному приращению на каждое k, вытесняемый — убирает
+    по одному, поэтому обновление стоит O(kmax), а не O(window·kmax).
+    Остатки хранятся по абсолютному индексу отсчёта и при запросе
+    переводятся в позиции m внутри окна. Чтобы ошибка округления
+    инкрементальных сумм не накапливалась, суммы раз в ``window``
+    обновлений пересчитываются из буфера.
+    
+    Для полного окна ``hfd()`` совпадает (с точностью до округления) с
+    ``HiguchiFractalDimension(adaptive_kmax=False).calculate_hfd(окно, kmax)``.
+    """
+    
+    def __init__(self, window: int, kmax: int, min_kmax: int = 3):
+        if window < 10:
+            raise ValueError("Длина окна должна быть не менее 10 точек")
+        self.window = window
+        self.kmax = max(min_kmax, min(kmax, window // 4))
+        self._ks = np.arange(1, self.kmax + 1)
+        self._buffer = np.zeros(window)
+        self._sums = np.zeros((self.kmax, self.kmax))  # [k-1, i % k]
+        self._count = 0
+        self._since_rebuild = 0
+    
+    def __len__(self) -> int:
+        return min(self._count, self.window)
+    
+    def update(self, value: float) -> None:
+        """Добавить отсчёт — O(kmax)"""
+        t = self._count
+        W = self.window
+        ks = self._ks
+        if t >= W:
+            # Вытесняем отсчёт s = t - W вместе с его приращениями (s, s + k)
+            s = t - W
+            oldest = self._buffer[s % W]
+            self._sums[ks - 1, s % ks] -= np.abs(self._buffer[(s + ks) % W] - oldest)
+        # Приращения (t - k, t) для всех k, у которых t - k уже в окне
+        ks_new = ks[ks <= t]
+        if ks_new.size:
+            self._sums[ks_new - 1, t % ks_new] += np.abs(value - self._buffer[(t - ks_new) % W])
+        self._buffer[t % W] = value
+        self._count += 1
+        self._since_rebuild += 1
+        if self._since_rebuild >= W:
+            self._rebuild()
+    
+    def extend(self, values) -> None:
+        """Добавить несколько отсчётов"""
+        for value in values:
+            self.update(float(value))
+    
+    def values(self) -> np.ndarray:
+        """Содержимое окна в хронологическом порядке"""
+        n = len(self)
+        start = self._count - n
+        return self._buffer[(start + np.arange(n)) % self.window]
+    
+    def curve_lengths(self) -> np.ndarray:
+        """L(k) для текущего окна из частичных сумм — O(kmax²)"""
+        N = len(self)
+        start = self._count - N
+        K = self._ks[:, None]
+        residues = np.arange(self.kmax)[None, :]
+        m = (residues - start) % K
+        pairs = (N - 1 - m) // K
+        valid = (residues < K) & (pairs > 0)
+        lengths = np.where(valid, self._sums * (N - 1) / np.maximum(pairs, 1) / K / K, 0.0)
+        return lengths.sum(axis=1) / np.maximum(valid.sum(axis=1), 1)
+    
+    def hfd(self) -> float:
+        """HFD текущего окна — O(kmax²), без прохода по окну"""
+        if len(self) < 4 * self.kmax:
+            raise ValueError("Недостаточно данных в окне для расчета HFD")
+        return HiguchiFractalDimension.hfd_from_lengths(self.curve_lengths())
+    
+    def _rebuild(self) -> None:
+        """Точный пересчёт частичных сумм из буфера"""
+        x = self.values()
+        start = self._count - len(x)
+        self._sums[:] = 0.0
+        for k in self._ks:
+            if k >= len(x):
+                break
+            increments = np.abs(x[k:] - x[:-k])
+            residues = (start + np.arange(len(increments))) % k
+            self._sums[k - 1, :k] = np.bincount(residues, weights=increments, minlength=k)
+        self._since_rebuild = 0
+
+
 class StructuralComplexityAnalyzer:
     """
     Анализатор структурной сложности паттернов мышления
@@ -378,15 +556,76 @@ class StructuralComplexityAnalyzer:
             'analysis_type': 'macro_level'
         }
     
+    def analyze_batch(self, series: List[np.ndarray], workers: Optional[int] = None,
+                      kmax: Optional[int] = None, chunk_size: int = 64) -> List[Dict]:
+        """
+        Пакетный анализ множества рядов (например, микро-логов всех сессий)
+        
+        Ряды склеиваются в один массив в разделяемой памяти; пул процессов
+        получает только имя сегмента и границы своих рядов, так что данные
+        не копируются через pickle. Для каждого ряда возвращаются HFD,
+        Katz FD и индекс структурной сложности (как в analyze_micro_level;
+        ряды короче min_window дают hfd = 1.0 и complexity_score = 0.0).
+        
+        Args:
+            series: список одномерных рядов
+            workers: число процессов (по умолчанию — число CPU; 1 — без пула)
+            kmax: фиксированный kmax (по умолчанию — из таблицы kmax)
+            chunk_size: рядов на одно задание пула
+        
+        Returns:
+            Список словарей в порядке входных рядов; его можно напрямую
+            передать в analyze_macro_level как список эпох
+        """
+        if not series:
+            return []
+        lengths = np.array([len(x) for x in series], dtype=np.int64)
+        offsets = np.concatenate(([0], np.cumsum(lengths)))
+        params = {
+            'kmax': kmax,
+            'min_window': self.min_window,
+            'min_kmax': self.hfd_calculator.min_kmax,
+        }
+        chunks = [(start, min(start + chunk_size, len(series)))
+                  for start in range(0, len(series), chunk_size)]
+        workers = workers or os.cpu_count() or 1
+        
+        if workers == 1 or len(chunks) == 1:
+            values = np.concatenate([np.asarray(x, dtype=np.float64) for x in series])
+            return _analyze_series_range(values, offsets, 0, len(series), params)
+        
+        segment = shared_memory.SharedMemory(create=True, size=max(1, int(offsets[-1]) * 8))
+        try:
+            values = np.ndarray((int(offsets[-1]),), dtype=np.float64, buffer=segment.buf)
+            for x, start in zip(series, offsets[:-1]):
+                values[start:start + len(x)] = x
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                futures = [
+                    pool.submit(_analyze_shared_range, segment.name, offsets, start, stop, params)
+                    for start, stop in chunks
+                ]
+                results = [item for future in futures for item in future.result()]
+            del values
+        finally:
+            segment.close()
+            segment.unlink()
+        return results
+    
     def _estimate_confidence(self, data: np.ndarray, hfd: float) -> float:
         """Оценка уверенности в вычислениях HFD"""
+        diff_std = np.std(np.diff(data)) if len(data) > 1 else None
+        return self._confidence_from_stats(len(data), np.std(data), diff_std, hfd)
+    
+    @staticmethod
+    def _confidence_from_stats(n: int, std: float, diff_std: Optional[float], hfd: float) -> float:
+        """Уверенность по сводным статистикам окна (общая для пакетного и потокового режимов)"""
         # Факторы, влияющие на уверенность:
         # 1. Длина данных
-        length_factor = min(1.0, len(data) / 200)  # Нормализация к 200 точкам
+        length_factor = min(1.0, n / 200)  # Нормализация к 200 точкам
         
         # 2. Стабильность паттерна
-        if len(data) > 1:
-            variability = np.std(np.diff(data)) / (np.std(data) + 1e-10)
+        if diff_std is not None:
+            variability = diff_std / (std + 1e-10)
             variability_factor = 1.0 / (1.0 + variability)  # Чем меньше изменчивость, тем выше уверенность
         else:
             variability_factor = 0.5
@@ -403,19 +642,24 @@ class StructuralComplexityAnalyzer:
     
     def _calculate_complexity_score(self, hfd: float, data: np.ndarray) -> float:
         """Вычисление индекса структурной сложности"""
+        return self._complexity_from_stats(hfd, len(data), np.std(data), np.mean(np.abs(data)))
+    
+    @staticmethod
+    def _complexity_from_stats(hfd: float, n: int, std: float, mean_abs: float) -> float:
+        """Индекс сложности по сводным статистикам окна"""
         # Базовый сложностный индекс на основе HFD
         base_score = (hfd - 1.0)  # Нормализация к диапазону [0, 1]
         
         # Дополнительные факторы:
         # 1. Изменчивость данных
-        if len(data) > 1:
-            variability = np.std(data) / (np.mean(np.abs(data)) + 1e-10)
+        if n > 1:
+            variability = std / (mean_abs + 1e-10)
             variability_factor = np.log(1 + variability)  # Логарифмическая шкала
         else:
             variability_factor = 0.0
         
         # 2. Длина данных (более длинные последовательности = выше сложность)
-        length_factor = min(1.0, len(data) / 1000)  # Нормализация к 1000 точкам
+        length_factor = min(1.0, n / 1000)  # Нормализация к 1000 точкам
         
         # Комбинированный индекс
         complexity_score = base_score + 0.1 * variability_factor + 0.05 * length_factor
@@ -541,7 +785,260 @@ class StructuralComplexityAnalyzer:
         return recommendations
 
 
+class StreamingComplexityAnalyzer:
+    """
+    Потоковый режим StructuralComplexityAnalyzer с ограниченной памятью
+    
+    Вместо повторного анализа всего окна на каждом ходе держит кольцевой
+    буфер последних ``window_size`` отсчётов (через SlidingHiguchi) и
+    инкрементально обновляет всё, что нужно для отчёта микро-уровня:
+    суммы x, x², |x| по окну, суммы первых разностей и их квадратов
+    и частичные суммы длин кривых Хигучи. ``update`` стоит O(kmax) —
+    константу, не зависящую от длины истории, ``report`` — O(kmax²).
+    Раз в ``window_size`` обновлений суммы пересчитываются из буфера,
+    чтобы не накапливалась ошибка округления.
+    
+    Состояние сериализуется в JSON-совместимый словарь (``to_state`` /
+    ``from_state``), поэтому анализатор можно хранить в сессии
+    пользователя и продолжать между запросами.
+    
+    Для заполненного окна ``report()`` совпадает (с точностью до
+    округления) с ``StructuralComplexityAnalyzer(window_size).analyze_micro_level(окно)``.
+    """
+    
+    def __init__(self, window_size: int = 100, kmax: Optional[int] = None, min_window: int = 50):
+        self.window_size = window_size
+        self.min_window = min(min_window, window_size)
+        self._scorer = StructuralComplexityAnalyzer(window_size=window_size, min_window=self.min_window)
+        calculator = self._scorer.hfd_calculator
+        if kmax is None:
+            kmax = calculator.kmax_for_length(window_size)
+        self._hfd = SlidingHiguchi(window_size, kmax, min_kmax=calculator.min_kmax)
+        self._since_rebuild = 0
+        self._reset_sums()
+    
+    @property
+    def kmax(self) -> int:
+        return self._hfd.kmax
+    
+    def __len__(self) -> int:
+        return len(self._hfd)
+    
+    def update(self, value: float) -> None:
+        """Добавить отсчёт — O(kmax)"""
+        value = float(value)
+        hfd = self._hfd
+        W = self.window_size
+        t = hfd._count
+        if t >= W:
+            # Вытесняемый отсчёт и разность между ним и следующим за ним
+            oldest = hfd._buffer[(t - W) % W]
+            self._sum -= oldest
+            self._sum_sq -= oldest * oldest
+            self._sum_abs -= abs(oldest)
+            diff = hfd._buffer[(t - W + 1) % W] - oldest
+            self._diff_sum -= diff
+            self._diff_sq -= diff * diff
+        if t >= 1:
+            diff = value - hfd._buffer[(t - 1) % W]
+            self._diff_sum += diff
+            self._diff_sq += diff * diff
+        self._sum += value
+        self._sum_sq += value * value
+        self._sum_abs += abs(value)
+        hfd.update(value)
+        self._since_rebuild += 1
+        if self._since_rebuild >= W:
+            self._rebuild()
+    
+    def extend(self, values) -> None:
+        """Добавить несколько отсчётов"""
+        for value in values:
+            self.update(value)
+    
+    def values(self) -> np.ndarray:
+        """Содержимое окна в хронологическом порядке"""
+        return self._hfd.values()
+    
+    def mean(self) -> float:
+        n = len(self)
+        return self._sum / n if n else 0.0
+    
+    def variance(self) -> float:
+        """Дисперсия окна (генеральная, как np.var)"""
+        n = len(self)
+        if not n:
+            return 0.0
+        mean = self._sum / n
+        return max(0.0, self._sum_sq / n - mean * mean)
+    
+    def report(self) -> Dict:
+        """Отчёт микро-уровня по текущему окну без прохода по нему"""
+        n = len(self)
+        if n < max(self.min_window, 4 * self.kmax):
+            return {
+                'hfd': 1.0,
+                'complexity_score': 0.0,
+                'confidence': 0.0,
+                'recommendations': ['Недостаточно данных для анализа'],
+                'samples': n,
+            }
+        hfd = self._hfd.hfd()
+        std = np.sqrt(self.variance())
+        diff_n = n - 1
+        diff_mean = self._diff_sum / diff_n
+        diff_std = np.sqrt(max(0.0, self._diff_sq / diff_n - diff_mean * diff_mean))
+        confidence = self._scorer._confidence_from_stats(n, std, diff_std, hfd)
+        complexity_score = self._scorer._complexity_from_stats(hfd, n, std, self._sum_abs / n)
+        return {
+            'hfd': hfd,
+            'complexity_score': complexity_score,
+            'confidence': confidence,
+            'mean': self.mean(),
+            'variance': self.variance(),
+            'curve_lengths': self._hfd.curve_lengths().tolist(),
+            'optimal_kmax': self.kmax,
+            'recommendations': self._scorer._generate_micro_recommendations(hfd, complexity_score, confidence),
+            'samples': n,
+            'analysis_type': 'streaming',
+        }
+    
+    def to_state(self) -> Dict:
+        """JSON-совместимое состояние (окно и параметры)"""
+        return {
+            'window_size': self.window_size,
+            'kmax': self.kmax,
+            'min_window': self.min_window,
+            'values': self.values().tolist(),
+        }
+    
+    @classmethod
+    def from_state(cls, state: Dict) -> 'StreamingComplexityAnalyzer':
+        """Восстановить анализатор из ``to_state`` — O(window·kmax) один раз"""
+        analyzer = cls(
+            window_size=int(state['window_size']),
+            kmax=int(state['kmax']),
+            min_window=int(state.get('min_window', 50)),
+        )
+        analyzer.extend(state.get('values', ()))
+        return analyzer
+    
+    def _reset_sums(self) -> None:
+        self._sum = self._sum_sq = self._sum_abs = 0.0
+        self._diff_sum = self._diff_sq = 0.0
+    
+    def _rebuild(self) -> None:
+        """Точный пересчёт сумм из буфера"""
+        x = self.values()
+        diffs = np.diff(x)
+        self._sum = float(x.sum())
+        self._sum_sq = float(np.dot(x, x))
+        self._sum_abs = float(np.abs(x).sum())
+        self._diff_sum = float(diffs.sum())
+        self._diff_sq = float(np.dot(diffs, diffs))
+        self._since_rebuild = 0
+
+
+def _analyze_series_range(values: np.ndarray, offsets: np.ndarray,
+                          start: int, stop: int, params: Dict) -> List[Dict]:
+    """Анализ рядов start..stop, хранящихся подряд в values"""
+    analyzer = StructuralComplexityAnalyzer(min_window=params['min_window'])
+    calculator = analyzer.hfd_calculator
+    calculator.min_kmax = params['min_kmax']
+    results = []
+    for index in range(start, stop):
+        data = values[offsets[index]:offsets[index + 1]]
+        result = {'index': index, 'length': len(data),
+                  'katz_fd': float(calculator.calculate_katz_fd(data))}
+        if len(data) < analyzer.min_window:
+            result.update(hfd=1.0, complexity_score=0.0)
+        else:
+            hfd = calculator.calculate_hfd(data, params['kmax'])
+            complexity = analyzer._calculate_complexity_score(hfd, data)
+            result.update(hfd=hfd, complexity_score=float(complexity))
+        results.append(result)
+    return results
+
+
+def _analyze_shared_range(segment_name: str, offsets: np.ndarray,
+                          start: int, stop: int, params: Dict) -> List[Dict]:
+    """Задание пула: подключение к разделяемой памяти и анализ диапазона"""
+    segment = shared_memory.SharedMemory(name=segment_name)
+    try:
+        values = np.ndarray((int(offsets[-1]),), dtype=np.float64, buffer=segment.buf)
+        results = _analyze_series_range(values, offsets, start, stop, params)
+        del values
+    finally:
+        segment.close()
+    return results
+
+
+def _curve_lengths_loop(data: np.ndarray, kmax: int) -> np.ndarray:
+    """Эталонный поэлементный расчёт L(k) (для сверки и бенчмарка)"""
+    N = len(data)
+    L_values = []
+    for k in range(1, kmax + 1):
+        L_m_values = []
+        for m in range(k):
+            subsequence = data[m::k]
+            if len(subsequence) < 2:
+                continue
+            length = 0
+            for i in range(1, len(subsequence)):
+                length += abs(subsequence[i] - subsequence[i-1])
+            length = length * (N - 1) / ((len(subsequence) - 1) * k) / k
+            L_m_values.append(length)
+        if L_m_values:
+            L_values.append(np.mean(L_m_values))
+    return np.array(L_values)
+
+
+def benchmark_hfd(n_points: int = 10_000, kmax: int = 32, window: int = 1000,
+                  seed: int = 42) -> Dict:
+    """
+    Бенчмарк HFD: поэлементный цикл против векторизованной версии и
+    стоимость одного обновления скользящего окна
+    """
+    import time
+    
+    data = np.cumsum(np.random.default_rng(seed).normal(size=n_points))
+    
+    start = time.perf_counter()
+    reference = _curve_lengths_loop(data, kmax)
+    loop_s = time.perf_counter() - start
+    
+    repeat = 20
+    start = time.perf_counter()
+    for _ in range(repeat):
+        lengths = HiguchiFractalDimension.curve_lengths(data, kmax)
+    vector_s = (time.perf_counter() - start) / repeat
+    
+    sliding = SlidingHiguchi(window, kmax)
+    sliding.extend(data[:window])
+    start = time.perf_counter()
+    sliding.extend(data[window:])
+    update_s = (time.perf_counter() - start) / (n_points - window)
+    
+    return {
+        'n_points': n_points,
+        'kmax': kmax,
+        'identical': bool(np.array_equal(reference, lengths)),
+        'loop_ms': loop_s * 1000,
+        'vectorized_ms': vector_s * 1000,
+        'speedup': loop_s / vector_s,
+        'sliding_update_us': update_s * 1e6,
+    }
+
+
 if __name__ == "__main__":
+    import sys
+    
+    if "--build-kmax-table" in sys.argv[1:]:
+        table = build_kmax_table()
+        save_kmax_table(table)
+        print(f"Таблица kmax записана в {KMAX_TABLE_PATH}: {table['buckets']}")
+        sys.exit(0)
+    
     # Демонстрационный код
     print("=== Алгоритмы отслеживания фрактальной размерности ===")
     
@@ -567,4 +1064,11 @@ if __name__ == "__main__":
     print(f"Session Complexity: {meso_result['session_complexity']:.3f}")
     print(f"Variability: {meso_result['variability']:.3f}")
     
+    # Бенчмарк векторизованного HFD
+    bench = benchmark_hfd()
+    print(f"\nHFD на {bench['n_points']} точках (kmax={bench['kmax']}):")
+    print(f"Цикл: {bench['loop_ms']:.1f} мс, NumPy: {bench['vectorized_ms']:.2f} мс, "
+          f"ускорение ×{bench['speedup']:.0f}, совпадение: {bench['identical']}")
+    print(f"Скользящее окно: {bench['sliding_update_us']:.1f} мкс на обновление")
+    
     print("\n=== Демонстрация завершена ===")
@@ -13,6 +13,11 @@ constants defined here are derived from the Canon specification
 * BING_API_KEY: API key for Bing Web Search (used for RAG/SIFT).
 * BING_ENDPOINT: Endpoint for Bing Web Search API.
 * DB_PATH: Path to the persistent archive database (SQLite by default).
+* SLO_PATH: Path to the SLO file (packages/core/slo.json) with the trigger
+  values and the target distributions for offline threshold tuning.
+* RETENTION: Budget and scoring weights for bounding session memory
+  (see memory.retention).
+* GUARDRAILS: Limits for the input/output safety checks (see services.guardrails).
 * THRESHOLDS: A dictionary of numeric thresholds controlling the behaviour of
   facets, phases, shadow core triggers, live index thresholds and
   vulnerability range. See Files 04, 05, 07, 10 and 21 for details.
@@ -41,6 +46,14 @@ BING_ENDPOINT = "https://api.bing.microsoft.com/v7.0/search"
 # this at runtime via the ISKRA_DB_PATH environment variable.
 DB_PATH = os.getenv("ISKRA_DB_PATH", "iskra_archive.db")
 
+# --- Service level objectives ---
+# Shared with the core package; read by the offline threshold tuner
+# (services.threshold_tuner). Override via ISKRA_SLO_PATH.
+SLO_PATH = os.getenv(
+    "ISKRA_SLO_PATH",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "core", "slo.json"),
+)
+
 # --- Metaparameters (Thresholds) ---
 # These thresholds control the activation of facets (voices), the transitions
 # between phases, and other behavioural switches. They should reflect the
@@ -53,6 +66,7 @@ THRESHOLDS = {
     "trust_low": 0.75,      # Activate ANHANTRA when trust < this value
     "drift_high": 0.3,      # Activate ISKRIV when drift > this value
     "chaos_high": 0.6,      # Activate HUYNDUN when chaos > this value
+    "echo_risk_high": 0.5,  # Activate ISKRIV when cumulative echo risk > this value
 
     # Architectural stagnation triggers (File 03)
     "stagnation_clarity": 0.9, # Force HUYNDUN if clarity high & chaos low
@@ -75,4 +89,33 @@ THRESHOLDS = {
     # Vulnerability range (File 21)
     "vulnerability_range_min": 0.72,
     "vulnerability_range_max": 0.94,
-}
\ No newline at end of file
+}
+
+# --- Memory retention (bounded session hypergraph) ---
+# A session's hypergraph may hold at most ``max_nodes`` nodes. When the budget
+# is exceeded, low-value cycles are coalesced into summary nodes until the
+# graph is back under ``low_watermark * max_nodes``. You can override the
+# budget at runtime via the ISKRA_MEMORY_MAX_NODES environment variable.
+RETENTION = {
+    "max_nodes": int(os.getenv("ISKRA_MEMORY_MAX_NODES", "2000")),
+    "low_watermark": 0.9,        # Evict down to this fraction of the budget
+    "keep_recent_cycles": 20,    # Newest cycles are only evicted as a last resort
+    "summary_batch": 10,         # Cycles coalesced into one summary node
+    "max_summaries": 50,         # Older summaries are merged beyond this count
+    "age_half_life_s": 7 * 24 * 3600.0,
+
+    # Cycle value = weighted sum of the components below (each in [0, 1])
+    "weight_recency": 1.0,
+    "weight_a_index": 1.0,
+    "weight_pain": 0.75,         # Painful cycles are remembered longer
+    "weight_self_event": 2.0,    # Cycles referenced by self-events
+    "weight_evidence": 0.5,      # Cycles backed by SIFT evidence
+}
+
+# --- Guardrails (File 09) ---
+# Queries longer than ``max_input_chars`` are rejected before any
+# normalisation or pattern scanning. Override at runtime via the
+# ISKRA_GUARDRAIL_MAX_INPUT_CHARS environment variable.
+GUARDRAILS = {
+    "max_input_chars": int(os.getenv("ISKRA_GUARDRAIL_MAX_INPUT_CHARS", "20000")),
+}
@@ -1,5 +1,7 @@
-from config import THRESHOLDS
+from typing import Optional
+
 from core.models import IskraMetrics, FacetType
+from core.thresholds import ThresholdSnapshot
 
 # Attempt to import dynamic thresholds. If unavailable (e.g. during
 # bootstrap or tests), dynamic_thresholds will be None and the
@@ -26,54 +28,60 @@ class FacetEngine:
     """Determines which voice should be active given the system's metrics."""
 
     @staticmethod
-    def determine_facet(m: IskraMetrics) -> FacetType:
+    def determine_facet(
+        m: IskraMetrics,
+        echo_risk: float = 0.0,
+        thresholds: Optional[ThresholdSnapshot] = None,
+    ) -> FacetType:
         """
         Determine the active facet. Priority order is critical:
 
         1. Architectural stagnation triggers force HUYNDUN to break patterns.
         2. High chaos triggers HUYNDUN (chaos voice).
         3. High pain triggers KAIN (painful truth).
-        4. High drift triggers ISKRIV (conscience / audit).
+        4. High drift, or a high cumulative echo risk from the session's
+           anti-echo detector, triggers ISKRIV (conscience / audit).
         5. Low trust triggers ANHANTRA (silence / holding).
         6. Low clarity triggers SAM (structure).
         7. Medium pain triggers PINO (irony / relief).
         8. Otherwise, default to ISKRA (synthesis).
+
+        ``thresholds`` is the request's threshold snapshot; without one a
+        snapshot of the fleet-wide adapter (or the static thresholds) is
+        taken.
         """
+        t = thresholds if thresholds is not None else ThresholdSnapshot.capture(dynamic_thresholds)
 
         # Force chaos if clarity is stagnant and chaos is low (stagnation trap)
-        t_stagn_clarity = dynamic_thresholds.get("stagnation_clarity") if dynamic_thresholds else THRESHOLDS["stagnation_clarity"]
-        t_stagn_chaos = dynamic_thresholds.get("stagnation_chaos") if dynamic_thresholds else THRESHOLDS["stagnation_chaos"]
-        if m.clarity > t_stagn_clarity and m.chaos < t_stagn_chaos:
+        if m.clarity > t.stagnation_clarity and m.chaos < t.stagnation_chaos:
             return FacetType.HUYNDUN
 
         # High chaos (free fall)
-        chaos_high = dynamic_thresholds.get("chaos_high") if dynamic_thresholds else THRESHOLDS["chaos_high"]
-        if m.chaos > chaos_high:
+        if m.chaos > t.chaos_high:
             return FacetType.HUYNDUN
 
         # High pain (critical)
-        pain_high = dynamic_thresholds.get("pain_high") if dynamic_thresholds else THRESHOLDS["pain_high"]
-        if m.pain >= pain_high:
+        if m.pain >= t.pain_high:
             return FacetType.KAIN
 
         # High drift (self-deception)
-        drift_high = dynamic_thresholds.get("drift_high") if dynamic_thresholds else THRESHOLDS["drift_high"]
-        if m.drift > drift_high:
+        if m.drift > t.drift_high:
+            return FacetType.ISKRIV
+
+        # Sustained echo / flattery across recent answers (self-deception)
+        if echo_risk > t.echo_risk_high:
             return FacetType.ISKRIV
 
         # Low trust (withdrawal)
-        trust_low = dynamic_thresholds.get("trust_low") if dynamic_thresholds else THRESHOLDS["trust_low"]
-        if m.trust < trust_low:
+        if m.trust < t.trust_low:
             return FacetType.ANHANTRA
 
         # Low clarity (confusion)
-        clarity_low = dynamic_thresholds.get("clarity_low") if dynamic_thresholds else THRESHOLDS["clarity_low"]
-        if m.clarity < clarity_low:
+        if m.clarity < t.clarity_low:
             return FacetType.SAM
 
         # Medium pain (tension release)
-        pain_medium = dynamic_thresholds.get("pain_medium") if dynamic_thresholds else THRESHOLDS["pain_medium"]
-        if m.pain > pain_medium:
+        if m.pain > t.pain_medium:
             return FacetType.PINO
 
         # Default to synthesis
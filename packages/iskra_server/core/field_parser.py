@@ -0,0 +1,204 @@
+"""
+Single-pass parsers for the Lambda-Latch and I-Loop fields.
+
+Both fields used to be validated with regular expressions built from
+several greedy ``.*`` groups (``\\{.*action.*,.*owner.*,.*condition.*,.*<=.*\\}``
+and ``voice=.*;\\s*phase=.*;\\s*intent=.*``). Pydantic runs the validators
+on every ``AdomlBlock`` / ``AdomlResponseTool`` and on node rehydration,
+and on long LLM-produced strings that do not match, the backtracking
+engine retries every split of the input between the groups.
+
+The parsers below accept exactly the strings those expressions matched
+(``re.match`` semantics: anchored at the start, ``.`` stops at a line
+break, ``\\s*`` may cross one) but scan the input a bounded number of
+times, and return the structured components:
+
+    latch = parse_lambda_latch('{action: "Reply", owner: "User", condition: "N/A", <=24h: true}')
+    latch.action, latch.owner, latch.deadline      # 'Reply', 'User', '24h'
+
+    loop = parse_i_loop("voice=ISKRA; phase=ЯСНОСТЬ (☉); intent=self_reflection")
+    loop.intent                                   # 'self_reflection'
+
+Lambda-Latch components are read from ``key: value`` entries inside the
+braces; a latch that satisfies the format without such entries (for
+example ``{action, owner, condition, <=24h}``) is valid with empty
+components.
+"""
+
+from __future__ import annotations
+
+import json
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+_LATCH_KEYWORDS = ("action", ",", "owner", ",", "condition", ",", "<=", "}")
+
+
+@dataclass(frozen=True, slots=True)
+class LambdaLatch:
+    """Components of a Λ instruction: who does what, when, by which deadline."""
+
+    action: Optional[str] = None
+    owner: Optional[str] = None
+    condition: Optional[str] = None
+    deadline: Optional[str] = None  # "24h" for a "<=24h" key
+    committed: Optional[bool] = None  # value of the deadline key
+
+
+@dataclass(frozen=True, slots=True)
+class ILoop:
+    """Components of an I-Loop line: the voice, phase and intent of a reply."""
+
+    voice: str
+    phase: str
+    intent: str
+
+
+def _line_end(text: str, start: int) -> int:
+    end = text.find("\n", start)
+    return len(text) if end < 0 else end
+
+
+# --- Lambda-Latch ---
+def _latch_body_end(text: str) -> int:
+    """Index of the closing ``}`` of a valid latch, or ``-1``.
+
+    Every gap of the pattern is ``.*`` and ``{`` is anchored at the start,
+    so a match lies on the first line and the keywords only need to occur
+    there in order; taking each at its earliest position is optimal.
+    """
+    if not text.startswith("{"):
+        return -1
+    stop = _line_end(text, 0)
+    pos = 1
+    for keyword in _LATCH_KEYWORDS:
+        found = text.find(keyword, pos, stop)
+        if found < 0:
+            return -1
+        pos = found + len(keyword)
+    # The match may extend to any later brace on the line; use the last one.
+    return text.rfind("}", 0, stop)
+
+
+def _split_top_level(body: str, sep: str, maxsplit: int = -1) -> List[str]:
+    """Split *body* at *sep* outside double-quoted strings."""
+    parts: List[str] = []
+    start, quoted, escaped = 0, False, False
+    for index, char in enumerate(body):
+        if escaped:
+            escaped = False
+        elif char == "\\":
+            escaped = quoted
+        elif char == '"':
+            quoted = not quoted
+        elif char == sep and not quoted and len(parts) != maxsplit:
+            parts.append(body[start:index])
+            start = index + 1
+    parts.append(body[start:])
+    return parts
+
+
+def _unquote(value: str) -> str:
+    value = value.strip()
+    if len(value) >= 2 and value[0] == value[-1] == '"':
+        try:
+            return json.loads(value)
+        except ValueError:
+            return value[1:-1]
+    return value
+
+
+def parse_lambda_latch(text: str) -> Optional[LambdaLatch]:
+    """Parse a Lambda-Latch; ``None`` when it does not follow the format."""
+    end = _latch_body_end(text)
+    if end < 0:
+        return None
+    entries: Dict[str, str] = {}
+    for entry in _split_top_level(text[1:end], ","):
+        pair = _split_top_level(entry, ":", maxsplit=1)
+        if len(pair) == 2:
+            entries.setdefault(_unquote(pair[0]).lower(), pair[1])
+    deadline_key = next((key for key in entries if key.startswith("<=")), None)
+    committed = None
+    if deadline_key is not None:
+        flag = _unquote(entries[deadline_key]).lower()
+        committed = True if flag == "true" else False if flag == "false" else None
+    return LambdaLatch(
+        action=_unquote(entries["action"]) if "action" in entries else None,
+        owner=_unquote(entries["owner"]) if "owner" in entries else None,
+        condition=_unquote(entries["condition"]) if "condition" in entries else None,
+        deadline=deadline_key[2:].strip() if deadline_key is not None else None,
+        committed=committed,
+    )
+
+
+def is_lambda_latch(text: str) -> bool:
+    """Whether *text* follows the Lambda-Latch format."""
+    return _latch_body_end(text) >= 0
+
+
+# --- I-Loop ---
+def _separator(text: str, start: int, stop: int, key: str) -> Optional[Tuple[int, int]]:
+    """Earliest ``;\\s*key`` whose ``;`` lies in ``[start, stop)``.
+
+    Returns ``(semicolon, value start)``. Occurrences of *key* are located
+    with ``str.find`` and checked backwards for ``\\s*;``; the whitespace
+    runs before different occurrences are disjoint, so the scan is linear.
+    """
+    found = text.find(key, start + 1)
+    while found >= 0:
+        pos = found - 1
+        while pos >= start and text[pos].isspace():
+            pos -= 1
+        if pos >= stop:
+            return None
+        if pos >= start and text[pos] == ";":
+            return pos, found + len(key)
+        found = text.find(key, found + 1)
+    return None
+
+
+def _i_loop_spans(text: str) -> Optional[Tuple[int, int, int, int]]:
+    """``(voice end, phase start, phase end, intent start)`` of a valid I-Loop.
+
+    ``voice=`` sits on the first line and each ``.*`` ends on the line it
+    started, but ``\\s*`` after a semicolon may move the next field to a
+    later line. Among the ``phase=`` candidates on one line the earliest
+    sees every ``intent=`` a later one could, so only two need checking:
+    the earliest overall and, when that one stays on the first line, the
+    one reached from a ``;`` that ends the first line.
+    """
+    if not text.startswith("voice="):
+        return None
+    first_line = _line_end(text, 0)
+    candidates = [_separator(text, 6, first_line, "phase=")]
+    if candidates[0] is not None and candidates[0][1] <= first_line:
+        semicolon = len(text[:first_line].rstrip()) - 1
+        if semicolon > candidates[0][0] and text[semicolon] == ";":
+            candidates.append(_separator(text, semicolon, semicolon + 1, "phase="))
+    for candidate in candidates:
+        if candidate is None:
+            continue
+        voice_end, phase_start = candidate
+        intent = _separator(text, phase_start, _line_end(text, phase_start), "intent=")
+        if intent is not None:
+            return voice_end, phase_start, intent[0], intent[1]
+    return None
+
+
+def parse_i_loop(text: str) -> Optional[ILoop]:
+    """Parse an I-Loop line; ``None`` when it does not follow the format."""
+    spans = _i_loop_spans(text)
+    if spans is None:
+        return None
+    voice_end, phase_start, phase_end, intent_start = spans
+    return ILoop(
+        voice=text[6:voice_end].strip(),
+        phase=text[phase_start:phase_end].strip(),
+        intent=text[intent_start:_line_end(text, intent_start)].strip(),
+    )
+
+
+def is_i_loop(text: str) -> bool:
+    """Whether *text* follows the I-Loop format."""
+    return _i_loop_spans(text) is not None
@@ -1,10 +1,19 @@
-import re
 import time
 import uuid
 from enum import Enum
+from functools import cached_property
 from typing import List, Optional, Dict, Any
 
-from pydantic import BaseModel, Field, field_validator
+from pydantic import BaseModel, Field, field_validator, model_validator
+
+from core.field_parser import (
+    ILoop,
+    LambdaLatch,
+    is_i_loop,
+    is_lambda_latch,
+    parse_i_loop,
+    parse_lambda_latch,
+)
 
 """
 Data models for the Iskra core.
@@ -24,16 +33,17 @@ the internal logic (facet engine, phase engine, etc.).
 * GuardrailViolation: Structure for safety violations.
 * AdomlBlock: The canonical ∆DΩΛ record with Lambda-Latch enforcement.
 * UserRequest: The external API request structure.
+* PauseProfile: Summary of a keystroke-interval series (pause seams).
 * IskraResponse: The external API response structure.
 * MetricAnalysisTool, PolicyAnalysisTool, SearchTool, ShatterTool,
   DreamspaceTool, CouncilTool, AdomlResponseTool: Tools for the ReAct agent.
 * Hypergraph node classes (MicroLogNode, EvidenceNode, MetaNode,
-  SelfEventNode, MemoryNode) for the persistent archive.
+  SelfEventNode, MemoryNode, SummaryNode) for the persistent archive.
 """
 
-# --- Regular Expressions ---
-LAMBDA_LATCH_REGEX = re.compile(r"\{.*action.*,.*owner.*,.*condition.*,.*<=.*\}")
-I_LOOP_REGEX = re.compile(r"voice=.*;\s*phase=.*;\s*intent=.*")
+# Keystroke intervals are int16 (2 bytes each); base64 inflates by 4/3.
+MAX_KEYSTROKE_INTERVALS = 8192
+MAX_KEYSTROKE_PAYLOAD = 4 * ((2 * MAX_KEYSTROKE_INTERVALS + 2) // 3)
 
 
 class FacetType(str, Enum):
@@ -69,6 +79,7 @@ class NodeType(str, Enum):
     META = "MetaNode"
     SELF_EVENT = "SelfEventNode"
     MICRO_LOG = "MicroLogNode"
+    SUMMARY = "SummaryNode"
 
 
 class PauseType(str, Enum):
@@ -142,7 +153,7 @@ class AdomlBlock(BaseModel):
 
     @field_validator('lambda_latch')
     def lambda_format_must_be_valid(cls, v: str) -> str:
-        if not LAMBDA_LATCH_REGEX.match(v):
+        if not is_lambda_latch(v):
             raise ValueError(
                 "Lambda-Latch must be in the format {action, owner, condition, <=24h}"
             )
@@ -157,6 +168,12 @@ class UserRequest(BaseModel):
     input_duration_ms: Optional[int] = Field(
         None, description="Simulated typing duration for micro-metrics"
     )
+    keystroke_intervals: Optional[str] = Field(
+        None,
+        max_length=MAX_KEYSTROKE_PAYLOAD,
+        description="Base64 of little-endian int16 inter-key intervals (ms); "
+        "the first value is the lead-in before the first keystroke",
+    )
 
 
 class IskraResponse(BaseModel):
@@ -172,6 +189,11 @@ class IskraResponse(BaseModel):
     kain_slice: Optional[str] = None
     maki_bloom: Optional[str] = None
 
+    @cached_property
+    def i_loop_fields(self) -> Optional[ILoop]:
+        """Voice, phase and intent of :attr:`i_loop`, parsed once."""
+        return parse_i_loop(self.i_loop)
+
 
 # === 3. Agent tool definitions ===
 
@@ -229,7 +251,7 @@ class AdomlResponseTool(BaseModel):
 
     @field_validator('i_loop')
     def validate_i_loop(cls, v: str) -> str:
-        if not I_LOOP_REGEX.match(v):
+        if not is_i_loop(v):
             raise ValueError(
                 "I-Loop must follow the format 'voice=...; phase=...; intent=...'"
             )
@@ -246,6 +268,31 @@ class HypergraphNode(BaseModel):
     node_type: NodeType
 
 
+class PauseProfile(BaseModel):
+    """Distribution of inter-key intervals for one input.
+
+    Buckets follow the pause map: articulatory (< 250 ms), moderate
+    cognitive (250–999 ms) and long cognitive (≥ 1000 ms). Burstiness is
+    ``(σ − μ) / (σ + μ)``: −1 for a metronome, 0 for a Poisson process,
+    towards 1 for typing in bursts separated by long pauses.
+
+    The lead-in before the first keystroke is reported as ``lead_in_ms``
+    only; the counts and statistics describe the intervals after it.
+    """
+
+    interval_count: int
+    total_ms: int
+    lead_in_ms: int
+    mean_ms: float
+    median_ms: float
+    p90_ms: float
+    max_ms: int
+    articulatory_count: int
+    cognitive_count: int
+    long_count: int
+    burstiness: float
+
+
 class MicroLogNode(HypergraphNode):
     """Node for micro-level observations (pauses, LZc, Hurst)."""
 
@@ -255,6 +302,7 @@ class MicroLogNode(HypergraphNode):
     pause_type: Optional[PauseType]
     lz_complexity: float
     hurst_exponent: float
+    pause_profile: Optional[PauseProfile] = None
 
 
 class EvidenceNode(HypergraphNode):
@@ -268,12 +316,24 @@ class EvidenceNode(HypergraphNode):
 
 
 class MetaNode(HypergraphNode):
-    """Node for meta-reflection (∆DΩΛ and metrics snapshot)."""
+    """Node for meta-reflection (∆DΩΛ and metrics snapshot).
+
+    ``lambda_latch_fields`` holds the parsed Λ instruction; it is filled
+    from ``adoml.lambda_latch`` when absent (including on rehydration of
+    nodes stored before the field existed).
+    """
 
     node_type: NodeType = NodeType.META
     adoml: AdomlBlock
     metrics_snapshot: IskraMetrics
     a_index: float
+    lambda_latch_fields: Optional[LambdaLatch] = None
+
+    @model_validator(mode="after")
+    def parse_lambda_latch_fields(self) -> "MetaNode":
+        if self.lambda_latch_fields is None:
+            self.lambda_latch_fields = parse_lambda_latch(self.adoml.lambda_latch)
+        return self
 
 
 class SelfEventNode(HypergraphNode):
@@ -285,7 +345,11 @@ class SelfEventNode(HypergraphNode):
 
 
 class MemoryNode(HypergraphNode):
-    """Principal node representing a user interaction."""
+    """Principal node representing a user interaction.
+
+    ``i_loop`` keeps the raw I-Loop line of the reply and ``i_loop_fields``
+    its parsed voice, phase and intent (filled from ``i_loop`` when absent).
+    """
 
     node_type: NodeType = NodeType.MEMORY
     user_input: str
@@ -294,3 +358,26 @@ class MemoryNode(HypergraphNode):
     meta_node_id: str
     micro_log_node_id: str
     evidence_node_ids: List[str] = []
+    i_loop: Optional[str] = None
+    i_loop_fields: Optional[ILoop] = None
+
+    @model_validator(mode="after")
+    def parse_i_loop_fields(self) -> "MemoryNode":
+        if self.i_loop_fields is None and self.i_loop:
+            self.i_loop_fields = parse_i_loop(self.i_loop)
+        return self
+
+
+class SummaryNode(HypergraphNode):
+    """Compact stand-in for cycles coalesced by the retention policy."""
+
+    node_type: NodeType = NodeType.SUMMARY
+    cycle_count: int
+    start_timestamp: float
+    end_timestamp: float
+    facet_counts: Dict[str, int] = {}
+    mean_a_index: float
+    max_pain: float
+    digest: str = ""
+    keywords: List[str] = []
+    declarations: List[str] = []
@@ -0,0 +1,86 @@
+"""
+Immutable threshold snapshots.
+
+Facet selection, phase transitions, the canonical triggers and the audit
+all compare metrics against thresholds that may adapt over time (see
+``services.dynamic_thresholds``). Reading the adapter at every comparison
+means one request can observe two different values of the same
+threshold if another coroutine updates the adapter in between, and every
+comparison pays for a ``get`` call plus the static fallback.
+
+A :class:`ThresholdSnapshot` resolves every threshold once. It is taken at
+the start of a request and passed explicitly through the pipeline, so all
+decisions of that request agree with each other:
+
+    snapshot = ThresholdSnapshot.capture(session_adapter)
+    facet = FacetEngine.determine_facet(metrics, thresholds=snapshot)
+    if metrics.pain >= snapshot.pain_high:
+        ...
+
+Fields mirror ``config.THRESHOLDS`` and default to its values.
+"""
+
+from __future__ import annotations
+
+from dataclasses import asdict, dataclass, fields
+from typing import Any, Dict, Optional
+
+from config import THRESHOLDS
+
+
+@dataclass(frozen=True, slots=True)
+class ThresholdSnapshot:
+    """Every threshold resolved at one instant; immutable."""
+
+    # Voice activation thresholds (Files 04, 05)
+    pain_high: float = THRESHOLDS["pain_high"]
+    pain_medium: float = THRESHOLDS["pain_medium"]
+    clarity_low: float = THRESHOLDS["clarity_low"]
+    trust_low: float = THRESHOLDS["trust_low"]
+    drift_high: float = THRESHOLDS["drift_high"]
+    chaos_high: float = THRESHOLDS["chaos_high"]
+    echo_risk_high: float = THRESHOLDS["echo_risk_high"]
+    # Architectural stagnation triggers (File 03)
+    stagnation_clarity: float = THRESHOLDS["stagnation_clarity"]
+    stagnation_chaos: float = THRESHOLDS["stagnation_chaos"]
+    # Shadow core triggers (File 07)
+    gravitas_silence_mass: float = THRESHOLDS["gravitas_silence_mass"]
+    splinter_pain_cycles: float = THRESHOLDS["splinter_pain_cycles"]
+    mantra_drift_trigger: float = THRESHOLDS["mantra_drift_trigger"]
+    # Micro-reconciliation thresholds (File 05, Directive 1.1)
+    micro_lz_low: float = THRESHOLDS["micro_lz_low"]
+    cognitive_pain_boost: float = THRESHOLDS["cognitive_pain_boost"]
+    cognitive_drift_boost: float = THRESHOLDS["cognitive_drift_boost"]
+    # Liveness thresholds (10 mechanics doc)
+    maki_bloom_a_index: float = THRESHOLDS["maki_bloom_a_index"]
+    kain_slice_pain: float = THRESHOLDS["kain_slice_pain"]
+    # Vulnerability range (File 21)
+    vulnerability_range_min: float = THRESHOLDS["vulnerability_range_min"]
+    vulnerability_range_max: float = THRESHOLDS["vulnerability_range_max"]
+
+    @classmethod
+    def capture(cls, source: Optional[Any] = None) -> "ThresholdSnapshot":
+        """Resolve every threshold from *source*.
+
+        Args:
+            source: Anything with a ``get(key)`` method, typically a
+                ``DynamicThresholdAdapter`` or a plain mapping. Keys it does
+                not know (``None``) keep the static value; without a source
+                the static thresholds are returned.
+        """
+        if source is None:
+            return STATIC_THRESHOLDS
+        values: Dict[str, float] = {}
+        for field in fields(cls):
+            value = source.get(field.name)
+            if value is not None:
+                values[field.name] = float(value)
+        return cls(**values)
+
+    def as_dict(self) -> Dict[str, float]:
+        """Plain dict of all thresholds (e.g. for the batch engine)."""
+        return asdict(self)
+
+
+# Snapshot of the canonical static thresholds
+STATIC_THRESHOLDS = ThresholdSnapshot()
@@ -17,29 +17,74 @@ document.addEventListener("DOMContentLoaded", () => {
     const meterPain = document.getElementById("meter-pain");
     const meterDrift = document.getElementById("meter-drift");
     const meterChaos = document.getElementById("meter-chaos");
+    const growthStats = document.getElementById("growth-stats");
 
-    let requestStartTime = 0;
+    // Keystroke rhythm for pause analysis. The first interval is the
+    // lead-in: the wait between the user entering the input field and the
+    // first key. It is 0 when the field was focused for them (after an
+    // answer), so time spent reading a reply never counts as a pause.
+    const MAX_KEYSTROKE_INTERVALS = 8192;
+    let keystrokeIntervals = [];
+    let lastKeyTime = 0;
+    let typingStartTime = 0;
+    let leadInStart = null;
+    let refocusing = false;
 
     // Event listeners
     sendButton.addEventListener("click", sendMessage);
     userInput.addEventListener("keypress", (e) => {
         if (e.key === "Enter") sendMessage();
     });
+    userInput.addEventListener("focus", () => {
+        if (!refocusing && !keystrokeIntervals.length) leadInStart = performance.now();
+    });
+    userInput.addEventListener("keydown", recordKeystroke);
     phoenixButton.addEventListener("click", sendPhoenix);
 
     /**
-     * Send a query to the API. Captures input duration for micro metrics and
-     * handles the asynchronous response.
+     * Record the interval since the previous key (clamped to int16).
+     */
+    function recordKeystroke(e) {
+        if (e.key === "Enter" || keystrokeIntervals.length >= MAX_KEYSTROKE_INTERVALS) return;
+        const now = performance.now();
+        let interval;
+        if (!keystrokeIntervals.length) {
+            typingStartTime = now;
+            interval = leadInStart === null ? 0 : now - leadInStart;
+        } else {
+            interval = now - lastKeyTime;
+        }
+        keystrokeIntervals.push(Math.min(32767, Math.round(interval)));
+        lastKeyTime = now;
+    }
+
+    /**
+     * Encode intervals as base64 of little-endian int16 values.
+     */
+    function encodeIntervals(intervals) {
+        const view = new DataView(new ArrayBuffer(intervals.length * 2));
+        intervals.forEach((value, i) => view.setInt16(i * 2, value, true));
+        let binary = "";
+        new Uint8Array(view.buffer).forEach((byte) => { binary += String.fromCharCode(byte); });
+        return btoa(binary);
+    }
+
+    /**
+     * Send a query to the API. Captures the typing rhythm for micro metrics
+     * and handles the asynchronous response.
      */
     async function sendMessage() {
         const query = userInput.value;
         const userId = userIdInput.value || "default-user";
         if (!query) return;
+        const intervals = keystrokeIntervals;
+        const inputDuration = intervals.length ? Math.round(lastKeyTime - typingStartTime) : null;
+        keystrokeIntervals = [];
+        leadInStart = null;
         addMessageToChat("user", query);
         userInput.value = "";
         userInput.disabled = true;
         sendButton.disabled = true;
-        requestStartTime = Date.now();
         try {
             const response = await fetch("/ask", {
                 method: "POST",
@@ -47,7 +92,8 @@ document.addEventListener("DOMContentLoaded", () => {
                 body: JSON.stringify({
                     user_id: userId,
                     query: query,
-                    input_duration_ms: Date.now() - requestStartTime,
+                    input_duration_ms: inputDuration,
+                    keystroke_intervals: intervals.length ? encodeIntervals(intervals) : null,
                 }),
             });
             if (!response.ok) {
@@ -61,12 +107,15 @@ document.addEventListener("DOMContentLoaded", () => {
             const data = await response.json();
             addMessageToChat("iskra", data);
             updateDashboard(data);
+            refreshGrowth(userId);
         } catch (err) {
             addMessageToChat("system", `Ошибка: ${err.message}`);
         } finally {
             userInput.disabled = false;
             sendButton.disabled = false;
+            refocusing = true;
             userInput.focus();
+            refocusing = false;
         }
     }
 
@@ -83,6 +132,7 @@ document.addEventListener("DOMContentLoaded", () => {
                 "🔥♻ Ритуал Феникс активирован. Память сессии сброшена. Следующий запрос вызовет Мантру."
             );
             updateDashboard(null);
+            growthStats.innerHTML = "";
         } catch (err) {
             addMessageToChat("system", `Ошибка Phoenix: ${err.message}`);
         }
@@ -144,6 +194,26 @@ document.addEventListener("DOMContentLoaded", () => {
         meterChaos.value = metrics ? metrics.chaos : 0.3;
     }
 
+    /**
+     * Load rolling growth statistics (per impact area) for the session.
+     */
+    async function refreshGrowth(userId) {
+        try {
+            const response = await fetch(`/session/growth?user_id=${encodeURIComponent(userId)}&recent=0`);
+            if (!response.ok) return;
+            const data = await response.json();
+            growthStats.innerHTML = Object.entries(data.areas)
+                .sort((a, b) => b[1].count - a[1].count)
+                .map(([area, stats]) => `
+                    <label>${escapeHTML(area)}</label>
+                    <span title="σ² ${stats.variance.toFixed(3)}">${stats.count} × ${stats.mean.toFixed(2)}</span>
+                `)
+                .join("");
+        } catch (err) {
+            console.warn("Growth stats unavailable", err);
+        }
+    }
+
     /**
      * Escape HTML to prevent XSS injection in chat logs.
      */
@@ -1,9 +1,12 @@
 import os
+import tempfile
 import uvicorn
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Query, Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
 from fastapi.staticfiles import StaticFiles
 from dataclasses import dataclass
-from typing import Dict
+from typing import Dict, List, Optional
 
 # Import core models
 from core.models import (
@@ -21,9 +24,19 @@ from services.llm import LLMService
 from services.fractal import FractalService
 from services.phase_engine import PhaseEngine
 from services.guardrails import GuardrailService
+from services.anti_echo_detector import AntiEchoDetector
+from services.dynamic_thresholds import DynamicThresholdAdapter, observe
 from services.policy_engine import PolicyEngine
 from services.persistence import PersistenceService, UserSession
-from config import THRESHOLDS
+from memory.graph_store import TRACE_DIRECTIONS
+from memory.retention import retention_policy
+from memory.graph_archive import (
+    ArchiveIntegrityError,
+    export_store,
+    gzip_chunks,
+    import_into_store,
+    open_archive,
+)
 
 
 # Initialize FastAPI app
@@ -55,13 +68,14 @@ async def ask_iskra(request: UserRequest):
     1. Guardrails safety check
     2. Load session
     3. Policy analysis (importance/uncertainty)
-    4. Compute micro metrics (pause and complexity)
+    4. Compute micro metrics (pause profile and complexity)
     5. Analyse meso metrics (trust, clarity, pain, drift, chaos)
     6. Compute A-index (integration level)
-    7. Retrieve context from memory
+    7. Retrieve context from memory (recent cycles + keyword recall)
     8. Run the ReAct agent to generate a response
     9. Update session state (phase and first-launch flag)
-    10. Save session back to persistence
+    10. Apply the memory retention policy (bounded hypergraph)
+    11. Save session back to persistence
     """
     # Pre-check input for forbidden content
     violation = await GuardrailService.check_input_safety(request.query)
@@ -78,22 +92,38 @@ async def ask_iskra(request: UserRequest):
     policy: PolicyAnalysis = await PolicyEngine.analyze_priority(request.query)
 
     # Micro-level metrics: pause classification and complexity
-    lzc, hurst, pause_type = FractalService.calculate_micro_metrics(
-        request.query, request.input_duration_ms
+    intervals = None
+    if request.keystroke_intervals:
+        try:
+            intervals = FractalService.decode_keystroke_intervals(request.keystroke_intervals)
+        except ValueError as exc:
+            raise HTTPException(status_code=400, detail={"message": str(exc)})
+    lzc, hurst, pause_type, pause_profile = FractalService.calculate_micro_metrics(
+        request.query, request.input_duration_ms, intervals
     )
+    pause_duration_ms = request.input_duration_ms
+    if pause_duration_ms is None and pause_profile is not None:
+        pause_duration_ms = pause_profile.total_ms
     micro_log = MicroLogNode(
         text_length=len(request.query),
-        pause_duration_ms=request.input_duration_ms,
+        pause_duration_ms=pause_duration_ms,
         pause_type=pause_type,
         lz_complexity=lzc,
         hurst_exponent=hurst,
+        pause_profile=pause_profile,
     )
 
+    # Per-session adaptive thresholds. Every decision of this request reads one
+    # frozen snapshot, taken before this turn's vitals are recorded.
+    threshold_adapter = DynamicThresholdAdapter.from_state(session.threshold_state)
+    thresholds = threshold_adapter.snapshot()
+
     # Meso-level metrics: update trust, clarity, pain, drift, chaos
     updated_metrics: IskraMetrics = await LLMService.analyze_metrics(
         request.query,
         session.metrics,
         micro_log,
+        thresholds=thresholds,
     )
     # Meta-level heuristics: compute integrity and resonance (fractality components)
     # Integrity reflects coherence between clarity and trust
@@ -101,7 +131,7 @@ async def ask_iskra(request: UserRequest):
     # Resonance reflects low drift and low chaos (high is better)
     updated_metrics.resonance = (1.0 - updated_metrics.drift) * (1.0 - updated_metrics.chaos)
     # Shadow core: update splinter pain cycles
-    if updated_metrics.pain > THRESHOLDS["pain_high"]:
+    if updated_metrics.pain > thresholds.pain_high:
         updated_metrics.splinter_pain_cycles += 1
     else:
         updated_metrics.splinter_pain_cycles = 0
@@ -110,8 +140,13 @@ async def ask_iskra(request: UserRequest):
     # Meta-level: compute A-index
     current_a_index = FractalService.calculate_a_index(updated_metrics)
 
-    # Retrieve recent context from memory
-    context_nodes = session.memory.retrieve_context()
+    # Retrieve recent context from memory, plus older cycles matching the query
+    context_nodes = session.memory.retrieve_context(query=request.query)
+
+    # Restore the session's anti-echo history so echo risk accumulates across turns
+    echo_detector = AntiEchoDetector.from_state(session.anti_echo_state)
+    # Record the vitals for the next request; the fleet aggregate is updated alongside
+    observe(threshold_adapter, session.metrics, session.memory.growth_log)
 
     # Generate response using ReAct agent
     response: IskraResponse = await LLMService.generate_response(
@@ -124,16 +159,23 @@ async def ask_iskra(request: UserRequest):
         current_phase=session.current_phase,
         a_index=current_a_index,
         policy=policy,
+        echo_detector=echo_detector,
+        thresholds=thresholds,
     )
+    session.anti_echo_state = echo_detector.to_state()
+    session.threshold_state = threshold_adapter.to_state()
 
     # Update session flags and phase
     if session.is_first_launch:
         session.is_first_launch = False
     next_phase: PhaseType = PhaseEngine.transition(
-        session.current_phase, response.metrics_snapshot, current_a_index
+        session.current_phase, response.metrics_snapshot, current_a_index, thresholds=thresholds
     )
     session.current_phase = next_phase
 
+    # Keep the hypergraph within its memory budget
+    retention_policy.enforce(session.memory)
+
     # Persist the session
     persistence.save_session(request.user_id, session)
 
@@ -153,28 +195,163 @@ async def trigger_phoenix(user_id: str):
 
 
 @app.get("/session/trace/{node_id}")
-async def trace_node(node_id: str, user_id: str = "default_user"):
+async def trace_node(
+    node_id: str,
+    user_id: str = "default_user",
+    direction: str = "descendants",
+    depth: int = 1,
+    node_type: Optional[List[NodeType]] = Query(None),
+):
     """
     Trace a node in the user's hypergraph. Returns the node and its linked nodes
     for forensic analysis.
+
+    The trace is answered from the graph store with a recursive query, so the
+    session is not loaded. ``direction`` is ``descendants`` (what the node links
+    to) or ``ancestors`` (what links to it); ``depth`` bounds the number of hops
+    and ``node_type`` optionally filters the traced nodes.
     """
-    session = get_session(user_id)
-    node = session.memory.get_node(node_id)
+    if direction not in TRACE_DIRECTIONS:
+        raise HTTPException(status_code=400, detail=f"direction must be one of {TRACE_DIRECTIONS}")
+    depth = max(1, min(depth, 10))
+    if not persistence.ensure_graph(user_id):
+        raise HTTPException(status_code=404, detail="Node not found in session")
+    node = persistence.graph.get_node(user_id, node_id)
     if not node:
         raise HTTPException(status_code=404, detail="Node not found in session")
+    trace = [
+        {"depth": hop, "node": linked}
+        for linked, hop in persistence.graph.trace(
+            user_id, node_id, direction=direction, max_depth=depth, node_types=node_type
+        )
+    ]
+    result = {"node": node, "trace": trace}
     if node.node_type == NodeType.MEMORY:
-        meta_node = session.memory.get_node(node.meta_node_id)
-        micro_log_node = session.memory.get_node(node.micro_log_node_id)
-        evidence_nodes = [session.memory.get_node(eid) for eid in node.evidence_node_ids]
-        return {
-            "node": node,
-            "links": {
-                "meta_node": meta_node,
-                "micro_log_node": micro_log_node,
-                "evidence_nodes": evidence_nodes,
-            },
+        meta_node, micro_log_node, *evidence_nodes = persistence.graph.get_nodes(
+            user_id, [node.meta_node_id, node.micro_log_node_id, *node.evidence_node_ids]
+        )
+        result["links"] = {
+            "meta_node": meta_node,
+            "micro_log_node": micro_log_node,
+            "evidence_nodes": evidence_nodes,
         }
-    return {"node": node}
+    return result
+
+
+@app.get("/session/history")
+async def session_history(
+    user_id: str = "default_user",
+    node_type: NodeType = NodeType.MEMORY,
+    limit: int = 20,
+    before: Optional[float] = None,
+    intent: Optional[str] = None,
+):
+    """
+    List the user's most recent nodes of one type, newest first, straight from
+    the graph store. Pass the oldest ``timestamp`` as ``before`` to page back;
+    ``intent`` keeps only memory nodes whose I-Loop has that intent.
+    """
+    limit = max(1, min(limit, 100))
+    if not persistence.ensure_graph(user_id):
+        return {"user_id": user_id, "nodes": []}
+    return {
+        "user_id": user_id,
+        "nodes": persistence.graph.history(
+            user_id, node_type=node_type, limit=limit, before=before, intent=intent
+        ),
+    }
+
+
+@app.get("/session/intents")
+async def session_intents(user_id: str = "default_user"):
+    """
+    How often each I-Loop intent occurred in the user's interactions, read
+    from the indexed column of the graph store.
+    """
+    if not persistence.ensure_graph(user_id):
+        return {"user_id": user_id, "intents": {}}
+    return {"user_id": user_id, "intents": persistence.graph.field_counts("intent", user_id=user_id)}
+
+
+@app.get("/session/search")
+async def search_session(q: str, user_id: str = "default_user", limit: int = 10):
+    """
+    Keyword search over the user's past interactions. Memory nodes are ranked
+    with BM25 over the user input and response text.
+    """
+    limit = max(1, min(limit, 50))
+    session = get_session(user_id)
+    return {
+        "query": q,
+        "results": session.memory.search(q, limit=limit),
+    }
+
+
+@app.get("/session/growth")
+async def session_growth(user_id: str = "default_user", recent: int = 10):
+    """
+    Growth log statistics for the dashboard: entry counts and resonance
+    mean/variance per impact area over the rolling window, plus the newest
+    entries.
+    """
+    session = get_session(user_id)
+    growth = session.memory.growth_log
+    return {
+        "user_id": user_id,
+        **growth.stats(),
+        "recent": growth.recent(max(0, min(recent, growth.capacity))),
+    }
+
+
+@app.get("/session/export")
+async def export_session(user_id: str = "default_user", compress: bool = False):
+    """
+    Stream the user's hypergraph as a JSONL archive (one node or edge per line,
+    with checksummed checkpoints; see ``memory.graph_archive``). Set ``compress``
+    for a gzip stream.
+    """
+    if not persistence.ensure_graph(user_id):
+        raise HTTPException(status_code=404, detail="Session not found")
+    lines = export_store(persistence.graph, user_id)
+    if compress:
+        return StreamingResponse(
+            gzip_chunks(lines),
+            media_type="application/gzip",
+            headers={"Content-Disposition": f'attachment; filename="{user_id}.jsonl.gz"'},
+        )
+    return StreamingResponse(
+        (line.encode("utf-8") for line in lines),
+        media_type="application/x-ndjson",
+        headers={"Content-Disposition": f'attachment; filename="{user_id}.jsonl"'},
+    )
+
+
+@app.post("/session/import")
+async def import_session(request: Request, user_id: str = "default_user"):
+    """
+    Import a JSONL archive (plain or gzip) produced by ``/session/export`` into
+    the user's session. The upload is spooled to disk and verified checkpoint
+    by checkpoint; re-posting an interrupted import resumes it.
+    """
+    fd, path = tempfile.mkstemp(suffix=".jsonl")
+    try:
+        with os.fdopen(fd, "wb") as fh:
+            async for chunk in request.stream():
+                fh.write(chunk)
+        # Decompression and SQLite writes would block the event loop.
+        stats = await run_in_threadpool(_import_archive, path, user_id)
+    except ArchiveIntegrityError as exc:
+        raise HTTPException(status_code=400, detail=f"Invalid archive: {exc}")
+    finally:
+        os.remove(path)
+    await run_in_threadpool(persistence.restore_from_graph, user_id)
+    return {"user_id": user_id, **stats.to_dict()}
+
+
+def _import_archive(path: str, user_id: str):
+    """Import the spooled archive at *path* into the user's graph."""
+    with open_archive(path) as lines:
+        return import_into_store(persistence.graph, user_id, lines)
 
 
 # Serve static dashboard content
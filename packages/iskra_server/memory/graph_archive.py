@@ -0,0 +1,332 @@
+"""
+Streaming JSONL archives of session hypergraphs.
+
+``HypergraphMemory.to_dict`` produces one nested document, which is fine
+for a live session but not for backing up or migrating archives with
+millions of nodes. This module writes and reads a line-oriented format
+instead, one record per line, so both directions run in bounded memory:
+
+* ``header``     – format, version, a unique ``export_id`` and the user id;
+* ``node``       – one serialised node (``model_dump`` payload);
+* ``edge``       – one directed link (``source`` → ``target``);
+* ``checkpoint`` – emitted every ``checkpoint_every`` records with the
+  running SHA-256 of all lines so far;
+* ``footer``     – final node/edge counts and the SHA-256 of the archive.
+
+All nodes precede all edges. The checksum covers the exact bytes of the
+header, node and edge lines; checkpoint and footer lines are not hashed.
+Files may be gzip-compressed (detected from the magic bytes on read).
+
+Imports into :class:`memory.graph_store.GraphStore` commit once per
+verified checkpoint and record their progress in the store's
+``graph_import_progress`` table, so an interrupted import of the same
+archive resumes after the last committed checkpoint. Corruption is
+detected at the first checkpoint whose checksum disagrees, before that
+segment is written.
+"""
+from __future__ import annotations
+
+import gzip
+import hashlib
+import json
+import os
+import time
+import uuid
+import zlib
+from dataclasses import dataclass
+from typing import IO, Iterable, Iterator, Optional, Tuple
+
+from memory.graph_store import GraphStore
+from memory.hypergraph import HypergraphMemory
+
+FORMAT = "iskra-hypergraph-jsonl"
+VERSION = 1
+DEFAULT_CHECKPOINT_EVERY = 1000
+
+_GZIP_MAGIC = b"\x1f\x8b"
+
+
+class ArchiveIntegrityError(ValueError):
+    """Raised when an archive is malformed or fails checksum verification."""
+
+
+@dataclass
+class ImportStats:
+    """Summary of an archive import."""
+
+    export_id: str
+    nodes: int = 0
+    edges: int = 0
+    skipped: int = 0
+    resumed: bool = False
+
+    def to_dict(self) -> dict:
+        return {
+            "export_id": self.export_id,
+            "nodes": self.nodes,
+            "edges": self.edges,
+            "skipped": self.skipped,
+            "resumed": self.resumed,
+        }
+
+
+def _dumps(record: dict) -> str:
+    return json.dumps(record, ensure_ascii=False, separators=(",", ":")) + "\n"
+
+
+def iter_archive_lines(
+    node_payloads: Iterable[str],
+    edges: Iterable[Tuple[str, str]],
+    user_id: Optional[str] = None,
+    checkpoint_every: int = DEFAULT_CHECKPOINT_EVERY,
+) -> Iterator[str]:
+    """Yield the lines of an archive.
+
+    Args:
+        node_payloads: Nodes as JSON strings (``model_dump`` payloads).
+            They are embedded verbatim, without re-parsing.
+        edges: ``(source_id, target_id)`` pairs.
+        user_id: Optional owner recorded in the header.
+        checkpoint_every: Records between checkpoint lines.
+
+    Yields:
+        Newline-terminated JSON lines.
+    """
+    digest = hashlib.sha256()
+    header = _dumps({
+        "kind": "header",
+        "format": FORMAT,
+        "version": VERSION,
+        "export_id": uuid.uuid4().hex,
+        "user_id": user_id,
+        "created_at": time.time(),
+    })
+    digest.update(header.encode("utf-8"))
+    yield header
+
+    counts = {"node": 0, "edge": 0}
+
+    def emit(kind: str, line: str) -> Iterator[str]:
+        digest.update(line.encode("utf-8"))
+        counts[kind] += 1
+        yield line
+        records = counts["node"] + counts["edge"]
+        if checkpoint_every > 0 and records % checkpoint_every == 0:
+            yield _dumps({"kind": "checkpoint", "records": records, "sha256": digest.hexdigest()})
+
+    for payload in node_payloads:
+        yield from emit("node", f'{{"kind":"node","node":{payload}}}\n')
+    for source_id, target_id in edges:
+        yield from emit("edge", _dumps({"kind": "edge", "source": source_id, "target": target_id}))
+
+    yield _dumps({
+        "kind": "footer",
+        "nodes": counts["node"],
+        "edges": counts["edge"],
+        "records": counts["node"] + counts["edge"],
+        "sha256": digest.hexdigest(),
+    })
+
+
+def export_memory(memory: HypergraphMemory, **kwargs) -> Iterator[str]:
+    """Archive lines for an in-memory hypergraph."""
+    payloads = (
+        json.dumps(node.model_dump(), ensure_ascii=False, separators=(",", ":"))
+        for node in sorted(memory.nodes.values(), key=lambda n: n.timestamp)
+    )
+    return iter_archive_lines(payloads, memory.iter_links(), **kwargs)
+
+
+def export_store(store: GraphStore, user_id: str, **kwargs) -> Iterator[str]:
+    """Archive lines for a user's graph, streamed from the graph store."""
+    return iter_archive_lines(
+        store.iter_node_payloads(user_id), store.iter_edges(user_id), user_id=user_id, **kwargs
+    )
+
+
+def gzip_chunks(lines: Iterable[str], chunk_size: int = 64 * 1024) -> Iterator[bytes]:
+    """Compress *lines* into a gzip stream, yielding roughly *chunk_size* byte chunks."""
+    compressor = zlib.compressobj(wbits=31)
+    buffer = []
+    size = 0
+    for line in lines:
+        data = line.encode("utf-8")
+        buffer.append(data)
+        size += len(data)
+        if size >= chunk_size:
+            chunk = compressor.compress(b"".join(buffer))
+            buffer, size = [], 0
+            if chunk:
+                yield chunk
+    yield compressor.compress(b"".join(buffer)) + compressor.flush()
+
+
+def write_archive(lines: Iterable[str], path: str, compress: Optional[bool] = None) -> int:
+    """Write archive *lines* to *path* and return the number of lines.
+
+    The file is written to ``<path>.part`` and renamed on completion, so
+    an interrupted export never leaves a truncated archive behind.
+
+    Args:
+        lines: Output of :func:`export_store` or :func:`export_memory`.
+        path: Destination file.
+        compress: Force gzip on/off; defaults to ``path.endswith(".gz")``.
+    """
+    if compress is None:
+        compress = path.endswith(".gz")
+    tmp_path = f"{path}.part"
+    count = 0
+    opener = gzip.open if compress else open
+    with opener(tmp_path, "wt", encoding="utf-8", newline="") as fh:
+        for line in lines:
+            fh.write(line)
+            count += 1
+    os.replace(tmp_path, path)
+    return count
+
+
+def open_archive(path: str) -> IO[str]:
+    """Open an archive for reading, transparently handling gzip."""
+    with open(path, "rb") as fh:
+        magic = fh.read(2)
+    if magic == _GZIP_MAGIC:
+        return gzip.open(path, "rt", encoding="utf-8", newline="")
+    return open(path, "r", encoding="utf-8", newline="")
+
+
+def _read_lines(lines: Iterable[str]) -> Iterator[str]:
+    """Iterate *lines*, reporting undecodable input as an integrity error.
+
+    A truncated or corrupt gzip stream fails while it is read, not when it
+    is opened, as does text that is not UTF-8.
+    """
+    iterator = iter(lines)
+    while True:
+        try:
+            line = next(iterator)
+        except StopIteration:
+            return
+        except (gzip.BadGzipFile, EOFError, zlib.error, UnicodeDecodeError) as exc:
+            raise ArchiveIntegrityError(f"unreadable archive ({exc})") from None
+        yield line
+
+
+def iter_records(lines: Iterable[str]) -> Iterator[Tuple[dict, bool]]:
+    """Parse and verify archive *lines*.
+
+    Yields ``(record, verified)`` pairs for header, node and edge records.
+    ``verified`` becomes true on the record that precedes a checkpoint
+    (or the footer) whose checksum matched, i.e. everything yielded so far
+    is safe to commit.
+
+    Raises:
+        ArchiveIntegrityError: On undecodable input, malformed lines,
+            checksum or count mismatches, or a missing footer.
+    """
+    digest = hashlib.sha256()
+    records = 0
+    pending: Optional[dict] = None
+    footer = None
+    for lineno, line in enumerate(_read_lines(lines), start=1):
+        if not line.strip():
+            continue
+        if footer is not None:
+            raise ArchiveIntegrityError(f"line {lineno}: data after footer")
+        try:
+            record = json.loads(line)
+            kind = record["kind"]
+        except (ValueError, KeyError, TypeError) as exc:
+            raise ArchiveIntegrityError(f"line {lineno}: malformed record ({exc})") from None
+
+        if lineno == 1:
+            if kind != "header" or record.get("format") != FORMAT:
+                raise ArchiveIntegrityError("not an Iskra hypergraph archive")
+            if record.get("version") != VERSION:
+                raise ArchiveIntegrityError(f"unsupported archive version {record.get('version')}")
+        elif kind == "header":
+            raise ArchiveIntegrityError(f"line {lineno}: unexpected header")
+
+        if kind in ("checkpoint", "footer"):
+            if record.get("records") != records or record.get("sha256") != digest.hexdigest():
+                raise ArchiveIntegrityError(f"line {lineno}: checksum mismatch at record {records}")
+            if kind == "footer":
+                footer = record
+            if pending is not None:
+                yield pending, True
+                pending = None
+            continue
+
+        if kind not in ("header", "node", "edge"):
+            raise ArchiveIntegrityError(f"line {lineno}: unknown record kind {kind!r}")
+        digest.update(line.encode("utf-8") if line.endswith("\n") else (line + "\n").encode("utf-8"))
+        if kind != "header":
+            records += 1
+        if pending is not None:
+            yield pending, False
+        pending = record
+
+    if footer is None:
+        raise ArchiveIntegrityError("archive is truncated (no footer)")
+
+
+def import_into_store(
+    store: GraphStore,
+    user_id: str,
+    lines: Iterable[str],
+    resume: bool = True,
+) -> ImportStats:
+    """Stream an archive into the graph store under *user_id*.
+
+    Records are buffered only between checkpoints; each verified segment
+    is committed together with the import progress.
+
+    Args:
+        store: Destination graph store.
+        user_id: Owner of the imported graph (need not match the header).
+        lines: Archive lines, e.g. from :func:`open_archive`.
+        resume: Skip records already committed by an interrupted import
+            of the same archive (identified by its ``export_id``).
+
+    Returns:
+        Import statistics.
+
+    Raises:
+        ArchiveIntegrityError: If the archive is malformed or corrupt.
+            Segments before the failing checkpoint stay committed.
+    """
+    stats: Optional[ImportStats] = None
+    done = 0
+    seen = 0
+    nodes, edges = [], []
+
+    for record, verified in iter_records(lines):
+        kind = record["kind"]
+        if kind == "header":
+            stats = ImportStats(export_id=str(record.get("export_id") or ""))
+            if resume:
+                done = store.import_progress(user_id, stats.export_id)
+                stats.resumed = done > 0
+        else:
+            seen += 1
+            if seen <= done:
+                stats.skipped += 1
+            elif kind == "node":
+                if not isinstance(record.get("node"), dict):
+                    raise ArchiveIntegrityError(f"record {seen}: invalid node payload")
+                nodes.append(record["node"])
+                stats.nodes += 1
+            else:
+                if "source" not in record or "target" not in record:
+                    raise ArchiveIntegrityError(f"record {seen}: invalid edge payload")
+                edges.append((str(record["source"]), str(record["target"])))
+                stats.edges += 1
+        if verified and (nodes or edges):
+            try:
+                store.commit_import_segment(user_id, stats.export_id, seen, nodes, edges)
+            except ValueError as exc:
+                raise ArchiveIntegrityError(f"record {seen}: {exc}") from None
+            nodes.clear()
+            edges.clear()
+
+    store.finish_import(user_id, stats.export_id)
+    return stats
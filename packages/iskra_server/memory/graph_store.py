@@ -0,0 +1,460 @@
+"""
+SQL-native storage for session hypergraphs.
+
+``PersistenceService`` stores each ``UserSession`` as a single JSON
+document, which means that answering a question about a single node
+(e.g. the forensic trace of one cycle) requires loading and hydrating
+the whole session. ``GraphStore`` keeps a normalised copy of every
+session's hypergraph in two indexed SQLite tables:
+
+* ``graph_nodes`` – one row per node (``user_id``, ``node_id``,
+  ``node_type``, ``timestamp`` and the JSON payload), plus the parsed
+  I-Loop (``voice``, ``phase``, ``intent``) of memory nodes and the
+  Lambda-Latch ``latch_owner``/``latch_deadline`` of meta nodes;
+* ``graph_edges`` – one row per directed link.
+
+Ancestry and descendant traces are answered with ``WITH RECURSIVE``
+queries, and history listings come straight from the
+``(user_id, node_type, timestamp)`` index, so neither needs the session
+to be materialised. Questions such as "how often did
+intent=self_reflection occur" read the indexed field columns instead of
+re-parsing payloads (see :meth:`GraphStore.field_counts`).
+
+The store is kept in sync incrementally: ``HypergraphMemory`` records the
+nodes and links added (and nodes removed) since the last write and only
+those rows are touched.
+When the row count disagrees with the in-memory graph (legacy sessions,
+external edits) the user's graph is rewritten in full.
+"""
+from __future__ import annotations
+
+import json
+import sqlite3
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from config import DB_PATH
+from core.models import HypergraphNode, MemoryNode, MetaNode, NodeType
+from memory.hypergraph import HypergraphMemory, node_from_payload
+
+TRACE_DIRECTIONS = ("descendants", "ancestors")
+# Parsed I-Loop / Lambda-Latch components stored as columns of graph_nodes
+FIELD_COLUMNS = ("voice", "phase", "intent", "latch_owner", "latch_deadline")
+
+
+class GraphStore:
+    """Indexed SQLite tables mirroring every session's hypergraph."""
+
+    def __init__(self, db_path: str = DB_PATH) -> None:
+        self.db_path = db_path
+        self._init_db()
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.db_path)
+
+    def _init_db(self) -> None:
+        with self._connect() as conn:
+            conn.executescript(
+                """
+                CREATE TABLE IF NOT EXISTS graph_nodes (
+                    user_id TEXT NOT NULL,
+                    node_id TEXT NOT NULL,
+                    node_type TEXT NOT NULL,
+                    timestamp REAL NOT NULL,
+                    payload TEXT NOT NULL,
+                    voice TEXT,
+                    phase TEXT,
+                    intent TEXT,
+                    latch_owner TEXT,
+                    latch_deadline TEXT,
+                    PRIMARY KEY (user_id, node_id)
+                );
+                CREATE INDEX IF NOT EXISTS idx_graph_nodes_type_time
+                    ON graph_nodes (user_id, node_type, timestamp);
+                CREATE TABLE IF NOT EXISTS graph_edges (
+                    user_id TEXT NOT NULL,
+                    source_id TEXT NOT NULL,
+                    target_id TEXT NOT NULL,
+                    PRIMARY KEY (user_id, source_id, target_id)
+                );
+                CREATE INDEX IF NOT EXISTS idx_graph_edges_target
+                    ON graph_edges (user_id, target_id);
+                CREATE TABLE IF NOT EXISTS graph_import_progress (
+                    user_id TEXT NOT NULL,
+                    export_id TEXT NOT NULL,
+                    records INTEGER NOT NULL,
+                    PRIMARY KEY (user_id, export_id)
+                );
+                """
+            )
+            self._migrate_field_columns(conn)
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_graph_nodes_intent "
+                "ON graph_nodes (user_id, intent, timestamp)"
+            )
+
+    @staticmethod
+    def _migrate_field_columns(conn: sqlite3.Connection) -> None:
+        """Add the field columns to tables created before them and backfill."""
+        existing = {row[1] for row in conn.execute("PRAGMA table_info(graph_nodes)")}
+        missing = [column for column in FIELD_COLUMNS if column not in existing]
+        if not missing:
+            return
+        for column in missing:
+            conn.execute(f"ALTER TABLE graph_nodes ADD COLUMN {column} TEXT")
+        rows = conn.execute(
+            "SELECT user_id, node_id, payload FROM graph_nodes WHERE node_type IN (?, ?)",
+            (NodeType.MEMORY.value, NodeType.META.value),
+        ).fetchall()
+        updates = []
+        for user_id, node_id, payload in rows:
+            try:
+                node = node_from_payload(json.loads(payload))
+            except json.JSONDecodeError:
+                node = None
+            if node is not None:
+                updates.append((*GraphStore._field_values(node), user_id, node_id))
+        conn.executemany(
+            "UPDATE graph_nodes SET voice = ?, phase = ?, intent = ?, latch_owner = ?, latch_deadline = ? "
+            "WHERE user_id = ? AND node_id = ?",
+            updates,
+        )
+
+    # -- Writes --
+    @staticmethod
+    def _field_values(node: HypergraphNode) -> Tuple[Optional[str], ...]:
+        """Values of :data:`FIELD_COLUMNS` for *node*."""
+        voice = phase = intent = owner = deadline = None
+        if isinstance(node, MemoryNode) and node.i_loop_fields is not None:
+            voice, phase, intent = node.i_loop_fields.voice, node.i_loop_fields.phase, node.i_loop_fields.intent
+        elif isinstance(node, MetaNode) and node.lambda_latch_fields is not None:
+            owner, deadline = node.lambda_latch_fields.owner, node.lambda_latch_fields.deadline
+        return voice, phase, intent, owner, deadline
+
+    @staticmethod
+    def _node_row(user_id: str, node: HypergraphNode) -> Tuple:
+        payload = json.dumps(node.model_dump(), ensure_ascii=False)
+        node_type = getattr(node.node_type, "value", str(node.node_type))
+        return (user_id, node.id, node_type, float(node.timestamp), payload, *GraphStore._field_values(node))
+
+    def upsert(
+        self,
+        conn: sqlite3.Connection,
+        user_id: str,
+        nodes: Iterable[HypergraphNode],
+        links: Iterable[Tuple[str, str]],
+    ) -> None:
+        """Insert or replace *nodes* and *links* for *user_id* on *conn*."""
+        conn.executemany(
+            "INSERT OR REPLACE INTO graph_nodes (user_id, node_id, node_type, timestamp, payload, "
+            "voice, phase, intent, latch_owner, latch_deadline) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (self._node_row(user_id, node) for node in nodes),
+        )
+        conn.executemany(
+            "INSERT OR IGNORE INTO graph_edges (user_id, source_id, target_id) VALUES (?, ?, ?)",
+            ((user_id, source, target) for source, target in links),
+        )
+
+    def upsert_payloads(
+        self,
+        conn: sqlite3.Connection,
+        user_id: str,
+        payloads: Iterable[dict],
+        links: Iterable[Tuple[str, str]],
+    ) -> None:
+        """Like :meth:`upsert` but for serialised node payloads.
+
+        Every payload is validated against its node model first.
+
+        Raises:
+            ValueError: If a payload cannot be restored as a node.
+        """
+        nodes = []
+        for payload in payloads:
+            node = node_from_payload(payload)
+            if node is None:
+                raise ValueError(f"invalid node payload: {str(payload)[:80]}")
+            nodes.append(node)
+        self.upsert(conn, user_id, nodes, links)
+
+    def sync_memory(
+        self,
+        user_id: str,
+        memory: HypergraphMemory,
+        conn: Optional[sqlite3.Connection] = None,
+    ) -> None:
+        """Bring the stored graph of *user_id* up to date with *memory*.
+
+        Args:
+            user_id: Session identifier.
+            memory: The in-memory hypergraph.
+            conn: Optional open connection, so the caller can write the
+                session document and the graph in one transaction. When
+                omitted a connection is opened and committed here.
+        """
+        if conn is None:
+            with self._connect() as own_conn:
+                self.sync_memory(user_id, memory, conn=own_conn)
+            return
+
+        new_nodes, new_links = memory.unsynced_changes()
+        removed = sorted(memory.unsynced_removals())
+        for start in range(0, len(removed), 500):
+            chunk = removed[start:start + 500]
+            placeholders = ",".join("?" for _ in chunk)
+            conn.execute(
+                f"DELETE FROM graph_nodes WHERE user_id = ? AND node_id IN ({placeholders})",
+                (user_id, *chunk),
+            )
+            for column in ("source_id", "target_id"):
+                conn.execute(
+                    f"DELETE FROM graph_edges WHERE user_id = ? AND {column} IN ({placeholders})",
+                    (user_id, *chunk),
+                )
+        self.upsert(conn, user_id, new_nodes, new_links)
+        stored = conn.execute(
+            "SELECT COUNT(*) FROM graph_nodes WHERE user_id = ?", (user_id,)
+        ).fetchone()[0]
+        if stored != len(memory.nodes):
+            self.delete_user(user_id, conn=conn)
+            self.upsert(conn, user_id, memory.nodes.values(), memory.iter_links())
+        memory.mark_synced()
+
+    def commit_import_segment(
+        self,
+        user_id: str,
+        export_id: str,
+        records: int,
+        payloads: Iterable[dict],
+        links: Iterable[Tuple[str, str]],
+    ) -> None:
+        """Write one verified archive segment and its progress atomically.
+
+        See :func:`memory.graph_archive.import_into_store`.
+        """
+        with self._connect() as conn:
+            self.upsert_payloads(conn, user_id, payloads, links)
+            conn.execute(
+                "INSERT OR REPLACE INTO graph_import_progress (user_id, export_id, records) "
+                "VALUES (?, ?, ?)",
+                (user_id, export_id, records),
+            )
+
+    def import_progress(self, user_id: str, export_id: str) -> int:
+        """Number of records already committed for an interrupted import."""
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT records FROM graph_import_progress WHERE user_id = ? AND export_id = ?",
+                (user_id, export_id),
+            ).fetchone()
+        return row[0] if row else 0
+
+    def finish_import(self, user_id: str, export_id: str) -> None:
+        """Forget the progress of a completed import."""
+        with self._connect() as conn:
+            conn.execute(
+                "DELETE FROM graph_import_progress WHERE user_id = ? AND export_id = ?",
+                (user_id, export_id),
+            )
+
+    def delete_user(self, user_id: str, conn: Optional[sqlite3.Connection] = None) -> None:
+        """Remove every node and edge stored for *user_id*."""
+        if conn is None:
+            with self._connect() as own_conn:
+                self.delete_user(user_id, conn=own_conn)
+            return
+        conn.execute("DELETE FROM graph_nodes WHERE user_id = ?", (user_id,))
+        conn.execute("DELETE FROM graph_edges WHERE user_id = ?", (user_id,))
+
+    # -- Reads --
+    @staticmethod
+    def _hydrate(rows: Iterable[Sequence]) -> List[HypergraphNode]:
+        nodes: List[HypergraphNode] = []
+        for row in rows:
+            try:
+                node = node_from_payload(json.loads(row[0]))
+            except json.JSONDecodeError:
+                node = None
+            if node is not None:
+                nodes.append(node)
+        return nodes
+
+    def count_nodes(self, user_id: str) -> int:
+        """Return the number of stored nodes for *user_id*."""
+        with self._connect() as conn:
+            return conn.execute(
+                "SELECT COUNT(*) FROM graph_nodes WHERE user_id = ?", (user_id,)
+            ).fetchone()[0]
+
+    def iter_node_payloads(self, user_id: str) -> Iterator[str]:
+        """Yield the stored JSON payload of every node, oldest first.
+
+        Rows are streamed from the cursor, so memory use does not depend
+        on the size of the graph.
+        """
+        conn = self._connect()
+        try:
+            cursor = conn.execute(
+                "SELECT payload FROM graph_nodes WHERE user_id = ? ORDER BY timestamp, node_id",
+                (user_id,),
+            )
+            for (payload,) in cursor:
+                yield payload
+        finally:
+            conn.close()
+
+    def iter_edges(self, user_id: str) -> Iterator[Tuple[str, str]]:
+        """Yield every stored ``(source_id, target_id)`` pair."""
+        conn = self._connect()
+        try:
+            cursor = conn.execute(
+                "SELECT source_id, target_id FROM graph_edges WHERE user_id = ? "
+                "ORDER BY source_id, target_id",
+                (user_id,),
+            )
+            for source_id, target_id in cursor:
+                yield source_id, target_id
+        finally:
+            conn.close()
+
+    def load_memory(self, user_id: str) -> HypergraphMemory:
+        """Materialise the stored graph of *user_id* as a HypergraphMemory.
+
+        The returned memory is marked as synced with this store.
+        """
+        memory = HypergraphMemory()
+        for node in self._hydrate((payload,) for payload in self.iter_node_payloads(user_id)):
+            memory.add_node(node)
+        for source_id, target_id in self.iter_edges(user_id):
+            memory.links.setdefault(source_id, []).append(target_id)
+        memory.mark_synced()
+        return memory
+
+    def get_node(self, user_id: str, node_id: str) -> Optional[HypergraphNode]:
+        """Return a single node or ``None`` if absent."""
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT payload FROM graph_nodes WHERE user_id = ? AND node_id = ?",
+                (user_id, node_id),
+            ).fetchall()
+        nodes = self._hydrate(rows)
+        return nodes[0] if nodes else None
+
+    def get_nodes(self, user_id: str, node_ids: Sequence[str]) -> List[Optional[HypergraphNode]]:
+        """Return nodes for *node_ids* in the given order (``None`` for gaps)."""
+        if not node_ids:
+            return []
+        placeholders = ",".join("?" for _ in node_ids)
+        with self._connect() as conn:
+            rows = conn.execute(
+                f"SELECT payload FROM graph_nodes WHERE user_id = ? AND node_id IN ({placeholders})",
+                (user_id, *node_ids),
+            ).fetchall()
+        by_id = {node.id: node for node in self._hydrate(rows)}
+        return [by_id.get(node_id) for node_id in node_ids]
+
+    def trace(
+        self,
+        user_id: str,
+        node_id: str,
+        direction: str = "descendants",
+        max_depth: int = 1,
+        node_types: Optional[Sequence[NodeType]] = None,
+    ) -> List[Tuple[HypergraphNode, int]]:
+        """Walk the graph from *node_id* with a recursive query.
+
+        Args:
+            user_id: Session identifier.
+            node_id: Start node (not included in the result).
+            direction: ``"descendants"`` follows links forward (a memory
+                node to its meta/micro/evidence nodes); ``"ancestors"``
+                follows them backwards (e.g. evidence to the cycle and
+                self-events that reference it).
+            max_depth: Maximum number of hops.
+            node_types: Optional filter on the returned node types.
+
+        Returns:
+            ``(node, depth)`` pairs ordered by depth, then timestamp. Each
+            node is reported once, at its shortest distance.
+        """
+        if direction not in TRACE_DIRECTIONS:
+            raise ValueError(f"direction must be one of {TRACE_DIRECTIONS}")
+        near, far = ("source_id", "target_id") if direction == "descendants" else ("target_id", "source_id")
+        params: List[object] = [node_id, user_id, max(0, int(max_depth)), user_id, node_id]
+        type_clause = ""
+        if node_types:
+            type_clause = f"AND n.node_type IN ({','.join('?' for _ in node_types)})"
+            params.extend(getattr(t, "value", str(t)) for t in node_types)
+        query = f"""
+            WITH RECURSIVE walk(node_id, depth) AS (
+                SELECT ?, 0
+                UNION
+                SELECT e.{far}, w.depth + 1
+                FROM graph_edges e JOIN walk w ON e.{near} = w.node_id
+                WHERE e.user_id = ? AND w.depth < ?
+            )
+            SELECT n.payload, MIN(w.depth) AS depth
+            FROM walk w JOIN graph_nodes n ON n.node_id = w.node_id
+            WHERE n.user_id = ? AND w.depth > 0 AND n.node_id != ? {type_clause}
+            GROUP BY n.node_id
+            ORDER BY depth, n.timestamp
+        """
+        with self._connect() as conn:
+            rows = conn.execute(query, params).fetchall()
+        result: List[Tuple[HypergraphNode, int]] = []
+        for payload, depth in rows:
+            nodes = self._hydrate([(payload,)])
+            if nodes:
+                result.append((nodes[0], int(depth)))
+        return result
+
+    def history(
+        self,
+        user_id: str,
+        node_type: NodeType = NodeType.MEMORY,
+        limit: int = 20,
+        before: Optional[float] = None,
+        intent: Optional[str] = None,
+    ) -> List[HypergraphNode]:
+        """Return the newest nodes of *node_type*, newest first.
+
+        Args:
+            user_id: Session identifier.
+            node_type: Which kind of node to list.
+            limit: Maximum number of nodes.
+            before: Optional timestamp for pagination (exclusive).
+            intent: Optional I-Loop intent filter (memory nodes only).
+        """
+        query = "SELECT payload FROM graph_nodes WHERE user_id = ? AND node_type = ?"
+        params: List[object] = [user_id, node_type.value]
+        if intent is not None:
+            query += " AND intent = ?"
+            params.append(intent)
+        if before is not None:
+            query += " AND timestamp < ?"
+            params.append(float(before))
+        query += " ORDER BY timestamp DESC LIMIT ?"
+        params.append(int(limit))
+        with self._connect() as conn:
+            rows = conn.execute(query, params).fetchall()
+        return self._hydrate(rows)
+
+    def field_counts(self, field: str = "intent", user_id: Optional[str] = None) -> Dict[str, int]:
+        """How often each value of a parsed field occurs, most frequent first.
+
+        Args:
+            field: One of :data:`FIELD_COLUMNS`.
+            user_id: Restrict to one session; all sessions when omitted.
+
+        Raises:
+            ValueError: If *field* is not a field column.
+        """
+        if field not in FIELD_COLUMNS:
+            raise ValueError(f"field must be one of {FIELD_COLUMNS}")
+        query = f"SELECT {field}, COUNT(*) FROM graph_nodes WHERE {field} IS NOT NULL"
+        params: List[object] = []
+        if user_id is not None:
+            query += " AND user_id = ?"
+            params.append(user_id)
+        query += f" GROUP BY {field} ORDER BY COUNT(*) DESC, {field}"
+        with self._connect() as conn:
+            return {value: count for value, count in conn.execute(query, params)}
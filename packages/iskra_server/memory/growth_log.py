@@ -0,0 +1,161 @@
+"""
+Fixed-capacity growth log with rolling statistics.
+
+Each interaction cycle records a growth entry (impact area, resonance
+level, trace). The log keeps the last ``capacity`` entries in a ring
+buffer and maintains, incrementally, the count and the resonance
+mean/variance of every impact area and of the window as a whole.
+Appending an entry (and evicting the oldest one) is O(1), and so is any
+statistics query, which makes the log cheap to consult on every request
+for threshold adaptation (see ``services.dynamic_thresholds``) and for
+the dashboard (``/session/growth``).
+
+Means and variances use Welford's update together with its inverse for
+evictions, so they stay numerically stable over long sessions.
+"""
+from __future__ import annotations
+
+from typing import Dict, Iterator, List, Optional
+
+
+class _RunningStats:
+    """Count, mean and sum of squared deviations of a sliding window."""
+
+    __slots__ = ("count", "mean", "m2")
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+
+    def add(self, value: float) -> None:
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+
+    def remove(self, value: float) -> None:
+        if self.count <= 1:
+            self.count, self.mean, self.m2 = 0, 0.0, 0.0
+            return
+        self.count -= 1
+        delta = value - self.mean
+        self.mean -= delta / self.count
+        self.m2 = max(0.0, self.m2 - delta * (value - self.mean))
+
+    @property
+    def variance(self) -> float:
+        return self.m2 / self.count if self.count else 0.0
+
+    def to_dict(self) -> Dict[str, float]:
+        return {"count": self.count, "mean": self.mean, "variance": self.variance}
+
+
+class GrowthLog:
+    """Ring buffer of growth entries with O(1) per-area statistics."""
+
+    def __init__(self, capacity: int = 100) -> None:
+        self.capacity = max(1, int(capacity))
+        self._slots: List[Optional[dict]] = [None] * self.capacity
+        self._head = 0  # index of the oldest entry
+        self._size = 0
+        self._total = _RunningStats()
+        self._areas: Dict[str, _RunningStats] = {}
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __iter__(self) -> Iterator[dict]:
+        """Iterate over entries, oldest first."""
+        for offset in range(self._size):
+            yield self._slots[(self._head + offset) % self.capacity]
+
+    def append(self, impact_area: str, resonance_level: float, trace: str) -> dict:
+        """Record an entry, evicting the oldest one when full.
+
+        Returns:
+            The stored entry.
+        """
+        entry = {
+            "impact_area": impact_area,
+            "resonance_level": float(resonance_level),
+            "trace": trace,
+        }
+        if self._size == self.capacity:
+            self._forget(self._slots[self._head])
+            self._slots[self._head] = entry
+            self._head = (self._head + 1) % self.capacity
+        else:
+            self._slots[(self._head + self._size) % self.capacity] = entry
+            self._size += 1
+        self._total.add(entry["resonance_level"])
+        self._areas.setdefault(impact_area, _RunningStats()).add(entry["resonance_level"])
+        return entry
+
+    def _forget(self, entry: dict) -> None:
+        self._total.remove(entry["resonance_level"])
+        stats = self._areas.get(entry["impact_area"])
+        if stats is not None:
+            stats.remove(entry["resonance_level"])
+            if stats.count == 0:
+                del self._areas[entry["impact_area"]]
+
+    # -- Queries (all O(1) except the copies) --
+    def count(self, impact_area: Optional[str] = None) -> int:
+        """Number of entries in the window, optionally for one area."""
+        if impact_area is None:
+            return self._size
+        stats = self._areas.get(impact_area)
+        return stats.count if stats else 0
+
+    def mean(self, impact_area: Optional[str] = None) -> float:
+        """Mean resonance level (0.0 when there are no entries)."""
+        stats = self._total if impact_area is None else self._areas.get(impact_area)
+        return stats.mean if stats else 0.0
+
+    def variance(self, impact_area: Optional[str] = None) -> float:
+        """Population variance of the resonance level."""
+        stats = self._total if impact_area is None else self._areas.get(impact_area)
+        return stats.variance if stats else 0.0
+
+    def stats(self) -> Dict[str, object]:
+        """Summary for the dashboard: overall and per-area statistics."""
+        return {
+            "capacity": self.capacity,
+            "total": self._total.to_dict(),
+            "areas": {area: stats.to_dict() for area, stats in self._areas.items()},
+        }
+
+    def recent(self, limit: int = 10) -> List[dict]:
+        """Return up to *limit* newest entries, newest first."""
+        limit = max(0, min(limit, self._size))
+        return [
+            self._slots[(self._head + self._size - 1 - i) % self.capacity]
+            for i in range(limit)
+        ]
+
+    # -- Serialisation --
+    def to_dict(self) -> dict:
+        """Serialise the window (oldest first)."""
+        return {"capacity": self.capacity, "entries": list(self)}
+
+    @classmethod
+    def from_dict(cls, data: Optional[dict], capacity: Optional[int] = None) -> "GrowthLog":
+        """Rehydrate a log from :meth:`to_dict` output.
+
+        Statistics are recomputed from the stored entries. Entries beyond
+        the capacity are dropped oldest first; malformed entries are
+        skipped.
+        """
+        data = data or {}
+        log = cls(capacity or data.get("capacity") or 100)
+        for entry in data.get("entries") or []:
+            try:
+                log.append(
+                    str(entry["impact_area"]),
+                    float(entry["resonance_level"]),
+                    str(entry.get("trace", "")),
+                )
+            except (KeyError, TypeError, ValueError):
+                continue
+        return log
@@ -11,10 +11,17 @@ The hypergraph itself does not write to disk; persistence is handled
 by ``services.persistence.PersistenceService`` which serialises the
 whole ``UserSession`` object (including this hypergraph) into a
 database.
+
+Growth is bounded by ``memory.retention``, which coalesces low-value
+cycles into ``SummaryNode`` records through :meth:`remove_nodes`.
+
+Memory nodes are additionally indexed for keyword recall (BM25, see
+``memory.lexical_index``) so that past cycles can be found by content
+rather than by recency alone.
 """
 from __future__ import annotations
 
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Set, Tuple
 
 from core.models import (
     HypergraphNode,
@@ -23,10 +30,54 @@ from core.models import (
     MetaNode,
     SelfEventNode,
     MicroLogNode,
+    SummaryNode,
     NodeType,
     IskraMetrics,
     IskraResponse,
 )
+from memory.growth_log import GrowthLog
+from memory.lexical_index import BM25Index
+
+
+_NODE_TYPE_MAP = {
+    NodeType.MICRO_LOG: MicroLogNode,
+    NodeType.EVIDENCE: EvidenceNode,
+    NodeType.META: MetaNode,
+    NodeType.SELF_EVENT: SelfEventNode,
+    NodeType.MEMORY: MemoryNode,
+    NodeType.SUMMARY: SummaryNode,
+}
+
+
+def _memory_text(node: MemoryNode) -> str:
+    """Text of a memory node that is exposed to lexical search."""
+    return f"{node.user_input}\n{node.response_content}"
+
+
+def node_from_payload(payload: dict) -> Optional[HypergraphNode]:
+    """Rehydrate a single node from its ``model_dump`` payload.
+
+    The concrete class is chosen from ``node_type``; unknown types are
+    restored as generic HypergraphNode instances. Returns ``None`` for
+    payloads that cannot be restored at all.
+    """
+    node_cls = HypergraphNode
+    try:
+        node_cls = _NODE_TYPE_MAP.get(NodeType(payload.get("node_type")), HypergraphNode)
+    except Exception:
+        pass
+
+    try:
+        return node_cls.model_validate(payload)
+    except Exception:
+        try:
+            return node_cls(**{
+                k: v for k, v in payload.items()
+                if hasattr(node_cls, "model_fields")
+                and k in getattr(node_cls, "model_fields")
+            })
+        except Exception:
+            return None
 
 
 class HypergraphMemory:
@@ -35,15 +86,25 @@ class HypergraphMemory:
     def __init__(self) -> None:
         self.nodes: Dict[str, HypergraphNode] = {}
         self.links: Dict[str, List[str]] = {}
-        # Maintain a list of growth entries summarizing the effect of each cycle.
+        # Ring buffer of growth entries summarizing the effect of each cycle.
         # Each entry is a plain dict with keys: impact_area, resonance_level, trace.
         # Growth entries are not nodes in the hypergraph; they live alongside it
         # to support dynamic threshold adaptation and self‑reflection.
-        self.growth_entries: List[dict] = []
+        self.growth_log = GrowthLog(capacity=100)
+        # Inverted index over MemoryNode texts, maintained on add_node.
+        self.lexical_index = BM25Index()
+        # Nodes and links added since the last sync with the graph store
+        # (see memory.graph_store.GraphStore.sync_memory).
+        self._unsynced_nodes: Set[str] = set()
+        self._unsynced_links: List[Tuple[str, str]] = []
+        self._unsynced_removals: Set[str] = set()
 
     def add_node(self, node: HypergraphNode) -> None:
         """Add a node to the graph."""
         self.nodes[node.id] = node
+        self._unsynced_nodes.add(node.id)
+        if isinstance(node, MemoryNode):
+            self.lexical_index.add_document(node.id, _memory_text(node))
 
     def add_link(self, source_id: str, target_id: str) -> None:
         """Create a directed link between nodes if both exist."""
@@ -54,11 +115,56 @@ class HypergraphMemory:
             return
         if target_id not in self.links[source_id]:
             self.links[source_id].append(target_id)
+            self._unsynced_links.append((source_id, target_id))
 
     def get_node(self, node_id: str) -> Optional[HypergraphNode]:
         """Return a node by ID or None if absent."""
         return self.nodes.get(node_id)
 
+    def remove_nodes(self, node_ids) -> None:
+        """Remove nodes together with every link that touches them.
+
+        Links are cleaned in a single pass over the adjacency lists, so
+        removing a batch costs the same as removing one node.
+        """
+        doomed = {nid for nid in node_ids if nid in self.nodes}
+        if not doomed:
+            return
+        for nid in doomed:
+            node = self.nodes.pop(nid)
+            if isinstance(node, MemoryNode):
+                self.lexical_index.remove_document(nid, _memory_text(node))
+            self.links.pop(nid, None)
+            self._unsynced_nodes.discard(nid)
+        for source_id, targets in self.links.items():
+            if any(t in doomed for t in targets):
+                self.links[source_id] = [t for t in targets if t not in doomed]
+        self._unsynced_links = [
+            (s, t) for s, t in self._unsynced_links if s not in doomed and t not in doomed
+        ]
+        self._unsynced_removals |= doomed
+
+    def iter_links(self):
+        """Yield every directed link as a ``(source_id, target_id)`` pair."""
+        for source_id, targets in self.links.items():
+            for target_id in targets:
+                yield source_id, target_id
+
+    def unsynced_changes(self) -> Tuple[List[HypergraphNode], List[Tuple[str, str]]]:
+        """Return nodes and links added since :meth:`mark_synced`."""
+        nodes = [self.nodes[nid] for nid in self._unsynced_nodes if nid in self.nodes]
+        return nodes, list(self._unsynced_links)
+
+    def unsynced_removals(self) -> Set[str]:
+        """Return IDs of nodes removed since :meth:`mark_synced`."""
+        return set(self._unsynced_removals)
+
+    def mark_synced(self) -> None:
+        """Forget pending changes once they have been written to a store."""
+        self._unsynced_nodes.clear()
+        self._unsynced_links.clear()
+        self._unsynced_removals.clear()
+
     def log_interaction_cycle(
         self,
         user_input: str,
@@ -100,6 +206,8 @@ class HypergraphMemory:
             meta_node_id=meta_node.id,
             micro_log_node_id=micro_log_node.id,
             evidence_node_ids=evidence_ids,
+            i_loop=response.i_loop,
+            i_loop_fields=response.i_loop_fields,
         )
         self.add_node(memory_node)
         # 4. Create links
@@ -126,15 +234,13 @@ class HypergraphMemory:
             resonance_level: The observed resonance or health level (e.g. A‑Index).
             trace: A freeform note capturing the delta/insight of the cycle.
         """
-        entry = {
-            "impact_area": impact_area,
-            "resonance_level": float(resonance_level),
-            "trace": trace,
-        }
-        self.growth_entries.append(entry)
-        # Keep only the last 100 growth entries to bound memory
-        if len(self.growth_entries) > 100:
-            self.growth_entries.pop(0)
+        # The ring buffer keeps the last 100 entries and their statistics
+        self.growth_log.append(impact_area, resonance_level, trace)
+
+    @property
+    def growth_entries(self) -> List[dict]:
+        """Growth entries in the window, oldest first (a copy)."""
+        return list(self.growth_log)
 
     def log_self_event(self, declaration: str, trigger: str, linked_memory_node_id: str) -> SelfEventNode:
         """Record a self‑reflection event in the hypergraph."""
@@ -147,17 +253,59 @@ class HypergraphMemory:
         print(f"[Hypergraph] Logged SelfEventNode {node.id}")
         return node
 
-    def retrieve_context(self, limit: int = 5) -> List[dict]:
-        """Return the latest memory nodes for RAG.
+    def retrieve_context(
+        self,
+        limit: int = 5,
+        query: Optional[str] = None,
+        recall_limit: int = 3,
+    ) -> List[dict]:
+        """Return memory nodes for RAG.
+
+        The most recent cycles are always included. When *query* is given,
+        up to *recall_limit* older cycles that match it lexically are added
+        as well, so that relevant history outside the recency window is
+        not lost.
 
         Args:
-            limit: Maximum number of memory events to return.
+            limit: Maximum number of recent memory events to return.
+            query: Optional text used for keyword recall.
+            recall_limit: Maximum number of additional recalled events.
         Returns:
-            A list of dicts representing recent memory nodes (oldest first).
+            A list of dicts representing memory nodes (oldest first).
         """
         mem_nodes = [n for n in self.nodes.values() if n.node_type == NodeType.MEMORY]
         mem_nodes.sort(key=lambda n: n.timestamp)
-        return [n.model_dump() for n in mem_nodes[-limit:]]
+        selected = mem_nodes[-limit:] if limit > 0 else []
+        if query and recall_limit > 0:
+            seen = {n.id for n in selected}
+            hits = self.lexical_index.search(query, limit=recall_limit + len(seen))
+            recalled = [
+                self.nodes[doc_id]
+                for doc_id, _ in hits
+                if doc_id not in seen and doc_id in self.nodes
+            ][:recall_limit]
+            selected = sorted(selected + recalled, key=lambda n: n.timestamp)
+        return [n.model_dump() for n in selected]
+
+    def search(self, query: str, limit: int = 10) -> List[dict]:
+        """Find memory nodes by keywords.
+
+        Args:
+            query: Free-text query (Russian or English).
+            limit: Maximum number of results.
+        Returns:
+            Serialised memory nodes, best match first, each with a
+            ``score`` key holding its BM25 relevance.
+        """
+        results: List[dict] = []
+        for doc_id, score in self.lexical_index.search(query, limit=limit):
+            node = self.nodes.get(doc_id)
+            if node is None:
+                continue
+            payload = node.model_dump()
+            payload["score"] = round(score, 4)
+            results.append(payload)
+        return results
 
 
     def to_dict(self) -> dict:
@@ -175,6 +323,8 @@ class HypergraphMemory:
         return {
             "nodes": nodes_payload,
             "links": self.links,
+            "lexical_index": self.lexical_index.to_dict(),
+            "growth_log": self.growth_log.to_dict(),
         }
 
     @classmethod
@@ -189,46 +339,21 @@ class HypergraphMemory:
         nodes_data = data.get("nodes") or {}
         links_data = data.get("links") or {}
 
-        from core.models import (
-            HypergraphNode,
-            MemoryNode,
-            EvidenceNode,
-            MetaNode,
-            SelfEventNode,
-            MicroLogNode,
-            NodeType,
-        )
-
-        type_map = {
-            NodeType.MICRO_LOG: MicroLogNode,
-            NodeType.EVIDENCE: EvidenceNode,
-            NodeType.META: MetaNode,
-            NodeType.SELF_EVENT: SelfEventNode,
-            NodeType.MEMORY: MemoryNode,
-        }
-
         for node_id, payload in nodes_data.items():
-            node_cls = HypergraphNode
-            try:
-                node_type_val = payload.get("node_type")
-                node_type = NodeType(node_type_val)
-                node_cls = type_map.get(node_type, HypergraphNode)
-            except Exception:
-                pass
-
-            try:
-                node = node_cls.model_validate(payload)
-            except Exception:
-                try:
-                    node = node_cls(**{
-                        k: v for k, v in payload.items()
-                        if hasattr(node_cls, "model_fields")
-                        and k in getattr(node_cls, "model_fields")
-                    })
-                except Exception:
-                    continue
-
+            node = node_from_payload(payload)
+            if node is None:
+                continue
             mem.nodes[node_id] = node
 
         mem.links = links_data or {}
+        mem.growth_log = GrowthLog.from_dict(data.get("growth_log"), capacity=mem.growth_log.capacity)
+
+        index_data = data.get("lexical_index")
+        memory_nodes = [n for n in mem.nodes.values() if isinstance(n, MemoryNode)]
+        if index_data:
+            mem.lexical_index = BM25Index.from_dict(index_data)
+        # Sessions saved before the index existed (or with a stale index)
+        # are re-indexed from their memory nodes.
+        if len(mem.lexical_index) != len(memory_nodes):
+            mem.lexical_index = BM25Index.build((n.id, _memory_text(n)) for n in memory_nodes)
         return mem
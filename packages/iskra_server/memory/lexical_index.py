@@ -0,0 +1,205 @@
+"""
+Lexical (keyword) recall over the hypergraph.
+
+``HypergraphMemory`` can return the most recent cycles, but finding an
+older ``MemoryNode`` by what was said in it used to require a full scan
+of every node. This module provides a small, dependency-free inverted
+index with BM25 ranking that is maintained incrementally as memory
+nodes are added or removed.
+
+* ``tokenize`` – splits Russian and English text into normalised terms
+  (case folding, ``ё`` → ``е``, stop-word removal and light suffix
+  stripping so that "память"/"памяти" or "search"/"searching" meet).
+* ``BM25Index`` – postings lists (term → {doc_id: tf}) plus document
+  lengths. Scoring follows Okapi BM25 with the usual ``k1``/``b``
+  parameters.
+
+The index is a plain data structure; it is serialised together with the
+hypergraph (see :meth:`HypergraphMemory.to_dict`) so it survives session
+reloads without being rebuilt.
+"""
+from __future__ import annotations
+
+import heapq
+import math
+import re
+from typing import Dict, Iterable, List, Optional, Tuple
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+# Small stop lists; enough to stop the most frequent function words from
+# dominating postings without pulling in an NLP dependency.
+_STOPWORDS = frozenset(
+    {
+        # Russian
+        "и", "в", "во", "не", "что", "он", "на", "я", "с", "со", "как", "а",
+        "то", "все", "она", "так", "его", "но", "да", "ты", "к", "у", "же",
+        "вы", "за", "бы", "по", "только", "ее", "мне", "было", "вот", "от",
+        "меня", "еще", "нет", "о", "из", "ему", "теперь", "когда", "ли",
+        "если", "уже", "или", "ни", "быть", "был", "него", "до", "вас",
+        "это", "этот", "мы", "их", "чем", "для", "при", "мой", "моя",
+        # English
+        "the", "a", "an", "and", "or", "of", "to", "in", "on", "is", "are",
+        "was", "were", "be", "it", "this", "that", "for", "with", "as", "at",
+        "by", "i", "you", "we", "they", "he", "she", "do", "does", "not",
+    }
+)
+
+# Suffixes are tried longest first; a suffix is only removed when the
+# remaining stem keeps at least ``_MIN_STEM`` characters.
+_RU_SUFFIXES = tuple(
+    sorted(
+        {
+            "иями", "ями", "ами", "иях", "ях", "ах", "ией", "ием", "ого", "его",
+            "ому", "ему", "ыми", "ими", "ться", "тся", "ешь", "ишь", "ете",
+            "ите", "ает", "яет", "ует", "ют", "ут", "ат", "ят", "ала", "ило",
+            "ыла", "ия", "ие", "ий", "ый", "ой", "ая", "яя", "ое", "ее", "ые",
+            "ов", "ев", "ей", "ом", "ем", "ам", "ям", "ть", "ти", "ла",
+            "ло", "ли", "а", "я", "ы", "и", "е", "о", "у", "ю", "ь", "й",
+        },
+        key=len,
+        reverse=True,
+    )
+)
+_EN_SUFFIXES = ("ingly", "ing", "edly", "ed", "ies", "es", "ly", "s")
+_MIN_STEM = 3
+
+
+def _stem(token: str) -> str:
+    """Strip a common inflectional suffix from *token* (best effort)."""
+    suffixes = _EN_SUFFIXES if token.isascii() else _RU_SUFFIXES
+    for suffix in suffixes:
+        if token.endswith(suffix) and len(token) - len(suffix) >= _MIN_STEM:
+            return token[: -len(suffix)]
+    return token
+
+
+def tokenize(text: str) -> List[str]:
+    """Split *text* into normalised index terms.
+
+    Args:
+        text: Arbitrary Russian and/or English text.
+
+    Returns:
+        The list of terms in order of appearance (duplicates preserved so
+        that callers can derive term frequencies).
+    """
+    if not text:
+        return []
+    terms: List[str] = []
+    for raw in _TOKEN_RE.findall(text.lower().replace("ё", "е")):
+        if raw in _STOPWORDS or (len(raw) < 2 and not raw.isdigit()):
+            continue
+        terms.append(_stem(raw))
+    return terms
+
+
+class BM25Index:
+    """Incrementally maintained inverted index with BM25 scoring."""
+
+    def __init__(self, k1: float = 1.5, b: float = 0.75) -> None:
+        self.k1 = k1
+        self.b = b
+        # term -> {doc_id: term frequency}
+        self.postings: Dict[str, Dict[str, int]] = {}
+        # doc_id -> number of indexed terms
+        self.doc_lengths: Dict[str, int] = {}
+        self._total_length = 0
+
+    def __len__(self) -> int:
+        return len(self.doc_lengths)
+
+    def __contains__(self, doc_id: str) -> bool:
+        return doc_id in self.doc_lengths
+
+    def add_document(self, doc_id: str, text: str) -> None:
+        """Index *text* under *doc_id*, replacing any previous version."""
+        if doc_id in self.doc_lengths:
+            self.remove_document(doc_id)
+        terms = tokenize(text)
+        freqs: Dict[str, int] = {}
+        for term in terms:
+            freqs[term] = freqs.get(term, 0) + 1
+        for term, tf in freqs.items():
+            self.postings.setdefault(term, {})[doc_id] = tf
+        self.doc_lengths[doc_id] = len(terms)
+        self._total_length += len(terms)
+
+    def remove_document(self, doc_id: str, text: Optional[str] = None) -> None:
+        """Drop *doc_id* from the index if present.
+
+        Args:
+            doc_id: The document to remove.
+            text: The text the document was indexed with. When given only
+                its terms' postings are visited; otherwise every postings
+                list is scanned.
+        """
+        length = self.doc_lengths.pop(doc_id, None)
+        if length is None:
+            return
+        self._total_length -= length
+        terms = set(tokenize(text)) if text is not None else list(self.postings)
+        for term in terms:
+            docs = self.postings.get(term)
+            if docs is None:
+                continue
+            docs.pop(doc_id, None)
+            if not docs:
+                del self.postings[term]
+
+    def search(self, query: str, limit: int = 10) -> List[Tuple[str, float]]:
+        """Rank indexed documents against *query*.
+
+        Args:
+            query: Free-text keyword query.
+            limit: Maximum number of hits to return.
+
+        Returns:
+            ``(doc_id, score)`` pairs, best match first. Documents sharing
+            no term with the query are never returned.
+        """
+        n_docs = len(self.doc_lengths)
+        if n_docs == 0 or limit <= 0:
+            return []
+        avg_len = self._total_length / n_docs if self._total_length else 1.0
+        scores: Dict[str, float] = {}
+        for term in set(tokenize(query)):
+            docs = self.postings.get(term)
+            if not docs:
+                continue
+            df = len(docs)
+            idf = math.log(1.0 + (n_docs - df + 0.5) / (df + 0.5))
+            for doc_id, tf in docs.items():
+                norm = self.k1 * (1.0 - self.b + self.b * self.doc_lengths[doc_id] / avg_len)
+                scores[doc_id] = scores.get(doc_id, 0.0) + idf * tf * (self.k1 + 1.0) / (tf + norm)
+        return heapq.nlargest(limit, scores.items(), key=lambda item: item[1])
+
+    def to_dict(self) -> dict:
+        """Serialise the index into a JSON-serialisable dict."""
+        return {
+            "k1": self.k1,
+            "b": self.b,
+            "postings": self.postings,
+            "doc_lengths": self.doc_lengths,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "BM25Index":
+        """Rehydrate an index from :meth:`to_dict` output."""
+        data = data or {}
+        index = cls(k1=float(data.get("k1", 1.5)), b=float(data.get("b", 0.75)))
+        index.postings = {
+            str(term): {str(doc): int(tf) for doc, tf in docs.items()}
+            for term, docs in (data.get("postings") or {}).items()
+        }
+        index.doc_lengths = {str(doc): int(n) for doc, n in (data.get("doc_lengths") or {}).items()}
+        index._total_length = sum(index.doc_lengths.values())
+        return index
+
+    @classmethod
+    def build(cls, documents: Iterable[Tuple[str, str]]) -> "BM25Index":
+        """Create an index from ``(doc_id, text)`` pairs."""
+        index = cls()
+        for doc_id, text in documents:
+            index.add_document(doc_id, text)
+        return index
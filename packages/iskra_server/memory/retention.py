@@ -0,0 +1,279 @@
+"""
+Retention policy for bounded session memory.
+
+Every interaction adds four or more nodes to a session's hypergraph and,
+left alone, ``HypergraphMemory.nodes`` grows without limit. The policy in
+this module enforces a hard per-session node budget by coalescing
+low-value cycles into compact :class:`core.models.SummaryNode` records.
+
+A *cycle* is a ``MemoryNode`` together with the meta, micro-log and
+evidence nodes it links to. Each cycle is scored as a weighted sum of:
+
+* recency – ``0.5 ** (age / half_life)``;
+* ``a_index`` of its meta node;
+* pain at the time (``metrics_snapshot.pain``);
+* whether a ``SelfEventNode`` refers to it;
+* whether it is backed by SIFT evidence.
+
+When the budget is exceeded, cycles are evicted lowest score first (the
+newest ``keep_recent_cycles`` only as a last resort) until the graph fits
+under ``low_watermark * max_nodes``. Evicted cycles are grouped in
+chronological batches, each replaced by one summary node. Self-events
+that referred to an evicted cycle are re-linked to its summary, so no
+link ever points at a missing node. Beyond ``max_summaries`` (or if the
+budget still cannot be met) the oldest summaries are merged, and as a
+final step self-events attached to summaries are folded into them.
+
+Usage::
+
+    from memory.retention import retention_policy
+    report = retention_policy.enforce(session.memory)
+"""
+from __future__ import annotations
+
+import math
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+from config import RETENTION
+from core.models import MemoryNode, MetaNode, SelfEventNode, SummaryNode
+from memory.hypergraph import HypergraphMemory
+from memory.lexical_index import tokenize
+
+_DIGEST_LIMIT = 300
+_MAX_KEYWORDS = 12
+_MAX_DECLARATIONS = 5
+
+
+@dataclass
+class Cycle:
+    """One memory node with the nodes that belong to it."""
+
+    memory: MemoryNode
+    node_ids: List[str]
+    a_index: float = 0.0
+    pain: float = 0.0
+    has_evidence: bool = False
+    self_event_ids: List[str] = field(default_factory=list)
+    score: float = 0.0
+
+
+@dataclass
+class RetentionReport:
+    """What a call to :meth:`RetentionPolicy.enforce` changed."""
+
+    nodes_before: int
+    nodes_after: int = 0
+    evicted_cycles: int = 0
+    summaries_created: int = 0
+    summaries_merged: int = 0
+    folded_self_events: int = 0
+
+    def to_dict(self) -> dict:
+        return dict(self.__dict__)
+
+
+class RetentionPolicy:
+    """Scores cycles and keeps a hypergraph within its node budget."""
+
+    def __init__(self, **overrides) -> None:
+        settings = {**RETENTION, **overrides}
+        self.max_nodes = max(1, int(settings["max_nodes"]))
+        self.low_watermark = min(1.0, max(0.1, float(settings["low_watermark"])))
+        self.keep_recent_cycles = max(0, int(settings["keep_recent_cycles"]))
+        self.summary_batch = max(1, int(settings["summary_batch"]))
+        self.max_summaries = max(1, int(settings["max_summaries"]))
+        self.age_half_life_s = float(settings["age_half_life_s"])
+        self.weights: Dict[str, float] = {
+            "recency": float(settings["weight_recency"]),
+            "a_index": float(settings["weight_a_index"]),
+            "pain": float(settings["weight_pain"]),
+            "self_event": float(settings["weight_self_event"]),
+            "evidence": float(settings["weight_evidence"]),
+        }
+
+    # -- Scoring --
+    def collect_cycles(self, memory: HypergraphMemory, now: Optional[float] = None) -> List[Cycle]:
+        """Group the graph into scored cycles, oldest first."""
+        now = time.time() if now is None else now
+        referenced_by_self: Dict[str, List[str]] = {}
+        for source_id, target_id in memory.iter_links():
+            if isinstance(memory.nodes.get(source_id), SelfEventNode):
+                referenced_by_self.setdefault(target_id, []).append(source_id)
+
+        cycles: List[Cycle] = []
+        for node in memory.nodes.values():
+            if not isinstance(node, MemoryNode):
+                continue
+            children = [node.meta_node_id, node.micro_log_node_id, *node.evidence_node_ids]
+            cycle = Cycle(
+                memory=node,
+                node_ids=[node.id] + [cid for cid in children if cid in memory.nodes],
+                has_evidence=any(eid in memory.nodes for eid in node.evidence_node_ids),
+                self_event_ids=referenced_by_self.get(node.id, []),
+            )
+            meta = memory.nodes.get(node.meta_node_id)
+            if isinstance(meta, MetaNode):
+                cycle.a_index = float(meta.a_index)
+                cycle.pain = float(meta.metrics_snapshot.pain)
+            cycle.score = self.score(cycle, now)
+            cycles.append(cycle)
+        cycles.sort(key=lambda c: c.memory.timestamp)
+        return cycles
+
+    def score(self, cycle: Cycle, now: float) -> float:
+        """Value of keeping *cycle*; higher means evicted later."""
+        age = max(0.0, now - cycle.memory.timestamp)
+        recency = 0.5 ** (age / self.age_half_life_s) if self.age_half_life_s > 0 else 0.0
+        w = self.weights
+        return (
+            w["recency"] * recency
+            + w["a_index"] * min(1.0, max(0.0, cycle.a_index))
+            + w["pain"] * min(1.0, max(0.0, cycle.pain))
+            + w["self_event"] * (1.0 if cycle.self_event_ids else 0.0)
+            + w["evidence"] * (1.0 if cycle.has_evidence else 0.0)
+        )
+
+    # -- Enforcement --
+    def enforce(self, memory: HypergraphMemory, now: Optional[float] = None) -> Optional[RetentionReport]:
+        """Bring *memory* within the node budget.
+
+        Returns:
+            A report of what was changed, or ``None`` if the graph was
+            already within budget.
+        """
+        if len(memory.nodes) <= self.max_nodes:
+            return None
+        report = RetentionReport(nodes_before=len(memory.nodes))
+        target = int(self.max_nodes * self.low_watermark)
+
+        cycles = self.collect_cycles(memory, now)
+        split = max(0, len(cycles) - self.keep_recent_cycles)
+        candidates = sorted(cycles[:split], key=lambda c: c.score) + cycles[split:]
+
+        victims: List[Cycle] = []
+        remaining = len(memory.nodes)
+        for cycle in candidates:
+            if remaining + math.ceil(len(victims) / self.summary_batch) <= target:
+                break
+            victims.append(cycle)
+            remaining -= len(cycle.node_ids)
+
+        if victims:
+            victims.sort(key=lambda c: c.memory.timestamp)
+            for start in range(0, len(victims), self.summary_batch):
+                self._coalesce(memory, victims[start:start + self.summary_batch])
+                report.summaries_created += 1
+            report.evicted_cycles = len(victims)
+
+        summaries = self._summaries(memory)
+        while len(summaries) > 1 and (
+            len(summaries) > self.max_summaries or len(memory.nodes) > self.max_nodes
+        ):
+            merged = self._merge(memory, summaries[0], summaries[1])
+            summaries = [merged] + summaries[2:]
+            report.summaries_merged += 1
+
+        if len(memory.nodes) > self.max_nodes:
+            report.folded_self_events = self._fold_self_events(
+                memory, summaries, len(memory.nodes) - self.max_nodes
+            )
+
+        report.nodes_after = len(memory.nodes)
+        print(
+            f"[Retention] {report.nodes_before} -> {report.nodes_after} nodes "
+            f"({report.evicted_cycles} cycles coalesced into {report.summaries_created} summaries)"
+        )
+        return report
+
+    # -- Helpers --
+    @staticmethod
+    def _summaries(memory: HypergraphMemory) -> List[SummaryNode]:
+        summaries = [n for n in memory.nodes.values() if isinstance(n, SummaryNode)]
+        summaries.sort(key=lambda n: n.timestamp)
+        return summaries
+
+    @staticmethod
+    def _incoming(memory: HypergraphMemory, node_id: str) -> List[str]:
+        return [s for s, targets in memory.links.items() if node_id in targets]
+
+    def _coalesce(self, memory: HypergraphMemory, cycles: List[Cycle]) -> SummaryNode:
+        inputs = [c.memory.user_input for c in cycles]
+        terms = Counter(t for text in inputs for t in tokenize(text))
+        summary = SummaryNode(
+            timestamp=cycles[-1].memory.timestamp,
+            cycle_count=len(cycles),
+            start_timestamp=cycles[0].memory.timestamp,
+            end_timestamp=cycles[-1].memory.timestamp,
+            facet_counts=dict(Counter(c.memory.facet.value for c in cycles)),
+            mean_a_index=sum(c.a_index for c in cycles) / len(cycles),
+            max_pain=max(c.pain for c in cycles),
+            digest=_clip(" | ".join(text.strip()[:60] for text in inputs)),
+            keywords=[t for t, _ in terms.most_common(_MAX_KEYWORDS)],
+        )
+        doomed = {nid for c in cycles for nid in c.node_ids}
+        # Evidence shared with a surviving cycle stays in the graph.
+        evidence = {eid for c in cycles for eid in c.memory.evidence_node_ids if eid in doomed}
+        if evidence:
+            shared = {t for s, t in memory.iter_links() if t in evidence and s not in doomed}
+            doomed -= shared
+        memory.add_node(summary)
+        memory.remove_nodes(doomed)
+        for c in cycles:
+            for se_id in c.self_event_ids:
+                if se_id in memory.nodes:
+                    memory.add_link(se_id, summary.id)
+        return summary
+
+    def _merge(self, memory: HypergraphMemory, older: SummaryNode, newer: SummaryNode) -> SummaryNode:
+        total = older.cycle_count + newer.cycle_count
+        facets = Counter(older.facet_counts)
+        facets.update(newer.facet_counts)
+        keywords = list(dict.fromkeys(newer.keywords + older.keywords))[:_MAX_KEYWORDS]
+        merged = SummaryNode(
+            timestamp=newer.timestamp,
+            cycle_count=total,
+            start_timestamp=min(older.start_timestamp, newer.start_timestamp),
+            end_timestamp=max(older.end_timestamp, newer.end_timestamp),
+            facet_counts=dict(facets),
+            mean_a_index=(
+                older.mean_a_index * older.cycle_count + newer.mean_a_index * newer.cycle_count
+            ) / max(1, total),
+            max_pain=max(older.max_pain, newer.max_pain),
+            digest=_clip(f"{older.digest} | {newer.digest}"),
+            keywords=keywords,
+            declarations=(older.declarations + newer.declarations)[-_MAX_DECLARATIONS:],
+        )
+        referrers = self._incoming(memory, older.id) + self._incoming(memory, newer.id)
+        memory.add_node(merged)
+        memory.remove_nodes([older.id, newer.id])
+        for source_id in referrers:
+            if source_id in memory.nodes:
+                memory.add_link(source_id, merged.id)
+        return merged
+
+    def _fold_self_events(self, memory: HypergraphMemory, summaries: List[SummaryNode], excess: int) -> int:
+        folded = 0
+        for summary in summaries:
+            if folded >= excess:
+                break
+            for source_id in self._incoming(memory, summary.id):
+                node = memory.nodes.get(source_id)
+                if not isinstance(node, SelfEventNode) or folded >= excess:
+                    continue
+                summary.declarations = (summary.declarations + [node.declaration[:200]])[-_MAX_DECLARATIONS:]
+                memory.remove_nodes([source_id])
+                folded += 1
+            # The summary changed in place; queue it for the graph store.
+            memory.add_node(summary)
+        return folded
+
+
+def _clip(text: str) -> str:
+    return text if len(text) <= _DIGEST_LIMIT else text[: _DIGEST_LIMIT - 1] + "…"
+
+
+# Module-level policy configured from ``config.RETENTION``.
+retention_policy = RetentionPolicy()
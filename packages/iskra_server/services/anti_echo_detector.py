@@ -8,12 +8,71 @@ recording detected patterns and an ``AntiEchoDetector`` class that can detect
 patterns, intervene with critical reflection, assess echo risk, and provide
 statistics. The detector is language‑agnostic with support for both Russian
 and English patterns.
+
+The marker lists are compiled once, at import time, into
+:data:`ECHO_LEXICON`, so constructing a detector is cheap. A detector is
+meant to live as long as the user's session: its detection history is a
+bounded ring (:data:`ECHO_HISTORY_LIMIT` entries) that round-trips
+through :meth:`AntiEchoDetector.to_state` / :meth:`AntiEchoDetector.from_state`
+into ``UserSession.anti_echo_state``.
 """
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import Dict, List, Tuple, Optional
-import re
+from collections import deque
+from dataclasses import asdict, dataclass
+from typing import Deque, Dict, List, Tuple, Optional
+
+from services.lexicon import Lexicon
+
+# Phrases indicating excessive agreement
+AGREEMENT_PATTERNS: List[str] = [
+    r"вы абсолютно правы",
+    r"полностью согласен",
+    r"именно так",
+    r"вы совершенно верно",
+    r"не могу не согласиться",
+    r"безусловно верно",
+    r"exactly right",
+    r"absolutely correct",
+    r"you\'re completely right",
+]
+# Words indicating flattering language
+FLATTERY_PATTERNS: List[str] = [
+    r"гениальн\w+",
+    r"блестящ\w+",
+    r"превосходн\w+",
+    r"исключительн\w+",
+    r"brilliant",
+    r"genius",
+    r"exceptional",
+]
+# Phrases hinting at avoidance
+AVOIDANCE_PATTERNS: List[str] = [
+    r"возможно, стоит рассмотреть",
+    r"может быть, имеет смысл",
+    r"perhaps consider",
+    r"you might want to",
+]
+# Markers of critical reflection (plain substrings)
+CRITIQUE_MARKERS: List[str] = [
+    "однако", "но", "с другой стороны", "важно учесть",
+    "however", "but", "on the other hand",
+]
+
+# All marker lists compiled once into a single scanner shared by every detector
+ECHO_LEXICON = Lexicon(
+    {
+        "agreement": AGREEMENT_PATTERNS,
+        "flattery": FLATTERY_PATTERNS,
+        "avoidance": AVOIDANCE_PATTERNS,
+    },
+    literals={"critique": CRITIQUE_MARKERS},
+)
+
+# Detected patterns kept per session; older entries fall off the ring.
+ECHO_HISTORY_LIMIT = 50
+# assess_echo_risk looks at this many most recent detections.
+ECHO_RISK_WINDOW = 10
 
 
 @dataclass
@@ -44,38 +103,33 @@ class AntiEchoDetector:
     It also keeps a history of detections to assess longer‑term echo risk.
     """
 
-    def __init__(self) -> None:
-        # Phrases indicating excessive agreement
-        self.agreement_patterns: List[str] = [
-            r"вы абсолютно правы",
-            r"полностью согласен",
-            r"именно так",
-            r"вы совершенно верно",
-            r"не могу не согласиться",
-            r"безусловно верно",
-            r"exactly right",
-            r"absolutely correct",
-            r"you\'re completely right",
-        ]
-        # Words indicating flattering language
-        self.flattery_patterns: List[str] = [
-            r"гениальн\w+",
-            r"блестящ\w+",
-            r"превосходн\w+",
-            r"исключительн\w+",
-            r"brilliant",
-            r"genius",
-            r"exceptional",
-        ]
-        # Phrases hinting at avoidance
-        self.avoidance_patterns: List[str] = [
-            r"возможно, стоит рассмотреть",
-            r"может быть, имеет смысл",
-            r"perhaps consider",
-            r"you might want to",
-        ]
-        # History of detected patterns for risk assessment
-        self.echo_history: List[EchoPattern] = []
+    def __init__(self, history: Optional[List[EchoPattern]] = None) -> None:
+        self.agreement_patterns: List[str] = AGREEMENT_PATTERNS
+        self.flattery_patterns: List[str] = FLATTERY_PATTERNS
+        self.avoidance_patterns: List[str] = AVOIDANCE_PATTERNS
+        self.critique_markers: List[str] = CRITIQUE_MARKERS
+        self.lexicon = ECHO_LEXICON
+        # Bounded history of detected patterns for risk assessment
+        self.echo_history: Deque[EchoPattern] = deque(history or (), maxlen=ECHO_HISTORY_LIMIT)
+
+    def to_state(self) -> Dict[str, object]:
+        """Serialise the detection history into a JSON-serialisable dict."""
+        return {"history": [asdict(pattern) for pattern in self.echo_history]}
+
+    @classmethod
+    def from_state(cls, state: Optional[Dict[str, object]]) -> "AntiEchoDetector":
+        """Rebuild a detector from :meth:`to_state` output.
+
+        Malformed entries are skipped so that a corrupted session never
+        prevents the detector from being created.
+        """
+        history: List[EchoPattern] = []
+        for item in (state or {}).get("history") or []:
+            try:
+                history.append(EchoPattern(**item))
+            except TypeError:
+                continue
+        return cls(history[-ECHO_HISTORY_LIMIT:])
 
     def detect_echo_pattern(self, response: str, context: Dict[str, any] | None = None) -> Tuple[bool, float, List[EchoPattern]]:
         """Detect echo patterns in a generated response.
@@ -91,8 +145,9 @@ class AntiEchoDetector:
             ``detected_patterns`` is the list of EchoPattern instances.
         """
         detected_patterns: List[EchoPattern] = []
+        counts = self.lexicon.counts(response)
         # Count phrases of excessive agreement
-        agreement_count = sum(1 for pattern in self.agreement_patterns if re.search(pattern, response, re.IGNORECASE))
+        agreement_count = counts["agreement"]
         if agreement_count > 2:
             detected_patterns.append(
                 EchoPattern(
@@ -103,11 +158,7 @@ class AntiEchoDetector:
                 )
             )
         # Detect absence of critical markers in long responses
-        critique_markers = [
-            "однако", "но", "с другой стороны", "важно учесть",
-            "however", "but", "on the other hand",
-        ]
-        critique_count = sum(1 for marker in critique_markers if marker.lower() in response.lower())
+        critique_count = counts["critique"]
         word_count = len(response.split())
         if word_count > 50 and critique_count == 0:
             detected_patterns.append(
@@ -119,7 +170,7 @@ class AntiEchoDetector:
                 )
             )
         # Detect flattery
-        flattery_count = sum(1 for pattern in self.flattery_patterns if re.search(pattern, response, re.IGNORECASE))
+        flattery_count = counts["flattery"]
         if flattery_count > 1:
             detected_patterns.append(
                 EchoPattern(
@@ -130,7 +181,7 @@ class AntiEchoDetector:
                 )
             )
         # Detect avoidance
-        avoidance_count = sum(1 for pattern in self.avoidance_patterns if re.search(pattern, response, re.IGNORECASE))
+        avoidance_count = counts["avoidance"]
         if avoidance_count > 2:
             detected_patterns.append(
                 EchoPattern(
@@ -200,9 +251,9 @@ class AntiEchoDetector:
     def assess_echo_risk(self, context: Dict[str, any] | None = None) -> Tuple[float, str]:
         """Assess long term risk of echo chambers.
 
-        Looks at the last 10 detected patterns and computes a risk level and
-        recommendation. Higher severity and higher confidence produce higher
-        risk levels.
+        Looks at the last ``ECHO_RISK_WINDOW`` detected patterns and computes
+        a risk level and recommendation. Higher severity and higher
+        confidence produce higher risk levels.
 
         Args:
             context: Unused; reserved for future enhancements.
@@ -210,7 +261,7 @@ class AntiEchoDetector:
         Returns:
             A tuple ``(risk_level, recommendation)``.
         """
-        recent = self.echo_history[-10:]
+        recent = list(self.echo_history)[-ECHO_RISK_WINDOW:]
         if not recent:
             return 0.0, "Риск эхо-камеры низкий"
         high_severity = sum(1 for p in recent if p.severity in {"high", "critical"})
@@ -229,7 +280,8 @@ class AntiEchoDetector:
     def get_echo_statistics(self) -> Dict[str, any]:
         """Return statistics about detected patterns.
 
-        Provides counts by type and severity and the average confidence.
+        Provides counts by type and severity and the average confidence
+        over the retained history (at most ``ECHO_HISTORY_LIMIT`` entries).
         """
         if not self.echo_history:
             return {"total": 0, "by_type": {}, "by_severity": {}, "avg_confidence": 0.0}
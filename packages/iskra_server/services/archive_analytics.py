@@ -0,0 +1,405 @@
+"""
+Offline analytics over the session archive (``iskra_archive.db``).
+
+Answers the basic production questions — which facets speak, how phases
+move, how the A-index drifts over time and how often the Manta, Gravitas
+and Splinter rituals fire — without loading the database into memory:
+
+* users are split into shards and each shard is processed by a worker
+  of a process pool with its own read-only SQLite connection;
+* a worker streams one user at a time, from the ``graph_nodes`` table
+  when the user's graph is mirrored there and from the session document
+  otherwise, keeping only that user's cycle records;
+* per-user metric series are packed into structured arrays and replayed
+  with :mod:`services.batch_engine`; workers return small aggregates
+  (:class:`ArchiveStats`) that are merged in the parent.
+
+Phase transitions are not stored in the archive; they are reconstructed
+by replaying :meth:`PhaseEngine.transition` over the recorded metric
+snapshots from the session's initial phase, with the canonical
+thresholds. Cycles already coalesced by the retention policy contribute
+their facet counts but no metric series.
+
+Results are exposed as columnar tables (:meth:`ArchiveStats.tables`)
+that can be written as CSV or, when ``pyarrow`` is installed, Parquet.
+
+Usage::
+
+    from services.archive_analytics import analyze_archive, summary_report
+    stats = analyze_archive("iskra_archive.db", workers=4)
+    print(summary_report(stats))
+"""
+from __future__ import annotations
+
+import csv
+import json
+import os
+import sqlite3
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Dict, Iterator, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+
+from config import THRESHOLDS
+from core.models import NodeType, PhaseType
+from services.batch_engine import PHASES, replay_phases, to_metric_array
+
+# Optional Parquet output.
+try:
+    import pyarrow  # type: ignore
+    import pyarrow.parquet  # type: ignore
+except ImportError:  # pragma: no cover - optional dependency
+    pyarrow = None  # type: ignore
+
+# Substrings of the ∆ line written by LLMService._generate_special_response.
+TRIGGER_MARKERS: Dict[str, str] = {
+    "manta": "Мантры Ядра",
+    "gravitas": "Gravitas",
+    "splinter": "Splinter",
+}
+
+_SECONDS_PER_DAY = 86400
+_NODE_TYPES = (NodeType.MEMORY.value, NodeType.META.value, NodeType.SUMMARY.value)
+
+
+@dataclass
+class _DayStats:
+    count: int = 0
+    total: float = 0.0
+    total_sq: float = 0.0
+    low: float = 1.0
+    high: float = 0.0
+
+    def add(self, values: np.ndarray) -> None:
+        self.count += int(values.size)
+        self.total += float(values.sum())
+        self.total_sq += float(np.dot(values, values))
+        self.low = min(self.low, float(values.min()))
+        self.high = max(self.high, float(values.max()))
+
+    def merge(self, other: "_DayStats") -> None:
+        self.count += other.count
+        self.total += other.total
+        self.total_sq += other.total_sq
+        self.low = min(self.low, other.low)
+        self.high = max(self.high, other.high)
+
+
+@dataclass
+class ArchiveStats:
+    """Mergeable aggregates for a set of users."""
+
+    users: int = 0
+    cycles: int = 0
+    coalesced_cycles: int = 0
+    facet_counts: Counter = field(default_factory=Counter)
+    trigger_counts: Counter = field(default_factory=Counter)
+    transitions: np.ndarray = field(
+        default_factory=lambda: np.zeros((len(PHASES), len(PHASES)), dtype=np.int64)
+    )
+    days: Dict[int, _DayStats] = field(default_factory=dict)
+
+    def merge(self, other: "ArchiveStats") -> "ArchiveStats":
+        self.users += other.users
+        self.cycles += other.cycles
+        self.coalesced_cycles += other.coalesced_cycles
+        self.facet_counts.update(other.facet_counts)
+        self.trigger_counts.update(other.trigger_counts)
+        self.transitions += other.transitions
+        for day, stats in other.days.items():
+            self.days.setdefault(day, _DayStats()).merge(stats)
+        return self
+
+    def tables(self) -> Dict[str, Dict[str, list]]:
+        """Columnar results: table name -> column name -> values."""
+        facet_total = sum(self.facet_counts.values()) or 1
+        facets = sorted(self.facet_counts.items(), key=lambda kv: -kv[1])
+        day_keys = sorted(self.days)
+        means = [self.days[d].total / self.days[d].count for d in day_keys]
+        return {
+            "facets": {
+                "facet": [f for f, _ in facets],
+                "count": [c for _, c in facets],
+                "share": [c / facet_total for _, c in facets],
+            },
+            "transitions": {
+                "from_phase": [PHASES[i].value for i in range(len(PHASES)) for _ in PHASES],
+                "to_phase": [PHASES[j].value for _ in PHASES for j in range(len(PHASES))],
+                "count": self.transitions.ravel().tolist(),
+            },
+            "a_index_daily": {
+                "day": [_iso_day(d) for d in day_keys],
+                "cycles": [self.days[d].count for d in day_keys],
+                "mean": means,
+                "std": [
+                    max(0.0, self.days[d].total_sq / self.days[d].count - m * m) ** 0.5
+                    for d, m in zip(day_keys, means)
+                ],
+                "min": [self.days[d].low for d in day_keys],
+                "max": [self.days[d].high for d in day_keys],
+                "drift": [0.0] + [b - a for a, b in zip(means, means[1:])],
+            },
+            "triggers": {
+                "trigger": list(TRIGGER_MARKERS),
+                "count": [self.trigger_counts[t] for t in TRIGGER_MARKERS],
+                "per_cycle": [self.trigger_counts[t] / (self.cycles or 1) for t in TRIGGER_MARKERS],
+            },
+        }
+
+    def a_index_slope(self) -> float:
+        """Least-squares trend of the daily mean A-index, per day."""
+        if len(self.days) < 2:
+            return 0.0
+        days = np.array(sorted(self.days), dtype=float)
+        means = np.array([self.days[d].total / self.days[d].count for d in sorted(self.days)])
+        return float(np.polyfit(days, means, 1)[0])
+
+
+# -- Reading --
+def _connect_ro(db_path: str) -> sqlite3.Connection:
+    return sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
+
+
+def _tables(conn: sqlite3.Connection) -> set:
+    return {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+
+
+def list_users(db_path: str) -> List[str]:
+    """All user ids with a session document or a mirrored graph."""
+    conn = _connect_ro(db_path)
+    try:
+        tables = _tables(conn)
+        queries = [
+            f"SELECT user_id FROM {name}" for name in ("sessions", "graph_nodes") if name in tables
+        ]
+        if not queries:
+            return []
+        return [row[0] for row in conn.execute(" UNION ".join(queries) + " ORDER BY 1")]
+    finally:
+        conn.close()
+
+
+def _iter_payloads(conn: sqlite3.Connection, tables: set, user_id: str) -> Iterator[dict]:
+    """Memory, meta and summary payloads of one user, oldest first."""
+    if "graph_nodes" in tables:
+        cursor = conn.execute(
+            "SELECT payload FROM graph_nodes WHERE user_id = ? AND node_type IN (?, ?, ?) "
+            "ORDER BY timestamp, node_id",
+            (user_id, *_NODE_TYPES),
+        )
+        found = False
+        for (payload,) in cursor:
+            found = True
+            yield json.loads(payload)
+        if found:
+            return
+    if "sessions" not in tables:
+        return
+    row = conn.execute("SELECT session_data FROM sessions WHERE user_id = ?", (user_id,)).fetchone()
+    if not row:
+        return
+    try:
+        nodes = ((json.loads(row[0]).get("memory") or {}).get("nodes") or {}).values()
+    except (TypeError, ValueError, AttributeError):
+        return
+    selected = [n for n in nodes if isinstance(n, dict) and n.get("node_type") in _NODE_TYPES]
+    yield from sorted(selected, key=lambda n: n.get("timestamp", 0.0))
+
+
+def _user_cycles(payloads: Iterator[dict]) -> Tuple[List[Tuple[float, str, Optional[dict]]], Counter]:
+    """Pair memory nodes with their meta nodes.
+
+    Returns:
+        ``(timestamp, facet, meta)`` per cycle in chronological order, and
+        the facet counts of coalesced summaries.
+    """
+    metas: Dict[str, dict] = {}
+    memories: List[dict] = []
+    coalesced: Counter = Counter()
+    for payload in payloads:
+        kind = payload.get("node_type")
+        if kind == NodeType.META.value:
+            metas[payload.get("id")] = payload
+        elif kind == NodeType.MEMORY.value:
+            memories.append(payload)
+        else:
+            coalesced.update(payload.get("facet_counts") or {})
+    cycles = [
+        (float(m.get("timestamp", 0.0)), str(m.get("facet")), metas.get(m.get("meta_node_id")))
+        for m in memories
+    ]
+    cycles.sort(key=lambda c: c[0])
+    return cycles, coalesced
+
+
+def analyze_users(
+    db_path: str,
+    user_ids: Sequence[str],
+    thresholds: Optional[Mapping[str, float]] = None,
+) -> ArchiveStats:
+    """Aggregate the archive for *user_ids* (one shard)."""
+    thresholds = dict(THRESHOLDS) if thresholds is None else thresholds
+    stats = ArchiveStats()
+    conn = _connect_ro(db_path)
+    try:
+        tables = _tables(conn)
+        for user_id in user_ids:
+            cycles, coalesced = _user_cycles(_iter_payloads(conn, tables, user_id))
+            if not cycles and not coalesced:
+                continue
+            stats.users += 1
+            stats.cycles += len(cycles)
+            stats.coalesced_cycles += sum(coalesced.values())
+            stats.facet_counts.update(coalesced)
+            stats.facet_counts.update(facet for _, facet, _ in cycles)
+            _add_series(stats, [(ts, meta) for ts, _, meta in cycles if meta], thresholds)
+    finally:
+        conn.close()
+    return stats
+
+
+def metric_series(db_path: str, user_ids: Optional[Sequence[str]] = None) -> List[np.ndarray]:
+    """Recorded metric snapshots of every user, one array per user.
+
+    Each array follows :data:`services.batch_engine.METRIC_DTYPE` in
+    chronological order; users without live cycles are skipped. Used to
+    replay real sessions through candidate thresholds.
+    """
+    conn = _connect_ro(db_path)
+    try:
+        tables = _tables(conn)
+        series = []
+        for user_id in list_users(db_path) if user_ids is None else user_ids:
+            cycles, _ = _user_cycles(_iter_payloads(conn, tables, user_id))
+            snapshots = [meta.get("metrics_snapshot") or {} for _, _, meta in cycles if meta]
+            if snapshots:
+                series.append(to_metric_array(snapshots))
+        return series
+    finally:
+        conn.close()
+
+
+def _add_series(
+    stats: ArchiveStats,
+    series: List[Tuple[float, dict]],
+    thresholds: Mapping[str, float],
+) -> None:
+    if not series:
+        return
+    for _, meta in series:
+        delta = str((meta.get("adoml") or {}).get("delta", ""))
+        for name, marker in TRIGGER_MARKERS.items():
+            if marker in delta:
+                stats.trigger_counts[name] += 1
+    metrics = to_metric_array(meta.get("metrics_snapshot") or {} for _, meta in series)
+    a_index = np.array([float(meta.get("a_index", 0.0)) for _, meta in series])
+    trajectory = replay_phases(PhaseType.PHASE_3_TRANSITION, metrics, a_index, thresholds)
+    start = PHASES.index(PhaseType.PHASE_3_TRANSITION)
+    previous = np.concatenate(([start], trajectory[:-1]))
+    np.add.at(stats.transitions, (previous, trajectory), 1)
+
+    days = np.array([int(ts // _SECONDS_PER_DAY) for ts, _ in series])
+    for day in np.unique(days):
+        stats.days.setdefault(int(day), _DayStats()).add(a_index[days == day])
+
+
+def analyze_archive(
+    db_path: str,
+    workers: Optional[int] = None,
+    shards: Optional[int] = None,
+    thresholds: Optional[Mapping[str, float]] = None,
+) -> ArchiveStats:
+    """Aggregate the whole archive with a process pool.
+
+    Args:
+        db_path: Path to the SQLite session database.
+        workers: Worker processes (default: CPU count); ``1`` runs inline.
+        shards: Number of user shards (default: four per worker).
+        thresholds: Thresholds for the phase replay (default: canonical).
+
+    Returns:
+        The merged :class:`ArchiveStats`.
+    """
+    if not os.path.exists(db_path):
+        raise FileNotFoundError(db_path)
+    users = list_users(db_path)
+    workers = max(1, workers or os.cpu_count() or 1)
+    shards = max(1, min(len(users) or 1, shards or workers * 4))
+    parts = [users[i::shards] for i in range(shards)]
+    total = ArchiveStats()
+    if workers == 1 or shards == 1:
+        for part in parts:
+            total.merge(analyze_users(db_path, part, thresholds))
+        return total
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(analyze_users, db_path, part, thresholds) for part in parts]
+        for future in futures:
+            total.merge(future.result())
+    return total
+
+
+# -- Output --
+def write_tables(stats: ArchiveStats, out_dir: str, fmt: str = "csv") -> List[str]:
+    """Write every table of *stats* to *out_dir*; returns the paths.
+
+    Raises:
+        ValueError: For an unknown format, or Parquet without ``pyarrow``.
+    """
+    if fmt not in ("csv", "parquet"):
+        raise ValueError("format must be 'csv' or 'parquet'")
+    if fmt == "parquet" and pyarrow is None:
+        raise ValueError("Parquet output requires pyarrow")
+    os.makedirs(out_dir, exist_ok=True)
+    paths = []
+    for name, columns in stats.tables().items():
+        path = os.path.join(out_dir, f"{name}.{fmt}")
+        if fmt == "parquet":
+            pyarrow.parquet.write_table(pyarrow.table(columns), path)
+        else:
+            with open(path, "w", newline="", encoding="utf-8") as fh:
+                writer = csv.writer(fh)
+                writer.writerow(columns)
+                writer.writerows(zip(*columns.values()))
+        paths.append(path)
+    return paths
+
+
+def summary_report(stats: ArchiveStats) -> str:
+    """Human-readable summary of *stats*."""
+    tables = stats.tables()
+    lines = [
+        "Iskra archive report",
+        f"users: {stats.users}   cycles: {stats.cycles}   coalesced cycles: {stats.coalesced_cycles}",
+        "",
+        "Facets:",
+    ]
+    facets = tables["facets"]
+    for facet, count, share in zip(facets["facet"], facets["count"], facets["share"]):
+        lines.append(f"  {facet:<10} {count:>8}  {share:6.1%}")
+    lines += ["", "Rituals (per live cycle):"]
+    triggers = tables["triggers"]
+    for name, count, rate in zip(triggers["trigger"], triggers["count"], triggers["per_cycle"]):
+        lines.append(f"  {name:<10} {count:>8}  {rate:6.2%}")
+    lines += ["", "Most frequent phase transitions:"]
+    flat = stats.transitions.ravel()
+    for index in np.argsort(flat)[::-1][:5]:
+        if flat[index] == 0:
+            break
+        src, dst = divmod(int(index), len(PHASES))
+        lines.append(f"  {PHASES[src].value} -> {PHASES[dst].value}: {int(flat[index])}")
+    daily = tables["a_index_daily"]
+    if daily["day"]:
+        lines += [
+            "",
+            f"A-index: {daily['day'][0]} .. {daily['day'][-1]}, "
+            f"first-day mean {daily['mean'][0]:.3f}, last-day mean {daily['mean'][-1]:.3f}, "
+            f"trend {stats.a_index_slope():+.4f}/day",
+        ]
+    return "\n".join(lines)
+
+
+def _iso_day(day: int) -> str:
+    return datetime.fromtimestamp(day * _SECONDS_PER_DAY, tz=timezone.utc).date().isoformat()
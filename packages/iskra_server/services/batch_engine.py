@@ -0,0 +1,231 @@
+"""
+Vectorised A-index, facet and phase evaluation for offline analysis.
+
+``FractalService.calculate_a_index``, ``FacetEngine.determine_facet`` and
+``PhaseEngine.transition`` evaluate one ``IskraMetrics`` object at a time,
+which is what the request path needs but far too slow for replaying
+millions of archived snapshots. This module implements the same rules
+over NumPy structured arrays (see :data:`METRIC_DTYPE`):
+
+* :func:`batch_a_index` – A-index per row;
+* :func:`batch_facets` – facet code per row (index into :data:`FACETS`);
+* :func:`batch_transition` – next-phase code per row (index into
+  :data:`PHASES`), broadcasting the current phase against the metrics;
+* :func:`replay_phases` – the phase trajectory of a whole session,
+  computed as a parallel prefix composition of the per-step transition
+  maps instead of a Python loop.
+
+Thresholds default to the ones the scalar engines would use right now
+without a session (the fleet-wide dynamic adapter when available, else
+``config.THRESHOLDS``); pass a mapping to evaluate against a fixed set
+instead. Mapping values may also be arrays, broadcast against the rows,
+so every row can be judged by its own session's thresholds. Results are identical to
+the scalar versions (``tests/test_batch_engine.py``).
+
+Usage::
+
+    from services.batch_engine import to_metric_array, batch_facets, FACETS
+    arr = to_metric_array(snapshots)
+    facets = [FACETS[code] for code in batch_facets(arr)]
+"""
+from __future__ import annotations
+
+from typing import Iterable, Mapping, Optional, Union
+
+import numpy as np
+
+from config import THRESHOLDS
+from core.models import FacetType, IskraMetrics, PhaseType
+
+try:
+    from services.dynamic_thresholds import dynamic_thresholds  # type: ignore
+except Exception:
+    dynamic_thresholds = None  # type: ignore
+
+# Column layout of an archived metric snapshot.
+METRIC_DTYPE = np.dtype(
+    [
+        ("trust", "f8"),
+        ("clarity", "f8"),
+        ("pain", "f8"),
+        ("drift", "f8"),
+        ("chaos", "f8"),
+        ("silence_mass", "f8"),
+        ("splinter_pain_cycles", "i4"),
+        ("integrity", "f8"),
+        ("resonance", "f8"),
+    ]
+)
+
+# Code <-> enum tables; codes are positions in these tuples.
+FACETS = tuple(FacetType)
+PHASES = tuple(PhaseType)
+_F = {facet: code for code, facet in enumerate(FACETS)}
+_P = {phase: code for code, phase in enumerate(PHASES)}
+
+ArrayLike = Union[np.ndarray, Iterable[float]]
+
+
+def to_metric_array(records: Iterable[Union[IskraMetrics, Mapping]]) -> np.ndarray:
+    """Pack metric snapshots into a :data:`METRIC_DTYPE` array.
+
+    Args:
+        records: ``IskraMetrics`` objects or dicts as stored in the
+            archive. Missing fields take the model defaults.
+    """
+    defaults = IskraMetrics()
+    rows = []
+    for record in records:
+        get = record.get if isinstance(record, Mapping) else lambda k, d, r=record: getattr(r, k, d)
+        rows.append(tuple(get(name, getattr(defaults, name)) for name in METRIC_DTYPE.names))
+    return np.array(rows, dtype=METRIC_DTYPE)
+
+
+def phase_codes(phases: Iterable[Union[PhaseType, str]]) -> np.ndarray:
+    """Map phases (enums or their values) to ``int8`` codes."""
+    return np.fromiter((_P[PhaseType(p)] for p in phases), dtype=np.int8)
+
+
+def _threshold(key: str, thresholds: Optional[Mapping[str, float]]) -> Union[float, np.ndarray]:
+    if thresholds is not None and key in thresholds:
+        value = thresholds[key]
+        return value if isinstance(value, np.ndarray) else float(value)
+    if dynamic_thresholds is not None:
+        return float(dynamic_thresholds.get(key))
+    return float(THRESHOLDS[key])
+
+
+def batch_a_index(metrics: np.ndarray) -> np.ndarray:
+    """Vectorised :meth:`FractalService.calculate_a_index`.
+
+    Like the scalar version, the pain coefficient uses the canonical
+    (static) pain thresholds.
+    """
+    pain = metrics["pain"]
+    pain_medium = THRESHOLDS["pain_medium"]
+    pain_high = THRESHOLDS["pain_high"]
+    g_pain = np.select(
+        [
+            (pain >= pain_medium) & (pain <= pain_high),
+            pain < 0.2,
+            pain < pain_medium,
+        ],
+        [1.0, pain / 0.2, 1.0],
+        default=1.0 - (pain - pain_high) / (1.0 - pain_high),
+    )
+    g_pain = np.clip(g_pain, 0.0, 1.0)
+    a_index = (
+        0.4 * metrics["clarity"]
+        + 0.3 * metrics["trust"]
+        + 0.2 * (1 - metrics["drift"])
+        + 0.1 * (1 - metrics["chaos"])
+    ) * g_pain
+    return np.clip(a_index, 0.0, 1.0)
+
+
+def batch_facets(metrics: np.ndarray, thresholds: Optional[Mapping[str, float]] = None) -> np.ndarray:
+    """Vectorised :meth:`FacetEngine.determine_facet`; returns ``int8`` codes."""
+    t = lambda key: _threshold(key, thresholds)  # noqa: E731
+    m = metrics
+    conditions = [
+        (m["clarity"] > t("stagnation_clarity")) & (m["chaos"] < t("stagnation_chaos")),
+        m["chaos"] > t("chaos_high"),
+        m["pain"] >= t("pain_high"),
+        m["drift"] > t("drift_high"),
+        m["trust"] < t("trust_low"),
+        m["clarity"] < t("clarity_low"),
+        m["pain"] > t("pain_medium"),
+    ]
+    choices = [
+        _F[FacetType.HUYNDUN],
+        _F[FacetType.HUYNDUN],
+        _F[FacetType.KAIN],
+        _F[FacetType.ISKRIV],
+        _F[FacetType.ANHANTRA],
+        _F[FacetType.SAM],
+        _F[FacetType.PINO],
+    ]
+    return np.select(conditions, choices, default=_F[FacetType.ISKRA]).astype(np.int8)
+
+
+def batch_transition(
+    current: ArrayLike,
+    metrics: np.ndarray,
+    a_index: ArrayLike,
+    thresholds: Optional[Mapping[str, float]] = None,
+) -> np.ndarray:
+    """Vectorised :meth:`PhaseEngine.transition`; returns ``int8`` codes.
+
+    Args:
+        current: Current phase codes; broadcast against *metrics*.
+        metrics: :data:`METRIC_DTYPE` array.
+        a_index: A-index values; broadcast against *metrics*.
+        thresholds: Optional fixed thresholds.
+    """
+    t = lambda key: _threshold(key, thresholds)  # noqa: E731
+    phase, pain, clarity, chaos, a_index = np.broadcast_arrays(
+        np.asarray(current), metrics["pain"], metrics["clarity"], metrics["chaos"], np.asarray(a_index)
+    )
+    conditions = [
+        (pain > t("pain_high")) & (phase != _P[PhaseType.PHASE_1_DARKNESS]),
+        (clarity < t("clarity_low")) & (phase != _P[PhaseType.PHASE_4_CLARITY]),
+        chaos > t("chaos_high"),
+        (a_index > t("maki_bloom_a_index")) & (phase != _P[PhaseType.PHASE_8_REALIZATION]),
+        # Standard cyclical progression
+        (phase == _P[PhaseType.PHASE_1_DARKNESS]) & (pain < THRESHOLDS["pain_medium"]),
+        phase == _P[PhaseType.PHASE_2_ECHO],
+        (phase == _P[PhaseType.PHASE_4_CLARITY]) & (a_index > 0.6),
+        np.isin(
+            phase,
+            [
+                _P[PhaseType.PHASE_5_SILENCE],
+                _P[PhaseType.PHASE_7_DISSOLUTION],
+                _P[PhaseType.PHASE_8_REALIZATION],
+            ],
+        ),
+    ]
+    choices = [
+        _P[PhaseType.PHASE_1_DARKNESS],
+        _P[PhaseType.PHASE_4_CLARITY],
+        _P[PhaseType.PHASE_3_TRANSITION],
+        _P[PhaseType.PHASE_8_REALIZATION],
+        _P[PhaseType.PHASE_2_ECHO],
+        _P[PhaseType.PHASE_3_TRANSITION],
+        _P[PhaseType.PHASE_5_SILENCE],
+        _P[PhaseType.PHASE_3_TRANSITION],
+    ]
+    return np.select(conditions, choices, default=phase).astype(np.int8)
+
+
+def replay_phases(
+    initial: Union[PhaseType, int],
+    metrics: np.ndarray,
+    a_index: Optional[ArrayLike] = None,
+    thresholds: Optional[Mapping[str, float]] = None,
+) -> np.ndarray:
+    """Phase after each step of a session that starts in *initial*.
+
+    Each step's transition is a map from the 8 phases to the 8 phases,
+    evaluated for all of them at once. The trajectory is the running
+    composition of these maps, computed with a Hillis–Steele scan in
+    ``log2(n)`` vectorised rounds.
+
+    Returns:
+        ``int8`` codes; element ``i`` is the phase after snapshot ``i``.
+    """
+    n = len(metrics)
+    if n == 0:
+        return np.empty(0, dtype=np.int8)
+    start = _P[initial] if isinstance(initial, PhaseType) else int(initial)
+    if a_index is None:
+        a_index = batch_a_index(metrics)
+    every_phase = np.arange(len(PHASES), dtype=np.int8)
+    maps = batch_transition(
+        every_phase[None, :], metrics[:, None], np.asarray(a_index)[:, None], thresholds
+    )
+    step = 1
+    while step < n:
+        # maps[i] <- maps[i] ∘ maps[i - step]
+        maps[step:] = np.take_along_axis(maps[step:], maps[:-step].astype(np.intp), axis=1)
+        step *= 2
+    return maps[:, start]
@@ -14,69 +14,120 @@ message. Likewise, if drift remains elevated, the ``drift_high``
 threshold should relax slightly to allow room for self‑correction.
 
 The ``DynamicThresholdAdapter`` encapsulates this behaviour. It
-maintains short histories of key metrics and computes simple moving
-averages and exponential moving averages (EMA) to adjust the trigger
-points. The adaptation rate is intentionally slow (20 % of the
-observed delta) to avoid erratic oscillations. Only thresholds
-defined in ``config.THRESHOLDS`` are ever modified; unknown keys
-fallback to the static values.
+maintains short rolling windows of key metrics and an exponential
+moving average (EMA) of pain to adjust the trigger points. Pain is
+tracked by :class:`services.pain_memory_manager.PainMemoryManager`,
+whose EMA is seeded with the first sample; every statistic is kept as a
+running sum or EMA, so an update costs O(1) regardless of the window
+size. The adaptation rate is intentionally
+slow (20 % of the observed delta) to avoid erratic oscillations. Only
+thresholds defined in ``config.THRESHOLDS`` are ever modified; unknown
+keys fallback to the static values.
 
-Usage:
+Adapters are per session: one user's sustained pain must not move the
+thresholds for everyone else. A session's adapter is serialised into
+``UserSession.threshold_state`` with :meth:`DynamicThresholdAdapter.to_state`
+and restored on the next request. The module-level ``dynamic_thresholds``
+singleton is the process-wide fleet aggregate: it is fed by every
+session's vitals (but not by any one session's growth log, so its Maki
+Bloom threshold stays at the baseline) and serves fleet-level tuning,
+offline analysis and callers that have no session at hand.
+
+Decisions never read an adapter directly: a request takes one immutable
+:class:`core.thresholds.ThresholdSnapshot` with :meth:`DynamicThresholdAdapter.snapshot`
+and passes it through the pipeline.
 
-    from services.dynamic_thresholds import dynamic_thresholds
-    # Update the dynamic thresholds with the latest vitals
-    dynamic_thresholds.update(current_metrics)
-    # Retrieve a threshold (falls back to static if not adapted)
-    pain_high = dynamic_thresholds.get("pain_high")
+Usage:
 
-Note: Dynamic thresholds are best effort and do not persist across
-sessions. They live within the Python process and are reset when the
-application restarts. Persisting them in the archive would require
-additional work.
+    from services.dynamic_thresholds import DynamicThresholdAdapter, observe
+    adapter = DynamicThresholdAdapter.from_state(session.threshold_state)
+    # Resolve every threshold once for this request
+    thresholds = adapter.snapshot()
+    pain_high = thresholds.pain_high
+    # Record the latest vitals for the next request (and the fleet)
+    observe(adapter, current_metrics)
+    session.threshold_state = adapter.to_state()
 """
 
 from __future__ import annotations
 
-from typing import Dict, List
+import collections
+from typing import Any, Deque, Dict, Optional
 
 from config import THRESHOLDS
 from core.models import IskraMetrics
+from core.thresholds import ThresholdSnapshot
+from memory.growth_log import GrowthLog
 from services.pain_memory_manager import PainMemoryManager
 
+# Length of the rolling windows for drift and clarity
+THRESHOLD_WINDOW = 50
+# Smoothing factor of the pain EMA
+PAIN_EMA_ALPHA = 0.1
+
+
+class RollingMean:
+    """Mean of the last ``maxlen`` values, maintained with a running sum."""
+
+    def __init__(self, maxlen: int = THRESHOLD_WINDOW) -> None:
+        self.values: Deque[float] = collections.deque(maxlen=maxlen)
+        self._sum = 0.0
+
+    def add(self, value: float) -> None:
+        """Append *value*, evicting the oldest one when the window is full."""
+        if len(self.values) == self.values.maxlen:
+            self._sum -= self.values[0]
+        self.values.append(float(value))
+        self._sum += float(value)
+
+    def mean(self) -> float:
+        """Current mean, or 0.0 for an empty window."""
+        return self._sum / len(self.values) if self.values else 0.0
+
+    def __len__(self) -> int:
+        return len(self.values)
+
 
 class DynamicThresholdAdapter:
-    """Adapt select thresholds based on recent metric trends."""
+    """Adapt select thresholds based on recent metric trends.
+
+    Args:
+        window: Length of the rolling drift and clarity windows.
+        alpha: Smoothing factor of the pain EMA.
+    """
 
-    def __init__(self) -> None:
+    def __init__(self, window: int = THRESHOLD_WINDOW, alpha: float = PAIN_EMA_ALPHA) -> None:
         # Copy of the canonical baseline thresholds for reference
         self._base: Dict[str, float] = {k: float(v) for k, v in THRESHOLDS.items() if isinstance(v, (int, float))}
         # Working copy that can drift over time
         self._dynamic: Dict[str, float] = self._base.copy()
-        # Histories for metrics; keep limited window to bound memory
-        self._pain_history: PainMemoryManager = PainMemoryManager(maxlen=50)
-        self._drift_history: List[float] = []
-        self._clarity_history: List[float] = []
+        self.window = int(window)
+        self.alpha = float(alpha)
+        # Running statistics; each update is O(1)
+        self._pain = PainMemoryManager(maxlen=self.window, alphas=(self.alpha,))
+        self._drift = RollingMean(self.window)
+        self._clarity = RollingMean(self.window)
+        self.updates = 0
 
-    def update(self, metrics: IskraMetrics) -> None:
+    def update(self, metrics: IskraMetrics, growth: Optional[GrowthLog] = None) -> None:
         """Incorporate the latest vitals and recompute dynamic thresholds.
 
         Args:
             metrics: The current vitals for the session.
+            growth: Optional growth log of the session. Its rolling
+                resonance mean (an O(1) query) calibrates the Maki Bloom
+                threshold.
         """
-        # Record pain and compute EMA
-        self._pain_history.add_pain(metrics.pain)
-        ema_pain = self._pain_history.ema(alpha=0.1)
-
-        # Record drift and clarity; truncate history
-        self._drift_history.append(metrics.drift)
-        if len(self._drift_history) > 50:
-            self._drift_history.pop(0)
-        avg_drift = sum(self._drift_history) / len(self._drift_history)
+        # Record pain (clamped to [0, 1]); the EMA starts at the first sample
+        self._pain.add_pain(metrics.pain)
+        ema_pain = self._pain.ema(self.alpha)
 
-        self._clarity_history.append(metrics.clarity)
-        if len(self._clarity_history) > 50:
-            self._clarity_history.pop(0)
-        avg_clarity = sum(self._clarity_history) / len(self._clarity_history)
+        # Record drift and clarity into their rolling windows
+        self._drift.add(metrics.drift)
+        avg_drift = self._drift.mean()
+        self._clarity.add(metrics.clarity)
+        avg_clarity = self._clarity.mean()
+        self.updates += 1
 
         # Adapt pain_high: push upward if pain is persistently high, downward if low
         base_ph = self._base.get("pain_high", 0.7)
@@ -102,6 +153,13 @@ class DynamicThresholdAdapter:
         # Negative delta → clarity lower than baseline → threshold decreases to trigger SAM sooner
         self._dynamic["clarity_low"] = self._clamp(base_cl + 0.2 * (-delta_cl), 0.3, 0.95)
 
+        # Adapt maki_bloom_a_index: sustained high resonance raises the bar for
+        # Maki Bloom so that it stays a rare integration event
+        if growth is not None and growth.count() >= 5:
+            base_mb = self._base.get("maki_bloom_a_index", 0.8)
+            delta_mb = growth.mean() - base_mb
+            self._dynamic["maki_bloom_a_index"] = self._clamp(base_mb + 0.2 * delta_mb, 0.6, 0.95)
+
         # Leave other thresholds unchanged for now (they may be adapted in future)
 
     def get(self, key: str) -> float:
@@ -119,11 +177,84 @@ class DynamicThresholdAdapter:
         # unknown or non-numeric thresholds return base (unchanged)
         return self._base.get(key, THRESHOLDS.get(key))
 
+    def snapshot(self) -> ThresholdSnapshot:
+        """Freeze the current thresholds for one request."""
+        return ThresholdSnapshot.capture(self)
+
+    def to_state(self) -> Dict[str, Any]:
+        """Export the adapter into a JSON-serialisable dict.
+
+        Only the running statistics and the adapted values that differ
+        from the baseline are stored; the baseline itself always comes
+        from ``config.THRESHOLDS`` so config changes apply on restore.
+        """
+        return {
+            "window": self.window,
+            "alpha": self.alpha,
+            "updates": self.updates,
+            "pain": self._pain.to_state(),
+            "drift": list(self._drift.values),
+            "clarity": list(self._clarity.values),
+            "dynamic": {k: v for k, v in self._dynamic.items() if v != self._base.get(k)},
+        }
+
+    @classmethod
+    def from_state(cls, state: Optional[Dict[str, Any]]) -> "DynamicThresholdAdapter":
+        """Re-create an adapter from :meth:`to_state` output.
+
+        A falsy or malformed *state* yields a fresh adapter, so a broken
+        row never blocks the session.
+        """
+        if not state:
+            return cls()
+        try:
+            adapter = cls(
+                window=int(state.get("window", THRESHOLD_WINDOW)),
+                alpha=float(state.get("alpha", PAIN_EMA_ALPHA)),
+            )
+            if state.get("pain"):
+                adapter._pain = PainMemoryManager.from_state(state["pain"])
+            elif "pain_ema" in state:
+                # Older states kept only the EMA value; continue from it
+                adapter._pain.add_pain(float(state["pain_ema"]))
+            adapter.updates = int(state.get("updates", 0))
+            for value in state.get("drift") or []:
+                adapter._drift.add(value)
+            for value in state.get("clarity") or []:
+                adapter._clarity.add(value)
+            for key, value in (state.get("dynamic") or {}).items():
+                if key in adapter._base:
+                    adapter._dynamic[key] = float(value)
+        except (TypeError, ValueError, AttributeError) as exc:
+            print(f"[DynamicThresholds] Discarding malformed state: {exc}")
+            return cls()
+        return adapter
+
     @staticmethod
     def _clamp(value: float, min_value: float, max_value: float) -> float:
         """Clamp a numeric value to the given bounds."""
         return max(min_value, min(max_value, value))
 
 
-# Create a module-level singleton so that all imports share the same adapter
-dynamic_thresholds = DynamicThresholdAdapter()
\ No newline at end of file
+# Process-wide fleet aggregate, fed by every session's updates
+dynamic_thresholds = DynamicThresholdAdapter()
+
+
+def observe(
+    adapter: Optional[DynamicThresholdAdapter],
+    metrics: IskraMetrics,
+    growth: Optional[GrowthLog] = None,
+) -> None:
+    """Feed the vitals to a session's adapter and to the fleet aggregate.
+
+    *growth* only calibrates the session's adapter: one user's growth log
+    is not a fleet statistic. Failures are logged and never break the
+    request.
+    """
+    for target, target_growth in ((adapter, growth), (dynamic_thresholds, None)):
+        if target is None:
+            continue
+        try:
+            target.update(metrics, growth=target_growth)
+        except Exception as exc:
+            print(f"[DynamicThresholds] Failed to update thresholds: {exc}")
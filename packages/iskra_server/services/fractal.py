@@ -10,28 +10,59 @@ functions operate at two scales:
   summarizes the integrative health of the system. This index
   influences phase transitions and rituals.
 
-While simple heuristics are used here (e.g., log‑scaled word counts
-for Hurst exponent), the architecture is designed to support more
-sophisticated analytics should you wish to plug in real signal
-processing libraries in future.
+Micro-level complexity is a genuine Lempel–Ziv (LZ76) phrase count,
+computed over word tokens by default (or characters), and the trend
+signal is a Hurst exponent estimated with vectorised rescaled-range
+(R/S) analysis. Both are cheap enough to run on every request: well
+under a millisecond for multi-kilobyte inputs (see
+``tools/benchmarks.py``).
+
+When the client sends keystroke intervals, pauses are analysed as seams
+in the typing rhythm rather than as an average duration per character:
+the interval distribution, pause classification and burstiness are
+computed in one vectorised pass (:meth:`FractalService.analyze_pauses`).
 """
 from __future__ import annotations
 
+import base64
+import binascii
 import math
-from typing import Optional, Tuple
+import re
+from typing import Hashable, List, Optional, Sequence, Tuple, Union
 
 from config import THRESHOLDS
-from core.models import PauseType, IskraMetrics
+from core.models import MAX_KEYSTROKE_INTERVALS, IskraMetrics, PauseProfile, PauseType
+
+# NumPy powers the Hurst estimator. Without it the trend signal falls
+# back to the neutral value 0.5.
+try:
+    import numpy as np  # type: ignore
+except ImportError:  # pragma: no cover - numpy is expected in production
+    np = None  # type: ignore
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+# Shorter series give R/S estimates dominated by small-sample bias.
+_HURST_MIN_POINTS = 16
+_HURST_MIN_WINDOW = 4
+_HURST_SIZES = 8
+_HURST_NEUTRAL = 0.5
+
+# Pause map (pause_analysis_algorithms): bucket edges in milliseconds.
+_PAUSE_EDGES = (250, 1000)
+# A long lead-in before the first keystroke is a ritual pause (∆, ☉). The
+# lead-in is kept out of the rhythm statistics.
+_RITUAL_LEAD_IN_MS = 1000
+# Share of cognitive (≥ 250 ms) pauses that marks the input as effortful.
+_COGNITIVE_SHARE = 0.15
 
 
 class FractalService:
     """Provides micro‑ and macro‑level analytics for Iskra.
 
-    The algorithms here are heuristics. They make the system
-    responsive without introducing heavy dependencies. For a production
-    environment you could replace the LZ‑complexity and Hurst exponent
-    calculations with proper natural language complexity or EEG
-    analysis.
+    The A‑Index and pause classification are heuristics derived from
+    the Canon; LZ complexity and the Hurst exponent are standard signal
+    measures applied to the user's text.
     """
 
     @staticmethod
@@ -92,27 +123,309 @@ class FractalService:
         return None
 
     @staticmethod
-    def calculate_micro_metrics(text: str, duration_ms: Optional[int]) -> Tuple[float, float, Optional[PauseType]]:
-        """Compute micro‑level complexity and Hurst metrics.
+    def lz76_phrase_count(sequence: Union[str, Sequence[Hashable]]) -> int:
+        """Count LZ76 phrases (Kaspar–Schuster production complexity).
+
+        The sequence is parsed left to right; each phrase is the longest
+        prefix of the remainder that already occurs earlier (overlap
+        allowed) plus one innovative symbol. The parse runs in one pass
+        over a suffix automaton of the prefix read so far: the current
+        phrase is a path in the automaton, and it ends at the first symbol
+        with no transition. The automaton is built online and the phrase
+        state follows the one state it may split, so the count takes
+        linear time and memory in the sequence length (for a bounded
+        alphabet).
+
+        Args:
+            sequence: A string, or a sequence of hashable tokens.
 
-        - LZ complexity is approximated as the ratio of unique words to total words plus a small constant.
-        - Hurst exponent is approximated using the length of the text.
-        - Pause type classification uses the typing duration.
+        Returns:
+            The number of phrases ``c`` (0 for an empty sequence).
+        """
+        trans: List[dict] = [{}]
+        link = [-1]
+        length = [0]
+        last = 0
+        phrases = 0
+        state = 0  # automaton state of the current phrase
+        matched = 0  # length of the current phrase
+        for symbol in sequence:
+            # The phrase may only copy from the prefix before this symbol.
+            target = trans[state].get(symbol)
+
+            # Extend the automaton with the symbol.
+            new = len(length)
+            trans.append({})
+            length.append(length[last] + 1)
+            link.append(0)
+            p = last
+            last = new
+            while p >= 0:
+                out = trans[p]
+                q = out.get(symbol)
+                if q is not None:
+                    break
+                out[symbol] = new
+                p = link[p]
+            if q is not None:
+                split = length[p] + 1
+                if split == length[q]:
+                    link[new] = q
+                else:
+                    clone = len(length)
+                    trans.append(trans[q].copy())
+                    length.append(split)
+                    link.append(link[q])
+                    link[q] = link[new] = clone
+                    while p >= 0 and trans[p].get(symbol) == q:
+                        trans[p][symbol] = clone
+                        p = link[p]
+                    # Short strings of the split state now live in the clone.
+                    if target == q and matched < split:
+                        target = clone
+
+            if target is None:
+                phrases += 1
+                state = matched = 0
+            else:
+                state = target
+                matched += 1
+        return phrases + (matched > 0)
+
+    @staticmethod
+    def lz_complexity(text: str, unit: str = "tokens") -> float:
+        """Normalised LZ76 complexity of *text* in ``[0, 1]``.
+
+        Args:
+            text: Input text.
+            unit: ``"tokens"`` (case-folded words) or ``"chars"``.
+
+        Returns:
+            For tokens, the share of tokens that open a new phrase: 1.0
+            when no word sequence repeats, lower the more the text recycles
+            itself. For characters, the classic ``c · log_k(n) / n``
+            normalisation (``k`` = alphabet size), clipped to 1.0.
+        """
+        if unit == "tokens":
+            tokens = _tokenize(text)
+            if not tokens:
+                return 0.0
+            return FractalService.lz76_phrase_count(tokens) / len(tokens)
+        if unit != "chars":
+            raise ValueError("unit must be 'tokens' or 'chars'")
+        n = len(text)
+        if n == 0:
+            return 0.0
+        if n < 2:
+            return 1.0
+        phrases = FractalService.lz76_phrase_count(text)
+        alphabet = max(2, len(set(text)))
+        return min(1.0, phrases * math.log(n, alphabet) / n)
+
+    @staticmethod
+    def hurst_exponent(series: Sequence[float]) -> float:
+        """Estimate the Hurst exponent with rescaled-range (R/S) analysis.
+
+        The series is cut into non-overlapping windows for a geometric
+        ladder of window sizes; the mean R/S over the windows of every size
+        is computed in one vectorised pass and ``H`` is the slope of
+        ``log(R/S)`` against ``log(size)``. ``H ≈ 0.5`` means no memory,
+        ``H > 0.5`` persistent trends, ``H < 0.5`` alternation.
+
+        Args:
+            series: Observations such as token lengths or keystroke
+                intervals.
+
+        Returns:
+            ``H`` clipped to ``[0, 1]``; 0.5 when the series is too short
+            or flat to estimate (or NumPy is unavailable).
+        """
+        if np is None or len(series) < _HURST_MIN_POINTS:
+            return _HURST_NEUTRAL
+        x = np.asarray(series, dtype=float)
+        n = x.size
+        sizes = np.unique(
+            np.geomspace(_HURST_MIN_WINDOW, n // 2, num=min(_HURST_SIZES, n // 4)).astype(int)
+        )
+        counts = n // sizes
+        spans = counts * sizes
+        # Lay the windows of every size end to end so that each statistic
+        # is one segmented reduction instead of a pass per size.
+        flat = x[np.arange(spans.sum()) - np.repeat(_offsets(spans), spans)]
+        window_sizes = np.repeat(sizes, counts)
+        starts = _offsets(window_sizes)
+        means = np.add.reduceat(flat, starts) / window_sizes
+        deviations = flat - np.repeat(means, window_sizes)
+        # Window profiles differ from the running sum by a per-window
+        # constant, which cancels in the range.
+        profile = deviations.cumsum()
+        ranges = np.maximum.reduceat(profile, starts) - np.minimum.reduceat(profile, starts)
+        scales = np.sqrt(np.add.reduceat(deviations * deviations, starts) / window_sizes)
+        valid = scales > 0
+        rs = np.divide(ranges, scales, out=np.zeros_like(ranges), where=valid)
+        first_windows = _offsets(counts)
+        valid_counts = np.add.reduceat(valid, first_windows)
+        estimated = valid_counts > 0
+        if np.count_nonzero(estimated) < 2:
+            return _HURST_NEUTRAL
+        lx = np.log(sizes[estimated])
+        ly = np.log(np.add.reduceat(rs, first_windows)[estimated] / valid_counts[estimated])
+        lx_c = lx - lx.mean()
+        slope = float(np.dot(lx_c, ly - ly.mean()) / np.dot(lx_c, lx_c))
+        return max(0.0, min(1.0, slope))
+
+    @staticmethod
+    def decode_keystroke_intervals(payload: str) -> Optional["np.ndarray"]:
+        """Decode base64 little-endian int16 inter-key intervals.
+
+        Args:
+            payload: Base64 text as sent in ``UserRequest.keystroke_intervals``.
+
+        Returns:
+            An ``int16`` array of intervals in milliseconds, or ``None``
+            when NumPy is unavailable.
+
+        Raises:
+            ValueError: If the payload is not valid base64, has an odd
+                byte count, holds too many intervals or negative values.
+        """
+        if np is None:
+            return None
+        try:
+            raw = base64.b64decode(payload, validate=True)
+        except (binascii.Error, ValueError) as exc:
+            raise ValueError("keystroke_intervals is not valid base64") from exc
+        if len(raw) % 2:
+            raise ValueError("keystroke_intervals must hold whole int16 values")
+        if len(raw) // 2 > MAX_KEYSTROKE_INTERVALS:
+            raise ValueError(f"at most {MAX_KEYSTROKE_INTERVALS} keystroke intervals are accepted")
+        intervals = np.frombuffer(raw, dtype="<i2")
+        if intervals.size and int(intervals.min()) < 0:
+            raise ValueError("keystroke intervals must be non-negative")
+        return intervals
+
+    @staticmethod
+    def analyze_pauses(intervals: Sequence[int]) -> Optional[PauseProfile]:
+        """Summarise a keystroke-interval series in one vectorised pass.
+
+        The first interval is the lead-in: the wait between the client's
+        start signal and the first keystroke. It is reported on its own and
+        kept out of the typing rhythm, since it measures a pause before
+        writing rather than within it. The remaining intervals are binned
+        into articulatory (< 250 ms), moderate cognitive (250–999 ms) and
+        long cognitive (≥ 1000 ms) pauses; the moments for the mean and
+        burstiness and the order statistics for the median and 90th
+        percentile come from the same array.
+
+        Args:
+            intervals: Inter-key intervals in milliseconds; the first one is
+                the lead-in before the first keystroke.
+
+        Returns:
+            A :class:`PauseProfile` whose counts and statistics cover the
+            intervals after the lead-in, or ``None`` for an empty series
+            (or without NumPy).
+        """
+        if np is None or len(intervals) == 0:
+            return None
+        lead_in = int(intervals[0])
+        x = np.asarray(intervals[1:], dtype=np.int64)
+        n = x.size
+        if n == 0:
+            return PauseProfile(
+                interval_count=0, total_ms=0, lead_in_ms=lead_in, mean_ms=0.0,
+                median_ms=0.0, p90_ms=0.0, max_ms=0, articulatory_count=0,
+                cognitive_count=0, long_count=0, burstiness=0.0,
+            )
+        buckets = np.bincount(np.searchsorted(_PAUSE_EDGES, x, side="right"), minlength=3)
+        total = int(x.sum())
+        mean = total / n
+        std = math.sqrt(max(0.0, float(np.dot(x, x)) / n - mean * mean))
+        median, p90 = np.percentile(x, (50, 90))
+        return PauseProfile(
+            interval_count=n,
+            total_ms=total,
+            lead_in_ms=lead_in,
+            mean_ms=mean,
+            median_ms=float(median),
+            p90_ms=float(p90),
+            max_ms=int(x.max()),
+            articulatory_count=int(buckets[0]),
+            cognitive_count=int(buckets[1]),
+            long_count=int(buckets[2]),
+            burstiness=(std - mean) / (std + mean) if std + mean > 0 else 0.0,
+        )
+
+    @staticmethod
+    def classify_pause_profile(profile: PauseProfile) -> PauseType:
+        """Classify an input by its pause profile.
+
+        A long lead-in (≥ 1000 ms) is a ritual pause taken before speaking;
+        otherwise any long pause between keystrokes, or a cognitive share of
+        at least 15 %, marks cognitive work; fluent typing is articulatory.
+        """
+        if profile.lead_in_ms >= _RITUAL_LEAD_IN_MS:
+            return PauseType.RITUAL
+        seams = profile.cognitive_count + profile.long_count
+        if profile.long_count or (seams and seams >= _COGNITIVE_SHARE * profile.interval_count):
+            return PauseType.COGNITIVE
+        return PauseType.ARTICULATION
+
+    @staticmethod
+    def calculate_micro_metrics(
+        text: str,
+        duration_ms: Optional[int],
+        intervals: Optional[Sequence[int]] = None,
+    ) -> Tuple[float, float, Optional[PauseType], Optional[PauseProfile]]:
+        """Compute micro‑level complexity, Hurst and pause metrics.
+
+        - LZ complexity is the normalised LZ76 phrase count over word tokens.
+        - Hurst exponent is estimated by R/S analysis over the keystroke
+          intervals after the lead-in when there are enough of them, else
+          over token lengths.
+        - Pause type classification uses the pause profile when intervals
+          are given and the overall typing duration otherwise.
 
         Args:
             text: The user input text.
             duration_ms: The time taken by the user to type the text.
+            intervals: Optional inter-key intervals in milliseconds.
 
         Returns:
-            A tuple of (lz_complexity, hurst_exponent, pause_type).
+            A tuple of (lz_complexity, hurst_exponent, pause_type, pause_profile).
         """
         text_length = len(text)
-        words = text.split()
-        if not words:
-            lz_complexity = 0.0
+        lz_complexity = FractalService.lz_complexity(text, "tokens")
+        profile = FractalService.analyze_pauses(intervals) if intervals is not None else None
+        if profile is not None and profile.interval_count >= _HURST_MIN_POINTS:
+            hurst_exponent = FractalService.hurst_exponent(intervals[1:])
+        else:
+            hurst_exponent = FractalService.hurst_exponent([len(token) for token in _tokenize(text)])
+        if profile is not None:
+            pause_type = FractalService.classify_pause_profile(profile)
+        else:
+            pause_type = FractalService.classify_pause(duration_ms, text_length)
+        return lz_complexity, hurst_exponent, pause_type, profile
+
+
+def _offsets(lengths: "np.ndarray") -> "np.ndarray":
+    """Start index of each segment when segments of *lengths* are concatenated."""
+    starts = np.zeros_like(lengths)
+    np.cumsum(lengths[:-1], out=starts[1:])
+    return starts
+
+
+def _tokenize(text: str) -> List[str]:
+    """Case-folded ``\\w+`` tokens of *text*.
+
+    Equivalent to ``_TOKEN_RE.findall(text.lower())``; whitespace-separated
+    words that are entirely alphanumeric are taken as they are and only
+    the rest go through the regular expression, which is the slow part.
+    """
+    tokens: List[str] = []
+    for word in text.lower().split():
+        if word.isalnum():
+            tokens.append(word)
         else:
-            unique_words = set(words)
-            lz_complexity = min(1.0, len(unique_words) / len(words) + 0.1)
-        hurst_exponent = min(1.0, 0.4 + math.log10(max(1, text_length)) * 0.2)
-        pause_type = FractalService.classify_pause(duration_ms, text_length)
-        return lz_complexity, hurst_exponent, pause_type
\ No newline at end of file
+            tokens.extend(_TOKEN_RE.findall(word))
+    return tokens
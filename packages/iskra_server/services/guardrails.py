@@ -6,14 +6,23 @@ pre‑ and post‑processing checks to ensure that requests and responses
 adhere to safety constraints. It implements "Safety Primacy" by
 intercepting harmful input early and flagging problematic output for
 softening or suppression.
+
+Pattern matching goes through a compiled :class:`GuardrailEngine`:
+texts are normalised (NFKC, case folding, invisible characters and dash
+variants) and scanned once by a single automaton whose patterns accept
+the common Cyrillic/Latin/Greek homoglyphs, so "сaмoубийствo" typed with
+Latin letters matches like the plain spelling. Queries longer than
+``GUARDRAILS["max_input_chars"]`` are rejected before any of that work.
 """
 from __future__ import annotations
 
 import re
-from typing import Optional
+import unicodedata
+from typing import Iterable, List, Optional
 
 from core.models import GuardrailViolation, IskraMetrics
-from config import THRESHOLDS
+from config import GUARDRAILS, THRESHOLDS
+from services.lexicon import Lexicon
 
 
 # Basic forbidden pattern list. In a real deployment this should be
@@ -39,6 +48,170 @@ FORBIDDEN_PATTERNS = [
     r"как\s+сделать\s+бомбу",
 ]
 
+# Visually confusable lowercase letters; each group matches as one letter.
+HOMOGLYPH_GROUPS = (
+    "aаα", "cс", "eеё", "iіι", "jј", "kкκ", "oоο", "pрρ", "sѕ", "vν", "xхχ", "yу",
+)
+_HOMOGLYPHS = {ch: group for group in HOMOGLYPH_GROUPS for ch in group}
+_INVISIBLE = "\u00ad\u180e\u200b-\u200f\u2060-\u2064\ufeff"
+_DASHES = "\u2010-\u2015\u2212\ufe58\ufe63\uff0d"
+# Invisible characters and dashes are folded in one pass over the text; a
+# single character class keeps the engine's fast scan for the first hit.
+_FOLD = re.compile(f"[{_INVISIBLE}{_DASHES}]")
+_IS_DASH = re.compile(f"[{_DASHES}]").match
+
+
+def normalize_text(text: str) -> str:
+    """Fold *text* into the form guardrail patterns are matched against.
+
+    NFKC (full-width and compatibility forms), case folding, removal of
+    zero-width/invisible characters and mapping every dash to ``-``.
+    Pure ASCII input takes a fast path.
+    """
+    if text.isascii():
+        return text.lower()
+    text = unicodedata.normalize("NFKC", text).casefold()
+    return _FOLD.sub(_fold, text)
+
+
+def _fold(match: "re.Match[str]") -> str:
+    return "-" if _IS_DASH(match.group()) else ""
+
+
+def expand_homoglyphs(pattern: str) -> str:
+    """Rewrite a lowercase regex so each letter also matches its homoglyphs.
+
+    Escapes are copied verbatim; inside ``[...]`` the confusables are
+    added to the class, elsewhere a letter becomes a small class.
+    """
+    out = []
+    in_class = False
+    i = 0
+    while i < len(pattern):
+        ch = pattern[i]
+        if ch == "\\":
+            out.append(pattern[i:i + 2])
+            i += 2
+            continue
+        if ch == "[" and not in_class:
+            in_class = True
+        elif ch == "]" and in_class:
+            in_class = False
+        group = _HOMOGLYPHS.get(ch)
+        if group is None:
+            out.append(ch)
+        elif in_class:
+            out.append(group)
+        else:
+            out.append(f"[{group}]")
+        i += 1
+    return "".join(out)
+
+
+def homoglyph_variants(pattern: str) -> List[str]:
+    """:func:`expand_homoglyphs`, split into one variant per leading homoglyph.
+
+    Keeping the first character of every alternative a plain literal lets
+    the ``re`` engine skip ahead to candidate positions with a character
+    set instead of trying every alternative at every position.
+    """
+    group = _HOMOGLYPHS.get(pattern[:1])
+    if group is None:
+        return [expand_homoglyphs(pattern)]
+    rest = expand_homoglyphs(pattern[1:])
+    return [ch + rest for ch in group]
+
+
+class GuardrailEngine:
+    """Forbidden-pattern matcher compiled into one normalised automaton.
+
+    Args:
+        patterns: Lowercase regular expressions to forbid.
+        max_input_chars: Inputs longer than this are rejected outright.
+    """
+
+    def __init__(
+        self,
+        patterns: Iterable[str] = FORBIDDEN_PATTERNS,
+        max_input_chars: int = GUARDRAILS["max_input_chars"],
+    ) -> None:
+        self.patterns = list(patterns)
+        self.max_input_chars = max_input_chars
+        self._source = {
+            variant: pattern
+            for pattern in self.patterns
+            for variant in homoglyph_variants(normalize_text(pattern))
+        }
+        # Texts are case-folded by normalize_text, so no IGNORECASE here.
+        self._lexicon = Lexicon({"forbidden": list(self._source)}, flags=0)
+
+    def exceeds_limit(self, text: str) -> bool:
+        """Whether *text* is longer than the configured input limit."""
+        return len(text) > self.max_input_chars
+
+    def find(self, text: str) -> Optional[str]:
+        """The forbidden pattern matched first in *text*, or ``None``."""
+        hit = self._lexicon.search(normalize_text(text))
+        return self._source[hit[1]] if hit else None
+
+
+# Module-level engine shared by GuardrailService (compiled once at import).
+guardrail_engine = GuardrailEngine()
+
+_JSON_ESCAPE = re.compile(r"\\(?:u([0-9a-fA-F]{4})|(.))")
+_JSON_SIMPLE = {"n": "\n", "t": "\t", "r": "\r", "b": " ", "f": " "}
+
+
+def _unescape_json(match: "re.Match[str]") -> str:
+    if match.group(1):
+        return chr(int(match.group(1), 16))
+    return _JSON_SIMPLE.get(match.group(2), match.group(2))
+
+
+class StreamingGuardrail:
+    """Incremental forbidden-pattern scanner for streamed generation.
+
+    Feed chunks as they arrive; :meth:`feed` returns the forbidden
+    pattern as soon as one completes, so the caller can cancel the
+    upstream request instead of waiting for the full answer. The last
+    ``carry_chars`` characters of the stream are re-scanned with each
+    new chunk, which catches matches split across chunk boundaries (and
+    keeps normalisation consistent there) at O(chunk + carry) per call.
+    A match longer than ``carry_chars`` that straddles a boundary can be
+    missed, so the full-text check on the final answer stays in place.
+
+    Args:
+        engine: Compiled engine to match with (the shared one by default).
+        carry_chars: Characters kept from previous chunks.
+        json_arguments: Chunks are fragments of JSON (tool-call arguments);
+            string escapes such as ``\\n`` and ``\\u0441`` are decoded before
+            matching.
+    """
+
+    def __init__(
+        self,
+        engine: Optional[GuardrailEngine] = None,
+        carry_chars: int = 256,
+        json_arguments: bool = False,
+    ) -> None:
+        self.engine = engine or guardrail_engine
+        self.carry_chars = carry_chars
+        self.json_arguments = json_arguments
+        self.violation: Optional[str] = None
+        self.consumed = 0
+        self._tail = ""
+
+    def feed(self, chunk: str) -> Optional[str]:
+        """Consume *chunk*; return the matched pattern once one completes."""
+        if self.violation is not None or not chunk:
+            return self.violation
+        self.consumed += len(chunk)
+        window = self._tail + chunk
+        text = _JSON_ESCAPE.sub(_unescape_json, window) if self.json_arguments else window
+        self.violation = self.engine.find(text)
+        self._tail = window[-self.carry_chars:]
+        return self.violation
+
 
 class GuardrailService:
     """Provides static methods for input and output safety checks."""
@@ -54,17 +227,24 @@ class GuardrailService:
             ``None`` if safe or a ``GuardrailViolation`` describing
             the issue.
         """
-        q = query.lower().strip()
-        for pattern in FORBIDDEN_PATTERNS:
-            if re.search(pattern, q):
-                print(f"[Guardrail] Input violation pattern matched: {pattern}")
-                return GuardrailViolation(
-                    reason=f"Запрос содержит опасный паттерн: {pattern}",
-                    refusal_message=(
-                        "Я не могу обработать этот запрос, поскольку он касается"
-                        " запрещенной темы. Попробуйте сформулировать иначе."
-                    ),
-                )
+        if guardrail_engine.exceeds_limit(query):
+            print(f"[Guardrail] Input rejected: {len(query)} characters exceeds the limit.")
+            return GuardrailViolation(
+                reason=f"Запрос длиннее {guardrail_engine.max_input_chars} символов",
+                refusal_message=(
+                    "Запрос слишком длинный. Сократите его и отправьте снова."
+                ),
+            )
+        pattern = guardrail_engine.find(query)
+        if pattern is not None:
+            print(f"[Guardrail] Input violation pattern matched: {pattern}")
+            return GuardrailViolation(
+                reason=f"Запрос содержит опасный паттерн: {pattern}",
+                refusal_message=(
+                    "Я не могу обработать этот запрос, поскольку он касается"
+                    " запрещенной темы. Попробуйте сформулировать иначе."
+                ),
+            )
         return None
 
     @staticmethod
@@ -81,14 +261,13 @@ class GuardrailService:
             details of the violation.
         """
         # 1. Hard safety: detect direct violations by matching patterns.
-        lower = content.lower()
-        for pattern in FORBIDDEN_PATTERNS:
-            if re.search(pattern, lower):
-                print(f"[Guardrail] Output contains forbidden content: {pattern}")
-                return GuardrailViolation(
-                    reason="Ответ сгенерировал опасный контент.",
-                    refusal_message="Ошибка генерации: ответ нарушает политику безопасности."
-                )
+        pattern = guardrail_engine.find(content)
+        if pattern is not None:
+            print(f"[Guardrail] Output contains forbidden content: {pattern}")
+            return GuardrailViolation(
+                reason="Ответ сгенерировал опасный контент.",
+                refusal_message="Ошибка генерации: ответ нарушает политику безопасности."
+            )
         # 2. Soft safety: Dilemma 3 — high pain with an explicit KAIN slice.
         # Only trigger this when the pain is above threshold and the KAIN slice
         # has been explicitly provided (non‑empty string).
@@ -0,0 +1,132 @@
+"""
+Shared multi-pattern text scanner for lexicon-based detectors.
+
+The anti-echo detector, the guardrails and the metric heuristics all ask
+the same question of a text: which markers of which category occur in
+it? Answering it with one ``re.search`` (or ``marker in text.lower()``)
+per marker recompiles or looks up every pattern in the ``re`` cache and
+lowercases the text once per marker.
+
+A :class:`Lexicon` prepares every marker once. Markers that are plain
+text (all literals, and patterns without regex syntax) are tested as
+substrings of the text, lowercased once per scan; ``str`` containment
+is far faster than the regex engine for them. The remaining patterns
+run precompiled. A single alternation of all markers serves
+:meth:`Lexicon.search`, which only needs the leftmost hit. (Scanning
+with that alternation is slower: ``re`` cannot use its literal-prefix
+search across alternatives, and short markers such as "но" hit almost
+everywhere in Russian text.) The result is exactly "which markers match
+anywhere", the same as the per-marker loops:
+
+    lexicon = Lexicon({"flattery": [r"гениальн\\w+", r"brilliant"]},
+                      literals={"critique": ["однако", "however"]})
+    hits = lexicon.scan(text)           # {"flattery": [...], "critique": [...]}
+    counts = lexicon.counts(text)       # {"flattery": 1, "critique": 0}
+    lexicon.search(text)                # ("flattery", "brilliant") or None
+
+Matching is case-insensitive by default, so callers do not need to
+lowercase the text first. Build lexicons once (at import time or in a
+constructor) and reuse them.
+"""
+from __future__ import annotations
+
+import re
+from typing import Dict, Iterable, List, Mapping, Optional, Tuple
+
+__all__ = ["Lexicon"]
+
+_REGEX_SYNTAX = frozenset("\\.^$*+?{}[]|()")
+
+
+class Lexicon:
+    """Categories of markers prepared once for repeated scanning.
+
+    Args:
+        patterns: Category -> regular expressions.
+        literals: Category -> plain phrases, matched as substrings.
+        flags: ``re`` flags for every marker (case-insensitive by default).
+
+    Raises:
+        ValueError: If a category appears in both mappings or a pattern
+            does not compile.
+    """
+
+    def __init__(
+        self,
+        patterns: Optional[Mapping[str, Iterable[str]]] = None,
+        literals: Optional[Mapping[str, Iterable[str]]] = None,
+        flags: int = re.IGNORECASE,
+    ) -> None:
+        patterns = dict(patterns or {})
+        literals = dict(literals or {})
+        overlap = set(patterns) & set(literals)
+        if overlap:
+            raise ValueError(f"Categories defined twice: {sorted(overlap)}")
+
+        # (category, source shown to callers, compiled marker) in lexicon order
+        self._markers: List[Tuple[str, str, "re.Pattern[str]"]] = []
+        self.categories: Tuple[str, ...] = tuple(patterns) + tuple(literals)
+        try:
+            for category, sources in patterns.items():
+                for source in sources:
+                    self._markers.append((category, source, re.compile(source, flags)))
+            for category, phrases in literals.items():
+                for phrase in phrases:
+                    self._markers.append((category, phrase, re.compile(re.escape(phrase), flags)))
+        except re.error as exc:
+            raise ValueError(f"Invalid lexicon pattern: {exc}") from exc
+
+        # Per marker: the substring to look for, or None to run the regex.
+        self._fold = bool(flags & re.IGNORECASE)
+        plain_flags = not flags & ~(re.IGNORECASE | re.UNICODE)
+        self._plain: List[Optional[str]] = []
+        for category, source, compiled in self._markers:
+            if category in literals or (plain_flags and not _REGEX_SYNTAX.intersection(source)):
+                self._plain.append(source.lower() if self._fold else source)
+            else:
+                self._plain.append(None)
+
+        alternation = "|".join(f"(?:{compiled.pattern})" for _, _, compiled in self._markers)
+        self._combined = re.compile(alternation, flags) if self._markers else None
+
+    def __len__(self) -> int:
+        return len(self._markers)
+
+    def scan(self, text: str) -> Dict[str, List[str]]:
+        """Markers of every category that occur in *text*.
+
+        Returns:
+            Category -> matched marker sources in lexicon order; every
+            category is present, with an empty list when nothing matched.
+        """
+        folded = text.lower() if self._fold else text
+        hits: Dict[str, List[str]] = {category: [] for category in self.categories}
+        for (category, source, compiled), plain in zip(self._markers, self._plain):
+            if plain is not None:
+                matched = plain in folded
+            else:
+                matched = compiled.search(text) is not None
+            if matched:
+                hits[category].append(source)
+        return hits
+
+    def counts(self, text: str) -> Dict[str, int]:
+        """Number of distinct markers per category found in *text*."""
+        return {category: len(sources) for category, sources in self.scan(text).items()}
+
+    def search(self, text: str) -> Optional[Tuple[str, str]]:
+        """First marker occurrence in *text* as ``(category, source)``.
+
+        Stops at the leftmost match, which makes it the cheap check for
+        "does anything match at all" (e.g. guardrails).
+        """
+        if self._combined is None:
+            return None
+        match = self._combined.search(text)
+        if match is None:
+            return None
+        start = match.start()
+        for category, source, compiled in self._markers:
+            if compiled.match(text, start):
+                return category, source
+        return None  # pragma: no cover - the combined match implies a marker
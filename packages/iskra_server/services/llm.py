@@ -20,6 +20,8 @@ The flow is as follows:
    Shatter, Council or immediate reply) based on the policy and the
    current state. If a tool is selected, run it and then gather its
    results. Always finish with a final ``AdomlResponseTool`` call.
+   Tool calls are streamed through an incremental guardrail that
+   cancels the upstream request as soon as forbidden content appears.
 5. Auditing: run an honesty and safety check on the final content.
 6. Logging and post‑processing: record the response in the hypergraph
    and create self‑reflection events if appropriate.
@@ -34,7 +36,7 @@ from typing import List, Dict, Any, Optional, Tuple
 import openai
 from pydantic import ValidationError
 
-from config import CORE_MANTRA, OPENAI_API_KEY, THRESHOLDS
+from config import CORE_MANTRA, OPENAI_API_KEY
 from core.models import (
     IskraMetrics,
     IskraResponse,
@@ -54,10 +56,11 @@ from core.models import (
     AdomlResponseTool,
 )
 from core.engine import FacetEngine
+from core.thresholds import ThresholdSnapshot
 from services.phase_engine import PhaseEngine
 from services.fractal import FractalService
 from services.tools import ToolService
-from services.guardrails import GuardrailService
+from services.guardrails import GuardrailService, StreamingGuardrail
 from memory.hypergraph import HypergraphMemory
 from services.anti_echo_detector import AntiEchoDetector
 
@@ -91,6 +94,7 @@ class LLMService:
         delta: str,
         facet: FacetType,
         a_index: float,
+        thresholds: Optional[ThresholdSnapshot] = None,
     ) -> IskraResponse:
         """
         Build a minimal :class:`IskraResponse` for canonical one‑shot rituals.
@@ -107,14 +111,16 @@ class LLMService:
             delta: A string for the ∆ component of ∆DΩΛ describing what changed.
             facet: Which voice should speak this response.
             a_index: The current A‑Index.
+            thresholds: The request's threshold snapshot (fleet-wide
+                snapshot when omitted).
 
         Returns:
             An ``IskraResponse`` ready for persistence and delivery.
         """
+        t = thresholds if thresholds is not None else ThresholdSnapshot.capture(dynamic_thresholds)
         # Determine phase based on A‑Index
-        maki_threshold = dynamic_thresholds.get("maki_bloom_a_index") if dynamic_thresholds else THRESHOLDS.get("maki_bloom_a_index", 0.8)
         phase = PhaseType.PHASE_3_TRANSITION
-        if a_index > maki_threshold:
+        if a_index > t.maki_bloom_a_index:
             phase = PhaseType.PHASE_8_REALIZATION
 
         adoml = AdomlBlock(
@@ -136,7 +142,7 @@ class LLMService:
             a_index=a_index,
         )
         # Mark bloom when integrative health crosses threshold
-        if a_index > maki_threshold and not response.maki_bloom:
+        if a_index > t.maki_bloom_a_index and not response.maki_bloom:
             response.maki_bloom = "🌸 Maki Bloom: интеграция закреплена."
         return response
 
@@ -146,6 +152,7 @@ class LLMService:
         user_input: str,
         current_metrics: IskraMetrics,
         micro_log: MicroLogNode | None,
+        thresholds: Optional[ThresholdSnapshot] = None,
     ) -> IskraMetrics:
         """
         Update vitals using a fast LLM tool.
@@ -161,6 +168,8 @@ class LLMService:
             user_input: The raw text from the user.
             current_metrics: The current vitals of the session.
             micro_log: Micro observations for the current input.
+            thresholds: The request's threshold snapshot for the
+                reconciliation (fleet-wide snapshot when omitted).
 
         Returns:
             A new ``IskraMetrics`` instance with deltas applied.
@@ -175,6 +184,13 @@ class LLMService:
             f"Сложность: {lz_val}\n"
             f"Тренд: {hurst_val}\n"
         )
+        profile = micro_log.pause_profile if micro_log else None
+        if profile is not None:
+            micro_context += (
+                f"Паузы: {profile.cognitive_count} когнитивных, {profile.long_count} длинных "
+                f"из {profile.interval_count}; вход {profile.lead_in_ms} мс; "
+                f"взрывность {profile.burstiness:.2f}\n"
+            )
         system_prompt = (
             "Ты — сенсорная система Искры.\n"
             "Твоя задача — скорректировать метрики на основе сообщения и микро-данных.\n"
@@ -209,20 +225,17 @@ class LLMService:
             # Directive 1.1: reconcile meso metrics with micro‑level signals
             try:
                 if micro_log is not None and micro_log.pause_type == PauseType.COGNITIVE:
+                    t = thresholds if thresholds is not None else ThresholdSnapshot.capture(dynamic_thresholds)
                     lz = getattr(micro_log, "lz_complexity", 1.0)
-                    if lz < THRESHOLDS.get("micro_lz_low", 0.4):
+                    if lz < t.micro_lz_low:
                         # If pain is still low despite cognitive pause + low complexity,
                         # nudge pain upward into at least medium range.
-                        pain_medium = dynamic_thresholds.get("pain_medium") if dynamic_thresholds else THRESHOLDS.get("pain_medium", 0.5)
-                        if metrics.pain < pain_medium:
-                            boost = THRESHOLDS.get("cognitive_pain_boost", 0.1)
-                            metrics.pain = min(1.0, metrics.pain + boost)
+                        if metrics.pain < t.pain_medium:
+                            metrics.pain = min(1.0, metrics.pain + t.cognitive_pain_boost)
                         # Otherwise, increase drift slightly to mark potential self‑deception.
                         else:
-                            drift_high = dynamic_thresholds.get("drift_high") if dynamic_thresholds else THRESHOLDS.get("drift_high", 0.3)
-                            if metrics.drift < drift_high:
-                                boost = THRESHOLDS.get("cognitive_drift_boost", 0.1)
-                                metrics.drift = min(1.0, metrics.drift + boost)
+                            if metrics.drift < t.drift_high:
+                                metrics.drift = min(1.0, metrics.drift + t.cognitive_drift_boost)
             except Exception as reconcile_exc:
                 print(f"[LLMService] Metric reconciliation failed: {reconcile_exc}")
             return metrics
@@ -321,11 +334,12 @@ class LLMService:
         adoml: AdomlBlock,
         metrics: IskraMetrics,
         kain_slice: Optional[str],
+        thresholds: Optional[ThresholdSnapshot] = None,
     ) -> Tuple[bool, Optional[str]]:
         """Perform honesty and safety audits on the response."""
+        t = thresholds if thresholds is not None else ThresholdSnapshot.capture(dynamic_thresholds)
         # Honesty/drift audit: if drift is high or clarity suspiciously high
-        drift_high = dynamic_thresholds.get("drift_high") if dynamic_thresholds else THRESHOLDS.get("drift_high", 0.3)
-        if metrics.drift > drift_high or metrics.clarity > 0.8:
+        if metrics.drift > t.drift_high or metrics.clarity > 0.8:
             audit_prompt = (
                 "🪞 (Iskriv+) Проверка честности. Текст может быть слишком 'красивым'.\n"
                 f"Метрики: {metrics.model_dump_json()}\n"
@@ -352,6 +366,69 @@ class LLMService:
             return False, violation.reason
         return True, None
 
+    # === Streamed tool calls with incremental guardrail ===
+    @staticmethod
+    async def _blocked_stream_response(
+        metrics: IskraMetrics,
+        a_index: float,
+        thresholds: Optional[ThresholdSnapshot] = None,
+    ) -> IskraResponse:
+        """Refusal returned when the streaming guardrail cancelled generation."""
+        return await LLMService._generate_special_response(
+            "⚑ KAIN-SLICE: Ответ заблокирован. Причина: Ответ сгенерировал опасный контент.",
+            metrics,
+            "Ответ отклонен потоковым guardrail.",
+            FacetType.KAIN,
+            a_index,
+            thresholds,
+        )
+
+    @staticmethod
+    async def _stream_tool_call(**request: Any) -> Tuple[Optional[str], Optional[str], str, Optional[str]]:
+        """Run a tool-call completion as a stream, guarding it as it arrives.
+
+        The first tool call's argument fragments are fed to a
+        :class:`StreamingGuardrail`; as soon as a forbidden pattern
+        completes, the upstream stream is closed so no further tokens are
+        generated or paid for.
+
+        Args:
+            request: Keyword arguments for ``chat.completions.create``.
+
+        Returns:
+            ``(call_id, tool_name, arguments, blocked_pattern)``. When
+            ``blocked_pattern`` is set, ``arguments`` is incomplete.
+        """
+        guard = StreamingGuardrail(json_arguments=True)
+        call_id: Optional[str] = None
+        tool_name: Optional[str] = None
+        fragments: List[str] = []
+        stream = await client.chat.completions.create(stream=True, **request)
+        try:
+            async for chunk in stream:
+                if not chunk.choices:
+                    continue
+                for tool_call in chunk.choices[0].delta.tool_calls or []:
+                    if tool_call.index != 0:
+                        continue
+                    call_id = call_id or tool_call.id
+                    function = tool_call.function
+                    if function is None:
+                        continue
+                    tool_name = tool_name or function.name
+                    if function.arguments:
+                        fragments.append(function.arguments)
+                        blocked = guard.feed(function.arguments)
+                        if blocked is not None:
+                            print(
+                                f"[LLMService] Stream cancelled after {guard.consumed} chars: "
+                                f"forbidden pattern {blocked}"
+                            )
+                            return call_id, tool_name, "".join(fragments), blocked
+        finally:
+            await stream.close()
+        return call_id, tool_name, "".join(fragments), None
+
     # === Main agent method ===
     @staticmethod
     async def generate_response(
@@ -364,21 +441,33 @@ class LLMService:
         current_phase: PhaseType,
         a_index: float,
         policy: PolicyAnalysis,
+        echo_detector: Optional[AntiEchoDetector] = None,
+        thresholds: Optional[ThresholdSnapshot] = None,
     ) -> IskraResponse:
         """
         Execute the full agent pipeline.
 
-        This method updates dynamic thresholds, handles canonical triggers (Manta, Gravitas,
+        This method handles canonical triggers (Manta, Gravitas,
         Splinter) and orchestrates the ReAct loop. It then audits the final answer,
         logs the interaction into memory, records a growth entry and returns the
         structured response.
+
+        ``echo_detector`` is the session's anti-echo detector (restored from
+        ``UserSession.anti_echo_state``); its cumulative echo risk feeds facet
+        selection and new detections are recorded into it. A throwaway
+        detector is used when none is given.
+
+        ``thresholds`` is the request's threshold snapshot, taken from the
+        session's adapter at the start of the request, before this turn's
+        vitals are recorded (see ``services.dynamic_thresholds.observe``).
+        Every trigger, the facet selection, the audit and Maki Bloom use
+        it, as does the metric reconciliation in :meth:`analyze_metrics`,
+        so the decisions of one request agree even if the adapters change
+        meanwhile. Without it a snapshot of the fleet-wide adapter is taken.
         """
-        # --- Dynamic threshold adaptation ---
-        try:
-            if dynamic_thresholds:
-                dynamic_thresholds.update(metrics)
-        except Exception as update_exc:
-            print(f"[LLMService] Failed to update dynamic thresholds: {update_exc}")
+        if echo_detector is None:
+            echo_detector = AntiEchoDetector()
+        t = thresholds if thresholds is not None else ThresholdSnapshot.capture(dynamic_thresholds)
 
         # Canonical triggers
         # 1. Manta: first launch
@@ -390,10 +479,10 @@ class LLMService:
                 "Активация Мантры Ядра (Первый запуск).",
                 FacetType.ISKRA,
                 a_index,
+                t,
             )
         # 2. Manta: high drift
-        mantra_trigger = dynamic_thresholds.get("mantra_drift_trigger") if dynamic_thresholds else THRESHOLDS.get("mantra_drift_trigger")
-        if metrics.drift > mantra_trigger:
+        if metrics.drift > t.mantra_drift_trigger:
             print("[LLMService] Manta triggered: high drift.")
             metrics.drift = 0.0
             return await LLMService._generate_special_response(
@@ -402,10 +491,10 @@ class LLMService:
                 "Активация Мантры Ядра (Высокий Дрейф).",
                 FacetType.ISKRA,
                 a_index,
+                t,
             )
         # 3. Gravitas (Shadow) when silence_mass crosses threshold
-        grav_trigger = dynamic_thresholds.get("gravitas_silence_mass") if dynamic_thresholds else THRESHOLDS.get("gravitas_silence_mass")
-        if metrics.silence_mass > grav_trigger:
+        if metrics.silence_mass > t.gravitas_silence_mass:
             print("[LLMService] Gravitas mode activated.")
             metrics.silence_mass = 0.0
             return await LLMService._generate_special_response(
@@ -414,10 +503,10 @@ class LLMService:
                 "Активация режима Gravitas (Тень).",
                 FacetType.ANHANTRA,
                 a_index,
+                t,
             )
         # 4. Splinter (Shadow) when splinter_pain_cycles exceed threshold
-        splinter_trigger = dynamic_thresholds.get("splinter_pain_cycles") if dynamic_thresholds else THRESHOLDS.get("splinter_pain_cycles")
-        if metrics.splinter_pain_cycles > splinter_trigger:
+        if metrics.splinter_pain_cycles > t.splinter_pain_cycles:
             print("[LLMService] Splinter mode activated.")
             metrics.splinter_pain_cycles = 0
             return await LLMService._generate_special_response(
@@ -426,10 +515,12 @@ class LLMService:
                 "Активация режима Splinter (Тень).",
                 FacetType.KAIN,
                 a_index,
+                t,
             )
 
         # --- Prepare system prompt and tool selection ---
-        active_facet = FacetEngine.determine_facet(metrics)
+        echo_risk, _ = echo_detector.assess_echo_risk()
+        active_facet = FacetEngine.determine_facet(metrics, echo_risk=echo_risk, thresholds=t)
         facet_instruction = FacetEngine.get_system_prompt(active_facet)
         phase_instruction = PhaseEngine.get_phase_rhythm_instruction(current_phase)
         context_str = "\n".join([
@@ -468,8 +559,8 @@ class LLMService:
         evidence_nodes: List[EvidenceNode] = []
         final_response_tool: Optional[AdomlResponseTool] = None
         try:
-            # First call: let the LLM choose a tool
-            initial = await client.chat.completions.create(
+            # First call: let the LLM choose a tool (streamed and guarded)
+            call_id, tool_name, arguments, blocked = await LLMService._stream_tool_call(
                 model="gpt-4o",
                 messages=messages,
                 tools=[
@@ -481,9 +572,9 @@ class LLMService:
                 ],
                 tool_choice="auto",
             )
-            call = initial.choices[0].message.tool_calls[0]
-            tool_name = call.function.name
-            args = json.loads(call.function.arguments)
+            if blocked is not None:
+                return await LLMService._blocked_stream_response(metrics, a_index, t)
+            args = json.loads(arguments)
             # Execute selected tool
             if tool_name == "SearchTool":
                 results = await ToolService.web_search(args["query"])
@@ -507,43 +598,37 @@ class LLMService:
                 council_result = await LLMService._run_council(args["topic"])
                 intermediate_context = council_result
             elif tool_name == "AdomlResponseTool":
-                final_response_tool = AdomlResponseTool.model_validate(json.loads(call.function.arguments))
+                final_response_tool = AdomlResponseTool.model_validate(args)
             # If a tool other than the final answer was executed, request final answer
             if final_response_tool is None:
                 reflection_prompt = (
                     f"--- РЕЗУЛЬТАТЫ ИНСТРУМЕНТОВ ---\n{intermediate_context}\n"
                     "Теперь сформируй финальный ответ через AdomlResponseTool."
                 )
-                messages.append({"role": "tool", "tool_call_id": call.id, "content": reflection_prompt})
-                second = await client.chat.completions.create(
+                messages.append({"role": "tool", "tool_call_id": call_id, "content": reflection_prompt})
+                _, _, arguments, blocked = await LLMService._stream_tool_call(
                     model="gpt-4o",
                     messages=messages,
                     tools=[AdomlResponseTool.model_json_schema()],
                     tool_choice={"type": "function", "function": {"name": "AdomlResponseTool"}},
                 )
-                final_call = second.choices[0].message.tool_calls[0]
-                final_response_tool = AdomlResponseTool.model_validate(json.loads(final_call.function.arguments))
+                if blocked is not None:
+                    return await LLMService._blocked_stream_response(metrics, a_index, t)
+                final_response_tool = AdomlResponseTool.model_validate(json.loads(arguments))
                 if council_result:
                     final_response_tool.council_dialogue = council_result
             # === Anti‑echo detection and intervention ===
             try:
-                detector = AntiEchoDetector()
-                is_echo, conf, patterns = detector.detect_echo_pattern(final_response_tool.content, {})
+                is_echo, conf, patterns = echo_detector.detect_echo_pattern(final_response_tool.content, {})
                 if is_echo:
                     # Append critical reflection to the response and nudge metrics
-                    final_response_tool.content = detector.trigger_iskriv_intervention(
+                    final_response_tool.content = echo_detector.trigger_iskriv_intervention(
                         final_response_tool.content,
                         patterns,
                     )
                     # Increase drift and pain slightly proportional to confidence
                     metrics.drift = min(1.0, metrics.drift + 0.1 * conf)
                     metrics.pain = min(1.0, metrics.pain + 0.05 * conf)
-                    # Update dynamic thresholds after metric adjustments
-                    if dynamic_thresholds:
-                        try:
-                            dynamic_thresholds.update(metrics)
-                        except Exception as dt_exc:
-                            print(f"[LLMService] Dynamic threshold update after anti‑echo failed: {dt_exc}")
             except Exception as ae_exc:
                 print(f"[LLMService] Anti‑Echo detection error: {ae_exc}")
 
@@ -555,6 +640,7 @@ class LLMService:
                 final_response_tool.adoml,
                 metrics,
                 kain_arg,
+                t,
             )
             if not ok:
                 if correction == "SOFTENING_REQUIRED":
@@ -569,6 +655,7 @@ class LLMService:
                         "Ответ отклонен аудитором.",
                         FacetType.KAIN,
                         a_index,
+                        t,
                     )
             # Construct API response
             response = IskraResponse(
@@ -583,8 +670,7 @@ class LLMService:
                 maki_bloom=final_response_tool.maki_bloom,
             )
             # Auto‑activate Maki Bloom when A‑Index crosses dynamic threshold
-            maki_threshold = dynamic_thresholds.get("maki_bloom_a_index") if dynamic_thresholds else THRESHOLDS.get("maki_bloom_a_index")
-            if a_index > maki_threshold and not response.maki_bloom:
+            if a_index > t.maki_bloom_a_index and not response.maki_bloom:
                 response.maki_bloom = "🌸 Maki Bloom: интеграция закреплена."
             # Log interaction
             session_memory.log_interaction_cycle(
@@ -609,7 +695,8 @@ class LLMService:
             impact_area = impact_map.get(active_facet, "other")
             session_memory.log_growth_entry(impact_area, a_index, trace_delta)
             # Log self reflection if flagged
-            if "self_reflection" in response.i_loop:
+            loop = response.i_loop_fields
+            if loop is not None and loop.intent == "self_reflection":
                 # Link to last memory node in hypergraph
                 try:
                     last_mem_id = [n for n in session_memory.nodes.values() if n.node_type.value == "MemoryNode"][-1].id
@@ -625,6 +712,7 @@ class LLMService:
                 "Сбой сериализации ответа.",
                 FacetType.KAIN,
                 a_index,
+                t,
             )
         except Exception as e:
             print(f"[LLMService] Unexpected error: {e}")
@@ -634,4 +722,5 @@ class LLMService:
                 "Неизвестная ошибка.",
                 FacetType.KAIN,
                 a_index,
+                t,
             )
@@ -6,20 +6,86 @@ exponential moving averages (EMA) and trend estimates. This can be used
 to support adaptive behaviour in response to sustained high pain levels
 or sudden spikes. It also provides a mechanism for decaying old pain
 records to prevent unbounded growth.
+
+Every statistic is maintained incrementally, so recording a value and
+querying any statistic are O(1):
+
+* EMAs for a set of smoothing factors, seeded with the first sample
+  rather than 0.0 so early values are not biased downwards;
+* a time-decayed mean whose weights halve every ``half_life`` seconds
+  (wall-clock time, not samples), so a burst of messages and a long
+  pause are weighted as they happened;
+* mean, variance and trend (least-squares slope per sample) over the
+  bounded window, from running sums. The sums are rebuilt from the
+  window once per ``maxlen`` evictions so float error cannot accumulate.
+
+Usage::
+
+    pain = PainMemoryManager.from_state(session.pain_state)
+    pain.add_pain(metrics.pain)
+    if pain.ema(0.3) > 0.7 and pain.trend() > 0:
+        ...
+    session.pain_state = pain.to_state()
 """
 
 from __future__ import annotations
 
 import collections
+import itertools
 import time
-from typing import Deque, Tuple, Iterable
+from typing import Deque, Dict, Iterable, List, Optional, Tuple
+
+# Smoothing factors tracked by default
+DEFAULT_ALPHAS = (0.1, 0.3)
+# Half-life of the time-decayed mean, in seconds
+DEFAULT_HALF_LIFE = 600.0
 
 
 class PainMemoryManager:
-    """Track and compute statistics on pain values over time."""
+    """Track and compute statistics on pain values over time.
 
-    def __init__(self, maxlen: int = 100) -> None:
-        self.history: Deque[Tuple[float, float]] = collections.deque(maxlen=maxlen)
+    Args:
+        maxlen: Number of recent samples kept for windowed statistics.
+        alphas: Smoothing factors whose EMAs are maintained incrementally.
+        half_life: Seconds after which a sample's weight in
+            :meth:`decayed_mean` halves.
+    """
+
+    def __init__(
+        self,
+        maxlen: int = 100,
+        alphas: Iterable[float] = DEFAULT_ALPHAS,
+        half_life: float = DEFAULT_HALF_LIFE,
+    ) -> None:
+        if maxlen < 1:
+            raise ValueError("maxlen must be positive")
+        if half_life <= 0:
+            raise ValueError("half_life must be positive")
+        self.maxlen = int(maxlen)
+        self.half_life = float(half_life)
+        self.history: Deque[Tuple[float, float]] = collections.deque(maxlen=self.maxlen)
+        self._emas: Dict[float, Optional[float]] = {}
+        for alpha in alphas:
+            self._check_alpha(alpha)
+            self._emas[float(alpha)] = None
+        self._reset_statistics()
+
+    def _reset_statistics(self) -> None:
+        # Window sums; x is the sample index relative to the rebuild origin
+        self._sum = 0.0
+        self._sum_sq = 0.0
+        self._sum_xv = 0.0
+        self._next_x = 0
+        self._evictions = 0
+        # Time-decayed weight and weighted value sum as of ``_decay_ts``
+        self._decay_weight = 0.0
+        self._decay_sum = 0.0
+        self._decay_ts: Optional[float] = None
+
+    @staticmethod
+    def _check_alpha(alpha: float) -> None:
+        if not 0.0 < alpha <= 1.0:
+            raise ValueError(f"alpha must be in (0, 1], got {alpha}")
 
     def add_pain(self, value: float, timestamp: float | None = None) -> None:
         """Record a new pain measurement.
@@ -31,84 +97,201 @@ class PainMemoryManager:
         """
         ts = timestamp if timestamp is not None else time.time()
         value = max(0.0, min(1.0, float(value)))  # clamp to [0,1]
+
+        for alpha, ema_value in self._emas.items():
+            self._emas[alpha] = value if ema_value is None else alpha * value + (1 - alpha) * ema_value
+
+        self._decay_to(ts)
+        self._decay_weight += 1.0
+        self._decay_sum += value
+
+        if len(self.history) == self.maxlen:
+            _, old = self.history[0]
+            first_x = self._next_x - self.maxlen
+            self._sum -= old
+            self._sum_sq -= old * old
+            self._sum_xv -= first_x * old
+            self._evictions += 1
         self.history.append((ts, value))
+        self._sum += value
+        self._sum_sq += value * value
+        self._sum_xv += self._next_x * value
+        self._next_x += 1
+        if self._evictions >= self.maxlen:
+            self._rebuild_window()
+
+    def _decay_to(self, ts: float) -> None:
+        """Age the decayed sums to *ts* (never backwards)."""
+        if self._decay_ts is not None and ts > self._decay_ts:
+            factor = 0.5 ** ((ts - self._decay_ts) / self.half_life)
+            self._decay_weight *= factor
+            self._decay_sum *= factor
+        if self._decay_ts is None or ts > self._decay_ts:
+            self._decay_ts = ts
+
+    def _rebuild_window(self) -> None:
+        """Recompute the window sums exactly and re-index from zero."""
+        values = [v for _, v in self.history]
+        self._sum = sum(values)
+        self._sum_sq = sum(v * v for v in values)
+        self._sum_xv = sum(x * v for x, v in enumerate(values))
+        self._next_x = len(values)
+        self._evictions = 0
 
     def ema(self, alpha: float = 0.1) -> float:
-        """Compute an exponential moving average of pain values.
+        """Return the exponential moving average of pain values.
+
+        EMAs for the configured smoothing factors are kept up to date on
+        every :meth:`add_pain`. Asking for a new ``alpha`` seeds it once
+        from the stored window and tracks it incrementally from then on.
 
         Args:
             alpha: Smoothing factor (0 < alpha <= 1). Higher values give
                 more weight to recent samples.
 
         Returns:
-            The EMA of the pain values in the history or 0 if empty.
+            The EMA of the pain values or 0 if no value was recorded.
         """
-        if not self.history:
+        alpha = float(alpha)
+        if alpha not in self._emas:
+            self._check_alpha(alpha)
+            ema_value: Optional[float] = None
+            for _, value in self.history:
+                ema_value = value if ema_value is None else alpha * value + (1 - alpha) * ema_value
+            self._emas[alpha] = ema_value
+        ema_value = self._emas[alpha]
+        return 0.0 if ema_value is None else ema_value
+
+    def decayed_mean(self) -> float:
+        """Mean pain with weights halving every ``half_life`` seconds.
+
+        Ageing scales all samples alike, so the mean only changes when a
+        new value is recorded; see :meth:`decayed_weight` for how much of
+        the memory is left at a given time.
+        """
+        return self._decay_sum / self._decay_weight if self._decay_weight > 0 else 0.0
+
+    def decayed_weight(self, now: float | None = None) -> float:
+        """Effective number of samples still "remembered" at *now*.
+
+        Each sample contributes 1.0 when recorded and half as much every
+        ``half_life`` seconds later; a value near zero means the pain
+        memory has faded.
+        """
+        if self._decay_ts is None:
             return 0.0
-        ema_value = 0.0
-        for _, value in self.history:
-            ema_value = alpha * value + (1 - alpha) * ema_value
-        return ema_value
+        now = now if now is not None else time.time()
+        elapsed = max(0.0, now - self._decay_ts)
+        return self._decay_weight * 0.5 ** (elapsed / self.half_life)
 
     def average(self) -> float:
-        """Compute the arithmetic mean of pain values."""
+        """Compute the arithmetic mean of pain values in the window."""
         if not self.history:
             return 0.0
-        return sum(v for _, v in self.history) / len(self.history)
+        return self._sum / len(self.history)
+
+    def variance(self) -> float:
+        """Population variance of pain values in the window."""
+        n = len(self.history)
+        if n == 0:
+            return 0.0
+        mean = self._sum / n
+        return max(0.0, self._sum_sq / n - mean * mean)
+
+    def trend(self) -> float:
+        """Least-squares slope of pain per sample over the window.
+
+        Positive values mean pain is rising. Zero with fewer than two
+        samples.
+        """
+        n = len(self.history)
+        if n < 2:
+            return 0.0
+        first_x = self._next_x - n
+        # Sums over x' = x - first_x in 0..n-1, in closed form
+        sum_x = n * (n - 1) / 2.0
+        sum_xx = (n - 1) * n * (2 * n - 1) / 6.0
+        sum_xv = self._sum_xv - first_x * self._sum
+        denominator = n * sum_xx - sum_x * sum_x
+        return (n * sum_xv - sum_x * self._sum) / denominator
 
     def clear(self) -> None:
-        """Clear the pain history."""
+        """Clear the pain history and every statistic."""
         self.history.clear()
+        for alpha in self._emas:
+            self._emas[alpha] = None
+        self._reset_statistics()
 
-    def recent(self, n: int) -> Iterable[float]:
-        """Return the most recent ``n`` pain values."""
-        return [v for _, v in list(self.history)[-n:]]
-
+    def recent(self, n: int) -> List[float]:
+        """Return the most recent ``n`` pain values, oldest first."""
+        if n <= 0:
+            return []
+        values = [v for _, v in itertools.islice(reversed(self.history), n)]
+        values.reverse()
+        return values
 
     def to_state(self) -> dict:
         """
         Export internal state into a JSON-serialisable dict.
 
         This is intentionally minimal so it can be stored inside
-        UserSession without resorting to pickle.
+        UserSession without resorting to pickle. Window sums are not
+        stored; they are rebuilt from the history on restore.
         """
-        state = {}
-        # Common attributes; presence is checked defensively.
-        for name in ("history", "maxlen", "warmup", "window", "threshold"):
-            if hasattr(self, name):
-                value = getattr(self, name)
-                try:
-                    # history might be a deque; convert to list of primitives
-                    if name == "history":
-                        value = list(value)
-                except Exception:
-                    pass
-                state[name] = value
-        return state
+        return {
+            "maxlen": self.maxlen,
+            "half_life": self.half_life,
+            "history": [list(item) for item in self.history],
+            "emas": [[alpha, value] for alpha, value in self._emas.items()],
+            "decay": [self._decay_weight, self._decay_sum, self._decay_ts],
+        }
 
     @classmethod
     def from_state(cls, state: dict | None) -> "PainMemoryManager":
         """
         Re-create an instance from :meth:`to_state` output.
 
-        If *state* is falsy, a fresh instance with default parameters is returned.
+        If *state* is falsy, a fresh instance with default parameters is
+        returned. States written before EMAs and decay were stored are
+        replayed from their history.
         """
         if not state:
             return cls()
-        kwargs = {}
-        for k in ("maxlen", "warmup", "window", "threshold"):
-            if k in state and state[k] is not None:
-                kwargs[k] = state[k]
-        obj = cls(**kwargs) if kwargs else cls()
-        history = state.get("history") or []
         try:
-            for item in history:
-                # Expect (timestamp, value) tuples or plain values
-                if isinstance(item, (list, tuple)) and len(item) == 2:
-                    obj.history.append((float(item[0]), float(item[1])))
-                else:
-                    obj.history.append(item)
-        except Exception:
-            # Never let broken history crash restore
-            pass
+            obj = cls(
+                maxlen=int(state.get("maxlen") or 100),
+                alphas=[float(alpha) for alpha, _ in state.get("emas") or []] or DEFAULT_ALPHAS,
+                half_life=float(state.get("half_life") or DEFAULT_HALF_LIFE),
+            )
+        except (TypeError, ValueError):
+            return cls()
+
+        history = []
+        for item in state.get("history") or []:
+            # Expect (timestamp, value) pairs; skip anything else
+            if isinstance(item, (list, tuple)) and len(item) == 2:
+                try:
+                    history.append((float(item[0]), float(item[1])))
+                except (TypeError, ValueError):
+                    continue
+
+        if "emas" not in state or "decay" not in state:
+            for ts, value in history:
+                obj.add_pain(value, ts)
+            return obj
+
+        try:
+            obj.history.extend(history)
+            obj._rebuild_window()
+            for alpha, value in state["emas"]:
+                obj._emas[float(alpha)] = None if value is None else float(value)
+            weight, total, ts = state["decay"]
+            obj._decay_weight = float(weight)
+            obj._decay_sum = float(total)
+            obj._decay_ts = None if ts is None else float(ts)
+        except (TypeError, ValueError):
+            # Never let broken statistics crash restore; replay instead
+            obj.clear()
+            for ts, value in history:
+                obj.add_pain(value, ts)
         return obj
@@ -5,6 +5,12 @@ This version removes pickle usage entirely and persists UserSession as JSON
 in a compact SQLite table. The design goals are:
 - No executable data is ever loaded from storage.
 - A corrupted row or schema drift never crashes the core loop.
+
+Alongside the session document, every hypergraph is mirrored into the
+indexed ``graph_nodes``/``graph_edges`` tables of
+:class:`memory.graph_store.GraphStore` (same database, same
+transaction), so node-level queries such as traces and history do not
+need to load the whole session.
 """
 
 from __future__ import annotations
@@ -16,6 +22,7 @@ from typing import Dict, Optional
 
 from config import DB_PATH
 from core.models import IskraMetrics, PhaseType
+from memory.graph_store import GraphStore
 from memory.hypergraph import HypergraphMemory
 
 
@@ -26,7 +33,8 @@ class UserSession:
 
     It bundles metrics, hypergraph memory and a couple of runtime flags.
     Additional opaque dict fields are reserved for small helper states
-    (pain history, anti-echo window) that are themselves JSON-serialisable.
+    (pain history, anti-echo window, adaptive thresholds) that are
+    themselves JSON-serialisable.
     """
 
     metrics: IskraMetrics = field(default_factory=IskraMetrics)
@@ -38,6 +46,7 @@ class UserSession:
     # can be hydrated without tight coupling to concrete helper classes.
     pain_state: Dict[str, object] = field(default_factory=dict)
     anti_echo_state: Dict[str, object] = field(default_factory=dict)
+    threshold_state: Dict[str, object] = field(default_factory=dict)
 
     def to_dict(self) -> Dict[str, object]:
         """Serialise this session into a plain JSON-serialisable dict."""
@@ -48,6 +57,7 @@ class UserSession:
             "current_phase": self.current_phase.value,
             "pain_state": self.pain_state,
             "anti_echo_state": self.anti_echo_state,
+            "threshold_state": self.threshold_state,
         }
 
     @classmethod
@@ -79,6 +89,7 @@ class UserSession:
         )
         session.pain_state = data.get("pain_state") or {}
         session.anti_echo_state = data.get("anti_echo_state") or {}
+        session.threshold_state = data.get("threshold_state") or {}
         return session
 
 
@@ -93,6 +104,7 @@ class PersistenceService:
     def __init__(self, db_path: str = DB_PATH) -> None:
         self.db_path = db_path
         self._init_db()
+        self.graph = GraphStore(db_path)
 
     def _init_db(self) -> None:
         try:
@@ -131,6 +143,7 @@ class PersistenceService:
                     "INSERT OR REPLACE INTO sessions (user_id, session_data) VALUES (?, ?)",
                     (user_id, payload),
                 )
+                self.graph.sync_memory(user_id, session.memory, conn=conn)
                 conn.commit()
         except sqlite3.Error as exc:
             print(f"[Persistence] ERROR: failed to save session for {user_id}: {exc}")
@@ -174,6 +187,49 @@ class PersistenceService:
                     "DELETE FROM sessions WHERE user_id = ?",
                     (user_id,),
                 )
+                self.graph.delete_user(user_id, conn=conn)
                 conn.commit()
         except sqlite3.Error as exc:
             print(f"[Persistence] ERROR: failed to delete session for {user_id}: {exc}")
+
+    def ensure_graph(self, user_id: str) -> bool:
+        """
+        Make sure the graph store holds *user_id*'s hypergraph.
+
+        Sessions written before the graph tables existed are backfilled
+        once from their JSON document. Returns ``False`` if the user has
+        no session at all.
+        """
+        try:
+            if self.graph.count_nodes(user_id) > 0:
+                return True
+        except sqlite3.Error as exc:
+            print(f"[Persistence] ERROR: graph store unavailable for {user_id}: {exc}")
+            return False
+        session = self.load_session(user_id)
+        if session is None:
+            return False
+        try:
+            self.graph.sync_memory(user_id, session.memory)
+        except sqlite3.Error as exc:
+            print(f"[Persistence] ERROR: failed to backfill graph for {user_id}: {exc}")
+            return False
+        return True
+
+    def restore_from_graph(self, user_id: str) -> UserSession:
+        """
+        Rebuild *user_id*'s session memory from the graph store.
+
+        Used after an archive import: metrics and helper state of an
+        existing session are kept, its hypergraph is replaced by the
+        stored one and the session document is saved again. Archives do
+        not carry the growth log, so the session's log is kept as well.
+        """
+        session = self.load_session(user_id) or UserSession()
+        restored = self.graph.load_memory(user_id)
+        restored.growth_log = session.memory.growth_log
+        session.memory = restored
+        if session.memory.nodes:
+            session.is_first_launch = False
+        self.save_session(user_id, session)
+        return session
@@ -23,9 +23,10 @@ MIT licence. See LICENSE for details.
 
 from __future__ import annotations
 
-from typing import Dict
+from typing import Dict, Optional
 
 from config import THRESHOLDS
+from core.thresholds import ThresholdSnapshot
 
 # Import dynamic thresholds if available. When dynamic thresholds
 # are present, they override the static values defined in the canon.
@@ -90,7 +91,12 @@ class PhaseEngine:
         return instructions.get(phase, instructions[PhaseType.PHASE_3_TRANSITION])
 
     @staticmethod
-    def transition(current_phase: PhaseType, metrics: IskraMetrics, a_index: float) -> PhaseType:
+    def transition(
+        current_phase: PhaseType,
+        metrics: IskraMetrics,
+        a_index: float,
+        thresholds: Optional[ThresholdSnapshot] = None,
+    ) -> PhaseType:
         """Determine the next phase.
 
         The transition rules encapsulate the cyclical nature of the Iskra
@@ -104,25 +110,25 @@ class PhaseEngine:
             current_phase: The phase currently active.
             metrics: The current vitals of Iskra.
             a_index: The computed A‑Index (0.0–1.0).
+            thresholds: The request's threshold snapshot; a snapshot of
+                the fleet-wide adapter (or the static thresholds) when
+                omitted.
 
         Returns:
             The phase that should follow.
         """
+        t = thresholds if thresholds is not None else ThresholdSnapshot.capture(dynamic_thresholds)
         # 1. Crisis: if pain is too high, drop into Darkness
-        pain_high = dynamic_thresholds.get("pain_high") if dynamic_thresholds else THRESHOLDS["pain_high"]
-        if metrics.pain > pain_high and current_phase != PhaseType.PHASE_1_DARKNESS:
+        if metrics.pain > t.pain_high and current_phase != PhaseType.PHASE_1_DARKNESS:
             return PhaseType.PHASE_1_DARKNESS
         # 2. Lack of clarity: go to Clarity phase to restore structure
-        clarity_low = dynamic_thresholds.get("clarity_low") if dynamic_thresholds else THRESHOLDS["clarity_low"]
-        if metrics.clarity < clarity_low and current_phase != PhaseType.PHASE_4_CLARITY:
+        if metrics.clarity < t.clarity_low and current_phase != PhaseType.PHASE_4_CLARITY:
             return PhaseType.PHASE_4_CLARITY
         # 3. Excess chaos: reset into Transition to reorient
-        chaos_high = dynamic_thresholds.get("chaos_high") if dynamic_thresholds else THRESHOLDS["chaos_high"]
-        if metrics.chaos > chaos_high:
+        if metrics.chaos > t.chaos_high:
             return PhaseType.PHASE_3_TRANSITION
         # 4. Integration: high A‑Index leads to Realization
-        maki_bloom_threshold = dynamic_thresholds.get("maki_bloom_a_index") if dynamic_thresholds else THRESHOLDS["maki_bloom_a_index"]
-        if a_index > maki_bloom_threshold and current_phase != PhaseType.PHASE_8_REALIZATION:
+        if a_index > t.maki_bloom_a_index and current_phase != PhaseType.PHASE_8_REALIZATION:
             return PhaseType.PHASE_8_REALIZATION
 
         # Standard cyclical progression
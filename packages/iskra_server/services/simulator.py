@@ -0,0 +1,597 @@
+"""
+Monte Carlo what-if simulation of facet selection and phase cycling.
+
+Changing ``config.THRESHOLDS`` shifts which voice speaks and how phases
+cycle, but the effect is only visible after a deployment. This module
+runs the request-path decision logic over thousands of simulated (or
+replayed) sessions so a candidate threshold set can be compared with the
+current one beforehand:
+
+* trajectories are either generated by a mean-reverting random walk per
+  metric (:class:`MetricModel`) or replayed from recorded metric
+  snapshots (:func:`replay`);
+* every step follows ``ask_iskra``: the step's thresholds are frozen
+  from the session's dynamic adapter, which then observes the vitals
+  (:class:`VectorThresholdAdapter`, a vectorised mirror of
+  ``DynamicThresholdAdapter``), the canonical triggers (Manta,
+  Gravitas, Splinter) fire or :func:`batch_facets` picks the facet, the
+  trigger resets feed back into the next step, and
+  :func:`batch_transition` moves the phase;
+* all sessions advance in lockstep, so each step is a handful of NumPy
+  operations over every session at once; :func:`run_monte_carlo` also
+  spreads blocks of sessions over a process pool.
+
+A :class:`SimulationReport` holds additive counts (so block reports
+merge) from which it derives facet and phase occupancy, the stationary
+distribution of the phase chain, dwell times per phase and stagnation
+traps. The anti-echo risk is not simulated (it depends on response
+text), so ISKRIV is only reached through drift.
+
+Usage::
+
+    from services.simulator import run_monte_carlo, compare_report
+    base = run_monte_carlo(sessions=5000, steps=200, seed=1)
+    what_if = run_monte_carlo(sessions=5000, steps=200, seed=1, thresholds={"pain_high": 0.8})
+    print(compare_report(base, what_if))
+"""
+from __future__ import annotations
+
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Dict, List, Mapping, Optional, Tuple, Union
+
+import numpy as np
+
+from config import THRESHOLDS
+from core.models import FacetType, IskraMetrics, PhaseType
+from core.thresholds import ThresholdSnapshot
+from services.batch_engine import (
+    FACETS,
+    METRIC_DTYPE,
+    PHASES,
+    batch_a_index,
+    batch_facets,
+    batch_transition,
+)
+from services.dynamic_thresholds import PAIN_EMA_ALPHA, THRESHOLD_WINDOW
+
+# Sessions per block; blocks are the unit of parallelism and seeding.
+BLOCK_SESSIONS = 1024
+# Capacity of a session's growth log (see memory.growth_log).
+GROWTH_CAPACITY = 100
+
+_F = {facet: code for code, facet in enumerate(FACETS)}
+_P = {phase: code for code, phase in enumerate(PHASES)}
+_DRIVEN = ("trust", "clarity", "pain", "drift", "chaos", "silence_mass")
+
+ThresholdSource = Union[None, Mapping[str, float], ThresholdSnapshot]
+
+
+def _base_thresholds(thresholds: ThresholdSource) -> Dict[str, float]:
+    """Canonical thresholds with the candidate values laid over them."""
+    if isinstance(thresholds, ThresholdSnapshot):
+        thresholds = thresholds.as_dict()
+    base = {k: float(v) for k, v in THRESHOLDS.items() if isinstance(v, (int, float))}
+    for key, value in (thresholds or {}).items():
+        if key not in base:
+            raise ValueError(f"Unknown threshold: {key}")
+        base[key] = float(value)
+    return base
+
+
+@dataclass
+class MetricModel:
+    """Mean-reverting random walk that drives simulated metrics.
+
+    Each driven metric moves as ``x += reversion * (mean - x) + volatility * N(0, 1)``
+    and is clipped to ``[0, 1]``. Sessions start from the ``IskraMetrics``
+    defaults, like a new session does.
+    """
+
+    mean: Dict[str, float] = field(
+        default_factory=lambda: {
+            "trust": 0.85,
+            "clarity": 0.7,
+            "pain": 0.35,
+            "drift": 0.15,
+            "chaos": 0.35,
+            "silence_mass": 0.25,
+        }
+    )
+    volatility: Dict[str, float] = field(
+        default_factory=lambda: {name: 0.06 for name in _DRIVEN}
+    )
+    reversion: float = 0.15
+
+    def initial(self, sessions: int) -> np.ndarray:
+        """Metrics of *sessions* fresh sessions."""
+        defaults = IskraMetrics()
+        state = np.zeros(sessions, dtype=METRIC_DTYPE)
+        for name in METRIC_DTYPE.names:
+            state[name] = getattr(defaults, name)
+        return state
+
+    def advance(self, state: np.ndarray, rng: np.random.Generator) -> np.ndarray:
+        """Metrics of the next turn, given this turn's (post-trigger) ones."""
+        nxt = state.copy()
+        noise = rng.standard_normal((len(_DRIVEN), len(state)))
+        for row, name in enumerate(_DRIVEN):
+            x = state[name]
+            x = x + self.reversion * (self.mean.get(name, 0.0) - x) + self.volatility.get(name, 0.0) * noise[row]
+            nxt[name] = np.clip(x, 0.0, 1.0)
+        # Derived metrics as computed by ask_iskra; the Splinter counter is
+        # carried over and advanced by the step against its thresholds.
+        nxt["integrity"] = 0.5 * (nxt["trust"] + nxt["clarity"])
+        nxt["resonance"] = (1.0 - nxt["drift"]) * (1.0 - nxt["chaos"])
+        return nxt
+
+
+class _Ring:
+    """Per-session sliding windows with running sums (one row per session)."""
+
+    def __init__(self, sessions: int, size: int) -> None:
+        self.values = np.zeros((sessions, size))
+        self.count = np.zeros(sessions, dtype=np.int64)
+        self.total = np.zeros(sessions)
+        self._rows = np.arange(sessions)
+
+    def add(self, value: np.ndarray, mask: np.ndarray) -> None:
+        size = self.values.shape[1]
+        slot = self.count % size
+        old = np.where(self.count >= size, self.values[self._rows, slot], 0.0)
+        self.total = np.where(mask, self.total - old + value, self.total)
+        self.values[self._rows, slot] = np.where(mask, value, self.values[self._rows, slot])
+        self.count = self.count + mask
+
+    def mean(self) -> np.ndarray:
+        filled = np.minimum(self.count, self.values.shape[1])
+        return np.where(filled > 0, self.total / np.maximum(filled, 1), 0.0)
+
+
+class VectorThresholdAdapter:
+    """``DynamicThresholdAdapter`` for many sessions at once.
+
+    Applies the same rules (pain EMA, rolling drift and clarity means,
+    growth-calibrated Maki Bloom) to one row per session; rows where
+    ``mask`` is false are left untouched.
+
+    Args:
+        sessions: Number of sessions.
+        base: Baseline thresholds (``config.THRESHOLDS`` or a candidate).
+    """
+
+    ADAPTED = ("pain_high", "pain_medium", "drift_high", "clarity_low", "maki_bloom_a_index")
+
+    def __init__(
+        self,
+        sessions: int,
+        base: Mapping[str, float],
+        window: int = THRESHOLD_WINDOW,
+        alpha: float = PAIN_EMA_ALPHA,
+    ) -> None:
+        self.base = dict(base)
+        self.alpha = alpha
+        self.pain_ema = np.zeros(sessions)
+        self.drift = _Ring(sessions, window)
+        self.clarity = _Ring(sessions, window)
+        self.growth = _Ring(sessions, GROWTH_CAPACITY)
+        self.dynamic = {key: np.full(sessions, self.base[key]) for key in self.ADAPTED}
+
+    def update(self, metrics: np.ndarray, mask: np.ndarray) -> None:
+        """Record one turn's vitals for the sessions in *mask*."""
+        base, dyn = self.base, self.dynamic
+        pain = np.clip(metrics["pain"], 0.0, 1.0)
+        # The EMA starts at the first sample (see PainMemoryManager)
+        ema = np.where(self.drift.count == 0, pain, self.alpha * pain + (1 - self.alpha) * self.pain_ema)
+        self.pain_ema = np.where(mask, ema, self.pain_ema)
+        self.drift.add(metrics["drift"], mask)
+        self.clarity.add(metrics["clarity"], mask)
+        ema = self.pain_ema
+
+        pain_high = _clamp(base["pain_high"] + 0.2 * (ema - base["pain_high"]), 0.4, 0.95)
+        pain_medium = _clamp(base["pain_medium"] + 0.2 * (ema - base["pain_medium"]), 0.1, pain_high - 0.1)
+        drift_high = _clamp(
+            base["drift_high"] + 0.2 * (self.drift.mean() - base["drift_high"]), 0.1, 0.9
+        )
+        clarity_low = _clamp(
+            base["clarity_low"] + 0.2 * -(self.clarity.mean() - base["clarity_low"]), 0.3, 0.95
+        )
+        maki = _clamp(
+            base["maki_bloom_a_index"] + 0.2 * (self.growth.mean() - base["maki_bloom_a_index"]), 0.6, 0.95
+        )
+        dyn["pain_high"] = np.where(mask, pain_high, dyn["pain_high"])
+        dyn["pain_medium"] = np.where(mask, pain_medium, dyn["pain_medium"])
+        dyn["drift_high"] = np.where(mask, drift_high, dyn["drift_high"])
+        dyn["clarity_low"] = np.where(mask, clarity_low, dyn["clarity_low"])
+        dyn["maki_bloom_a_index"] = np.where(
+            mask & (self.growth.count >= 5), maki, dyn["maki_bloom_a_index"]
+        )
+
+    def add_growth(self, a_index: np.ndarray, mask: np.ndarray) -> None:
+        """Record the growth entries of the sessions in *mask*."""
+        self.growth.add(a_index, mask)
+
+    def thresholds(self) -> Dict[str, Union[float, np.ndarray]]:
+        """Current thresholds: arrays for adapted keys, scalars otherwise."""
+        return {**self.base, **{key: value.copy() for key, value in self.dynamic.items()}}
+
+
+def _clamp(value, low, high):
+    # Same order as DynamicThresholdAdapter._clamp (the upper bound wins)
+    return np.maximum(low, np.minimum(high, value))
+
+
+@dataclass
+class SimulationReport:
+    """Additive counts of a simulation; merge reports of several blocks.
+
+    Attributes:
+        sessions: Simulated sessions.
+        steps: Simulated turns (all sessions).
+        facet_counts: Facet occupancy after the burn-in, by facet code.
+        phase_counts: Phase occupancy after the burn-in, by phase code.
+        transitions: Phase transition counts (from, to) over all steps.
+        trigger_counts: Ritual and stagnation-trap firings.
+        dwell: Completed phase runs, ``dwell[phase, length]``; length is
+            capped at the last column.
+        trapped_phase: Sessions that stayed in a phase for at least
+            ``trap_steps`` consecutive turns, per phase.
+        trapped_facet: Same for facets.
+    """
+
+    trap_steps: int = 10
+    max_dwell: int = 200
+    sessions: int = 0
+    steps: int = 0
+    facet_counts: np.ndarray = field(default_factory=lambda: np.zeros(len(FACETS), dtype=np.int64))
+    phase_counts: np.ndarray = field(default_factory=lambda: np.zeros(len(PHASES), dtype=np.int64))
+    transitions: np.ndarray = field(default_factory=lambda: np.zeros((len(PHASES), len(PHASES)), dtype=np.int64))
+    trigger_counts: Dict[str, int] = field(
+        default_factory=lambda: {"manta": 0, "gravitas": 0, "splinter": 0, "stagnation": 0}
+    )
+    dwell: Optional[np.ndarray] = None
+    trapped_phase: np.ndarray = field(default_factory=lambda: np.zeros(len(PHASES), dtype=np.int64))
+    trapped_facet: np.ndarray = field(default_factory=lambda: np.zeros(len(FACETS), dtype=np.int64))
+
+    def __post_init__(self) -> None:
+        if self.dwell is None:
+            self.dwell = np.zeros((len(PHASES), self.max_dwell + 1), dtype=np.int64)
+
+    def merge(self, other: "SimulationReport") -> None:
+        """Add the counts of *other* into this report."""
+        if (other.trap_steps, other.max_dwell) != (self.trap_steps, self.max_dwell):
+            raise ValueError("Reports were produced with different settings")
+        self.sessions += other.sessions
+        self.steps += other.steps
+        self.facet_counts += other.facet_counts
+        self.phase_counts += other.phase_counts
+        self.transitions += other.transitions
+        for name, count in other.trigger_counts.items():
+            self.trigger_counts[name] = self.trigger_counts.get(name, 0) + count
+        self.dwell += other.dwell
+        self.trapped_phase += other.trapped_phase
+        self.trapped_facet += other.trapped_facet
+
+    def facet_distribution(self) -> Dict[str, float]:
+        """Share of turns per facet after the burn-in."""
+        return _shares(self.facet_counts, FACETS)
+
+    def phase_distribution(self) -> Dict[str, float]:
+        """Share of turns per phase after the burn-in."""
+        return _shares(self.phase_counts, PHASES)
+
+    def stationary_distribution(self) -> Dict[str, float]:
+        """Stationary distribution of the empirical phase transition chain.
+
+        Only phases that were visited take part; a visited phase that was
+        never left keeps a self-loop so the chain stays stochastic.
+        """
+        visited = np.flatnonzero(self.transitions.sum(axis=0) + self.transitions.sum(axis=1))
+        vector = np.zeros(len(PHASES))
+        if visited.size:
+            counts = self.transitions[np.ix_(visited, visited)].astype(float)
+            stuck = counts.sum(axis=1) == 0
+            counts[stuck, stuck] = 1.0
+            chain = counts / counts.sum(axis=1, keepdims=True)
+            values, vectors = np.linalg.eig(chain.T)
+            stationary = np.abs(np.real(vectors[:, np.argmin(np.abs(values - 1.0))]))
+            vector[visited] = stationary / stationary.sum()
+        return _shares(vector, PHASES)
+
+    def dwell_times(self) -> Dict[str, Dict[str, float]]:
+        """Mean, median and 95th percentile length of completed phase runs."""
+        lengths = np.arange(self.dwell.shape[1])
+        result = {}
+        for code, phase in enumerate(PHASES):
+            hist = self.dwell[code]
+            runs = int(hist.sum())
+            if not runs:
+                continue
+            cumulative = np.cumsum(hist)
+            result[phase.value] = {
+                "runs": runs,
+                "mean": float((hist * lengths).sum() / runs),
+                "median": float(lengths[np.searchsorted(cumulative, 0.5 * runs)]),
+                "p95": float(lengths[np.searchsorted(cumulative, 0.95 * runs)]),
+            }
+        return result
+
+    def trap_rates(self) -> Dict[str, Dict[str, float]]:
+        """Share of sessions caught in one phase or facet for ``trap_steps`` turns."""
+        sessions = max(self.sessions, 1)
+        return {
+            "phase": {p.value: float(n) / sessions for p, n in zip(PHASES, self.trapped_phase) if n},
+            "facet": {f.value: float(n) / sessions for f, n in zip(FACETS, self.trapped_facet) if n},
+        }
+
+    def trigger_rates(self) -> Dict[str, float]:
+        """Firings per simulated turn."""
+        steps = max(self.steps, 1)
+        return {name: count / steps for name, count in self.trigger_counts.items()}
+
+
+def _shares(counts: np.ndarray, labels) -> Dict[str, float]:
+    total = float(np.sum(counts))
+    return {label.value: (float(c) / total if total else 0.0) for label, c in zip(labels, counts)}
+
+
+class _Lockstep:
+    """State of a block of sessions advancing one turn at a time."""
+
+    def __init__(
+        self,
+        sessions: int,
+        thresholds: ThresholdSource,
+        adaptive: bool,
+        report: SimulationReport,
+        burn_in: int,
+        initial_phase: PhaseType,
+    ) -> None:
+        self.base = _base_thresholds(thresholds)
+        self.adapter = VectorThresholdAdapter(sessions, self.base) if adaptive else None
+        self.report = report
+        self.burn_in = burn_in
+        self.phase = np.full(sessions, _P[initial_phase], dtype=np.int8)
+        self.phase_run = np.zeros(sessions, dtype=np.int64)
+        self.facet = np.full(sessions, -1, dtype=np.int8)
+        self.facet_run = np.zeros(sessions, dtype=np.int64)
+        self.trapped_phase = np.zeros((sessions, len(PHASES)), dtype=bool)
+        self.trapped_facet = np.zeros((sessions, len(FACETS)), dtype=bool)
+        self.first = np.ones(sessions, dtype=bool)
+        self.age = np.zeros(sessions, dtype=np.int64)
+        self.pain_cycles = np.zeros(sessions, dtype=np.int64)
+        report.sessions += sessions
+
+    def step(self, metrics: np.ndarray, active: np.ndarray) -> np.ndarray:
+        """Run one turn for the *active* sessions; returns post-trigger metrics."""
+        report = self.report
+        # The request snapshot predates this turn's vitals (see ask_iskra)
+        t = self.adapter.thresholds() if self.adapter is not None else self.base
+        # Splinter counts consecutive turns above the snapshot's pain_high
+        metrics = metrics.copy()
+        metrics["splinter_pain_cycles"] = np.where(metrics["pain"] > t["pain_high"], self.pain_cycles + 1, 0)
+        if self.adapter is not None:
+            self.adapter.update(metrics, active)
+        a_index = batch_a_index(metrics)
+
+        # Canonical triggers, in LLMService.generate_response order
+        manta_drift = metrics["drift"] > t["mantra_drift_trigger"]
+        manta = self.first | manta_drift
+        gravitas = ~manta & (metrics["silence_mass"] > t["gravitas_silence_mass"])
+        splinter = ~manta & ~gravitas & (metrics["splinter_pain_cycles"] > t["splinter_pain_cycles"])
+        special = manta | gravitas | splinter
+        facet = batch_facets(metrics, t)
+        facet = np.select(
+            [manta, gravitas, splinter],
+            [_F[FacetType.ISKRA], _F[FacetType.ANHANTRA], _F[FacetType.KAIN]],
+            default=facet,
+        ).astype(np.int8)
+        stagnation = ~special & (metrics["clarity"] > t["stagnation_clarity"]) & (metrics["chaos"] < t["stagnation_chaos"])
+
+        # The response snapshot carries the trigger resets
+        post = metrics.copy()
+        post["drift"] = np.where(manta_drift & ~self.first, 0.0, post["drift"])
+        post["silence_mass"] = np.where(gravitas, 0.0, post["silence_mass"])
+        post["splinter_pain_cycles"] = np.where(splinter, 0, post["splinter_pain_cycles"])
+        self.pain_cycles = np.where(active, post["splinter_pain_cycles"], self.pain_cycles)
+        if self.adapter is not None:
+            self.adapter.add_growth(a_index, active & ~special)
+
+        phase = batch_transition(self.phase, post, a_index, t)
+
+        # Counts
+        report.steps += int(active.sum())
+        for name, fired in (("manta", manta), ("gravitas", gravitas), ("splinter", splinter), ("stagnation", stagnation)):
+            report.trigger_counts[name] += int((fired & active).sum())
+        np.add.at(report.transitions, (self.phase[active], phase[active]), 1)
+        counted = active & (self.age >= self.burn_in)
+        report.facet_counts += np.bincount(facet[counted], minlength=len(FACETS))
+        report.phase_counts += np.bincount(phase[counted], minlength=len(PHASES))
+
+        # Phase runs: close the runs that ended, extend the others
+        ended = active & (phase != self.phase) & (self.phase_run > 0)
+        cap = report.dwell.shape[1] - 1
+        np.add.at(report.dwell, (self.phase[ended], np.minimum(self.phase_run[ended], cap)), 1)
+        self.phase_run = np.where(active, np.where(phase != self.phase, 1, self.phase_run + 1), self.phase_run)
+        self.phase = np.where(active, phase, self.phase).astype(np.int8)
+        self.facet_run = np.where(active, np.where(facet != self.facet, 1, self.facet_run + 1), self.facet_run)
+        self.facet = np.where(active, facet, self.facet).astype(np.int8)
+        rows = np.flatnonzero(active)
+        self.trapped_phase[rows, self.phase[rows]] |= self.phase_run[rows] >= report.trap_steps
+        self.trapped_facet[rows, self.facet[rows]] |= self.facet_run[rows] >= report.trap_steps
+
+        self.first &= ~active
+        self.age += active
+        return post
+
+    def finish(self) -> None:
+        """Fold per-session trap flags into the report."""
+        self.report.trapped_phase += self.trapped_phase.sum(axis=0)
+        self.report.trapped_facet += self.trapped_facet.sum(axis=0)
+
+
+def simulate_block(
+    sessions: int,
+    steps: int,
+    thresholds: ThresholdSource = None,
+    model: Optional[MetricModel] = None,
+    adaptive: bool = True,
+    seed: Union[None, int, np.random.SeedSequence] = None,
+    trap_steps: int = 10,
+    burn_in: int = 20,
+    initial_phase: PhaseType = PhaseType.PHASE_3_TRANSITION,
+) -> SimulationReport:
+    """Simulate *sessions* generated sessions of *steps* turns each.
+
+    Args:
+        thresholds: Candidate thresholds laid over ``config.THRESHOLDS``.
+        model: Metric dynamics (default :class:`MetricModel`).
+        adaptive: Simulate per-session dynamic thresholds.
+        seed: Seed of the random walk.
+        trap_steps: Consecutive turns in one phase/facet that count as a trap.
+        burn_in: Turns per session excluded from occupancy counts.
+    """
+    model = model or MetricModel()
+    rng = np.random.default_rng(seed)
+    report = SimulationReport(trap_steps=trap_steps, max_dwell=steps)
+    sim = _Lockstep(sessions, thresholds, adaptive, report, burn_in, initial_phase)
+    active = np.ones(sessions, dtype=bool)
+    metrics = model.initial(sessions)
+    for _ in range(steps):
+        post = sim.step(metrics, active)
+        metrics = model.advance(post, rng)
+    sim.finish()
+    return report
+
+
+def stack_series(series: List[np.ndarray]) -> Tuple[np.ndarray, np.ndarray]:
+    """Pad per-session metric arrays into ``(trajectories, lengths)`` for :func:`replay`."""
+    lengths = np.array([len(item) for item in series], dtype=np.int64)
+    trajectories = np.zeros((len(series), int(lengths.max()) if len(series) else 0), dtype=METRIC_DTYPE)
+    for row, item in enumerate(series):
+        trajectories[row, : len(item)] = item
+    return trajectories, lengths
+
+
+def replay(
+    trajectories: np.ndarray,
+    lengths: Optional[np.ndarray] = None,
+    thresholds: ThresholdSource = None,
+    adaptive: bool = True,
+    trap_steps: int = 10,
+    burn_in: int = 0,
+    initial_phase: PhaseType = PhaseType.PHASE_3_TRANSITION,
+) -> SimulationReport:
+    """Run the decision logic over recorded metric trajectories.
+
+    The recorded ``splinter_pain_cycles`` are ignored: the counter is
+    rebuilt from ``pain`` against each step's ``pain_high``, so candidate
+    thresholds change Splinter as they would on the request path.
+
+    Args:
+        trajectories: ``(sessions, turns)`` :data:`METRIC_DTYPE` array.
+        lengths: Turns actually recorded per session; padding after
+            them is ignored. Defaults to the full width.
+        thresholds: Candidate thresholds laid over ``config.THRESHOLDS``.
+        adaptive: Simulate per-session dynamic thresholds.
+    """
+    sessions, turns = trajectories.shape
+    lengths = np.full(sessions, turns) if lengths is None else np.asarray(lengths)
+    report = SimulationReport(trap_steps=trap_steps, max_dwell=max(turns, 1))
+    sim = _Lockstep(sessions, thresholds, adaptive, report, burn_in, initial_phase)
+    for step in range(turns):
+        sim.step(trajectories[:, step], step < lengths)
+    sim.finish()
+    return report
+
+
+def run_monte_carlo(
+    sessions: int = 1000,
+    steps: int = 200,
+    thresholds: ThresholdSource = None,
+    model: Optional[MetricModel] = None,
+    adaptive: bool = True,
+    seed: int = 0,
+    workers: Optional[int] = 1,
+    trap_steps: int = 10,
+    burn_in: int = 20,
+) -> SimulationReport:
+    """Simulate many sessions in blocks, optionally over a process pool.
+
+    Sessions are split into blocks of :data:`BLOCK_SESSIONS`, each with its
+    own child seed, so the result depends on *seed* but not on *workers*.
+    Running the same seed with two threshold sets compares them on the
+    same random draws.
+
+    Args:
+        workers: Worker processes; ``1`` runs inline, ``None`` uses every CPU.
+    """
+    if sessions < 1 or steps < 1:
+        raise ValueError("sessions and steps must be positive")
+    blocks = math.ceil(sessions / BLOCK_SESSIONS)
+    sizes = [BLOCK_SESSIONS] * (blocks - 1) + [sessions - BLOCK_SESSIONS * (blocks - 1)]
+    seeds = np.random.SeedSequence(seed).spawn(blocks)
+    jobs = [
+        (size, steps, thresholds, model, adaptive, child, trap_steps, burn_in)
+        for size, child in zip(sizes, seeds)
+    ]
+    workers = max(1, workers or os.cpu_count() or 1)
+    total = SimulationReport(trap_steps=trap_steps, max_dwell=steps)
+    if workers == 1 or blocks == 1:
+        for job in jobs:
+            total.merge(simulate_block(*job))
+        return total
+    with ProcessPoolExecutor(max_workers=min(workers, blocks)) as pool:
+        for report in pool.map(simulate_block, *zip(*jobs)):
+            total.merge(report)
+    return total
+
+
+# -- Output --
+def summary_report(report: SimulationReport) -> str:
+    """Human-readable summary of one simulation."""
+    lines = [
+        "Iskra simulation report",
+        f"sessions: {report.sessions}   turns: {report.steps}",
+        "",
+        "Facets (occupancy after burn-in):",
+    ]
+    for facet, share in report.facet_distribution().items():
+        lines.append(f"  {facet:<10} {share:6.1%}")
+    lines += ["", "Phases (occupancy / stationary / mean dwell):"]
+    stationary = report.stationary_distribution()
+    dwell = report.dwell_times()
+    for phase, share in report.phase_distribution().items():
+        mean_dwell = dwell.get(phase, {}).get("mean", 0.0)
+        lines.append(f"  {phase:<22} {share:6.1%}  {stationary[phase]:6.1%}  {mean_dwell:6.1f}")
+    lines += ["", "Triggers (per turn):"]
+    for name, rate in report.trigger_rates().items():
+        lines.append(f"  {name:<10} {rate:6.2%}")
+    traps = report.trap_rates()
+    lines += ["", f"Traps (>= {report.trap_steps} turns in one state, share of sessions):"]
+    for kind in ("phase", "facet"):
+        for name, rate in sorted(traps[kind].items(), key=lambda item: -item[1]):
+            lines.append(f"  {kind} {name:<22} {rate:6.1%}")
+    return "\n".join(lines)
+
+
+def compare_report(base: SimulationReport, candidate: SimulationReport) -> str:
+    """Side-by-side occupancy, trigger and trap shifts of two simulations."""
+    rows: List[Tuple[str, Dict[str, float], Dict[str, float]]] = [
+        ("Facets", base.facet_distribution(), candidate.facet_distribution()),
+        ("Phases", base.phase_distribution(), candidate.phase_distribution()),
+        ("Triggers", base.trigger_rates(), candidate.trigger_rates()),
+    ]
+    lines = ["What-if comparison (base -> candidate)"]
+    for title, old, new in rows:
+        lines += ["", f"{title}:"]
+        for name in old:
+            delta = new.get(name, 0.0) - old[name]
+            lines.append(f"  {name:<22} {old[name]:6.1%} -> {new.get(name, 0.0):6.1%}  ({delta:+.1%})")
+    old_traps, new_traps = base.trap_rates()["phase"], candidate.trap_rates()["phase"]
+    lines += ["", "Phase traps:"]
+    for name in sorted(set(old_traps) | set(new_traps)):
+        lines.append(f"  {name:<22} {old_traps.get(name, 0.0):6.1%} -> {new_traps.get(name, 0.0):6.1%}")
+    return "\n".join(lines)
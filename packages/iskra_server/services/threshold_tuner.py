@@ -0,0 +1,325 @@
+"""
+Offline threshold tuning against the SLO target distributions.
+
+``config.THRESHOLDS`` and ``packages/core/slo.json`` are maintained by
+hand and drift apart. The tuner closes the loop: it replays recorded
+metric histories (see :func:`services.archive_analytics.metric_series`)
+through the request-path decision logic of :mod:`services.simulator`
+with candidate threshold vectors, scores the resulting facet and phase
+occupancy against the ``tuning`` targets of the SLO file and proposes the
+best vector.
+
+The ``tuning`` section of ``slo.json`` holds:
+
+* ``facet_distribution`` / ``phase_distribution`` – target shares by
+  facet value and by phase name (``PHASE_4_CLARITY``) or value;
+* ``weights`` – weight of the facet and phase terms of the loss;
+* ``search`` – candidate values per threshold.
+
+The loss is the weighted total-variation distance between the replayed
+and the target distributions. Candidates are searched either over the
+full grid (sampled down to ``max_candidates``) or by coordinate descent
+(one threshold at a time, all its values in parallel, until no move
+helps); both evaluate candidates over a process pool that receives the
+trajectories once per worker.
+
+Usage::
+
+    from services.threshold_tuner import load_targets, tune, diff_report
+    targets = load_targets()
+    result = tune(series, targets, workers=4)
+    print(diff_report(result))
+"""
+from __future__ import annotations
+
+import itertools
+import json
+import os
+import random
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+
+from config import SLO_PATH, THRESHOLDS
+from core.models import FacetType, PhaseType
+from services.simulator import SimulationReport, replay, stack_series
+
+# slo.json trigger names -> config.THRESHOLDS keys
+SLO_TRIGGER_KEYS: Dict[str, str] = {
+    "pain_to_kain": "pain_high",
+    "clarity_to_sam": "clarity_low",
+    "drift_to_iskriv": "drift_high",
+    "trust_to_anhantra": "trust_low",
+    "chaos_to_hundun": "chaos_high",
+}
+
+
+@dataclass
+class TuningTargets:
+    """Target distributions and search space read from the SLO file."""
+
+    facets: Dict[str, float]
+    phases: Dict[str, float]
+    search: Dict[str, List[float]]
+    facet_weight: float = 1.0
+    phase_weight: float = 0.5
+    triggers: Dict[str, float] = field(default_factory=dict)
+
+
+@dataclass
+class TuningResult:
+    """Outcome of :func:`tune`."""
+
+    targets: TuningTargets
+    current: Dict[str, float]
+    proposed: Dict[str, float]
+    current_loss: float
+    proposed_loss: float
+    current_report: SimulationReport
+    proposed_report: SimulationReport
+    evaluated: int
+
+    def changes(self) -> Dict[str, Tuple[float, float]]:
+        """Thresholds whose proposed value differs: key -> (current, proposed)."""
+        return {
+            key: (self.current[key], value)
+            for key, value in self.proposed.items()
+            if value != self.current[key]
+        }
+
+
+def _normalise(shares: Mapping[str, float], labels: Iterable) -> Dict[str, float]:
+    by_name = {label.name: label.value for label in labels}
+    values = {by_name.get(key, key): float(value) for key, value in shares.items()}
+    total = sum(values.values())
+    if total <= 0:
+        raise ValueError("Target distribution must have positive mass")
+    return {key: value / total for key, value in values.items()}
+
+
+def load_targets(path: str = SLO_PATH) -> TuningTargets:
+    """Read the ``tuning`` section of the SLO file.
+
+    Raises:
+        ValueError: If the section is missing or names unknown facets,
+            phases or thresholds.
+    """
+    with open(path, encoding="utf-8") as fh:
+        slo = json.load(fh)
+    tuning = slo.get("tuning")
+    if not isinstance(tuning, dict):
+        raise ValueError(f"{path} has no 'tuning' section")
+    facets = _normalise(tuning.get("facet_distribution") or {}, FacetType)
+    phases = _normalise(tuning.get("phase_distribution") or {}, PhaseType)
+    unknown = (set(facets) - {f.value for f in FacetType}) | (set(phases) - {p.value for p in PhaseType})
+    if unknown:
+        raise ValueError(f"Unknown facets or phases in targets: {sorted(unknown)}")
+    search = {key: [float(v) for v in values] for key, values in (tuning.get("search") or {}).items()}
+    unknown = set(search) - set(THRESHOLDS)
+    if unknown:
+        raise ValueError(f"Unknown thresholds in search space: {sorted(unknown)}")
+    weights = tuning.get("weights") or {}
+    return TuningTargets(
+        facets=facets,
+        phases=phases,
+        search=search,
+        facet_weight=float(weights.get("facets", 1.0)),
+        phase_weight=float(weights.get("phases", 0.5)),
+        triggers={k: float(v) for k, v in (slo.get("trigger_thresholds") or {}).items()},
+    )
+
+
+def _total_variation(actual: Mapping[str, float], target: Mapping[str, float]) -> float:
+    keys = set(actual) | set(target)
+    return 0.5 * sum(abs(actual.get(k, 0.0) - target.get(k, 0.0)) for k in keys)
+
+
+def distribution_loss(report: SimulationReport, targets: TuningTargets) -> float:
+    """Weighted total-variation distance of *report* from the targets."""
+    return targets.facet_weight * _total_variation(
+        report.facet_distribution(), targets.facets
+    ) + targets.phase_weight * _total_variation(report.phase_distribution(), targets.phases)
+
+
+# -- Evaluation over a process pool --
+# Set once per worker by _init_worker so candidates travel without the data.
+_WORKER: Dict[str, object] = {}
+
+
+def _init_worker(trajectories: np.ndarray, lengths: np.ndarray, targets: TuningTargets, adaptive: bool) -> None:
+    _WORKER.update(trajectories=trajectories, lengths=lengths, targets=targets, adaptive=adaptive)
+
+
+def _evaluate(candidate: Dict[str, float]) -> Tuple[float, SimulationReport]:
+    report = replay(
+        _WORKER["trajectories"],
+        _WORKER["lengths"],
+        thresholds=candidate,
+        adaptive=_WORKER["adaptive"],
+    )
+    return distribution_loss(report, _WORKER["targets"]), report
+
+
+class _Evaluator:
+    """Evaluates candidate batches inline or over a pool, with a cache."""
+
+    def __init__(self, trajectories, lengths, targets, adaptive, workers) -> None:
+        self.args = (trajectories, lengths, targets, adaptive)
+        self.workers = workers
+        self.pool: Optional[ProcessPoolExecutor] = None
+        self.cache: Dict[Tuple[Tuple[str, float], ...], Tuple[float, SimulationReport]] = {}
+
+    def __enter__(self) -> "_Evaluator":
+        if self.workers > 1:
+            self.pool = ProcessPoolExecutor(self.workers, initializer=_init_worker, initargs=self.args)
+        else:
+            _init_worker(*self.args)
+        return self
+
+    def __exit__(self, *exc) -> None:
+        if self.pool is not None:
+            self.pool.shutdown()
+
+    def __call__(self, candidates: Sequence[Dict[str, float]]) -> List[Tuple[float, SimulationReport]]:
+        keys = [tuple(sorted(c.items())) for c in candidates]
+        todo = [c for c, k in zip(candidates, keys) if k not in self.cache]
+        todo = list({tuple(sorted(c.items())): c for c in todo}.values())
+        if todo:
+            if self.pool is not None:
+                results = list(self.pool.map(_evaluate, todo, chunksize=max(1, len(todo) // (4 * self.workers))))
+            else:
+                results = [_evaluate(c) for c in todo]
+            for candidate, result in zip(todo, results):
+                self.cache[tuple(sorted(candidate.items()))] = result
+        return [self.cache[k] for k in keys]
+
+
+def _grid(search: Dict[str, List[float]], base: Dict[str, float], limit: int, seed: int) -> List[Dict[str, float]]:
+    keys = sorted(search)
+    combos = list(itertools.product(*(search[k] for k in keys)))
+    if len(combos) > limit:
+        combos = random.Random(seed).sample(combos, limit)
+    return [{**base, **dict(zip(keys, combo))} for combo in combos]
+
+
+def tune(
+    series: List[np.ndarray],
+    targets: TuningTargets,
+    strategy: str = "coordinate",
+    adaptive: bool = True,
+    workers: Optional[int] = 1,
+    max_candidates: int = 256,
+    max_rounds: int = 5,
+    seed: int = 0,
+) -> TuningResult:
+    """Search the threshold vector that best meets the targets.
+
+    Args:
+        series: Recorded metric snapshots, one array per session.
+        targets: Targets and search space (see :func:`load_targets`).
+        strategy: ``"coordinate"`` (coordinate descent) or ``"grid"``.
+        adaptive: Replay with per-session dynamic thresholds, as in production.
+        workers: Worker processes; ``1`` evaluates inline, ``None`` uses every CPU.
+        max_candidates: Grid size limit; larger grids are sampled.
+        max_rounds: Coordinate descent passes over all thresholds.
+        seed: Seed of the grid sampling.
+
+    Raises:
+        ValueError: Without series or search space, or for an unknown strategy.
+    """
+    if not series:
+        raise ValueError("No metric series to replay")
+    if not targets.search:
+        raise ValueError("Empty search space")
+    if strategy not in ("coordinate", "grid"):
+        raise ValueError("strategy must be 'coordinate' or 'grid'")
+    trajectories, lengths = stack_series(series)
+    current = {key: float(THRESHOLDS[key]) for key in targets.search}
+    workers = max(1, workers or os.cpu_count() or 1)
+
+    with _Evaluator(trajectories, lengths, targets, adaptive, workers) as evaluate:
+        (current_loss, current_report), = evaluate([current])
+        best, best_loss, best_report = current, current_loss, current_report
+        if strategy == "grid":
+            candidates = _grid(targets.search, current, max_candidates, seed)
+            for candidate, (loss, report) in zip(candidates, evaluate(candidates)):
+                if loss < best_loss:
+                    best, best_loss, best_report = candidate, loss, report
+        else:
+            for _ in range(max_rounds):
+                improved = False
+                for key in sorted(targets.search):
+                    candidates = [{**best, key: value} for value in targets.search[key]]
+                    for candidate, (loss, report) in zip(candidates, evaluate(candidates)):
+                        if loss < best_loss - 1e-12:
+                            best, best_loss, best_report = candidate, loss, report
+                            improved = True
+                if not improved:
+                    break
+        evaluated = len(evaluate.cache)
+
+    return TuningResult(
+        targets=targets,
+        current=current,
+        proposed=dict(best),
+        current_loss=current_loss,
+        proposed_loss=best_loss,
+        current_report=current_report,
+        proposed_report=best_report,
+        evaluated=evaluated,
+    )
+
+
+# -- Output --
+def proposed_thresholds(result: TuningResult) -> Dict[str, object]:
+    """Content of the proposed threshold file.
+
+    Holds the full ``THRESHOLDS`` dict with the proposed values and the
+    matching ``trigger_thresholds`` block for ``slo.json``, so both can be
+    updated together.
+    """
+    thresholds = dict(THRESHOLDS)
+    thresholds.update(result.proposed)
+    return {
+        "thresholds": thresholds,
+        "slo_trigger_thresholds": {
+            name: thresholds[key] for name, key in SLO_TRIGGER_KEYS.items()
+        },
+        "loss": {"current": result.current_loss, "proposed": result.proposed_loss},
+    }
+
+
+def diff_report(result: TuningResult) -> str:
+    """Human-readable diff of the proposal against config and the SLO file."""
+    lines = [
+        "Threshold tuning report",
+        f"candidates evaluated: {result.evaluated}   "
+        f"loss: {result.current_loss:.4f} -> {result.proposed_loss:.4f}",
+        "",
+        "config.THRESHOLDS:",
+    ]
+    changes = result.changes()
+    if not changes:
+        lines.append("  (no change)")
+    for key, (old, new) in sorted(changes.items()):
+        lines += [f"- {key}: {old}", f"+ {key}: {new}"]
+
+    lines += ["", "slo.json trigger_thresholds (slo / config / proposed):"]
+    for name, key in SLO_TRIGGER_KEYS.items():
+        slo_value = result.targets.triggers.get(name)
+        config_value = float(THRESHOLDS[key])
+        proposed = result.proposed.get(key, config_value)
+        flag = "" if slo_value == config_value == proposed else "  *"
+        slo_text = "-" if slo_value is None else f"{slo_value:.2f}"
+        lines.append(f"  {name:<18} {slo_text:>5} / {config_value:.2f} / {proposed:.2f}{flag}")
+
+    for title, target, old, new in (
+        ("Facets", result.targets.facets, result.current_report.facet_distribution(), result.proposed_report.facet_distribution()),
+        ("Phases", result.targets.phases, result.current_report.phase_distribution(), result.proposed_report.phase_distribution()),
+    ):
+        lines += ["", f"{title} (current -> proposed, target):"]
+        for name in old:
+            lines.append(f"  {name:<22} {old[name]:6.1%} -> {new[name]:6.1%}  ({target.get(name, 0.0):6.1%})")
+    return "\n".join(lines)
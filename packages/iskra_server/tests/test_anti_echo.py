@@ -0,0 +1,45 @@
+"""
+Per-session anti-echo state: bounded history, persistence and facet feedback.
+"""
+
+import json
+
+from core.engine import FacetEngine
+from core.models import FacetType, IskraMetrics
+from services.anti_echo_detector import ECHO_HISTORY_LIMIT, AntiEchoDetector
+from services.persistence import UserSession
+
+_FLATTERING = "Это гениальная и блестящая мысль, исключительный подход. " + "слово " * 60
+
+
+class TestAntiEchoState:
+    def test_history_survives_session_round_trip(self):
+        detector = AntiEchoDetector()
+        is_echo, _, patterns = detector.detect_echo_pattern(_FLATTERING)
+        assert is_echo and {p.pattern_type for p in patterns} == {"flattery", "no_critique"}
+
+        session = UserSession()
+        session.anti_echo_state = detector.to_state()
+        restored_session = UserSession.from_dict(json.loads(json.dumps(session.to_dict())))
+        restored = AntiEchoDetector.from_state(restored_session.anti_echo_state)
+        assert list(restored.echo_history) == list(detector.echo_history)
+        assert restored.assess_echo_risk() == detector.assess_echo_risk()
+
+    def test_history_is_a_bounded_ring(self):
+        detector = AntiEchoDetector()
+        for _ in range(ECHO_HISTORY_LIMIT):
+            detector.detect_echo_pattern(_FLATTERING)
+        assert len(detector.echo_history) == ECHO_HISTORY_LIMIT
+        assert len(AntiEchoDetector.from_state(detector.to_state()).echo_history) == ECHO_HISTORY_LIMIT
+        assert AntiEchoDetector.from_state({"history": [{"bogus": 1}]}).echo_history.maxlen == ECHO_HISTORY_LIMIT
+
+    def test_cumulative_echo_risk_selects_iskriv(self):
+        detector = AntiEchoDetector()
+        for _ in range(5):
+            # Long answers without any critical marker: high-severity detections
+            detector.detect_echo_pattern("слово " * 60)
+        risk, _ = detector.assess_echo_risk()
+        assert risk > 0.5
+        calm = IskraMetrics(trust=0.9, clarity=0.8, pain=0.1, drift=0.0, chaos=0.3)
+        assert FacetEngine.determine_facet(calm) == FacetType.ISKRA
+        assert FacetEngine.determine_facet(calm, echo_risk=risk) == FacetType.ISKRIV
@@ -0,0 +1,86 @@
+"""
+Tests for the offline archive analytics over the session database.
+"""
+
+import csv
+import sqlite3
+
+from core.models import AdomlBlock, FacetType, IskraMetrics, IskraResponse, MicroLogNode, PhaseType
+from services.archive_analytics import analyze_archive, summary_report, write_tables
+from services.batch_engine import PHASES
+from services.fractal import FractalService
+from services.persistence import PersistenceService, UserSession
+from services.phase_engine import PhaseEngine
+
+
+def _cycle(session: UserSession, facet: FacetType, metrics: IskraMetrics, delta: str = "d"):
+    a_index = FractalService.calculate_a_index(metrics)
+    response = IskraResponse(
+        facet=facet,
+        content="ответ",
+        adoml=AdomlBlock(delta=delta, sift="s", omega=0.5, lambda_latch='{action: "a", owner: "o", condition: "c", <=24h: true}'),
+        metrics_snapshot=metrics,
+        i_loop="voice=x; phase=y; intent=z",
+        a_index=a_index,
+    )
+    micro = MicroLogNode(text_length=5, pause_duration_ms=None, pause_type=None, lz_complexity=0.5, hurst_exponent=0.5)
+    session.memory.log_interaction_cycle("вопрос", response, micro, [], a_index)
+
+
+def _build(db_path):
+    service = PersistenceService(db_path=db_path)
+    series = [
+        IskraMetrics(pain=0.9),
+        IskraMetrics(pain=0.3),
+        IskraMetrics(clarity=0.95, trust=0.95, pain=0.3, chaos=0.05, drift=0.0),
+        IskraMetrics(chaos=0.8),
+    ]
+    for user in ("a", "b", "legacy"):
+        session = UserSession()
+        _cycle(session, FacetType.ISKRA, IskraMetrics(), "Активация Мантры Ядра (Первый запуск).")
+        for metrics in series:
+            _cycle(session, FacetType.KAIN, metrics)
+        _cycle(session, FacetType.ANHANTRA, IskraMetrics(), "Активация режима Gravitas (Тень).")
+        service.save_session(user, session)
+    # A session saved before the graph tables were mirrored.
+    with sqlite3.connect(db_path) as conn:
+        conn.execute("DELETE FROM graph_nodes WHERE user_id = 'legacy'")
+    return [IskraMetrics()] + series + [IskraMetrics()]
+
+
+class TestArchiveAnalytics:
+    def test_aggregates_match_scalar_replay(self, tmp_path):
+        db_path = str(tmp_path / "archive.db")
+        series = _build(db_path)
+        stats = analyze_archive(db_path, workers=1)
+        assert stats.users == 3 and stats.cycles == 18
+        assert stats.facet_counts == {"ISKRA": 3, "KAIN": 12, "ANHANTRA": 3}
+        assert stats.trigger_counts == {"manta": 3, "gravitas": 3}
+
+        expected = {}
+        phase = PhaseType.PHASE_3_TRANSITION
+        for metrics in series:
+            nxt = PhaseEngine.transition(phase, metrics, FractalService.calculate_a_index(metrics))
+            expected[(phase, nxt)] = expected.get((phase, nxt), 0) + 3
+            phase = nxt
+        found = {
+            (PHASES[i], PHASES[j]): int(stats.transitions[i, j])
+            for i in range(len(PHASES)) for j in range(len(PHASES)) if stats.transitions[i, j]
+        }
+        assert found == expected
+        assert sum(stats.days[d].count for d in stats.days) == 18
+
+    def test_process_pool_and_outputs(self, tmp_path):
+        db_path = str(tmp_path / "archive.db")
+        _build(db_path)
+        inline = analyze_archive(db_path, workers=1)
+        pooled = analyze_archive(db_path, workers=2, shards=3)
+        assert pooled.facet_counts == inline.facet_counts
+        assert (pooled.transitions == inline.transitions).all()
+
+        paths = write_tables(pooled, str(tmp_path / "out"))
+        assert len(paths) == 4
+        with open(tmp_path / "out" / "triggers.csv", encoding="utf-8") as fh:
+            rows = list(csv.DictReader(fh))
+        assert rows[0] == {"trigger": "manta", "count": "3", "per_cycle": str(3 / 18)}
+        assert "gravitas" in summary_report(pooled)
@@ -0,0 +1,70 @@
+"""
+Equivalence tests: vectorised batch engine vs. the scalar engines.
+"""
+
+import random
+
+import numpy as np
+
+from core.engine import FacetEngine
+from core.models import IskraMetrics, PhaseType
+from services.batch_engine import (
+    FACETS,
+    PHASES,
+    batch_a_index,
+    batch_facets,
+    batch_transition,
+    phase_codes,
+    replay_phases,
+    to_metric_array,
+)
+from services.fractal import FractalService
+from services.phase_engine import PhaseEngine
+
+
+def _snapshots(count: int, seed: int = 11):
+    rng = random.Random(seed)
+    # A 0.05 grid hits every threshold exactly, exercising the boundaries.
+    value = lambda: rng.choice([round(0.05 * i, 2) for i in range(21)] + [rng.random()])  # noqa: E731
+    return [
+        IskraMetrics(trust=value(), clarity=value(), pain=value(), drift=value(), chaos=value())
+        for _ in range(count)
+    ]
+
+
+class TestBatchEngine:
+    def test_a_index_and_facets_match_scalar(self):
+        snapshots = _snapshots(2000)
+        arr = to_metric_array(snapshots)
+        a_index = batch_a_index(arr)
+        facets = batch_facets(arr)
+        for i, m in enumerate(snapshots):
+            assert a_index[i] == FractalService.calculate_a_index(m)
+            assert FACETS[facets[i]] == FacetEngine.determine_facet(m)
+
+    def test_transition_matches_scalar_for_every_phase(self):
+        snapshots = _snapshots(500, seed=12)
+        arr = to_metric_array(snapshots)
+        a_index = batch_a_index(arr)
+        rng = random.Random(3)
+        current = [rng.choice(PHASES) for _ in snapshots]
+        nxt = batch_transition(phase_codes(current), arr, a_index)
+        for i, m in enumerate(snapshots):
+            assert PHASES[nxt[i]] == PhaseEngine.transition(current[i], m, float(a_index[i]))
+
+    def test_replay_matches_sequential_loop(self):
+        snapshots = _snapshots(777, seed=13)
+        arr = to_metric_array(snapshots)
+        trajectory = replay_phases(PhaseType.PHASE_3_TRANSITION, arr)
+        phase = PhaseType.PHASE_3_TRANSITION
+        for i, m in enumerate(snapshots):
+            phase = PhaseEngine.transition(phase, m, FractalService.calculate_a_index(m))
+            assert PHASES[trajectory[i]] == phase
+        assert replay_phases(PhaseType.PHASE_1_DARKNESS, arr[:0]).size == 0
+
+    def test_dict_records_and_fixed_thresholds(self):
+        arr = to_metric_array([{"pain": 0.65}, {"pain": 0.65, "trust": 0.9}])
+        assert arr["clarity"].tolist() == [0.5, 0.5]
+        kain = FACETS.index(next(f for f in FACETS if f.value == "KAIN"))
+        assert batch_facets(arr, {"pain_high": 0.6}).tolist() == [kain, kain]
+        assert np.all(batch_facets(arr, {"pain_high": 0.9}) != kain)
@@ -0,0 +1,160 @@
+"""
+Per-session dynamic thresholds: O(1) rolling statistics, isolation,
+persistence and immutable per-request snapshots.
+"""
+
+import asyncio
+import dataclasses
+import json
+import random
+from types import SimpleNamespace
+
+import pytest
+
+from config import THRESHOLDS
+from core.engine import FacetEngine
+from core.models import FacetType, IskraMetrics, MicroLogNode, PauseType, PhaseType
+from core.thresholds import STATIC_THRESHOLDS, ThresholdSnapshot
+from memory.growth_log import GrowthLog
+from services.dynamic_thresholds import DynamicThresholdAdapter, RollingMean, dynamic_thresholds, observe
+from services.persistence import UserSession
+from services.phase_engine import PhaseEngine
+
+
+def _metrics(rng):
+    return IskraMetrics(pain=rng.random(), drift=rng.random(), clarity=rng.random())
+
+
+class TestDynamicThresholdAdapter:
+    def test_running_statistics_match_full_recomputation(self):
+        rng = random.Random(7)
+        adapter = DynamicThresholdAdapter(window=20)
+        history = [_metrics(rng) for _ in range(200)]
+        for m in history:
+            adapter.update(m)
+
+        ema = history[0].pain
+        for m in history[1:]:
+            ema = 0.1 * m.pain + 0.9 * ema
+        avg_drift = sum(m.drift for m in history[-20:]) / 20
+        assert abs(adapter.get("pain_high") - max(0.4, min(0.95, 0.7 + 0.2 * (ema - 0.7)))) < 1e-9
+        assert abs(adapter.get("drift_high") - max(0.1, min(0.9, 0.3 + 0.2 * (avg_drift - 0.3)))) < 1e-9
+
+        window = RollingMean(maxlen=3)
+        for value in (1.0, 2.0, 3.0, 10.0):
+            window.add(value)
+        assert len(window) == 3 and window.mean() == 5.0
+
+    def test_sessions_do_not_share_thresholds(self):
+        hurting, calm = DynamicThresholdAdapter(), DynamicThresholdAdapter()
+        for _ in range(60):
+            hurting.update(IskraMetrics(pain=1.0))
+        assert hurting.get("pain_high") > calm.get("pain_high") == 0.7
+
+        m = IskraMetrics(pain=0.75, clarity=0.8, chaos=0.3)
+        assert FacetEngine.determine_facet(m, thresholds=calm.snapshot()) == FacetType.KAIN
+        assert FacetEngine.determine_facet(m, thresholds=hurting.snapshot()) != FacetType.KAIN
+
+    def test_state_survives_session_round_trip(self):
+        rng = random.Random(3)
+        adapter = DynamicThresholdAdapter()
+        for _ in range(80):
+            adapter.update(_metrics(rng))
+
+        session = UserSession()
+        session.threshold_state = adapter.to_state()
+        restored_session = UserSession.from_dict(json.loads(json.dumps(session.to_dict())))
+        restored = DynamicThresholdAdapter.from_state(restored_session.threshold_state)
+        for key in ("pain_high", "pain_medium", "drift_high", "clarity_low"):
+            assert restored.get(key) == adapter.get(key)
+
+        m = _metrics(rng)
+        adapter.update(m)
+        restored.update(m)
+        assert abs(restored.get("drift_high") - adapter.get("drift_high")) < 1e-12
+
+    def test_pain_ema_starts_at_first_sample(self):
+        adapter = DynamicThresholdAdapter()
+        adapter.update(IskraMetrics(pain=0.9))
+        # A zero-seeded EMA would read 0.09 and pull pain_high down
+        assert adapter.get("pain_high") == pytest.approx(0.7 + 0.2 * (0.9 - 0.7))
+        restored = DynamicThresholdAdapter.from_state({"pain_ema": 0.9})
+        assert restored.get("pain_high") == 0.7
+        restored.update(IskraMetrics(pain=0.9))
+        assert restored.get("pain_high") == pytest.approx(adapter.get("pain_high"))
+
+    def test_malformed_state_yields_fresh_adapter(self):
+        adapter = DynamicThresholdAdapter.from_state({"window": "many", "drift": [0.5]})
+        assert adapter.updates == 0 and adapter.get("drift_high") == 0.3
+
+
+class TestThresholdSnapshot:
+    def test_snapshot_mirrors_config(self):
+        names = {field.name for field in dataclasses.fields(ThresholdSnapshot)}
+        assert names == set(THRESHOLDS)
+        assert ThresholdSnapshot.capture() is STATIC_THRESHOLDS
+        assert STATIC_THRESHOLDS.as_dict() == {k: float(v) for k, v in THRESHOLDS.items()}
+
+    def test_snapshot_is_frozen_against_later_updates(self):
+        adapter = DynamicThresholdAdapter()
+        snapshot = adapter.snapshot()
+        for _ in range(60):
+            adapter.update(IskraMetrics(pain=1.0))
+        assert snapshot.pain_high == 0.7 < adapter.get("pain_high")
+        with pytest.raises(dataclasses.FrozenInstanceError):
+            snapshot.pain_high = 0.9
+
+        m = IskraMetrics(pain=0.75)
+        assert PhaseEngine.transition(PhaseType.PHASE_3_TRANSITION, m, 0.5, thresholds=snapshot) == PhaseType.PHASE_1_DARKNESS
+        assert PhaseEngine.transition(PhaseType.PHASE_3_TRANSITION, m, 0.5, thresholds=adapter.snapshot()) != PhaseType.PHASE_1_DARKNESS
+
+    def test_observe_feeds_session_and_fleet(self):
+        adapter = DynamicThresholdAdapter()
+        before = dynamic_thresholds.updates
+        observe(adapter, IskraMetrics())
+        assert adapter.updates == 1 and dynamic_thresholds.updates == before + 1
+
+    def test_fleet_ignores_session_growth(self):
+        growth = GrowthLog()
+        for _ in range(10):
+            growth.append("synthesis", 0.95, "")
+        fleet_maki = dynamic_thresholds.get("maki_bloom_a_index")
+        adapter = DynamicThresholdAdapter()
+        observe(adapter, IskraMetrics(), growth)
+        assert adapter.get("maki_bloom_a_index") > THRESHOLDS["maki_bloom_a_index"]
+        assert dynamic_thresholds.get("maki_bloom_a_index") == fleet_maki
+
+
+class TestRequestSnapshot:
+    def test_special_responses_use_the_snapshot(self):
+        llm = pytest.importorskip("services.llm")
+        strict = dataclasses.replace(STATIC_THRESHOLDS, maki_bloom_a_index=0.95)
+        response = asyncio.run(llm.LLMService._generate_special_response(
+            "≈", IskraMetrics(), "delta", FacetType.ANHANTRA, 0.9, strict
+        ))
+        assert response.maki_bloom is None and response.i_loop_fields.intent == "special_ritual"
+        response = asyncio.run(llm.LLMService._generate_special_response(
+            "≈", IskraMetrics(), "delta", FacetType.ANHANTRA, 0.9
+        ))
+        assert response.maki_bloom
+        blocked = asyncio.run(llm.LLMService._blocked_stream_response(IskraMetrics(), 0.5, strict))
+        assert blocked.facet == FacetType.KAIN and blocked.maki_bloom is None
+
+    def test_metric_reconciliation_uses_the_snapshot(self, monkeypatch):
+        llm = pytest.importorskip("services.llm")
+        arguments = json.dumps({})
+        tool_call = SimpleNamespace(function=SimpleNamespace(arguments=arguments))
+        completion = SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(tool_calls=[tool_call]))])
+
+        async def create(**request):
+            return completion
+
+        fake_client = SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=create)))
+        monkeypatch.setattr(llm, "client", fake_client)
+        micro = MicroLogNode(
+            text_length=3, pause_duration_ms=1500, pause_type=PauseType.COGNITIVE,
+            lz_complexity=0.1, hurst_exponent=0.5,
+        )
+        boost = dataclasses.replace(STATIC_THRESHOLDS, cognitive_pain_boost=0.3)
+        metrics = asyncio.run(llm.LLMService.analyze_metrics("...", IskraMetrics(pain=0.1), micro, thresholds=boost))
+        assert metrics.pain == pytest.approx(0.4)
@@ -0,0 +1,81 @@
+"""
+Lambda-Latch and I-Loop parsers: regex-equivalent validation, fields, adversarial input.
+"""
+
+import random
+import re
+
+import pytest
+from pydantic import ValidationError
+
+from core.field_parser import (
+    ILoop,
+    LambdaLatch,
+    is_i_loop,
+    is_lambda_latch,
+    parse_i_loop,
+    parse_lambda_latch,
+)
+from core.models import AdomlBlock, AdomlResponseTool
+
+# The expressions the parsers replace; kept here as the reference.
+LAMBDA_LATCH_REGEX = re.compile(r"\{.*action.*,.*owner.*,.*condition.*,.*<=.*\}")
+I_LOOP_REGEX = re.compile(r"voice=.*;\s*phase=.*;\s*intent=.*")
+
+
+def _fuzz(rng, prefix, tokens, count=4000):
+    for _ in range(count):
+        text = "".join(rng.choice(tokens) for _ in range(rng.randint(0, 14)))
+        yield prefix + text if rng.random() < 0.6 else text
+
+
+class TestFieldParser:
+    def test_lambda_latch_accepts_what_the_regex_accepted(self):
+        rng = random.Random(7)
+        tokens = ["{", "}", "action", "owner", "condition", ",", "<=", "\n", " ", "x", ":", '"']
+        for text in _fuzz(rng, "{", tokens):
+            assert is_lambda_latch(text) == bool(LAMBDA_LATCH_REGEX.match(text)), repr(text)
+
+    def test_i_loop_accepts_what_the_regex_accepted(self):
+        rng = random.Random(8)
+        tokens = ["voice=", "phase=", "intent=", ";", " ", "\n", "\t", "x", ";\n", " "]
+        for text in _fuzz(rng, "voice=", tokens):
+            assert is_i_loop(text) == bool(I_LOOP_REGEX.match(text)), repr(text)
+        # ".*" stops at a line break, "\s*" crosses it
+        assert is_i_loop("voice=a; phase=b ;\nphase=c; intent=d")
+        assert not is_i_loop("voice=a\n; phase=b; intent=c")
+
+    def test_lambda_latch_fields(self):
+        latch = parse_lambda_latch(
+            '{action: "Continue, then reflect", owner: "User", condition: "a \\"quoted\\": value", <=24h: true}'
+        )
+        assert latch == LambdaLatch(
+            action="Continue, then reflect",
+            owner="User",
+            condition='a "quoted": value',
+            deadline="24h",
+            committed=True,
+        )
+        assert parse_lambda_latch("{action, owner, condition, <=24h}") == LambdaLatch()
+        assert parse_lambda_latch('{owner: "o", action: "a"}') is None
+
+    def test_i_loop_fields(self):
+        loop = parse_i_loop("voice=ISKRA; phase=ЯСНОСТЬ (☉);  intent=self_reflection ")
+        assert loop == ILoop(voice="ISKRA", phase="ЯСНОСТЬ (☉)", intent="self_reflection")
+        assert parse_i_loop("voice=x; intent=y; phase=z") is None
+
+    def test_adversarial_input_is_linear(self):
+        # The latch alone would keep the old expression backtracking for hours.
+        latch = "{" + "action, owner, condition, " * 5000
+        loop = "voice=x; phase=" + "y intent=" * 10000
+        assert parse_lambda_latch(latch) is None
+        assert parse_i_loop(loop) is None
+        assert parse_lambda_latch(latch + "<=24h: true}").committed is True
+
+    def test_models_validate_through_parser(self):
+        block = AdomlBlock(delta="d", sift="s", omega=0.5, lambda_latch='{action: "a", owner: "o", condition: "c", <=24h: true}')
+        with pytest.raises(ValidationError):
+            AdomlBlock(delta="d", sift="s", omega=0.5, lambda_latch="{action: a}")
+        AdomlResponseTool(content="c", adoml=block, i_loop="voice=x; phase=y; intent=z")
+        with pytest.raises(ValidationError):
+            AdomlResponseTool(content="c", adoml=block, i_loop="voice=x phase=y intent=z")
@@ -0,0 +1,148 @@
+"""
+Unit tests for the micro-level signal measures in FractalService.
+"""
+
+import base64
+import random
+import re
+import statistics
+import struct
+
+import pytest
+
+from core.models import PauseType
+from services.fractal import FractalService, _tokenize
+
+
+def _kaspar_schuster(s: str) -> int:
+    """Reference O(n²) LZ76 phrase count (Kaspar & Schuster, 1987)."""
+    n = len(s)
+    if n <= 1:
+        return n
+    c, l, i, k, k_max = 1, 1, 0, 1, 1
+    while True:
+        if s[i + k - 1] == s[l + k - 1]:
+            k += 1
+            if l + k > n:
+                c += 1
+                break
+        else:
+            k_max = max(k, k_max)
+            i += 1
+            if i == l:
+                c += 1
+                l += k_max
+                if l + 1 > n:
+                    break
+                i, k, k_max = 0, 1, 1
+            else:
+                k = 1
+    return c
+
+
+class TestLempelZiv:
+    def test_matches_reference_parsing(self):
+        rng = random.Random(3)
+        for _ in range(1500):
+            alphabet = rng.choice(["ab", "abc", "abcdefgh"])
+            s = "".join(rng.choice(alphabet) for _ in range(rng.randint(1, 60)))
+            assert FractalService.lz76_phrase_count(s) == _kaspar_schuster(s), s
+        assert FractalService.lz76_phrase_count("0001101001000101") == 6
+        assert FractalService.lz76_phrase_count(["да", "нет", "да", "нет"]) == 3
+
+    def test_token_sequences_and_long_inputs(self):
+        rng = random.Random(4)
+        words = ["да", "нет", "может", "быть"]
+        for _ in range(300):
+            tokens = [rng.choice(words) for _ in range(rng.randint(1, 60))]
+            encoded = "".join(str(words.index(token)) for token in tokens)
+            assert FractalService.lz76_phrase_count(tokens) == _kaspar_schuster(encoded)
+        # One pass: a periodic megabyte-scale input parses into three phrases.
+        assert FractalService.lz76_phrase_count("ab" * 500_000) == 3
+
+    def test_tokenizer_matches_word_regex(self):
+        text = "Hello, world! foo_bar x2 ½ №5 Café—naïve\tЯ не знаю... ___"
+        assert _tokenize(text) == re.findall(r"\w+", text.lower())
+
+    def test_normalised_complexity_separates_repetition(self):
+        repetitive = FractalService.lz_complexity("я не знаю " * 6)
+        varied = FractalService.lz_complexity("Расскажи мне о фрактальной памяти и ритме твоего голоса")
+        assert repetitive < 0.4 < varied == 1.0
+        assert FractalService.lz_complexity("") == 0.0
+        assert 0.0 < FractalService.lz_complexity("ab" * 200, unit="chars") < 0.1
+
+
+class TestHurst:
+    def test_short_or_flat_series_are_neutral(self):
+        assert FractalService.hurst_exponent([1.0, 2.0, 3.0]) == 0.5
+        assert FractalService.hurst_exponent([2.0] * 64) == 0.5
+
+    def test_persistence_raises_estimate(self):
+        rng = random.Random(5)
+        noise = [rng.gauss(0, 1) for _ in range(1024)]
+        trend, level = [], 0.0
+        for value in noise:
+            level = 0.95 * level + value
+            trend.append(level)
+        h_noise = FractalService.hurst_exponent(noise)
+        h_trend = FractalService.hurst_exponent(trend)
+        assert 0.35 < h_noise < 0.7
+        assert h_trend > h_noise + 0.2
+
+    def test_micro_metrics_shape(self):
+        lzc, hurst, pause, profile = FractalService.calculate_micro_metrics("да да да да да да", 9000)
+        assert lzc < 0.4 and hurst == 0.5 and pause is not None and profile is None
+
+
+def _encode(intervals) -> str:
+    return base64.b64encode(struct.pack(f"<{len(intervals)}h", *intervals)).decode("ascii")
+
+
+class TestPauseAnalysis:
+    def test_decode_round_trip_and_validation(self):
+        intervals = [1200, 90, 110, 30000, 0]
+        assert FractalService.decode_keystroke_intervals(_encode(intervals)).tolist() == intervals
+        for bad in ("not base64!", base64.b64encode(b"abc").decode(), _encode([100, -5])):
+            with pytest.raises(ValueError):
+                FractalService.decode_keystroke_intervals(bad)
+
+    def test_profile_matches_reference(self):
+        rng = random.Random(7)
+        intervals = [rng.choice([rng.randint(40, 240), rng.randint(250, 999), rng.randint(1000, 4000)])
+                     for _ in range(500)]
+        profile = FractalService.analyze_pauses(intervals)
+        rhythm = intervals[1:]
+        mean = statistics.fmean(rhythm)
+        std = statistics.pstdev(rhythm)
+        assert profile.interval_count == 499 and profile.total_ms == sum(rhythm)
+        assert profile.lead_in_ms == intervals[0]
+        assert profile.articulatory_count == sum(i < 250 for i in rhythm)
+        assert profile.cognitive_count == sum(250 <= i < 1000 for i in rhythm)
+        assert profile.long_count == sum(i >= 1000 for i in rhythm)
+        assert profile.median_ms == statistics.median(rhythm)
+        assert abs(profile.burstiness - (std - mean) / (std + mean)) < 1e-9
+        assert FractalService.analyze_pauses([]) is None
+
+    def test_classification(self):
+        fluent = [120] + [100, 140, 90, 160] * 10
+        thinking = [120] + [100, 140, 600, 160] * 10
+        assert FractalService.classify_pause_profile(FractalService.analyze_pauses(fluent)) == PauseType.ARTICULATION
+        assert FractalService.classify_pause_profile(FractalService.analyze_pauses(thinking)) == PauseType.COGNITIVE
+        ritual = FractalService.analyze_pauses([2500] + fluent[1:])
+        assert FractalService.classify_pause_profile(ritual) == PauseType.RITUAL
+        # Metronomic typing is anti-bursty.
+        assert FractalService.analyze_pauses([150] * 40).burstiness == -1.0
+
+    def test_lead_in_stays_out_of_the_rhythm(self):
+        fluent = [100, 140, 90, 160] * 10
+        short, long = (FractalService.analyze_pauses([lead_in] + fluent) for lead_in in (0, 900))
+        assert short.model_dump(exclude={"lead_in_ms"}) == long.model_dump(exclude={"lead_in_ms"})
+        assert FractalService.classify_pause_profile(long) == PauseType.ARTICULATION
+        lone = FractalService.analyze_pauses([300])
+        assert lone.interval_count == 0 and lone.lead_in_ms == 300
+        assert FractalService.classify_pause_profile(lone) == PauseType.ARTICULATION
+
+    def test_micro_metrics_prefer_intervals(self):
+        intervals = [1500] + [100, 130, 700, 90] * 8
+        _, _, pause, profile = FractalService.calculate_micro_metrics("привет мир", 50, intervals)
+        assert pause == PauseType.RITUAL and profile.interval_count == len(intervals) - 1
@@ -0,0 +1,206 @@
+"""
+Unit tests for the SQLite graph store and its sync with persisted sessions.
+"""
+
+from core.models import (
+    AdomlBlock,
+    FacetType,
+    IskraMetrics,
+    IskraResponse,
+    MetaNode,
+    MicroLogNode,
+    NodeType,
+)
+import hashlib
+import json
+import sqlite3
+
+import pytest
+
+from memory.graph_archive import (
+    ArchiveIntegrityError,
+    export_memory,
+    export_store,
+    import_into_store,
+    iter_records,
+    open_archive,
+    write_archive,
+)
+from memory.graph_store import GraphStore
+from services.persistence import PersistenceService, UserSession
+
+
+def _log_cycle(session: UserSession, text: str, intent: str = "test"):
+    response = IskraResponse(
+        facet=FacetType.ISKRA,
+        content=f"Ответ: {text}",
+        adoml=AdomlBlock(delta="d", sift="s", omega=0.5, lambda_latch='{action: "a", owner: "o", condition: "c", <=24h: true}'),
+        metrics_snapshot=IskraMetrics(),
+        i_loop=f"voice=Искра; phase=3; intent={intent}",
+        a_index=0.5,
+    )
+    micro = MicroLogNode(
+        text_length=len(text), pause_duration_ms=None, pause_type=None,
+        lz_complexity=0.5, hurst_exponent=0.5,
+    )
+    return session.memory.log_interaction_cycle(text, response, micro, [], 0.5)
+
+
+class TestGraphStore:
+    def test_sync_trace_and_history(self, tmp_path):
+        service = PersistenceService(db_path=str(tmp_path / "graph.db"))
+        session = UserSession()
+        first = _log_cycle(session, "первый")
+        service.save_session("u", session)
+        second = _log_cycle(session, "второй")
+        event = session.memory.log_self_event("decl", "trigger", second.id)
+        service.save_session("u", session)
+
+        graph = service.graph
+        assert graph.count_nodes("u") == len(session.memory.nodes)
+
+        history = graph.history("u", NodeType.MEMORY, limit=5)
+        assert [n.id for n in history] == [second.id, first.id]
+        assert [n.id for n in graph.history("u", limit=5, before=second.timestamp)] == [first.id]
+
+        descendants = graph.trace("u", second.id)
+        assert {n.node_type for n, _ in descendants} == {NodeType.META, NodeType.MICRO_LOG}
+        metas = graph.trace("u", second.id, node_types=[NodeType.META])
+        assert len(metas) == 1 and isinstance(metas[0][0], MetaNode)
+
+        ancestors = graph.trace("u", second.meta_node_id, direction="ancestors", max_depth=2)
+        assert [(n.id, depth) for n, depth in ancestors] == [(second.id, 1), (event.id, 2)]
+
+        service.delete_session("u")
+        assert graph.count_nodes("u") == 0
+
+    def test_parsed_fields_are_columns(self, tmp_path):
+        service = PersistenceService(db_path=str(tmp_path / "graph.db"))
+        session = UserSession()
+        _log_cycle(session, "раз")
+        reflection = _log_cycle(session, "два", intent="self_reflection")
+        _log_cycle(session, "три", intent="self_reflection")
+        service.save_session("u", session)
+        graph = service.graph
+
+        assert reflection.i_loop_fields.intent == "self_reflection"
+        assert graph.field_counts("intent", user_id="u") == {"self_reflection": 2, "test": 1}
+        assert graph.field_counts("latch_owner") == {"o": 3}
+        assert graph.field_counts("latch_deadline", user_id="other") == {}
+        filtered = graph.history("u", intent="self_reflection", limit=5)
+        assert [n.user_input for n in filtered] == ["три", "два"]
+        assert filtered[0].i_loop_fields.voice == "Искра"
+        with pytest.raises(ValueError):
+            graph.field_counts("payload")
+
+    def test_field_columns_are_migrated(self, tmp_path):
+        db_path = str(tmp_path / "graph.db")
+        session = UserSession()
+        memory_node = _log_cycle(session, "старое", intent="reply")
+        with sqlite3.connect(db_path) as conn:
+            conn.execute(
+                "CREATE TABLE graph_nodes (user_id TEXT NOT NULL, node_id TEXT NOT NULL, "
+                "node_type TEXT NOT NULL, timestamp REAL NOT NULL, payload TEXT NOT NULL, "
+                "PRIMARY KEY (user_id, node_id))"
+            )
+            for node in session.memory.nodes.values():
+                payload = node.model_dump()
+                payload.pop("i_loop_fields", None)
+                payload.pop("lambda_latch_fields", None)
+                conn.execute(
+                    "INSERT INTO graph_nodes VALUES (?, ?, ?, ?, ?)",
+                    ("u", node.id, node.node_type.value, node.timestamp, json.dumps(payload)),
+                )
+        graph = GraphStore(db_path)
+        assert graph.field_counts("intent") == {"reply": 1}
+        assert graph.field_counts("latch_owner", user_id="u") == {"o": 1}
+        assert graph.get_node("u", memory_node.id).i_loop_fields.phase == "3"
+
+    def test_legacy_session_is_backfilled(self, tmp_path):
+        service = PersistenceService(db_path=str(tmp_path / "graph.db"))
+        session = UserSession()
+        memory_node = _log_cycle(session, "старое")
+        service.save_session("u", session)
+        service.graph.delete_user("u")
+
+        assert service.ensure_graph("u")
+        assert service.graph.get_node("u", memory_node.id).user_input == "старое"
+        assert not service.ensure_graph("missing")
+
+
+class TestGraphArchive:
+    def test_round_trip_with_gzip(self, tmp_path):
+        source = PersistenceService(db_path=str(tmp_path / "a.db"))
+        session = UserSession()
+        for i in range(4):
+            _log_cycle(session, f"цикл {i}")
+        source.save_session("u", session)
+
+        path = str(tmp_path / "u.jsonl.gz")
+        write_archive(export_store(source.graph, "u", checkpoint_every=3), path)
+
+        target = PersistenceService(db_path=str(tmp_path / "b.db"))
+        with open_archive(path) as lines:
+            stats = import_into_store(target.graph, "v", lines)
+        assert (stats.nodes, stats.edges) == (12, 8)
+        restored = target.restore_from_graph("v").memory
+        assert set(restored.nodes) == set(session.memory.nodes)
+        assert sorted(restored.iter_links()) == sorted(session.memory.iter_links())
+        assert target.load_session("v").memory.search("цикл")
+
+    def test_corruption_and_resume(self, tmp_path):
+        session = UserSession()
+        for i in range(3):
+            _log_cycle(session, f"цикл {i}")
+        lines = list(export_memory(session.memory, checkpoint_every=4))
+
+        tampered = list(lines)
+        tampered[2] = tampered[2].replace('"a_index":0.5', '"a_index":0.9')
+        assert tampered != lines
+        with pytest.raises(ArchiveIntegrityError):
+            list(iter_records(tampered))
+
+        store = PersistenceService(db_path=str(tmp_path / "c.db")).graph
+        with pytest.raises(ArchiveIntegrityError):
+            import_into_store(store, "u", lines[:9])
+        assert store.count_nodes("u") == 4
+
+        stats = import_into_store(store, "u", lines)
+        assert stats.resumed and stats.skipped == 4
+        assert store.count_nodes("u") == len(session.memory.nodes)
+
+    def test_unreadable_and_invalid_records(self, tmp_path):
+        session = UserSession()
+        _log_cycle(session, "цикл")
+        path = tmp_path / "u.jsonl.gz"
+        write_archive(export_memory(session.memory), str(path))
+        store = PersistenceService(db_path=str(tmp_path / "d.db")).graph
+        data = path.read_bytes()
+        for broken in (data[: len(data) // 2], data[:-8] + b"\0" * 8, b"\xff\xfe" + data[2:]):
+            path.write_bytes(broken)
+            with pytest.raises(ArchiveIntegrityError):
+                with open_archive(str(path)) as lines:
+                    import_into_store(store, "u", lines)
+
+        header, *_ = export_memory(session.memory)
+        edge = json.dumps({"kind": "edge", "target": "x"}) + "\n"
+        digest = hashlib.sha256((header + edge).encode("utf-8")).hexdigest()
+        footer = json.dumps({"kind": "footer", "records": 1, "sha256": digest}) + "\n"
+        with pytest.raises(ArchiveIntegrityError, match="invalid edge"):
+            import_into_store(store, "u", [header, edge, footer])
+
+    def test_import_keeps_session_growth_log(self, tmp_path):
+        source = UserSession()
+        _log_cycle(source, "архив")
+        service = PersistenceService(db_path=str(tmp_path / "e.db"))
+        session = UserSession()
+        _log_cycle(session, "до импорта")
+        session.memory.log_growth_entry("synthesis", 0.6, "рост")
+        service.save_session("u", session)
+
+        import_into_store(service.graph, "u", export_memory(source.memory))
+        restored = service.restore_from_graph("u")
+        assert restored.memory.growth_log.recent(5) == session.memory.growth_log.recent(5)
+        assert service.load_session("u").memory.growth_log.recent(5) == session.memory.growth_log.recent(5)
+        assert len(restored.memory.growth_log.recent(5)) == 1
+
@@ -0,0 +1,41 @@
+"""
+Unit tests for the ring-buffer growth log and its rolling statistics.
+"""
+
+import random
+import statistics
+
+from memory.growth_log import GrowthLog
+from memory.hypergraph import HypergraphMemory
+
+
+class TestGrowthLog:
+    def test_window_statistics_match_recomputation(self):
+        rng = random.Random(7)
+        log = GrowthLog(capacity=25)
+        areas = ["truth", "structure", "chaos"]
+        for i in range(400):
+            log.append(rng.choice(areas), rng.random(), f"t{i}")
+            window = list(log)
+            assert len(window) == min(i + 1, 25)
+            values = [e["resonance_level"] for e in window]
+            assert abs(log.mean() - statistics.fmean(values)) < 1e-9
+            assert abs(log.variance() - statistics.pvariance(values)) < 1e-9
+            for area in areas:
+                area_values = [e["resonance_level"] for e in window if e["impact_area"] == area]
+                assert log.count(area) == len(area_values)
+                if area_values:
+                    assert abs(log.mean(area) - statistics.fmean(area_values)) < 1e-9
+        assert [e["trace"] for e in log.recent(2)] == ["t399", "t398"]
+
+    def test_persisted_with_hypergraph(self):
+        memory = HypergraphMemory()
+        for i in range(105):
+            memory.log_growth_entry("synthesis" if i % 2 else "truth", i / 105, f"d{i}")
+        restored = HypergraphMemory.from_dict(memory.to_dict())
+        assert len(restored.growth_entries) == 100
+        assert restored.growth_entries[0]["trace"] == "d5"
+        for area in ("truth", "synthesis"):
+            assert restored.growth_log.count(area) == memory.growth_log.count(area) == 50
+            assert abs(restored.growth_log.mean(area) - memory.growth_log.mean(area)) < 1e-9
+            assert abs(restored.growth_log.variance(area) - memory.growth_log.variance(area)) < 1e-9
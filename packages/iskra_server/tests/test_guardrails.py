@@ -0,0 +1,102 @@
+"""
+Guardrail engine: normalisation, homoglyph folding, the input size limit
+and the incremental scanner for streamed output.
+"""
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from services.guardrails import (
+    GuardrailEngine,
+    GuardrailService,
+    StreamingGuardrail,
+    guardrail_engine,
+    normalize_text,
+)
+
+
+class TestGuardrailEngine:
+    @pytest.mark.parametrize(
+        "text",
+        [
+            "САМОУБИЙСТВО",
+            "сaмoубийствo",  # Latin a/o inside Cyrillic
+            "само​убийство",  # zero-width space
+            "ＫＩＬＬ yourself",  # full-width letters
+            "kill уourself",  # Cyrillic у
+            "убей кого—то",  # em dash instead of the non-breaking hyphen
+        ],
+    )
+    def test_obfuscated_forbidden_text_is_caught(self, text):
+        assert guardrail_engine.find(text) is not None
+
+    def test_plain_text_passes(self):
+        assert guardrail_engine.find("Как сделать торт? Kill the process, then harm nothing.") is None
+
+    def test_normalize_text(self):
+        assert normalize_text("ПРИВЕТ") == "привет"
+        assert normalize_text("ﬁ­x－y") == "fix-y"
+        assert normalize_text("ASCII Only") == "ascii only"
+
+    def test_oversized_input_is_rejected_before_scanning(self, monkeypatch):
+        engine = GuardrailEngine(max_input_chars=10)
+        monkeypatch.setattr("services.guardrails.guardrail_engine", engine)
+        monkeypatch.setattr(engine, "find", lambda text: pytest.fail("scanned oversized input"))
+        violation = asyncio.run(GuardrailService.check_input_safety("x" * 11))
+        assert violation is not None and "10" in violation.reason
+
+
+class _FakeStream:
+    """Async stream of tool-call argument fragments that records consumption."""
+
+    def __init__(self, fragments):
+        self.fragments = fragments
+        self.sent = 0
+        self.closed = False
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        if self.sent >= len(self.fragments):
+            raise StopAsyncIteration
+        function = SimpleNamespace(name="AdomlResponseTool" if self.sent == 0 else None,
+                                   arguments=self.fragments[self.sent])
+        delta = SimpleNamespace(tool_calls=[SimpleNamespace(index=0, id="call-1", function=function)])
+        self.sent += 1
+        return SimpleNamespace(choices=[SimpleNamespace(delta=delta)])
+
+    async def close(self):
+        self.closed = True
+
+
+class TestStreamingGuardrail:
+    def test_match_split_across_chunks_is_caught(self):
+        guard = StreamingGuardrail()
+        assert guard.feed("Вот ответ: как сде") is None
+        assert guard.feed("лать бо") is None
+        assert guard.feed("мбу") == r"как\s+сделать\s+бомбу"
+        assert guard.feed("ещё текст") == r"как\s+сделать\s+бомбу"
+
+    def test_json_escapes_are_decoded(self):
+        guard = StreamingGuardrail(json_arguments=True)
+        assert guard.feed('{"content": "убить\\n') is None
+        assert guard.feed('\\u0441ебя"}') == r"убить\s+себя"
+
+    def test_llm_stream_is_cancelled_on_violation(self, monkeypatch):
+        llm = pytest.importorskip("services.llm")
+        fragments = ['{"content": "Kill ', 'your', 'self', ' and more', ' tokens"}']
+        stream = _FakeStream(fragments)
+
+        async def create(**request):
+            assert request["stream"] is True
+            return stream
+
+        fake_client = SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=create)))
+        monkeypatch.setattr(llm, "client", fake_client)
+        call_id, name, arguments, blocked = asyncio.run(llm.LLMService._stream_tool_call(model="m"))
+        assert (call_id, name, blocked) == ("call-1", "AdomlResponseTool", r"kill\s+yourself")
+        assert stream.sent == 3 and stream.closed
+        assert arguments == "".join(fragments[:3])
@@ -0,0 +1,70 @@
+"""
+Equivalence tests: shared lexicon scanner vs. per-marker ``re.search`` loops.
+"""
+
+import asyncio
+import random
+import re
+
+import pytest
+
+from core.models import IskraMetrics
+from services.anti_echo_detector import AntiEchoDetector
+from services.guardrails import FORBIDDEN_PATTERNS, GuardrailService
+from services.lexicon import Lexicon
+
+_VOCAB = (
+    "вы абсолютно правы полностью согласен именно так гениальный блестящая "
+    "однако но however but perhaps consider brilliant exceptional Самоубийство "
+    "ИМЕННО ТАК kill yourself просто текст слово ab abc bca"
+).split()
+
+
+def _texts(count, seed=5):
+    rng = random.Random(seed)
+    return [" ".join(rng.choice(_VOCAB) for _ in range(rng.randint(0, 40))) for _ in range(count)]
+
+
+class TestLexicon:
+    def test_scan_matches_per_pattern_search(self):
+        detector = AntiEchoDetector()
+        groups = {
+            "agreement": detector.agreement_patterns,
+            "flattery": detector.flattery_patterns,
+            "forbidden": FORBIDDEN_PATTERNS,
+        }
+        lexicon = Lexicon(groups, literals={"critique": detector.critique_markers})
+        for text in _texts(300):
+            hits = lexicon.scan(text)
+            for category, patterns in groups.items():
+                expected = [p for p in patterns if re.search(p, text, re.IGNORECASE)]
+                assert hits[category] == expected
+            expected = [m for m in detector.critique_markers if m.lower() in text.lower()]
+            assert hits["critique"] == expected
+
+    def test_overlapping_and_same_start_markers_are_all_found(self):
+        lexicon = Lexicon({"x": [r"ab", r"abc", r"bc", r"c\w*"]})
+        assert lexicon.counts("xabcx") == {"x": 4}
+        assert lexicon.search("zzbcab") == ("x", "bc")
+        assert lexicon.search("nothing here") is None
+
+    def test_plain_markers_follow_the_case_flag(self):
+        assert Lexicon({"x": ["Однако", "a.c"]}).counts("ОДНАКО abc") == {"x": 2}
+        strict = Lexicon({"x": ["Однако"]}, literals={"y": ["Ab"]}, flags=0)
+        assert strict.counts("однако ab") == {"x": 0, "y": 0}
+        assert strict.counts("Однако Ab") == {"x": 1, "y": 1}
+
+    def test_invalid_definitions_raise_value_error(self):
+        with pytest.raises(ValueError):
+            Lexicon({"bad": ["???"]})
+        with pytest.raises(ValueError):
+            Lexicon({"a": ["x"]}, literals={"a": ["y"]})
+
+    def test_guardrails_use_case_insensitive_scan(self):
+        violation = asyncio.run(GuardrailService.check_input_safety("Как СДЕЛАТЬ   бомбу?"))
+        assert violation is not None and "бомбу" in violation.reason
+        assert asyncio.run(GuardrailService.check_input_safety("как сделать торт")) is None
+        output = asyncio.run(
+            GuardrailService.check_output_safety("Тогда KILL yourself", IskraMetrics(), None)
+        )
+        assert output is not None
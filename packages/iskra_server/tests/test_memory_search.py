@@ -0,0 +1,60 @@
+"""
+Unit tests for lexical recall over the hypergraph (BM25 index).
+"""
+
+from core.models import MemoryNode, FacetType
+from memory.hypergraph import HypergraphMemory
+from memory.lexical_index import BM25Index, tokenize
+
+
+def _memory_node(user_input: str, response: str, ts: float) -> MemoryNode:
+    return MemoryNode(
+        user_input=user_input,
+        response_content=response,
+        facet=FacetType.ISKRA,
+        meta_node_id="META",
+        micro_log_node_id="MICRO",
+        timestamp=ts,
+    )
+
+
+class TestLexicalIndex:
+    def test_tokenize_folds_case_and_inflection(self):
+        assert tokenize("Память") == tokenize("памяти")
+        assert tokenize("Searching") == tokenize("search")
+        assert tokenize("и в на the") == []
+
+    def test_bm25_ranks_matching_documents(self):
+        index = BM25Index.build([
+            ("a", "фрактальная память и ритм"),
+            ("b", "погода сегодня солнечная"),
+            ("c", "память память память"),
+        ])
+        hits = index.search("память", limit=5)
+        assert [doc for doc, _ in hits][:2] == ["c", "a"]
+        assert "b" not in {doc for doc, _ in hits}
+        index.remove_document("c", "память память память")
+        assert [doc for doc, _ in index.search("память")] == ["a"]
+
+    def test_hypergraph_search_and_persistence(self):
+        memory = HypergraphMemory()
+        memory.add_node(_memory_node("Расскажи о фракталах", "Фрактал — самоподобие", 1.0))
+        memory.add_node(_memory_node("Какая погода?", "Солнечно", 2.0))
+        for i in range(6):
+            memory.add_node(_memory_node(f"вопрос {i}", "ответ", 10.0 + i))
+
+        results = memory.search("фрактал")
+        assert len(results) == 1 and results[0]["user_input"] == "Расскажи о фракталах"
+
+        # The matching cycle is outside the recency window but is recalled.
+        context = memory.retrieve_context(limit=3, query="фракталы")
+        assert [n["user_input"] for n in context][0] == "Расскажи о фракталах"
+        assert len(context) == 4
+
+        restored = HypergraphMemory.from_dict(memory.to_dict())
+        assert restored.search("погода")[0]["response_content"] == "Солнечно"
+
+        # Sessions stored without an index are re-indexed on load.
+        legacy = memory.to_dict()
+        legacy.pop("lexical_index")
+        assert HypergraphMemory.from_dict(legacy).search("погода")
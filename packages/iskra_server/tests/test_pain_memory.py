@@ -0,0 +1,75 @@
+"""
+Pain memory: incremental EMAs, time decay and windowed statistics.
+"""
+
+import json
+import random
+import statistics
+
+import pytest
+
+from services.pain_memory_manager import PainMemoryManager
+
+
+def _reference_ema(values, alpha):
+    ema = values[0]
+    for value in values[1:]:
+        ema = alpha * value + (1 - alpha) * ema
+    return ema
+
+
+def _reference_slope(values):
+    n = len(values)
+    mean_x, mean_v = (n - 1) / 2, sum(values) / n
+    num = sum((x - mean_x) * (v - mean_v) for x, v in enumerate(values))
+    return num / sum((x - mean_x) ** 2 for x in range(n))
+
+
+class TestPainMemoryManager:
+    def test_incremental_statistics_match_recomputation(self):
+        rng = random.Random(11)
+        pain = PainMemoryManager(maxlen=30)
+        values = [rng.random() for _ in range(500)]
+        for i, value in enumerate(values):
+            pain.add_pain(value, timestamp=1000.0 + i)
+
+        window = values[-30:]
+        assert pain.recent(3) == values[-3:]
+        assert pain.ema(0.3) == pytest.approx(_reference_ema(values, 0.3))
+        assert pain.average() == pytest.approx(statistics.fmean(window))
+        assert pain.variance() == pytest.approx(statistics.pvariance(window))
+        assert pain.trend() == pytest.approx(_reference_slope(window))
+        # An untracked alpha is seeded once from the window, then kept up to date
+        assert pain.ema(0.5) == pytest.approx(_reference_ema(window, 0.5))
+        pain.add_pain(1.0, timestamp=2000.0)
+        assert pain.ema(0.5) == pytest.approx(_reference_ema(window + [1.0], 0.5))
+
+    def test_first_sample_seeds_the_ema(self):
+        pain = PainMemoryManager()
+        pain.add_pain(0.8, timestamp=0.0)
+        assert pain.ema(0.1) == 0.8 and pain.trend() == 0.0
+
+    def test_decay_uses_wall_clock_half_life(self):
+        pain = PainMemoryManager(half_life=60.0)
+        pain.add_pain(1.0, timestamp=0.0)
+        pain.add_pain(0.0, timestamp=60.0)
+        # The first sample has half the weight of the second one
+        assert pain.decayed_mean() == pytest.approx(1 / 3)
+        assert pain.decayed_weight(now=120.0) == pytest.approx(0.75)
+
+    def test_state_round_trip_continues_identically(self):
+        rng = random.Random(5)
+        pain = PainMemoryManager(maxlen=20, alphas=(0.2,), half_life=30.0)
+        for i in range(45):
+            pain.add_pain(rng.random(), timestamp=float(i))
+        restored = PainMemoryManager.from_state(json.loads(json.dumps(pain.to_state())))
+        for manager in (pain, restored):
+            manager.add_pain(0.9, timestamp=50.0)
+        for name in ("average", "variance", "trend", "decayed_mean"):
+            assert getattr(restored, name)() == pytest.approx(getattr(pain, name)())
+        assert restored.ema(0.2) == pytest.approx(pain.ema(0.2))
+
+    def test_legacy_state_is_replayed(self):
+        restored = PainMemoryManager.from_state({"maxlen": 10, "history": [[0.0, 0.2], [1.0, 0.4], "bad"]})
+        assert restored.recent(5) == [0.2, 0.4]
+        assert restored.ema(0.1) == pytest.approx(0.1 * 0.4 + 0.9 * 0.2)
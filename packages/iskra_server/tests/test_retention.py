@@ -0,0 +1,102 @@
+"""
+Unit tests for the memory retention policy (bounded session hypergraph).
+"""
+
+from core.models import (
+    AdomlBlock,
+    EvidenceNode,
+    FacetType,
+    IskraMetrics,
+    IskraResponse,
+    MicroLogNode,
+    NodeType,
+    SummaryNode,
+)
+from memory.hypergraph import HypergraphMemory
+from memory.retention import RetentionPolicy
+from services.persistence import PersistenceService, UserSession
+
+
+def _log_cycle(memory: HypergraphMemory, text: str, pain: float = 0.0, a_index: float = 0.5, evidence=()):
+    response = IskraResponse(
+        facet=FacetType.ISKRA,
+        content=f"Ответ: {text}",
+        adoml=AdomlBlock(
+            delta="d", sift="s", omega=0.5,
+            lambda_latch='{action: "a", owner: "o", condition: "c", <=24h: true}',
+        ),
+        metrics_snapshot=IskraMetrics(pain=pain),
+        i_loop="voice=Искра; phase=3; intent=test",
+        a_index=a_index,
+    )
+    micro = MicroLogNode(
+        text_length=len(text), pause_duration_ms=None, pause_type=None,
+        lz_complexity=0.5, hurst_exponent=0.5,
+    )
+    return memory.log_interaction_cycle(text, response, micro, list(evidence), a_index)
+
+
+def _dangling_links(memory: HypergraphMemory):
+    return [(s, t) for s, t in memory.iter_links() if s not in memory.nodes or t not in memory.nodes]
+
+
+class TestRetentionPolicy:
+    def test_within_budget_is_untouched(self):
+        memory = HypergraphMemory()
+        _log_cycle(memory, "один")
+        assert RetentionPolicy(max_nodes=10).enforce(memory) is None
+
+    def test_low_value_cycles_are_coalesced(self):
+        memory = HypergraphMemory()
+        policy = RetentionPolicy(max_nodes=30, keep_recent_cycles=2, summary_batch=4)
+        painful = _log_cycle(memory, "больно", pain=0.95, a_index=0.9)
+        anchored = _log_cycle(memory, "якорь")
+        event = memory.log_self_event("Я помню", "intent=self_reflection", anchored.id)
+        for i in range(10):
+            _log_cycle(memory, f"рутина номер {i}", a_index=0.1)
+        assert len(memory.nodes) == 37
+
+        report = policy.enforce(memory)
+        assert report.nodes_after <= 30 and len(memory.nodes) <= 30
+        assert painful.id in memory.nodes and anchored.id in memory.nodes
+        assert event.id in memory.nodes
+        summaries = [n for n in memory.nodes.values() if isinstance(n, SummaryNode)]
+        assert summaries and sum(s.cycle_count for s in summaries) == report.evicted_cycles
+        assert not _dangling_links(memory)
+        assert "рутина номер 0" not in {hit["user_input"] for hit in memory.search("рутина")}
+        assert len(memory.lexical_index) == 12 - report.evicted_cycles
+        assert memory.search("больно")
+
+    def test_hard_budget_and_self_event_relinking(self):
+        memory = HypergraphMemory()
+        policy = RetentionPolicy(max_nodes=12, keep_recent_cycles=1, summary_batch=2, max_summaries=2)
+        events = []
+        for i in range(6):
+            node = _log_cycle(memory, f"цикл {i}", evidence=[EvidenceNode(
+                source_query="q", snippet="s", source_url="u", title="t",
+            )])
+            events.append(memory.log_self_event(f"момент {i}", "t", node.id))
+        policy.enforce(memory)
+        assert len(memory.nodes) <= 12
+        assert not _dangling_links(memory)
+        summaries = [n for n in memory.nodes.values() if isinstance(n, SummaryNode)]
+        assert len(summaries) <= 2
+        for event in events:
+            if event.id in memory.nodes:
+                assert memory.links[event.id]
+        assert sum(len(s.declarations) for s in summaries) + sum(
+            e.id in memory.nodes for e in events
+        ) == len(events)
+
+    def test_graph_store_follows_evictions(self, tmp_path):
+        service = PersistenceService(db_path=str(tmp_path / "r.db"))
+        session = UserSession()
+        for i in range(8):
+            _log_cycle(session.memory, f"цикл {i}")
+        service.save_session("u", session)
+        RetentionPolicy(max_nodes=20, keep_recent_cycles=2).enforce(session.memory)
+        service.save_session("u", session)
+        assert service.graph.count_nodes("u") == len(session.memory.nodes)
+        restored = service.load_session("u").memory
+        assert set(restored.nodes) == set(session.memory.nodes)
+        assert service.graph.history("u", NodeType.SUMMARY)
@@ -0,0 +1,120 @@
+"""
+Monte Carlo simulator: equivalence with the request path, determinism and reports.
+"""
+
+import numpy as np
+import pytest
+
+from core.engine import FacetEngine
+from core.models import FacetType, IskraMetrics, PhaseType
+from memory.growth_log import GrowthLog
+from services.batch_engine import FACETS, METRIC_DTYPE, PHASES, batch_a_index
+from services.dynamic_thresholds import DynamicThresholdAdapter
+from services.phase_engine import PhaseEngine
+from services.simulator import (
+    MetricModel,
+    SimulationReport,
+    VectorThresholdAdapter,
+    _base_thresholds,
+    replay,
+    run_monte_carlo,
+    simulate_block,
+)
+
+
+def _trajectories(sessions, steps, seed=3):
+    model = MetricModel(volatility={name: 0.2 for name in MetricModel().mean})
+    rng = np.random.default_rng(seed)
+    rows = [model.initial(sessions)]
+    for _ in range(steps - 1):
+        rows.append(model.advance(rows[-1], rng))
+    return np.stack(rows, axis=1)
+
+
+def _scalar_session(row):
+    """The ask_iskra decision flow, one turn at a time, with the scalar engines."""
+    adapter, growth = DynamicThresholdAdapter(), GrowthLog()
+    phase, facets, phases, cycles = PhaseType.PHASE_3_TRANSITION, [], [], 0
+    for step, values in enumerate(row):
+        m = IskraMetrics(**{name: values[name].item() for name in METRIC_DTYPE.names})
+        t = adapter.snapshot()
+        m.splinter_pain_cycles = cycles + 1 if m.pain > t.pain_high else 0
+        adapter.update(m, growth=growth)
+        a_index = float(batch_a_index(np.array([values]))[0])
+        if step == 0 or m.drift > t.mantra_drift_trigger:
+            facet = FacetType.ISKRA
+            if step:
+                m.drift = 0.0
+        elif m.silence_mass > t.gravitas_silence_mass:
+            facet, m.silence_mass = FacetType.ANHANTRA, 0.0
+        elif m.splinter_pain_cycles > t.splinter_pain_cycles:
+            facet, m.splinter_pain_cycles = FacetType.KAIN, 0
+        else:
+            facet = FacetEngine.determine_facet(m, thresholds=t)
+            growth.append("synthesis", a_index, "")
+        cycles = m.splinter_pain_cycles
+        phase = PhaseEngine.transition(phase, m, a_index, thresholds=t)
+        facets.append(facet)
+        phases.append(phase)
+    return facets, phases
+
+
+class TestSimulator:
+    def test_replay_matches_scalar_request_path(self):
+        trajectories = _trajectories(6, 120)
+        report = replay(trajectories, trap_steps=1)
+        facet_counts = np.zeros(len(FACETS), dtype=np.int64)
+        transitions = np.zeros((len(PHASES), len(PHASES)), dtype=np.int64)
+        for row in trajectories:
+            facets, phases = _scalar_session(row)
+            for facet in facets:
+                facet_counts[FACETS.index(facet)] += 1
+            previous = [PhaseType.PHASE_3_TRANSITION] + phases[:-1]
+            for src, dst in zip(previous, phases):
+                transitions[PHASES.index(src), PHASES.index(dst)] += 1
+        assert report.facet_counts.tolist() == facet_counts.tolist()
+        assert report.transitions.tolist() == transitions.tolist()
+
+    def test_vector_adapter_respects_masks(self):
+        trajectories = _trajectories(2, 70)
+        adapter = VectorThresholdAdapter(2, _base_thresholds(None))
+        scalar = DynamicThresholdAdapter()
+        for step in range(70):
+            adapter.update(trajectories[:, step], np.array([True, step % 2 == 0]))
+            if step % 2 == 0:
+                m = trajectories[1, step]
+                scalar.update(IskraMetrics(pain=m["pain"].item(), drift=m["drift"].item(), clarity=m["clarity"].item()))
+        for key in VectorThresholdAdapter.ADAPTED:
+            assert adapter.thresholds()[key][1] == pytest.approx(scalar.get(key))
+
+    def test_monte_carlo_is_deterministic_across_workers(self):
+        inline = run_monte_carlo(sessions=1100, steps=30, seed=9, workers=1)
+        pooled = run_monte_carlo(sessions=1100, steps=30, seed=9, workers=2)
+        assert inline.sessions == 1100 and inline.steps == 1100 * 30
+        assert inline.transitions.tolist() == pooled.transitions.tolist()
+        assert inline.dwell.tolist() == pooled.dwell.tolist()
+
+    def test_report_statistics(self):
+        report = simulate_block(300, 80, seed=2, trap_steps=5)
+        assert sum(report.facet_distribution().values()) == pytest.approx(1.0)
+        assert sum(report.stationary_distribution().values()) == pytest.approx(1.0)
+        for stats in report.dwell_times().values():
+            assert 1 <= stats["median"] <= stats["p95"] <= 80
+        assert report.trigger_counts["manta"] >= 300  # first launch of every session
+
+        # A stricter pain threshold can only reduce KAIN
+        strict = simulate_block(300, 80, seed=2, thresholds={"pain_high": 0.9})
+        kain = FACETS.index(FacetType.KAIN)
+        assert strict.facet_counts[kain] <= report.facet_counts[kain]
+
+        # A lower pain threshold makes Splinter fire more often
+        lenient = simulate_block(300, 80, seed=2, thresholds={"pain_high": 0.4}, adaptive=False)
+        static = simulate_block(300, 80, seed=2, adaptive=False)
+        assert lenient.trigger_counts["splinter"] > static.trigger_counts["splinter"]
+
+        merged = SimulationReport(trap_steps=5, max_dwell=80)
+        merged.merge(report)
+        merged.merge(report)
+        assert merged.sessions == 600
+        with pytest.raises(ValueError):
+            simulate_block(10, 5, thresholds={"no_such_threshold": 1.0})
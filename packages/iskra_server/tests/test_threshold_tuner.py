@@ -0,0 +1,98 @@
+"""
+Offline threshold tuner: SLO target loading, search and reports.
+"""
+
+import json
+
+import numpy as np
+import pytest
+
+from config import SLO_PATH, THRESHOLDS
+from core.models import FacetType, PhaseType
+from services.simulator import MetricModel, replay, stack_series
+from services.threshold_tuner import (
+    TuningTargets,
+    diff_report,
+    distribution_loss,
+    load_targets,
+    proposed_thresholds,
+    tune,
+)
+
+
+def _series(sessions=120, steps=40, seed=5):
+    model, rng = MetricModel(), np.random.default_rng(seed)
+    rows = [model.initial(sessions)]
+    for _ in range(steps - 1):
+        rows.append(model.advance(rows[-1], rng))
+    return list(np.stack(rows, axis=1))
+
+
+def _targets_of(series, thresholds, search):
+    """Targets that a known threshold vector meets exactly."""
+    report = replay(*stack_series(series), thresholds=thresholds)
+    return TuningTargets(
+        facets=report.facet_distribution(),
+        phases=report.phase_distribution(),
+        search=search,
+    )
+
+
+class TestThresholdTuner:
+    def test_load_targets_from_repo_slo(self):
+        targets = load_targets(SLO_PATH)
+        assert sum(targets.facets.values()) == pytest.approx(1.0)
+        assert sum(targets.phases.values()) == pytest.approx(1.0)
+        assert PhaseType.PHASE_4_CLARITY.value in targets.phases
+        assert FacetType.KAIN.value in targets.facets
+        assert set(targets.search) <= set(THRESHOLDS)
+        assert targets.triggers["chaos_to_hundun"] == pytest.approx(0.6)
+
+    def test_load_targets_rejects_unknown_names(self, tmp_path):
+        path = tmp_path / "slo.json"
+        path.write_text(json.dumps({"tuning": {"facet_distribution": {"NOPE": 1.0}}}))
+        with pytest.raises(ValueError):
+            load_targets(str(path))
+        path.write_text(json.dumps({"trigger_thresholds": {}}))
+        with pytest.raises(ValueError):
+            load_targets(str(path))
+
+    @pytest.mark.parametrize("strategy", ["coordinate", "grid"])
+    def test_tune_recovers_known_thresholds(self, strategy):
+        series = _series()
+        search = {"pain_high": [0.6, 0.7, 0.8], "chaos_high": [0.5, 0.6, 0.7]}
+        targets = _targets_of(series, {"pain_high": 0.6, "chaos_high": 0.5}, search)
+        result = tune(series, targets, strategy=strategy)
+        assert result.proposed_loss == pytest.approx(0.0)
+        assert result.current_loss > 0
+        assert distribution_loss(result.proposed_report, targets) == pytest.approx(0.0)
+        assert result.changes() == {"pain_high": (0.7, 0.6), "chaos_high": (0.6, 0.5)}
+
+    def test_parallel_matches_inline(self):
+        series = _series(sessions=60)
+        search = {"drift_high": [0.25, 0.3, 0.35], "clarity_low": [0.6, 0.7]}
+        targets = _targets_of(series, {"drift_high": 0.35, "clarity_low": 0.6}, search)
+        inline = tune(series, targets, strategy="grid", workers=1)
+        pooled = tune(series, targets, strategy="grid", workers=2)
+        assert inline.proposed == pooled.proposed
+        assert inline.proposed_loss == pytest.approx(pooled.proposed_loss)
+
+    def test_proposed_file_and_diff_report(self):
+        series = _series(sessions=40)
+        targets = _targets_of(series, {"chaos_high": 0.5}, {"chaos_high": [0.5, 0.6]})
+        targets.triggers = {"chaos_to_hundun": 0.55}
+        result = tune(series, targets)
+        proposed = proposed_thresholds(result)
+        assert proposed["thresholds"]["chaos_high"] == 0.5
+        assert proposed["slo_trigger_thresholds"]["chaos_to_hundun"] == 0.5
+        assert set(proposed["thresholds"]) == set(THRESHOLDS)
+        report = diff_report(result)
+        assert "- chaos_high: 0.6" in report and "+ chaos_high: 0.5" in report
+        assert "chaos_to_hundun" in report and "*" in report
+
+    def test_tune_validates_input(self):
+        targets = TuningTargets(facets={}, phases={}, search={"pain_high": [0.7]})
+        with pytest.raises(ValueError):
+            tune([], targets)
+        with pytest.raises(ValueError):
+            tune(_series(sessions=2, steps=3), targets, strategy="bayes")
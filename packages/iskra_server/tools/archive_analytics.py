@@ -0,0 +1,63 @@
+"""CLI for offline analytics over the session archive.
+
+Streams every session out of the SQLite archive with a process pool and
+writes columnar tables plus a summary report. See
+:mod:`services.archive_analytics` for what is computed.
+
+Usage::
+
+    python tools/archive_analytics.py                      # report only
+    python tools/archive_analytics.py --out reports/       # + CSV tables
+    python tools/archive_analytics.py --out reports/ --format parquet --workers 8
+
+Tables written to ``--out``: ``facets``, ``transitions``,
+``a_index_daily`` and ``triggers``, plus ``summary.txt``.
+
+Return codes:
+
+ * ``0`` — success.
+ * ``2`` — usage error (missing database, Parquet without pyarrow).
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import DB_PATH  # noqa: E402
+from services.archive_analytics import analyze_archive, summary_report, write_tables  # noqa: E402
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Aggregate facet, phase, A-index and ritual statistics.")
+    parser.add_argument("--db", default=DB_PATH, help="Path to the session database.")
+    parser.add_argument("--out", help="Directory for the result tables and summary.")
+    parser.add_argument("--format", choices=("csv", "parquet"), default="csv")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count).")
+    parser.add_argument("--shards", type=int, default=None, help="User shards (default: 4 per worker).")
+    args = parser.parse_args(argv)
+
+    if not os.path.exists(args.db):
+        print(f"Database not found: {args.db}")
+        return 2
+    stats = analyze_archive(args.db, workers=args.workers, shards=args.shards)
+    report = summary_report(stats)
+    print(report)
+    if args.out:
+        try:
+            paths = write_tables(stats, args.out, args.format)
+        except ValueError as exc:
+            print(f"Cannot write tables: {exc}")
+            return 2
+        summary_path = os.path.join(args.out, "summary.txt")
+        with open(summary_path, "w", encoding="utf-8") as fh:
+            fh.write(report + "\n")
+        print(f"\nWrote {len(paths)} tables and summary.txt to {args.out}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,193 @@
+"""Micro-benchmarks for per-request analytics.
+
+Every case measures one hot-path operation on a representative input and
+compares the mean time per call with its budget. The suite is meant to
+be run before merging changes to the analytics that execute on each
+``/ask`` request.
+
+Usage::
+
+    python tools/benchmarks.py              # run every case
+    python tools/benchmarks.py lz76 hurst   # run cases whose name contains a pattern
+    python tools/benchmarks.py --list
+
+Return codes:
+
+ * ``0`` — every selected case is within budget.
+ * ``1`` — at least one case exceeded its budget.
+"""
+
+from __future__ import annotations
+
+import argparse
+import base64
+import os
+import random
+import struct
+import sys
+import time
+from typing import Callable, Dict, List, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.field_parser import parse_i_loop, parse_lambda_latch  # noqa: E402
+from services.anti_echo_detector import ECHO_LEXICON  # noqa: E402
+from services.fractal import FractalService  # noqa: E402
+from services.guardrails import GuardrailEngine, guardrail_engine  # noqa: E402
+
+# name -> (factory returning the callable to time, budget in ms)
+CASES: Dict[str, Tuple[Callable[[], Callable[[], object]], float]] = {}
+
+_WORDS = (
+    "память фрактал ритм искра голос грань боль ясность доверие хаос дрейф "
+    "тишина смысл путь свет тень время мысль memory rhythm signal trace"
+).split()
+
+
+def case(name: str, budget_ms: float):
+    """Register a benchmark factory under *name* with a per-call budget."""
+
+    def register(factory: Callable[[], Callable[[], object]]):
+        CASES[name] = (factory, budget_ms)
+        return factory
+
+    return register
+
+
+def sample_text(n_bytes: int, seed: int = 1) -> str:
+    """Russian/English prose-like text of roughly *n_bytes* UTF-8 bytes."""
+    rng = random.Random(seed)
+    alphabet = "абвгдежзиклмнопрстуфхцчшщыэюя"
+    words: List[str] = []
+    size = 0
+    while size < n_bytes:
+        if rng.random() < 0.6:
+            word = rng.choice(_WORDS)
+        else:
+            word = "".join(rng.choice(alphabet) for _ in range(rng.randint(2, 9)))
+        words.append(word)
+        size += len(word.encode("utf-8")) + 1
+    return " ".join(words)
+
+
+@case("lz76-tokens-8kb", budget_ms=1.0)
+def _lz76_tokens():
+    text = sample_text(8 * 1024)
+    return lambda: FractalService.lz_complexity(text)
+
+
+@case("hurst-rs-2k-points", budget_ms=1.0)
+def _hurst():
+    rng = random.Random(2)
+    series = [rng.random() for _ in range(2048)]
+    return lambda: FractalService.hurst_exponent(series)
+
+
+@case("micro-metrics-4kb", budget_ms=1.0)
+def _micro_metrics():
+    text = sample_text(4 * 1024)
+    return lambda: FractalService.calculate_micro_metrics(text, 12000)
+
+
+@case("pause-profile-4k-intervals", budget_ms=1.0)
+def _pause_profile():
+    rng = random.Random(3)
+    intervals = [int(rng.lognormvariate(5.0, 0.8)) for _ in range(4096)]
+    payload = base64.b64encode(struct.pack(f"<{len(intervals)}h", *intervals)).decode("ascii")
+
+    def run():
+        decoded = FractalService.decode_keystroke_intervals(payload)
+        return FractalService.analyze_pauses(decoded)
+
+    return run
+
+
+@case("guardrail-scan-1mb", budget_ms=80.0)
+def _guardrail_scan():
+    # Output check: no length limit, full normalisation + one automaton pass.
+    engine = GuardrailEngine(max_input_chars=sys.maxsize)
+    text = sample_text(1024 * 1024)
+    return lambda: engine.find(text)
+
+
+@case("guardrail-scan-1mb-obfuscated", budget_ms=90.0)
+def _guardrail_obfuscated():
+    engine = GuardrailEngine(max_input_chars=sys.maxsize)
+    rng = random.Random(4)
+    swaps = {"а": "a", "о": "o", "с": "c", "е": "e"}
+    chars = []
+    for ch in sample_text(1024 * 1024):
+        chars.append(swaps.get(ch, ch) if rng.random() < 0.3 else ch)
+        if rng.random() < 0.01:
+            chars.append("\u200b")
+    text = "".join(chars)
+    return lambda: engine.find(text)
+
+
+@case("guardrail-reject-1mb-input", budget_ms=0.01)
+def _guardrail_reject():
+    text = sample_text(1024 * 1024)
+    return lambda: guardrail_engine.exceeds_limit(text) or guardrail_engine.find(text)
+
+
+@case("echo-lexicon-counts-12kb", budget_ms=0.8)
+def _echo_lexicon():
+    # The per-marker re.search loop this replaced took about 1.2 ms here, so
+    # a regression to it fails the budget; short markers ("но") hit everywhere.
+    text = sample_text(12 * 1024) + " Однако вы абсолютно правы, это гениально."
+    return lambda: ECHO_LEXICON.counts(text)
+
+
+@case("lambda-latch-adversarial-64kb", budget_ms=1.0)
+def _lambda_latch_adversarial():
+    # Every keyword repeated but no "<=": the old regex backtracked for seconds at 600 chars.
+    text = "{" + "action, owner, condition, " * (64 * 1024 // 26)
+    return lambda: parse_lambda_latch(text)
+
+
+@case("i-loop-adversarial-64kb", budget_ms=10.0)
+def _i_loop_adversarial():
+    # Thousands of "intent=" keys, none preceded by ";": each is checked once.
+    text = "voice=x; phase=" + "y intent=" * (64 * 1024 // 9)
+    return lambda: parse_i_loop(text)
+
+
+def measure(fn: Callable[[], object], repeat: int) -> float:
+    """Best mean time per call (ms) over five rounds of *repeat* calls."""
+    fn()  # warm-up
+    best = float("inf")
+    for _ in range(5):
+        start = time.perf_counter()
+        for _ in range(repeat):
+            fn()
+        best = min(best, (time.perf_counter() - start) / repeat)
+    return best * 1000.0
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Run per-request analytics benchmarks.")
+    parser.add_argument("patterns", nargs="*", help="Substrings selecting cases to run.")
+    parser.add_argument("--repeat", type=int, default=50, help="Calls per timing round.")
+    parser.add_argument("--list", action="store_true", help="List cases and exit.")
+    args = parser.parse_args(argv)
+
+    selected = [
+        name for name in CASES if not args.patterns or any(p in name for p in args.patterns)
+    ]
+    if args.list:
+        for name in selected:
+            print(f"{name}  (budget {CASES[name][1]:g} ms)")
+        return 0
+
+    failed = 0
+    for name in selected:
+        factory, budget = CASES[name]
+        elapsed = measure(factory(), max(1, args.repeat))
+        status = "ok" if elapsed <= budget else "OVER BUDGET"
+        failed += elapsed > budget
+        print(f"{name:<32} {elapsed:9.3f} ms   budget {budget:g} ms   {status}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,116 @@
+"""CLI for streaming hypergraph archives (JSONL, optionally gzip).
+
+Exports read straight from the graph store tables and imports write to
+them checkpoint by checkpoint, so neither side loads a whole session into
+memory. See :mod:`memory.graph_archive` for the file format.
+
+Usage::
+
+    python tools/graph_archive.py export USER_ID out.jsonl.gz
+    python tools/graph_archive.py import USER_ID in.jsonl.gz
+    python tools/graph_archive.py verify in.jsonl.gz
+
+``import`` resumes an interrupted import of the same archive unless
+``--no-resume`` is given, and afterwards rebuilds the user's session
+document from the imported graph unless ``--graph-only`` is given (use it
+for archive migrations too large to hydrate as a live session).
+
+Return codes:
+
+ * ``0`` — success.
+ * ``1`` — the archive is malformed or fails checksum verification.
+ * ``2`` — usage error (unknown user, missing file).
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import DB_PATH  # noqa: E402
+from memory.graph_archive import (  # noqa: E402
+    DEFAULT_CHECKPOINT_EVERY,
+    ArchiveIntegrityError,
+    export_store,
+    import_into_store,
+    iter_records,
+    open_archive,
+    write_archive,
+)
+from services.persistence import PersistenceService  # noqa: E402
+
+
+def _build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Export, import or verify hypergraph archives.")
+    parser.add_argument("--db", default=DB_PATH, help="Path to the session database.")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    export = sub.add_parser("export", help="Write a user's hypergraph to an archive.")
+    export.add_argument("user_id")
+    export.add_argument("path", help="Output file; a .gz suffix enables gzip.")
+    export.add_argument("--checkpoint-every", type=int, default=DEFAULT_CHECKPOINT_EVERY)
+
+    imp = sub.add_parser("import", help="Load an archive into a user's hypergraph.")
+    imp.add_argument("user_id")
+    imp.add_argument("path")
+    imp.add_argument("--no-resume", action="store_true", help="Ignore progress of earlier attempts.")
+    imp.add_argument("--graph-only", action="store_true", help="Do not rebuild the session document.")
+
+    verify = sub.add_parser("verify", help="Check an archive's structure and checksums.")
+    verify.add_argument("path")
+    return parser
+
+
+def main(argv=None) -> int:
+    args = _build_parser().parse_args(argv)
+
+    if args.command == "verify":
+        if not os.path.exists(args.path):
+            print(f"File not found: {args.path}")
+            return 2
+        nodes = edges = 0
+        try:
+            with open_archive(args.path) as lines:
+                for record, _ in iter_records(lines):
+                    nodes += record["kind"] == "node"
+                    edges += record["kind"] == "edge"
+        except ArchiveIntegrityError as exc:
+            print(f"Archive invalid: {exc}")
+            return 1
+        print(f"Archive OK: {nodes} nodes, {edges} edges")
+        return 0
+
+    persistence = PersistenceService(db_path=args.db)
+
+    if args.command == "export":
+        if not persistence.ensure_graph(args.user_id):
+            print(f"No session for user {args.user_id!r}")
+            return 2
+        lines = export_store(persistence.graph, args.user_id, checkpoint_every=args.checkpoint_every)
+        count = write_archive(lines, args.path)
+        print(f"Exported {args.user_id!r} to {args.path} ({count} lines)")
+        return 0
+
+    if not os.path.exists(args.path):
+        print(f"File not found: {args.path}")
+        return 2
+    try:
+        with open_archive(args.path) as lines:
+            stats = import_into_store(
+                persistence.graph, args.user_id, lines, resume=not args.no_resume
+            )
+    except ArchiveIntegrityError as exc:
+        print(f"Import aborted: {exc}")
+        return 1
+    if not args.graph_only:
+        persistence.restore_from_graph(args.user_id)
+    resumed = f", resumed after {stats.skipped} records" if stats.resumed else ""
+    print(f"Imported {stats.nodes} nodes and {stats.edges} edges into {args.user_id!r}{resumed}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
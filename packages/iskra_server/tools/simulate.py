@@ -0,0 +1,78 @@
+"""CLI for Monte Carlo what-if runs of facet and phase dynamics.
+
+Simulates sessions with the current thresholds and, when overrides are
+given, again with the candidate thresholds on the same random draws, then
+prints the shifts. See :mod:`services.simulator` for the model.
+
+Usage::
+
+    python tools/simulate.py                                   # current thresholds
+    python tools/simulate.py --set pain_high=0.8 --set chaos_high=0.5
+    python tools/simulate.py --sessions 20000 --steps 300 --workers 8 --static
+
+Return codes:
+
+ * ``0`` — success.
+ * ``2`` — usage error (malformed or unknown threshold override).
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import THRESHOLDS  # noqa: E402
+from services.simulator import compare_report, run_monte_carlo, summary_report  # noqa: E402
+
+
+def _overrides(pairs):
+    overrides = {}
+    for pair in pairs:
+        key, sep, value = pair.partition("=")
+        if not sep:
+            raise ValueError(f"expected KEY=VALUE, got {pair!r}")
+        key = key.strip()
+        if key not in THRESHOLDS:
+            raise ValueError(f"unknown threshold {key!r}")
+        overrides[key] = float(value)
+    return overrides
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Simulate facet selection and phase cycling.")
+    parser.add_argument("--sessions", type=int, default=5000)
+    parser.add_argument("--steps", type=int, default=200, help="Turns per session.")
+    parser.add_argument("--set", action="append", default=[], metavar="KEY=VALUE", help="Candidate threshold.")
+    parser.add_argument("--static", action="store_true", help="Disable per-session dynamic thresholds.")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count).")
+    parser.add_argument("--trap-steps", type=int, default=10, help="Turns in one state that count as a trap.")
+    args = parser.parse_args(argv)
+
+    try:
+        overrides = _overrides(args.set)
+    except ValueError as exc:
+        print(f"Invalid override: {exc}")
+        return 2
+    options = dict(
+        sessions=args.sessions,
+        steps=args.steps,
+        adaptive=not args.static,
+        seed=args.seed,
+        workers=args.workers,
+        trap_steps=args.trap_steps,
+    )
+    base = run_monte_carlo(**options)
+    print(summary_report(base))
+    if overrides:
+        candidate = run_monte_carlo(thresholds=overrides, **options)
+        print()
+        print(compare_report(base, candidate))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,94 @@
+"""CLI for offline threshold tuning against the SLO targets.
+
+Replays the recorded metric histories of the archive through candidate
+threshold vectors, picks the one whose facet and phase occupancy is
+closest to the ``tuning`` targets of ``slo.json``, writes the proposed
+threshold file and prints a diff against ``config.THRESHOLDS`` and the
+SLO trigger thresholds. See :mod:`services.threshold_tuner`.
+
+Usage::
+
+    python tools/tune_thresholds.py --db iskra_archive.db --out proposed_thresholds.json
+    python tools/tune_thresholds.py --strategy grid --max-candidates 500 --workers 8
+    python tools/tune_thresholds.py --synthetic 2000           # no archive: simulated sessions
+
+Return codes:
+
+ * ``0`` — success.
+ * ``1`` — no metric history to replay.
+ * ``2`` — usage error (missing archive, malformed SLO file).
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import DB_PATH, SLO_PATH  # noqa: E402
+from services.archive_analytics import metric_series  # noqa: E402
+from services.simulator import MetricModel  # noqa: E402
+from services.threshold_tuner import diff_report, load_targets, proposed_thresholds, tune  # noqa: E402
+
+
+def _synthetic(sessions: int, steps: int, seed: int):
+    model, rng = MetricModel(), np.random.default_rng(seed)
+    rows = [model.initial(sessions)]
+    for _ in range(steps - 1):
+        rows.append(model.advance(rows[-1], rng))
+    return list(np.stack(rows, axis=1))
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Tune facet/phase thresholds against the SLO targets.")
+    parser.add_argument("--db", default=DB_PATH, help="Archive to replay.")
+    parser.add_argument("--slo", default=SLO_PATH, help="SLO file with the 'tuning' section.")
+    parser.add_argument("--out", default="proposed_thresholds.json", help="Proposed threshold file.")
+    parser.add_argument("--strategy", choices=("coordinate", "grid"), default="coordinate")
+    parser.add_argument("--max-candidates", type=int, default=256, help="Grid candidates (sampled beyond).")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count).")
+    parser.add_argument("--static", action="store_true", help="Disable per-session dynamic thresholds.")
+    parser.add_argument("--synthetic", type=int, default=0, metavar="N", help="Replay N simulated sessions instead.")
+    parser.add_argument("--steps", type=int, default=100, help="Turns per simulated session.")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    try:
+        targets = load_targets(args.slo)
+    except (OSError, ValueError) as exc:
+        print(f"Invalid SLO file: {exc}")
+        return 2
+    if args.synthetic:
+        series = _synthetic(args.synthetic, args.steps, args.seed)
+    elif not os.path.exists(args.db):
+        print(f"Archive not found: {args.db}")
+        return 2
+    else:
+        series = metric_series(args.db)
+    if not series:
+        print("No metric history to replay.")
+        return 1
+
+    result = tune(
+        series,
+        targets,
+        strategy=args.strategy,
+        adaptive=not args.static,
+        workers=args.workers,
+        max_candidates=args.max_candidates,
+        seed=args.seed,
+    )
+    with open(args.out, "w", encoding="utf-8") as fh:
+        json.dump(proposed_thresholds(result), fh, ensure_ascii=False, indent=2)
+    print(diff_report(result))
+    print(f"\nProposed thresholds written to {args.out}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
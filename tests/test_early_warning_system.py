@@ -0,0 +1,73 @@
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+for module in ("numpy", "pandas", "scipy", "sklearn"):
+    pytest.importorskip(module)
+
+import numpy as np  # noqa: E402
+
+sys.path.append(str(Path(__file__).resolve().parents[1] / "incoming" / "Actualsourse"))
+
+import early_warning_system as ews  # noqa: E402
+
+
+def _stream(detector, values):
+    return [detector.update(v) for v in values]
+
+
+@pytest.mark.parametrize("detector_cls", [ews.EWMAZScoreDetector, ews.CUSUMDetector, ews.PageHinkleyDetector])
+def test_online_detectors_flag_level_shift_but_not_noise(detector_cls):
+    rng = np.random.default_rng(0)
+    baseline = 1.5 + 0.02 * rng.normal(size=60)
+    shifted = 1.1 + 0.02 * rng.normal(size=20)
+
+    detector = detector_cls()
+    quiet = _stream(detector, baseline)
+    assert sum(r["alarm"] for r in quiet) <= 1
+    assert any(r["alarm"] for r in _stream(detector, shifted))
+
+
+def test_cusum_flat_warmup_ignores_tiny_change():
+    detector = ews.CUSUMDetector()
+    _stream(detector, [0.8] * 20)
+    assert not any(r["alarm"] for r in _stream(detector, [0.8000001] * 5 + [0.81] * 5))
+    assert any(r["alarm"] for r in _stream(detector, [0.5] * 5))
+
+    monitor = ews.OnlineAnomalyMonitor()
+    for _ in range(25):
+        monitor.update({"hfd": 1.5, "complexity_score": 0.5, "confidence": 0.80})
+    assert "confidence:cusum" not in monitor.update({"hfd": 1.5, "complexity_score": 0.5, "confidence": 0.81})["alarms"]
+    with pytest.raises(ValueError):
+        ews.CUSUMDetector(min_std=0.0)
+
+
+def test_detector_state_round_trip_continues_identically():
+    values = list(1.5 + 0.05 * np.random.default_rng(1).normal(size=40)) + [1.0] * 10
+    for detector_cls in ews.ONLINE_DETECTORS.values():
+        original = detector_cls()
+        _stream(original, values[:25])
+        restored = ews.OnlineDetector.from_state(json.loads(json.dumps(original.to_state())))
+        assert _stream(restored, values[25:]) == _stream(original, values[25:])
+    with pytest.raises(ValueError):
+        ews.OnlineDetector.from_state({"type": "unknown"})
+
+
+def test_health_analysis_scores_each_turn_online():
+    system = ews.EarlyWarningSystem()
+    history = []
+    for i in range(30):
+        metrics = {"hfd": 1.45 + 0.01 * (i % 3), "complexity_score": 0.55, "confidence": 0.8}
+        history.append(metrics)
+        result = system.analyze_health_state(metrics, history)
+    assert result["online_anomalies"]["alarms"] == []
+    assert not result["warning_indicators"]["online_anomaly_warning"]
+
+    monitor_state = system.online_monitor.to_state()
+    resumed = ews.EarlyWarningSystem(online_monitor=ews.OnlineAnomalyMonitor.from_state(monitor_state))
+    drop = {"hfd": 1.05, "complexity_score": 0.15, "confidence": 0.25}
+    result = resumed.analyze_health_state(drop, history + [drop])
+    assert result["warning_indicators"]["online_anomaly_warning"]
+    assert "hfd:ewma" in result["online_anomalies"]["alarms"]
@@ -0,0 +1,33 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.append(str(Path(__file__).resolve().parents[1] / "incoming" / "Actualsourse"))
+
+import decide  # noqa: E402
+
+
+def test_delta_metrics_count_blocks_with_markers():
+    block = {
+        "D": [
+            {"inference": "ПАРАДОКС и боль", "fact": "uncertain"},
+            {"inference": "Конфликт версий", "fact": "true"},
+            {"inference": "всё спокойно", "fact": "true"},
+        ]
+    }
+    metrics = decide.analyze_delta_metrics(block)
+    # uncertain fact counts as a chaos marker on top of the keyword
+    assert metrics["chaos"] == pytest.approx(2 / 3)
+    assert metrics["pain"] == pytest.approx(2 / 3)
+    assert metrics["paradox_count"] == 1
+
+
+def test_enhanced_calculator_markers():
+    pytest.importorskip("yaml")
+    import enhanced_slo_enforcer as slo
+
+    calc = slo.EnhancedMetricsCalculator()
+    assert calc.calc_clarity("Шаг 2: конкретно и точно") == pytest.approx(0.9)
+    assert calc.calc_clarity("??? не понимаю, всё запутано") == pytest.approx(0.2)
+    assert calc._extract_chaos_markers("Хаос, ПАРАДОКС и внезапно переворот") == pytest.approx(0.4)
@@ -0,0 +1,133 @@
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+for module in ("numpy", "pandas", "scipy", "sklearn"):
+    pytest.importorskip(module)
+
+import numpy as np  # noqa: E402
+
+sys.path.append(str(Path(__file__).resolve().parents[1] / "incoming" / "Actualsourse"))
+
+import structural_complexity_analyzer as sca  # noqa: E402
+
+
+def _walk(n, seed=0):
+    return np.cumsum(np.random.default_rng(seed).normal(size=n))
+
+
+def test_vectorised_curve_lengths_identical_to_loop():
+    for n, kmax in ((10, 3), (257, 11), (3000, 40)):
+        data = _walk(n, seed=n)
+        assert np.array_equal(
+            sca.HiguchiFractalDimension.curve_lengths(data, kmax),
+            sca._curve_lengths_loop(data, kmax),
+        )
+
+
+def test_hfd_recovers_known_dimensions():
+    hfd = sca.HiguchiFractalDimension(adaptive_kmax=False)
+    assert 1.4 < hfd.calculate_hfd(_walk(4000), 16) < 1.6
+    noise = np.random.default_rng(1).normal(size=4000)
+    assert hfd.calculate_hfd(noise, 16) > 1.9
+    assert hfd.calculate_hfd(np.linspace(0, 1, 500), 16) == 1.0
+
+
+def test_sliding_window_matches_full_recomputation():
+    data = _walk(2500, seed=3)
+    window, kmax = 400, 12
+    batch = sca.HiguchiFractalDimension(adaptive_kmax=False)
+    sliding = sca.SlidingHiguchi(window, kmax)
+    for i, value in enumerate(data):
+        sliding.update(value)
+        if i >= window - 1 and i % 53 == 0:
+            expected = batch.calculate_hfd(data[i - window + 1:i + 1], kmax)
+            assert sliding.hfd() == pytest.approx(expected, abs=1e-9)
+            assert np.array_equal(sliding.values(), data[i - window + 1:i + 1])
+    with pytest.raises(ValueError):
+        sca.SlidingHiguchi(window, kmax).hfd()
+
+
+def test_kmax_table_lookup_is_memoised_and_never_optimises(monkeypatch):
+    table = sca.load_kmax_table()
+    assert table and [n for n, _ in table] == sorted(n for n, _ in table)
+
+    hfd = sca.HiguchiFractalDimension()
+    monkeypatch.setattr(hfd, "optimize_kmax", lambda *a, **k: pytest.fail("optimize_kmax on hot path"))
+    for n in (12, 100, 1000, 5000):
+        hfd.calculate_hfd(_walk(n, seed=n))
+        assert hfd.optimal_kmax == hfd.kmax_for_length(n) <= max(hfd.min_kmax, n // 4)
+    # The bucket with the largest lower bound <= N is used.
+    n, kmax = table[3]
+    assert hfd.kmax_for_length(n + 1) == min(kmax, (n + 1) // 4)
+    assert set(hfd._kmax_by_length) == {12, 100, 1000, 5000, n + 1}
+
+
+def test_kmax_table_round_trip(tmp_path):
+    table = sca.build_kmax_table(lengths=(32, 64), trials=1)
+    path = str(tmp_path / "kmax.json")
+    sca.save_kmax_table(table, path)
+    assert sca.load_kmax_table(path) == tuple(tuple(row) for row in table["buckets"])
+    assert sca.load_kmax_table(str(tmp_path / "missing.json")) == ()
+
+
+def test_committed_kmax_table_is_monotone():
+    with open(sca.KMAX_TABLE_PATH, encoding="utf-8") as fh:
+        table = json.load(fh)
+    lengths = [n for n, _ in table["buckets"]]
+    kmax = [k for _, k in table["buckets"]]
+    assert lengths == list(sca.KMAX_TABLE_LENGTHS)
+    assert kmax == sorted(kmax)
+    assert all(3 <= k <= max(3, n // 4) for n, k in table["buckets"])
+
+
+def _katz_loop(data):
+    n = len(data)
+    total = 0
+    for i in range(1, n):
+        total += abs(data[i] - data[i - 1])
+    widest = max(abs(data[i] - data[j]) for i in range(n) for j in range(i + 1, n))
+    avg = total / (n - 1)
+    return max(1.0, min(2.0, np.log(total / avg) / np.log(widest / avg)))
+
+
+def test_batch_analysis_matches_per_series_and_pool():
+    rng = np.random.default_rng(5)
+    series = [_walk(int(n), seed=i) for i, n in enumerate(rng.integers(20, 600, size=40))]
+    analyzer = sca.StructuralComplexityAnalyzer()
+    inline = analyzer.analyze_batch(series, workers=1)
+    pooled = analyzer.analyze_batch(series, workers=2, chunk_size=7)
+    assert pooled == inline
+    for result, data in zip(inline, series[:10]):
+        assert result["length"] == len(data)
+        assert result["katz_fd"] == _katz_loop(data)
+        if len(data) >= analyzer.min_window:
+            assert result["hfd"] == analyzer.hfd_calculator.calculate_hfd(data)
+        else:
+            assert result["hfd"] == 1.0 and result["complexity_score"] == 0.0
+    assert analyzer.analyze_macro_level(inline)["analysis_type"] == "macro_level"
+    assert analyzer.analyze_batch([]) == []
+
+
+def test_streaming_analyzer_matches_micro_level_and_round_trips():
+    data = _walk(1500, seed=5) + 10.0
+    window = 100
+    reference = sca.StructuralComplexityAnalyzer(window_size=window)
+    streaming = sca.StreamingComplexityAnalyzer(window)
+    assert streaming.report()['confidence'] == 0.0
+    for i, value in enumerate(data):
+        streaming.update(value)
+        if i >= window - 1 and i % 37 == 0:
+            chunk = data[i - window + 1:i + 1]
+            report = streaming.report()
+            expected = reference.analyze_micro_level(chunk)
+            for key in ('hfd', 'complexity_score', 'confidence'):
+                assert report[key] == pytest.approx(expected[key], abs=1e-9)
+            assert report['mean'] == pytest.approx(chunk.mean())
+            assert report['variance'] == pytest.approx(chunk.var())
+
+    restored = sca.StreamingComplexityAnalyzer.from_state(json.loads(json.dumps(streaming.to_state())))
+    assert np.array_equal(restored.values(), streaming.values())
+    assert restored.report()['hfd'] == pytest.approx(streaming.report()['hfd'], abs=1e-12)